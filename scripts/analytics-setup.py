@@ -6,9 +6,12 @@ This script helps set up basic usage tracking without collecting personal data.
 
 import json
 import os
+import argparse
 from datetime import datetime
 from pathlib import Path
 
+from tracing import add_instrumentation_arguments, start_instrumentation
+
 def create_analytics_config():
     """Create configuration for privacy-respecting analytics."""
     config = {
@@ -186,4 +189,7 @@ Questions about our privacy practices? Open an issue or discussion in the reposi
     print("📈 Dashboard template created")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Set up privacy-first analytics tracking')
+    add_instrumentation_arguments(parser)
+    start_instrumentation(parser.parse_args(), "analytics-setup")
     setup_analytics_tracking()
\ No newline at end of file
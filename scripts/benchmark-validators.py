@@ -0,0 +1,455 @@
+#!/usr/bin/env python3
+"""
+Validator Throughput Benchmarks
+
+Generates seeded synthetic corpora (`generate-corpus.py`) at several sizes
+and times every validator against each one: files/s and MB/s over the
+files that validator reads, and peak RSS. Each run happens in a fresh
+interpreter with the corpus as its working directory, so the import cost,
+memory peak and on-disk caches of one validator don't leak into another.
+
+The JSON report records the commit, interpreter, seed and sizes alongside
+a scaling curve per validator. It includes a fitted exponent
+(seconds ~ files^k, so about 1.0 is linear), and the cold-start time of
+`sdd --help` and of each main subcommand's `--help`, with the
+`-X importtime` totals and slowest top-level imports behind each one. Use `--compare` with an older
+report to see per-validator speedups and regressions between commits:
+
+    benchmark-validators.py --sizes 50,200,800 --output before.json
+    benchmark-validators.py --sizes 50,200,800 --compare before.json
+"""
+
+import asyncio
+import contextlib
+import json
+import math
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import argparse
+from dataclasses import dataclass
+from datetime import date, datetime
+from pathlib import Path
+from statistics import median
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from tracing import add_instrumentation_arguments, start_instrumentation
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+
+# sdd invocations timed from a cold interpreter; a subcommand's --help imports its script
+STARTUP_COMMANDS = (
+    ("--help",),
+    ("validate", "templates", "--help"),
+    ("validate", "examples", "--help"),
+    ("journeys", "--help"),
+    ("feedback", "--help"),
+    ("generate", "--help"),
+    ("run-all", "--help"),
+)
+STARTUP_RUNS = 10
+STARTUP_BUDGET_SECONDS = 0.05
+
+@dataclass
+class Benchmark:
+    """A validator run against a corpus, and the files that run reads."""
+    name: str
+    inputs: Callable[[Path], List[Path]]
+    run: Callable[[Path], None]
+
+def _markdown(root: Path, directory: str = ".") -> List[Path]:
+    return sorted((root / directory).rglob("*.md"))
+
+def _template_files(root: Path) -> List[Path]:
+    templates = root / "resources/templates"
+    return [path for path in sorted(templates.rglob("*")) if path.suffix in (".md", ".json")]
+
+def _example_files(root: Path) -> List[Path]:
+    return [path for path in _markdown(root, "examples")
+            if path.name in ("README.md", "spec.md", "plan.md", "tasks.md")]
+
+def _journey_files(root: Path) -> List[Path]:
+    from validation_workspace import load_script
+    journeys = load_script("test-user-journeys").UserJourneyTester(str(root)).journeys()
+    files = {step.expected_file for _, _, steps in journeys for step in steps}
+    return sorted(root / path for path in files if (root / path).exists())
+
+def _feedback_files(root: Path) -> List[Path]:
+    analytics = root / "analytics"
+    return _markdown(root) + (sorted(path for path in analytics.rglob("*") if path.is_file())
+                              if analytics.is_dir() else [])
+
+def _ai_integration_files(root: Path) -> List[Path]:
+    templates = [path for path in _markdown(root, "resources/templates")
+                 if path.name in ("spec.md", "plan.md", "tasks.md")]
+    return templates + sorted((root / "examples").rglob("spec.md"))[:3]
+
+def run_template_metadata(root: Path):
+    from validation_workspace import load_script
+    validator = load_script("validate-template-metadata").TemplateValidator("resources/templates/template-schema.json")
+    validator.validate_template_directory("resources/templates")
+
+def run_template_structure(root: Path):
+    from validation_workspace import load_script
+    load_script("validate-templates").TemplateStructureValidator("resources/templates").validate_all(jobs=1)
+
+def run_examples(root: Path):
+    from validation_workspace import load_script
+    load_script("validate-examples").ExampleValidator("examples").validate_all_examples(jobs=1)
+
+def run_journeys(root: Path):
+    from validation_workspace import load_script
+    load_script("test-user-journeys").UserJourneyTester(".").test_all_user_journeys()
+
+def run_feedback(root: Path):
+    from validation_workspace import load_script
+    feedback_analysis = load_script("feedback-analysis")
+    analyzer = feedback_analysis.FeedbackAnalyzer(".", cache_path=None)
+    for export in sorted(Path("analytics/feedback").glob("*.json")):
+        with open(export, 'r', encoding='utf-8') as f:
+            for record in json.load(f):
+                record["created_at"] = datetime.fromisoformat(record["created_at"])
+                analyzer.add_feedback(feedback_analysis.FeedbackItem(**record))
+    analyzer.analyze_feedback()
+
+def run_ai_integration(root: Path):
+    from validation_workspace import load_script
+    tester = load_script("test-ai-integration").AIIntegrationTester(simulated_latency=0)
+    asyncio.run(tester.run_all_tests())
+
+def run_links(root: Path):
+    from validation_workspace import load_script
+    load_script("check-links").LinkChecker(".", cache_path=None, offline=True).check_all()
+
+def run_decision_trees(root: Path):
+    from validation_workspace import load_script
+    load_script("validate-decision-trees").DecisionTreeValidator("resources/decision-trees").validate_all(jobs=1)
+
+BENCHMARKS = {
+    benchmark.name: benchmark for benchmark in (
+        Benchmark("template-metadata", _template_files, run_template_metadata),
+        Benchmark("template-structure", lambda root: _markdown(root, "resources/templates"), run_template_structure),
+        Benchmark("examples", _example_files, run_examples),
+        Benchmark("user-journeys", _journey_files, run_journeys),
+        Benchmark("feedback", _feedback_files, run_feedback),
+        Benchmark("ai-integration", _ai_integration_files, run_ai_integration),
+        Benchmark("links", _markdown, run_links),
+        Benchmark("decision-trees", lambda root: _markdown(root, "resources/decision-trees"), run_decision_trees),
+    )
+}
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def run_one(name: str, root: Path):
+    """Time one benchmark in this process and print the measurements as JSON."""
+    os.chdir(root)
+    benchmark = BENCHMARKS[name]
+    
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        start_time = time.perf_counter()
+        from validation_workspace import load_script  # noqa: F401 - timed as part of the import cost
+        import_seconds = time.perf_counter() - start_time
+        baseline_rss = peak_rss_mb()
+        
+        start_time = time.perf_counter()
+        benchmark.run(root)
+        seconds = time.perf_counter() - start_time
+    
+    print(json.dumps({
+        "seconds": seconds,
+        "import_seconds": import_seconds,
+        "peak_rss_mb": peak_rss_mb(),
+        "baseline_rss_mb": baseline_rss
+    }))
+
+def measure(name: str, root: Path, timeout: float) -> Dict[str, Any]:
+    """Run one benchmark in a fresh interpreter."""
+    process = subprocess.run(
+        [sys.executable, str(Path(__file__).resolve()), "--run-one", name, "--corpus", str(root)],
+        capture_output=True, text=True, timeout=timeout
+    )
+    if process.returncode != 0:
+        raise RuntimeError(process.stderr.strip().splitlines()[-1] if process.stderr.strip()
+                           else f"exit status {process.returncode}")
+    return json.loads(process.stdout.strip().splitlines()[-1])
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int, bool]]:
+    """(module, self µs, cumulative µs, top-level) for each import in `-X importtime` output."""
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        # Nested imports are indented by two more spaces per level
+        imports.append((parts[2].strip(), int(parts[0]), int(parts[1]), not parts[2].startswith("  ")))
+    return imports
+
+def measure_startup(args: Tuple[str, ...], runs: int = STARTUP_RUNS) -> Dict[str, Any]:
+    """Time `sdd <args>` from a cold interpreter, then break its imports down with -X importtime."""
+    command = [str(SCRIPTS_DIR / "sdd"), *args]
+    timings = []
+    for _ in range(runs):
+        start_time = time.perf_counter()
+        subprocess.run([sys.executable, *command], cwd=SCRIPTS_DIR.parent,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start_time)
+    process = subprocess.run([sys.executable, "-X", "importtime", *command], cwd=SCRIPTS_DIR.parent,
+                             stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    imports = parse_importtime(process.stderr)
+    top_level = [(module, cumulative) for module, _, cumulative, top in imports if top]
+    return {
+        "command": " ".join(("sdd",) + args),
+        "seconds": round(median(timings), 4),
+        "min_seconds": round(min(timings), 4),
+        "import_us": sum(cumulative for _, cumulative in top_level),
+        "modules": len(imports),
+        "slowest_imports": [{"module": module, "cumulative_us": cumulative}
+                            for module, cumulative in sorted(top_level, key=lambda item: -item[1])[:5]]
+    }
+
+def scaling_exponent(points: List[Dict[str, Any]]) -> Optional[float]:
+    """Least-squares slope of log(seconds) against log(files)."""
+    pairs = [(math.log(point["files"]), math.log(point["seconds"]))
+             for point in points if point["files"] > 0 and point["seconds"] > 0]
+    if len(pairs) < 2:
+        return None
+    mean_x = sum(x for x, _ in pairs) / len(pairs)
+    mean_y = sum(y for _, y in pairs) / len(pairs)
+    spread = sum((x - mean_x) ** 2 for x, _ in pairs)
+    if spread == 0:
+        return None
+    return round(sum((x - mean_x) * (y - mean_y) for x, y in pairs) / spread, 3)
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=SCRIPTS_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+class BenchmarkSuite:
+    """Runs the selected benchmarks over corpora of increasing size."""
+    
+    def __init__(self, names: List[str], sizes: List[int], seed: int = 1, repeat: int = 3,
+                 defect_rate: float = 0.05, corpus_dir: Optional[str] = None, timeout: float = 600.0):
+        self.names = names
+        self.sizes = sizes
+        self.seed = seed
+        self.repeat = repeat
+        self.defect_rate = defect_rate
+        self.corpus_dir = corpus_dir
+        self.timeout = timeout
+    
+    def run(self) -> Dict[str, Any]:
+        from validation_workspace import load_script
+        generate_corpus = load_script("generate-corpus")
+        
+        print("\n🚦 sdd start-up (cold interpreter, median of runs):")
+        startup = []
+        for args in STARTUP_COMMANDS:
+            point = measure_startup(args)
+            startup.append(point)
+            slowest = ", ".join(f"{item['module']} {item['cumulative_us'] / 1000:.1f}" for item in point["slowest_imports"][:3])
+            print(f"   {point['command']:32} {point['seconds'] * 1000:7.1f} ms  "
+                  f"imports {point['import_us'] / 1000:6.1f} ms ({slowest})")
+        
+        results: Dict[str, Dict[str, Any]] = {name: {"points": []} for name in self.names}
+        corpora = []
+        keep = self.corpus_dir is not None
+        base = Path(self.corpus_dir) if keep else Path(tempfile.mkdtemp(prefix="sdd-benchmark-"))
+        
+        try:
+            for size in self.sizes:
+                root = base / f"corpus-{size}"
+                if root.exists():
+                    shutil.rmtree(root)
+                spec = generate_corpus.CorpusSpec.scaled(size, self.seed, self.defect_rate)
+                stats = generate_corpus.CorpusGenerator(str(root), spec).generate()
+                corpora.append({"projects": size, **stats.to_dict()})
+                print(f"\n📁 Corpus with {size} projects: {stats.files} files, {stats.bytes / 1_000_000:.1f} MB")
+                
+                for name in self.names:
+                    inputs = BENCHMARKS[name].inputs(root)
+                    size_bytes = sum(path.stat().st_size for path in inputs)
+                    try:
+                        runs = [measure(name, root, self.timeout) for _ in range(self.repeat)]
+                    except (RuntimeError, subprocess.TimeoutExpired) as e:
+                        print(f"   ❌ {name}: {e}")
+                        results[name]["points"].append({"projects": size, "error": str(e)})
+                        continue
+                    seconds = median(run["seconds"] for run in runs)
+                    point = {
+                        "projects": size,
+                        "files": len(inputs),
+                        "bytes": size_bytes,
+                        "seconds": round(seconds, 4),
+                        "min_seconds": round(min(run["seconds"] for run in runs), 4),
+                        "files_per_second": round(len(inputs) / seconds, 1) if seconds else None,
+                        "mb_per_second": round(size_bytes / 1_000_000 / seconds, 2) if seconds else None,
+                        "peak_rss_mb": round(max(run["peak_rss_mb"] for run in runs), 1),
+                        "rss_growth_mb": round(max(run["peak_rss_mb"] - run["baseline_rss_mb"] for run in runs), 1),
+                        "import_seconds": round(median(run["import_seconds"] for run in runs), 4)
+                    }
+                    results[name]["points"].append(point)
+                    print(f"   ⏱️  {name:20} {point['seconds']:8.3f}s  {point['files_per_second'] or 0:9.1f} files/s  "
+                          f"{point['mb_per_second'] or 0:7.2f} MB/s  {point['peak_rss_mb']:7.1f} MB peak")
+        finally:
+            if not keep:
+                shutil.rmtree(base, ignore_errors=True)
+        
+        for result in results.values():
+            result["scaling_exponent"] = scaling_exponent([point for point in result["points"] if "error" not in point])
+        
+        return {
+            "metadata": {
+                "commit": git_commit(),
+                "date": date.today().isoformat(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "seed": self.seed,
+                "sizes": self.sizes,
+                "repeat": self.repeat,
+                "defect_rate": self.defect_rate
+            },
+            "startup": startup,
+            "corpora": corpora,
+            "benchmarks": results
+        }
+
+def compare_reports(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Print per-point speed ratios against a baseline; return the regressions."""
+    print(f"\n📈 Compared with {baseline['metadata'].get('commit') or 'baseline'}:")
+    if baseline["metadata"].get("seed") != current["metadata"]["seed"]:
+        print("⚠️  Seeds differ, so the corpora are not identical")
+    regressions = []
+    for name, result in current["benchmarks"].items():
+        previous = {point["projects"]: point for point in baseline["benchmarks"].get(name, {}).get("points", [])
+                    if "error" not in point}
+        for point in result["points"]:
+            before = previous.get(point["projects"])
+            if "error" in point or before is None or not point["seconds"]:
+                continue
+            ratio = before["seconds"] / point["seconds"]
+            if ratio < 1 / (1 + threshold):
+                symbol = "❌"
+                regressions.append(f"{name} at {point['projects']} projects")
+            elif ratio > 1 + threshold:
+                symbol = "🚀"
+            else:
+                symbol = "  "
+            print(f"   {symbol} {name:20} {point['projects']:6} projects  {before['seconds']:8.3f}s -> "
+                  f"{point['seconds']:8.3f}s  ({ratio:.2f}x)")
+    
+    previous_startup = {point["command"]: point for point in baseline.get("startup", [])}
+    for point in current.get("startup", []):
+        before = previous_startup.get(point["command"])
+        if before is None or not point["min_seconds"]:
+            continue
+        # Start-up is short and noisy, so compare the fastest runs
+        ratio = before["min_seconds"] / point["min_seconds"]
+        if ratio < 1 / (1 + threshold):
+            symbol = "❌"
+            regressions.append(f"{point['command']} start-up")
+        elif ratio > 1 + threshold:
+            symbol = "🚀"
+        else:
+            symbol = "  "
+        print(f"   {symbol} {point['command']:32} {before['min_seconds'] * 1000:7.1f} ms -> "
+              f"{point['min_seconds'] * 1000:7.1f} ms  ({ratio:.2f}x)")
+    return regressions
+
+def save_report(report: Dict[str, Any], output_path: str):
+    """Save the benchmark report to file."""
+    output_file = Path(output_path)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    
+    with open(output_file, 'w') as f:
+        json.dump(report, f, indent=2)
+    
+    print(f"\n📊 Benchmark report saved to: {output_file}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark validator throughput on synthetic corpora')
+    parser.add_argument('--sizes', default='25,100,400',
+                       help='Comma-separated corpus sizes, in example projects')
+    parser.add_argument('--benchmarks', default=','.join(BENCHMARKS),
+                       help='Comma-separated benchmarks to run')
+    parser.add_argument('--seed', type=int, default=1,
+                       help='Corpus generator seed')
+    parser.add_argument('--repeat', type=int, default=3,
+                       help='Runs per benchmark and size; the median is reported')
+    parser.add_argument('--defect-rate', type=float, default=0.05,
+                       help='Share of generated documents with a deliberate defect')
+    parser.add_argument('--corpus-dir', default=None,
+                       help='Keep the generated corpora here instead of a temporary directory')
+    parser.add_argument('--timeout', type=float, default=600.0,
+                       help='Seconds before a single run is abandoned')
+    parser.add_argument('--output', default='test-results/validator-benchmark.json',
+                       help='Where to write the JSON report')
+    parser.add_argument('--compare', metavar='REPORT',
+                       help='Earlier benchmark report to compare against')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                       help='Slowdown ratio beyond which --compare reports a regression')
+    parser.add_argument('--run-one', help=argparse.SUPPRESS)
+    parser.add_argument('--corpus', help=argparse.SUPPRESS)
+    add_instrumentation_arguments(parser)
+    
+    args = parser.parse_args()
+    start_instrumentation(args, "benchmark-validators")
+    
+    if args.run_one:
+        run_one(args.run_one, Path(args.corpus).resolve())
+        return
+    
+    names = [name.strip() for name in args.benchmarks.split(',') if name.strip()]
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        print(f"❌ Unknown benchmarks: {', '.join(unknown)} (available: {', '.join(BENCHMARKS)})")
+        sys.exit(1)
+    try:
+        sizes = sorted({int(size) for size in args.sizes.split(',')})
+    except ValueError:
+        print(f"❌ Invalid --sizes: {args.sizes}")
+        sys.exit(1)
+    
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)
+    
+    print(f"🚀 Benchmarking {len(names)} validators at {len(sizes)} sizes (seed {args.seed})")
+    report = BenchmarkSuite(names, sizes, args.seed, args.repeat, args.defect_rate,
+                            args.corpus_dir, args.timeout).run()
+    
+    print("\n📐 Scaling exponents (seconds ~ files^k):")
+    for name, result in report["benchmarks"].items():
+        exponent = result["scaling_exponent"]
+        print(f"   {name:20} {exponent if exponent is not None else 'n/a'}")
+    
+    help_startup = report["startup"][0]
+    if help_startup["seconds"] > STARTUP_BUDGET_SECONDS:
+        print(f"\n⚠️  sdd --help took {help_startup['seconds'] * 1000:.1f} ms "
+              f"(budget {STARTUP_BUDGET_SECONDS * 1000:.0f} ms)")
+    
+    save_report(report, args.output)
+    
+    if baseline is not None:
+        regressions = compare_reports(report, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regressions beyond {args.threshold:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+        print("\n✅ No regressions")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,774 @@
+#!/usr/bin/env python3
+"""
+Markdown Link Checker
+
+Checks every link in every Markdown file in the repository. A single pass
+builds an index of all repository paths and all heading anchors, so each
+relative link and `#fragment` resolves with a set lookup. External URLs are
+deduplicated and checked concurrently over pooled keep-alive connections
+(a bounded number per host), with alive results cached on disk.
+
+Honors `.markdown-link-check.json` (ignorePatterns, replacementPatterns,
+httpHeaders, timeout, retryOn429, retryCount, fallbackRetryDelay,
+aliveStatusCodes).
+
+Links already known to be broken are listed in `.link-check-baseline.json`
+by source page and target. They are reported as `baselined` and do not
+fail the run, so CI catches new breakage while the listed pages are
+written; `--update-baseline` rewrites the list from a full run.
+
+Each link's outcome is streamed as a record as soon as it is known (see
+result_records.py). With `--shard`, every shard indexes the whole
+repository but checks only the links in the pages it owns; each page's
+checking time, including its share of the external URLs it links to, is
+recorded for the shard plan.
+"""
+
+import http.client
+import json
+import os
+import queue
+import re
+import sys
+import threading
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+from urllib.parse import unquote, urljoin, urlsplit
+
+from openmetrics import MetricsRegistry, add_metrics_argument, validator_metrics
+from result_records import RecordWriter, ReportReducer, add_records_argument, merge_streams
+from sharding import ShardSelector, add_shard_arguments, shard_selector
+from tracing import add_instrumentation_arguments, span, start_instrumentation
+
+CACHE_VERSION = 1
+MAX_REDIRECTS = 5
+SKIPPED_DIRS = {'.git', 'node_modules', '.sdd-cache'}
+
+FENCE_PATTERN = re.compile(r'^\s{0,3}(`{3,}|~{3,})')
+HEADING_PATTERN = re.compile(r'^\s{0,3}(#{1,6})\s+(.*?)\s*#*\s*$')
+INLINE_CODE_PATTERN = re.compile(r'(`+)(?:(?!\1).)+?\1')
+INLINE_LINK_PATTERN = re.compile(r'!?\[(?:[^\[\]]|\[[^\[\]]*\])*\]\(\s*<?([^()\s<>]*(?:\([^()\s]*\)[^()\s<>]*)*)>?(?:\s+(?:"[^"]*"|\'[^\']*\'|\([^)]*\)))?\s*\)')
+REFERENCE_DEF_PATTERN = re.compile(r'^\s{0,3}\[([^\]]+)\]:\s*<?(\S+?)>?(?:\s+.*)?$')
+AUTOLINK_PATTERN = re.compile(r'<((?:https?|ftp)://[^\s<>]+)>')
+BARE_URL_PATTERN = re.compile(r'(?<![(<\["\'=/])\bhttps?://[^\s<>()\[\]"\'`]+')
+HTML_HREF_PATTERN = re.compile(r'<a\s[^>]*?href\s*=\s*["\']([^"\']+)["\']', re.IGNORECASE)
+HTML_ANCHOR_PATTERN = re.compile(r'<[a-z][^>]*?\s(?:id|name)\s*=\s*["\']([^"\']+)["\']', re.IGNORECASE)
+SLUG_STRIP_PATTERN = re.compile(r'[^\w\- ]', re.UNICODE)
+MARKUP_LINK_PATTERN = re.compile(r'!?\[([^\]]*)\]\([^)]*\)')
+HTML_TAG_PATTERN = re.compile(r'<[^>]+>')
+
+@dataclass(frozen=True)
+class Link:
+    """A link target found in a Markdown file."""
+    source: str
+    line: int
+    target: str
+
+@dataclass
+class LinkResult:
+    """Outcome of checking one link occurrence."""
+    source: str
+    line: int
+    target: str
+    status: str  # ok, broken, baselined, ignored, skipped
+    message: str = ""
+
+def github_slug(heading: str) -> str:
+    """Anchor slug GitHub generates for a heading's text."""
+    text = MARKUP_LINK_PATTERN.sub(r'\1', heading)
+    text = HTML_TAG_PATTERN.sub('', text).strip().lower()
+    return SLUG_STRIP_PATTERN.sub('', text).replace(' ', '-')
+
+def heading_anchors(slugs: Iterable[str]) -> Set[str]:
+    """Anchors of headings in document order, numbering repeats as GitHub does."""
+    anchors: Set[str] = set()
+    slug_counts: Dict[str, int] = {}
+    for slug in slugs:
+        count = slug_counts.get(slug, 0)
+        slug_counts[slug] = count + 1
+        anchors.add(f"{slug}-{count}" if count else slug)
+    return anchors
+
+def scan_markdown(content: str) -> Tuple[List[Tuple[int, str]], Set[str]]:
+    """Extract (line, target) links and the anchors a document defines in one pass."""
+    links, slugs, html_anchors = scan_markdown_tokens(content)
+    return links, heading_anchors(slugs) | html_anchors
+
+def scan_markdown_tokens(content: str) -> Tuple[List[Tuple[int, str]], List[str], Set[str]]:
+    """Extract (line, target) links, heading slugs in order, and HTML anchors.
+    
+    Slugs are not yet numbered, so the tokens of consecutive parts of a
+    document can be combined before ``heading_anchors`` is applied.
+    """
+    links: List[Tuple[int, str]] = []
+    slugs: List[str] = []
+    html_anchors: Set[str] = set()
+    fence = None
+    
+    for number, line in enumerate(content.split('\n'), 1):
+        fence_match = FENCE_PATTERN.match(line)
+        if fence is not None:
+            if fence_match and fence_match.group(1)[0] == fence[0] and len(fence_match.group(1)) >= len(fence):
+                fence = None
+            continue
+        if fence_match:
+            fence = fence_match.group(1)
+            continue
+        
+        text = INLINE_CODE_PATTERN.sub(lambda m: ' ' * len(m.group(0)), line)
+        
+        heading = HEADING_PATTERN.match(text)
+        if heading:
+            slugs.append(github_slug(heading.group(2)))
+        for match in HTML_ANCHOR_PATTERN.finditer(text):
+            html_anchors.add(match.group(1))
+        
+        reference = REFERENCE_DEF_PATTERN.match(text)
+        if reference:
+            links.append((number, reference.group(2)))
+            continue
+        
+        covered = []
+        for pattern in (INLINE_LINK_PATTERN, AUTOLINK_PATTERN, HTML_HREF_PATTERN):
+            for match in pattern.finditer(text):
+                covered.append(match.span())
+                if match.group(1):
+                    links.append((number, match.group(1)))
+        for match in BARE_URL_PATTERN.finditer(text):
+            if not any(start <= match.start() < end for start, end in covered):
+                links.append((number, match.group(0).rstrip('.,;:!?*_')))
+    
+    return links, slugs, html_anchors
+
+class LinkIndex:
+    """Every repository path plus the heading anchors of every Markdown file."""
+    
+    def __init__(self, repo_root: Path):
+        self.repo_root = repo_root
+        self.paths: Set[str] = {''}
+        self.directories: Set[str] = {''}
+        self.anchors: Dict[str, FrozenSet[str]] = {}
+        self.documents: Dict[str, List[Link]] = {}
+        self.files_read = 0
+        self.bytes_read = 0
+    
+    @property
+    def links(self) -> List[Link]:
+        return [link for links in self.documents.values() for link in links]
+    
+    def build(self) -> "LinkIndex":
+        """Walk the tree once, indexing paths and scanning Markdown files."""
+        with span("walk", self.repo_root):
+            self._walk()
+        return self
+    
+    def _walk(self):
+        for directory, subdirs, files in os.walk(self.repo_root):
+            subdirs[:] = sorted(d for d in subdirs if d not in SKIPPED_DIRS)
+            relative_dir = Path(directory).relative_to(self.repo_root).as_posix()
+            prefix = '' if relative_dir == '.' else relative_dir + '/'
+            if prefix:
+                self.paths.add(relative_dir)
+                self.directories.add(relative_dir)
+            for name in sorted(files):
+                relative = prefix + name
+                self.paths.add(relative)
+                if name.lower().endswith('.md'):
+                    self._scan_file(relative)
+    
+    def _scan_file(self, relative: str):
+        try:
+            with span("read", relative), open(self.repo_root / relative, 'r', encoding='utf-8') as f:
+                content = f.read()
+                self.files_read += 1
+                self.bytes_read += os.fstat(f.fileno()).st_size
+        except (OSError, UnicodeDecodeError):
+            return
+        self.scan_content(relative, content)
+    
+    def scan_content(self, relative: str, content: str):
+        """Index the links and anchors of one Markdown document."""
+        with span("parse", relative):
+            self.set_document(relative, *scan_markdown(content))
+    
+    def set_document(self, relative: str, links: Iterable[Tuple[int, str]], anchors: Iterable[str]):
+        """Index a Markdown document from an existing scan of its content."""
+        self.anchors[relative] = frozenset(anchors)
+        self.documents[relative] = [Link(relative, line, target) for line, target in links]
+    
+    def update(self, relative: str) -> bool:
+        """Re-index one path after it changed on disk.
+        
+        Returns True if what other documents can link to changed: the path
+        appeared or disappeared, or a Markdown file's anchors changed.
+        """
+        if not (self.repo_root / relative).exists():
+            if relative not in self.paths:
+                return False
+            removed = {relative}
+            if relative in self.directories:
+                prefix = relative + '/'
+                removed.update(path for path in self.paths if path.startswith(prefix))
+            for path in removed:
+                self.paths.discard(path)
+                self.directories.discard(path)
+                self.anchors.pop(path, None)
+                self.documents.pop(path, None)
+            return True
+        
+        added = relative not in self.paths
+        if added:
+            parts = relative.split('/')
+            for depth in range(1, len(parts)):
+                parent = '/'.join(parts[:depth])
+                self.paths.add(parent)
+                self.directories.add(parent)
+            self.paths.add(relative)
+            if (self.repo_root / relative).is_dir():
+                self.directories.add(relative)
+        
+        if relative.lower().endswith('.md') and relative not in self.directories:
+            previous = self.anchors.get(relative)
+            self._scan_file(relative)
+            return added or self.anchors.get(relative) != previous
+        return added
+    
+    def has_anchor(self, path: str, fragment: str) -> bool:
+        anchors = self.anchors.get(path, frozenset())
+        fragment = unquote(fragment)
+        return fragment in anchors or fragment.lower() in anchors
+
+class _HostPool:
+    """Keep-alive connections for one scheme://host, bounded in concurrency."""
+    
+    def __init__(self, scheme: str, netloc: str, size: int, timeout: float):
+        self.scheme = scheme
+        self.netloc = netloc
+        self.timeout = timeout
+        self.slots = threading.BoundedSemaphore(size)
+        self.idle: "queue.LifoQueue[http.client.HTTPConnection]" = queue.LifoQueue()
+    
+    def request(self, method: str, target: str, headers: Dict[str, str]) -> Tuple[int, Dict[str, str]]:
+        with self.slots:
+            for attempt in range(2):
+                connection = self._connection()
+                try:
+                    connection.request(method, target, headers=headers)
+                    response = connection.getresponse()
+                    response.read()
+                    result = response.status, {k.lower(): v for k, v in response.getheaders()}
+                except (OSError, http.client.HTTPException):
+                    connection.close()
+                    # A pooled connection may have been closed by the server; retry once fresh
+                    if attempt:
+                        raise
+                    continue
+                if response.will_close:
+                    connection.close()
+                else:
+                    self.idle.put(connection)
+                return result
+        raise OSError("unreachable")
+    
+    def _connection(self) -> http.client.HTTPConnection:
+        try:
+            return self.idle.get_nowait()
+        except queue.Empty:
+            if self.scheme == 'https':
+                return http.client.HTTPSConnection(self.netloc, timeout=self.timeout)
+            return http.client.HTTPConnection(self.netloc, timeout=self.timeout)
+    
+    def close(self):
+        while not self.idle.empty():
+            self.idle.get_nowait().close()
+
+class ExternalLinkChecker:
+    """Checks external URLs concurrently with per-host pooling and a result cache.
+    
+    Only alive results are cached (for ``cache_ttl`` seconds), so broken
+    links are always rechecked.
+    """
+    
+    def __init__(self, config: Dict[str, Any], cache_path: Optional[Path] = None,
+                 concurrency: int = 16, per_host: int = 4, cache_ttl: float = 86400):
+        self.timeout = _parse_seconds(config.get('timeout', '20s'))
+        self.retry_on_429 = config.get('retryOn429', False)
+        self.retry_count = config.get('retryCount', 2)
+        self.fallback_retry_delay = _parse_seconds(config.get('fallbackRetryDelay', '60s'))
+        self.alive_codes = set(config.get('aliveStatusCodes', [200]))
+        self.http_headers = config.get('httpHeaders', [])
+        self.cache_path = cache_path
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.cache_ttl = cache_ttl
+        self.cache: Dict[str, Dict[str, Any]] = self._load_cache()
+        self._pools: Dict[Tuple[str, str], _HostPool] = {}
+        self._pools_lock = threading.Lock()
+        self.requests_made = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        # url -> seconds spent checking it
+        self.durations: Dict[str, float] = {}
+    
+    def _load_cache(self) -> Dict[str, Dict[str, Any]]:
+        if self.cache_path is None or not self.cache_path.exists():
+            return {}
+        try:
+            with open(self.cache_path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get('version') != CACHE_VERSION:
+            return {}
+        return data.get('entries', {})
+    
+    def save_cache(self):
+        if self.cache_path is None:
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.cache_path.with_suffix('.tmp')
+        with open(temp_path, 'w') as f:
+            json.dump({'version': CACHE_VERSION, 'entries': self.cache}, f, indent=2, sort_keys=True)
+        os.replace(temp_path, self.cache_path)
+    
+    def check_all(self, urls: Set[str]) -> Dict[str, Tuple[bool, str]]:
+        """Check each unique URL once; returns url -> (alive, message)."""
+        now = time.time()
+        results: Dict[str, Tuple[bool, str]] = {}
+        pending = []
+        for url in sorted(urls):
+            cached = self.cache.get(url)
+            if cached and now - cached.get('checked', 0) < self.cache_ttl:
+                results[url] = (True, f"{cached['status']} (cached)")
+            else:
+                pending.append(url)
+        self.cache_hits += len(results)
+        self.cache_misses += len(pending)
+        
+        try:
+            with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                for url, outcome in zip(pending, executor.map(self.check, pending)):
+                    results[url] = outcome
+        finally:
+            for pool in self._pools.values():
+                pool.close()
+        return results
+    
+    def check(self, url: str) -> Tuple[bool, str]:
+        """Check a single URL: HEAD first, falling back to GET."""
+        start_time = time.perf_counter()
+        try:
+            status = self._fetch('HEAD', url)
+            if status not in self.alive_codes:
+                status = self._fetch('GET', url)
+        except (OSError, http.client.HTTPException, ValueError) as e:
+            return False, f"request failed: {e}"
+        finally:
+            self.durations[url] = time.perf_counter() - start_time
+        
+        if status in self.alive_codes:
+            self.cache[url] = {'status': status, 'checked': time.time()}
+            return True, str(status)
+        return False, f"HTTP {status}"
+    
+    def _fetch(self, method: str, url: str) -> int:
+        attempts = 0
+        for _ in range(MAX_REDIRECTS + 1):
+            parts = urlsplit(url)
+            if parts.scheme not in ('http', 'https') or not parts.netloc:
+                raise ValueError(f"unsupported URL: {url}")
+            target = (parts.path or '/') + (f"?{parts.query}" if parts.query else '')
+            status, headers = self._pool(parts.scheme, parts.netloc).request(method, target, self._headers_for(url))
+            self.requests_made += 1
+            
+            if status == 429 and self.retry_on_429 and attempts < self.retry_count:
+                attempts += 1
+                time.sleep(_parse_retry_after(headers.get('retry-after'), self.fallback_retry_delay))
+                continue
+            if status in (301, 302, 303, 307, 308) and 'location' in headers:
+                url = urljoin(url, headers['location'])
+                continue
+            return status
+        return status
+    
+    def _pool(self, scheme: str, netloc: str) -> _HostPool:
+        key = (scheme, netloc)
+        with self._pools_lock:
+            if key not in self._pools:
+                self._pools[key] = _HostPool(scheme, netloc, self.per_host, self.timeout)
+            return self._pools[key]
+    
+    def _headers_for(self, url: str) -> Dict[str, str]:
+        headers = {'User-Agent': 'sdd-link-checker'}
+        for entry in self.http_headers:
+            if any(url.startswith(prefix) for prefix in entry.get('urls', [])):
+                headers.update(entry.get('headers', {}))
+        return headers
+
+def _parse_seconds(value: Any) -> float:
+    """Parse '20s', '500ms', '1m' or a bare number of seconds."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = re.fullmatch(r'\s*(\d+(?:\.\d+)?)\s*(ms|s|m)?\s*', str(value))
+    if not match:
+        return 20.0
+    amount = float(match.group(1))
+    return amount / 1000 if match.group(2) == 'ms' else amount * 60 if match.group(2) == 'm' else amount
+
+def _parse_retry_after(value: Optional[str], fallback: float) -> float:
+    if value and value.strip().isdigit():
+        return float(value)
+    return fallback
+
+class LinkChecker:
+    """Checks intra-repo links against the index and external links over HTTP."""
+    
+    def __init__(self, repo_root: str = ".", config_path: str = ".markdown-link-check.json",
+                 cache_path: str = ".sdd-cache/link-check.json", offline: bool = False,
+                 concurrency: int = 16, per_host: int = 4, baseline_path: Optional[str] = None):
+        self.repo_root = Path(repo_root).resolve()
+        self.config = self._load_config(self._in_repo(config_path))
+        self.baseline_path = self._in_repo(baseline_path) if baseline_path else None
+        self.baseline = self._load_baseline(self.baseline_path)
+        self.ignore_patterns = [re.compile(p['pattern']) for p in self.config.get('ignorePatterns', [])]
+        self.replacements = [
+            (re.compile(p['pattern']), p['replacement'].replace('{{BASEURL}}', self.repo_root.as_posix()))
+            for p in self.config.get('replacementPatterns', [])
+        ]
+        self.offline = offline
+        self.external = ExternalLinkChecker(self.config, self._in_repo(cache_path) if cache_path else None,
+                                            concurrency=concurrency, per_host=per_host)
+        self.index = LinkIndex(self.repo_root)
+        self.results: List[LinkResult] = []
+        # page -> seconds spent checking its links
+        self.timings: Dict[str, float] = {}
+    
+    def _in_repo(self, path: str) -> Path:
+        """Resolve a relative path against the repository root, not the working directory."""
+        return self.repo_root / path
+    
+    @staticmethod
+    def _load_config(config_path: Path) -> Dict[str, Any]:
+        if not config_path.exists():
+            return {}
+        with open(config_path, 'r') as f:
+            return json.load(f)
+    
+    @staticmethod
+    def _load_baseline(baseline_path: Optional[Path]) -> Dict[Tuple[str, str], str]:
+        """(source, target) -> message for links known to be broken."""
+        if baseline_path is None or not baseline_path.exists():
+            return {}
+        with open(baseline_path, 'r') as f:
+            data = json.load(f)
+        return {(entry['source'], entry['target']): entry.get('message', '') for entry in data.get('links', [])}
+    
+    def save_baseline(self):
+        """Record every currently broken link as known.
+        
+        Baselined links skipped offline keep their entries.
+        """
+        links = {}
+        for result in self.results:
+            key = (result.source, result.target)
+            if result.status in ("broken", "baselined"):
+                links[key] = result.message
+            elif result.status == "skipped" and key in self.baseline:
+                links[key] = self.baseline[key]
+        links = sorted(links.items())
+        self.baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.baseline_path, 'w') as f:
+            json.dump({'links': [{'source': source, 'target': target, 'message': message}
+                                 for (source, target), message in links]}, f, indent=2)
+            f.write('\n')
+    
+    def stale_baseline(self) -> List[Tuple[str, str]]:
+        """Baseline entries no longer broken; only meaningful after a full run.
+        
+        Links skipped offline are not known to be fixed, so they are kept.
+        """
+        still_listed = {(result.source, result.target) for result in self.results
+                        if result.status in ("baselined", "skipped")}
+        return sorted(set(self.baseline) - still_listed)
+    
+    def check_all(self, sources: Optional[Set[str]] = None, shard: Optional[ShardSelector] = None,
+                  records: Optional[RecordWriter] = None) -> List[LinkResult]:
+        """Index the repository, then check every link occurrence.
+        
+        ``sources`` limits checking to the links in those pages, and
+        ``shard`` to the pages it owns; the whole repository is still
+        indexed, so their targets resolve as usual. Each outcome is
+        emitted to ``records`` as soon as it is known.
+        """
+        self.index.build()
+        if records is not None:
+            records.emit("index", markdown_files=len(self.index.anchors), indexed_paths=len(self.index.paths) - 1)
+        links = self.index.links
+        if sources is not None:
+            links = [link for link in links if link.source in sources]
+        if shard is not None:
+            links = shard.select(links, key=lambda link: link.source)
+        
+        external: Dict[str, List[Link]] = {}
+        timings = self.timings
+        with span("validate", "local links"):
+            for link in links:
+                start_time = time.perf_counter()
+                kind, target = self.classify(link)
+                if kind == "external":
+                    external.setdefault(target, []).append(link)
+                elif kind == "local":
+                    self._add(self.check_local(link, target), records)
+                else:
+                    self._add(LinkResult(link.source, link.line, link.target, kind), records)
+                timings[link.source] = timings.get(link.source, 0.0) + time.perf_counter() - start_time
+        
+        if external:
+            if self.offline:
+                for links in external.values():
+                    for link in links:
+                        self._add(LinkResult(link.source, link.line, link.target, "skipped", "offline"), records)
+            else:
+                with span("validate", "external links", urls=len(external)):
+                    outcomes = self.external.check_all(set(external))
+                self.external.save_cache()
+                for url, links in external.items():
+                    alive, message = outcomes[url]
+                    for link in links:
+                        self._add(LinkResult(link.source, link.line, link.target,
+                                             "ok" if alive else "broken", message), records)
+                    # Pages linking to the same URL share the cost of checking it
+                    share = self.external.durations.get(url, 0.0) / len(links)
+                    for link in links:
+                        timings[link.source] += share
+                if records is not None:
+                    records.emit("external", urls=len(external), requests=self.external.requests_made)
+        
+        if records is not None:
+            for page, seconds in timings.items():
+                records.emit("page", path=page, duration=seconds)
+        self.results.sort(key=lambda result: (result.source, result.line, result.target))
+        return self.results
+    
+    def _add(self, result: LinkResult, records: Optional[RecordWriter]):
+        if result.status == "broken" and (result.source, result.target) in self.baseline:
+            result = LinkResult(result.source, result.line, result.target, "baselined", result.message)
+        self.results.append(result)
+        if records is not None:
+            records.emit("link", **asdict(result))
+    
+    def classify(self, link: Link) -> Tuple[str, str]:
+        """Return (kind, target) with replacements applied.
+        
+        ``kind`` is ``ignored``, ``external`` (http/https), ``skipped`` (mailto:,
+        tel:, ftp: and friends are not checked) or ``local``.
+        """
+        target = link.target
+        if any(pattern.search(target) for pattern in self.ignore_patterns):
+            return "ignored", target
+        for pattern, replacement in self.replacements:
+            target = pattern.sub(replacement, target)
+        
+        scheme = urlsplit(target).scheme.lower()
+        if scheme in ('http', 'https'):
+            return "external", target
+        if scheme and len(scheme) > 1:
+            return "skipped", target
+        return "local", target
+    
+    def resolve_local(self, link: Link, target: str) -> Tuple[Optional[str], str]:
+        """Map a relative or root-relative link to (repository path, fragment).
+        
+        The path is None when the link points outside the repository.
+        """
+        path_part, _, fragment = target.partition('#')
+        path_part = unquote(path_part.split('?', 1)[0])
+        
+        if not path_part:
+            return link.source, fragment
+        if path_part.startswith(self.repo_root.as_posix() + '/') or path_part == self.repo_root.as_posix():
+            base = path_part[len(self.repo_root.as_posix()):].lstrip('/')
+        elif path_part.startswith('/'):
+            base = path_part.lstrip('/')
+        else:
+            base = f"{os.path.dirname(link.source)}/{path_part}"
+        resolved = os.path.normpath(base).replace(os.sep, '/').lstrip('/')
+        if resolved == '.':
+            resolved = ''
+        return (None if resolved.startswith('..') else resolved), fragment
+    
+    def check_local(self, link: Link, target: str) -> LinkResult:
+        """Resolve a local link against the path and anchor index."""
+        resolved, fragment = self.resolve_local(link, target)
+        if resolved is None:
+            return LinkResult(link.source, link.line, link.target, "broken", "points outside the repository")
+        if resolved not in self.index.paths:
+            return LinkResult(link.source, link.line, link.target, "broken", f"missing file: {resolved}")
+        
+        if fragment and resolved in self.index.anchors and not self.index.has_anchor(resolved, fragment):
+            return LinkResult(link.source, link.line, link.target, "broken", f"missing anchor #{fragment} in {resolved}")
+        return LinkResult(link.source, link.line, link.target, "ok")
+    
+    def metrics(self, duration: float) -> MetricsRegistry:
+        """OpenMetrics for the last check_all() run."""
+        caches = {}
+        if self.external.cache_hits + self.external.cache_misses:
+            caches["external-links"] = (self.external.cache_hits, self.external.cache_misses)
+        return validator_metrics(
+            "links",
+            duration=duration,
+            files=self.index.files_read,
+            bytes_read=self.index.bytes_read,
+            errors=sum(1 for result in self.results if result.status == "broken"),
+            warnings=0,
+            rule_evaluations=sum(1 for result in self.results if result.status in ("ok", "broken")),
+            caches=caches
+        )
+    
+    def save_report(self, report: Dict[str, Any], output_path: str):
+        """Save the link check report to file."""
+        output_file = Path(output_path)
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        
+        with open(output_file, 'w') as f:
+            json.dump(report, f, indent=2)
+        
+        print(f"\n📊 Link check report saved to: {output_file}")
+
+class LinkReportReducer(ReportReducer):
+    """Renders the link check report from `index`, `link`, `external` and `page` records."""
+    
+    def __init__(self):
+        super().__init__()
+        self.index: Optional[Dict[str, int]] = None
+        self.counts: Dict[str, int] = {}
+        self.broken: List[Dict[str, Any]] = []
+        self.external_requests = 0
+        self.timings: Dict[str, float] = {}
+    
+    def reduce_index(self, record: Dict[str, Any]):
+        # Every shard indexes the whole repository
+        if self.index is None:
+            self.index = {"markdown_files": record["markdown_files"], "indexed_paths": record["indexed_paths"]}
+    
+    def reduce_link(self, record: Dict[str, Any]):
+        self.counts[record["status"]] = self.counts.get(record["status"], 0) + 1
+        if record["status"] == "broken":
+            self.broken.append({key: record[key] for key in ("source", "line", "target", "status", "message")})
+    
+    def reduce_external(self, record: Dict[str, Any]):
+        self.external_requests += record["requests"]
+    
+    def reduce_page(self, record: Dict[str, Any]):
+        self.timings[record["path"]] = self.timings.get(record["path"], 0.0) + record["duration"]
+    
+    def report(self) -> Dict[str, Any]:
+        index = self.index or {"markdown_files": 0, "indexed_paths": 0}
+        return {
+            "summary": {
+                **index,
+                "links": sum(self.counts.values()),
+                "ok": self.counts.get("ok", 0),
+                "broken": self.counts.get("broken", 0),
+                "ignored": self.counts.get("ignored", 0),
+                "skipped": self.counts.get("skipped", 0),
+                "baselined": self.counts.get("baselined", 0),
+                "external_requests": self.external_requests
+            },
+            "broken": sorted(self.broken, key=lambda entry: (entry["source"], entry["line"], entry["target"])),
+            "timings": {page: round(seconds, 6) for page, seconds in sorted(self.timings.items())}
+        }
+    
+    def failure(self, report: Dict[str, Any]) -> Optional[str]:
+        broken = len(report['broken'])
+        return f"{broken} broken links" if broken else None
+
+REPORT_REDUCER = LinkReportReducer
+
+def main():
+    parser = argparse.ArgumentParser(description='Check intra-repo and external links in all Markdown files')
+    parser.add_argument('--repo-root', default='.',
+                       help='Repository root to scan')
+    parser.add_argument('--config', default='.markdown-link-check.json',
+                       help='markdown-link-check compatible configuration (relative to the repository root)')
+    parser.add_argument('--cache', default='.sdd-cache/link-check.json',
+                       help='On-disk cache of alive external URLs (relative to the repository root)')
+    parser.add_argument('--offline', action='store_true',
+                       help='Only check repository links; skip external URLs')
+    parser.add_argument('--concurrency', type=int, default=16,
+                       help='Maximum concurrent external requests')
+    parser.add_argument('--per-host', type=int, default=4,
+                       help='Maximum concurrent connections per host')
+    parser.add_argument('--output', default='test-results/link-check-report.json',
+                       help='Where to write the JSON report')
+    parser.add_argument('--sources', nargs='+', metavar='PAGE',
+                       help='Only check links in these Markdown pages (paths relative to the repository root)')
+    parser.add_argument('--baseline', default='.link-check-baseline.json',
+                       help='Known broken links that do not fail the run (relative to the repository root); "" for none')
+    parser.add_argument('--update-baseline', action='store_true',
+                       help='Rewrite the baseline with every link that is broken now')
+    add_metrics_argument(parser, "check-links")
+    add_records_argument(parser, "check-links")
+    add_shard_arguments(parser)
+    add_instrumentation_arguments(parser)
+    
+    args = parser.parse_args()
+    start_instrumentation(args, "check-links")
+    if args.update_baseline and (args.merge or args.shard or args.sources or not args.baseline):
+        parser.error("--update-baseline needs a full run with --baseline set")
+    
+    checker = LinkChecker(args.repo_root, args.config, args.cache, offline=args.offline,
+                          concurrency=args.concurrency, per_host=args.per_host, baseline_path=args.baseline)
+    
+    if args.merge:
+        report = merge_streams(parser, args.merge, LinkReportReducer(), "check-links")
+        print(f"🧩 Merged {len(args.merge)} shard record streams")
+    else:
+        shard = shard_selector(parser, args, "check-links")
+        records = RecordWriter(args.records, "check-links", LinkReportReducer(), shard.shard)
+        print(f"🔗 Checking links in: {checker.repo_root}")
+        start_time = time.time()
+        with span("suite", "links"):
+            checker.check_all(set(args.sources) if args.sources else None, shard=shard, records=records)
+        duration = time.time() - start_time
+        report = records.close(duration)
+    summary = report['summary']
+    
+    print(f"📄 Markdown files: {summary['markdown_files']}")
+    print(f"🔍 Links checked: {summary['links']} "
+          f"({summary['ok']} ok, {summary['ignored']} ignored, {summary['skipped']} skipped, "
+          f"{summary['baselined']} baselined)")
+    if not args.merge:
+        print(f"⏱️  Completed in {duration:.2f}s")
+    
+    if args.update_baseline:
+        checker.save_baseline()
+        print(f"📌 Baseline updated: {checker.baseline_path} ({len(report['broken']) + summary['baselined']} links)")
+    elif not (args.merge or args.shard or args.sources):
+        stale = checker.stale_baseline()
+        if stale:
+            print(f"\n⚠️  {len(stale)} baselined links are no longer broken; remove them from {checker.baseline_path}:")
+            for source, target in stale:
+                print(f"  • {source}: {target}")
+    
+    if report['broken']:
+        print(f"\n❌ BROKEN LINKS ({len(report['broken'])}):")
+        for entry in report['broken']:
+            print(f"  • {entry['source']}:{entry['line']}: {entry['target']} ({entry['message']})")
+    else:
+        print("\n✅ No broken links found")
+    
+    with span("report", "links"):
+        checker.save_report(report, args.output)
+    if args.metrics and not args.merge:
+        checker.metrics(duration).write(args.metrics)
+    
+    if report['broken']:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,347 @@
+"""
+Decision Tree Engine
+
+Compiles the main Mermaid flowchart of each decision-tree document into a
+compact state-machine table: nodes become ints, branch labels become
+interned answer codes, and each node keeps a small code -> next-node map.
+Every reachable answer combination is enumerated at compile time and its
+result memoized, so an evaluation is a walk over int tables ending in a
+dictionary lookup.
+
+Templates are linked from nodes with Mermaid `click` statements
+(`click E "../templates/base/"`); an evaluation returns the templates
+linked along its path, with directories expanded to their templates.
+"""
+
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, List, Mapping, Optional, Sequence, Tuple, Union
+
+from mermaid_flowchart import Flowchart, extract_mermaid_blocks, parse_flowchart
+
+# Upper bound on answer combinations enumerated eagerly; the rest are memoized on first use
+MAX_PRECOMPUTED_STATES = 50000
+
+NO_NODE = -1
+DECISION, STEP, OUTCOME, FAN_OUT = range(4)
+
+Answers = Union[Mapping[str, str], Sequence[str]]
+
+def normalize_answer(text: str) -> str:
+    """Case- and whitespace-insensitive key for questions and answers."""
+    return ' '.join(text.casefold().split())
+
+def check_answers(answers: Any) -> Answers:
+    """Return ``answers`` if it is a question->answer mapping of strings or a list of strings.
+    
+    Raises TypeError otherwise; a bare string would otherwise be taken as
+    one answer per character.
+    """
+    if isinstance(answers, Mapping):
+        for question, answer in answers.items():
+            if not isinstance(question, str) or not isinstance(answer, str):
+                raise TypeError(f"answers must map questions to strings, got {question!r}: {answer!r}")
+    elif isinstance(answers, (list, tuple)):
+        for answer in answers:
+            if not isinstance(answer, str):
+                raise TypeError(f"answers must be strings, got {answer!r}")
+    else:
+        raise TypeError(f"answers must be an object or a list of strings, not {type(answers).__name__}")
+    return answers
+
+@dataclass(frozen=True)
+class PathStep:
+    node: str
+    label: str
+    answer: Optional[str] = None
+
+@dataclass(frozen=True)
+class Evaluation:
+    """Result of walking a tree with a set of answers.
+    
+    ``status`` is 'outcome', 'needs_answer' (``question`` and ``options``
+    say what to ask next), 'invalid_answer' or 'ambiguous' (a step fans out
+    to several unlabelled successors).
+    """
+    tree: str
+    status: str
+    path: Tuple[PathStep, ...]
+    outcome: Optional[str] = None
+    outcome_node: Optional[str] = None
+    templates: Tuple[str, ...] = ()
+    question: Optional[str] = None
+    options: Tuple[str, ...] = ()
+    possible_outcomes: Tuple[str, ...] = ()
+    message: str = ""
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "tree": self.tree,
+            "status": self.status,
+            "outcome": self.outcome,
+            "outcome_node": self.outcome_node,
+            "path": [{"node": step.node, "label": step.label, "answer": step.answer} for step in self.path],
+            "templates": list(self.templates),
+            "question": self.question,
+            "options": list(self.options),
+            "possible_outcomes": list(self.possible_outcomes),
+            "message": self.message
+        }
+
+class CompiledTree:
+    """State-machine table for one decision tree."""
+    
+    def __init__(self, name: str, chart: Flowchart, document: Path, repo_root: Path):
+        self.name = name
+        node_ids = list(chart.nodes)
+        index = {node_id: position for position, node_id in enumerate(node_ids)}
+        self.node_ids: Tuple[str, ...] = tuple(node_ids)
+        self.labels: Tuple[str, ...] = tuple(chart.nodes[node_id].label for node_id in node_ids)
+        
+        # Interned answer codes, shared by every decision in the tree
+        self.answers: List[str] = []
+        self.answer_codes: Dict[str, int] = {}
+        
+        successors = chart.successors()
+        kinds, transitions, defaults, option_codes, fan_out = [], [], [], [], []
+        for node_id in node_ids:
+            edges = successors[node_id]
+            targets = {edge.target for edge in edges}
+            table: Dict[int, int] = {}
+            if len(targets) > 1 and (chart.nodes[node_id].is_decision or all(edge.label for edge in edges)):
+                kinds.append(DECISION)
+                for edge in edges:
+                    table.setdefault(self._intern(edge.label), index[edge.target])
+                defaults.append(NO_NODE)
+            elif len(targets) == 1:
+                kinds.append(STEP)
+                defaults.append(index[edges[0].target])
+            else:
+                kinds.append(FAN_OUT if targets else OUTCOME)
+                defaults.append(NO_NODE)
+            transitions.append(table)
+            option_codes.append(tuple(table))
+            fan_out.append(tuple(sorted({index[edge.target] for edge in edges})) if kinds[-1] == FAN_OUT else ())
+        self.kinds: Tuple[int, ...] = tuple(kinds)
+        self.transitions: Tuple[Dict[int, int], ...] = tuple(transitions)
+        self.defaults: Tuple[int, ...] = tuple(defaults)
+        self.option_codes: Tuple[Tuple[int, ...], ...] = tuple(option_codes)
+        self.fan_out: Tuple[Tuple[int, ...], ...] = tuple(fan_out)
+        
+        # A decision can be answered by node id or by its question text
+        self.question_keys: Tuple[Tuple[str, ...], ...] = tuple(
+            self._question_keys(node_id, label) if kind == DECISION else ()
+            for node_id, label, kind in zip(self.node_ids, self.labels, self.kinds)
+        )
+        self.templates: Tuple[Tuple[str, ...], ...] = tuple(
+            self._linked_templates(chart.links[node_id].target, document, repo_root) if node_id in chart.links else ()
+            for node_id in node_ids
+        )
+        self.reachable_outcomes: Tuple[FrozenSet[int], ...] = self._outcome_sets()
+        self._results: Dict[Tuple[int, ...], Evaluation] = {}
+        self._precompute()
+    
+    def _intern(self, label: str) -> int:
+        key = normalize_answer(label)
+        code = self.answer_codes.get(key)
+        if code is None:
+            code = self.answer_codes[key] = len(self.answers)
+            self.answers.append(label)
+        return code
+    
+    @staticmethod
+    def _question_keys(node_id: str, label: str) -> Tuple[str, ...]:
+        question = normalize_answer(label)
+        return tuple(dict.fromkeys((node_id.casefold(), question, question.rstrip('?').rstrip())))
+    
+    @staticmethod
+    def _linked_templates(target: str, document: Path, repo_root: Path) -> Tuple[str, ...]:
+        if '://' in target:
+            return (target,)
+        path = (document.parent / target.split('#', 1)[0]).resolve()
+        if path.is_dir():
+            files = sorted(p for p in path.rglob('*.md'))
+        else:
+            files = [path]
+        return tuple(Path(os.path.relpath(file, repo_root)).as_posix() for file in files)
+    
+    def _outcome_sets(self) -> Tuple[FrozenSet[int], ...]:
+        """Outcomes reachable from each node, memoized bottom-up."""
+        memo: Dict[int, FrozenSet[int]] = {}
+        for start in range(len(self.node_ids)):
+            stack = [(start, False)]
+            in_progress = set()
+            while stack:
+                node, expanded = stack.pop()
+                if node in memo:
+                    continue
+                children = self._children(node)
+                if expanded:
+                    outcomes = frozenset({node}) if self.kinds[node] == OUTCOME else frozenset()
+                    for child in children:
+                        outcomes |= memo.get(child, frozenset())
+                    memo[node] = outcomes
+                    in_progress.discard(node)
+                    continue
+                in_progress.add(node)
+                stack.append((node, True))
+                stack.extend((child, False) for child in children if child not in memo and child not in in_progress)
+        return tuple(memo[node] for node in range(len(self.node_ids)))
+    
+    def _children(self, node: int) -> List[int]:
+        children = list(self.transitions[node].values()) + list(self.fan_out[node])
+        if self.defaults[node] != NO_NODE:
+            children.append(self.defaults[node])
+        return children
+    
+    def _precompute(self):
+        """Enumerate every answer combination reachable from the entry node."""
+        if not self.node_ids:
+            return
+        stack: List[Tuple[int, Tuple[int, ...]]] = [(0, ())]
+        while stack and len(self._results) < MAX_PRECOMPUTED_STATES:
+            node, key = stack.pop()
+            node = self._follow(node)
+            self._results[key] = self._build_result(key)
+            if node != NO_NODE and self.kinds[node] == DECISION:
+                for code, target in self.transitions[node].items():
+                    stack.append((target, key + (node, code)))
+    
+    def _follow(self, node: int) -> int:
+        """Advance through single-successor steps; NO_NODE if they loop."""
+        for _ in range(len(self.node_ids)):
+            following = self.defaults[node]
+            if following == NO_NODE:
+                return node
+            node = following
+        return NO_NODE
+    
+    def _build_result(self, key: Tuple[int, ...]) -> Evaluation:
+        """Replay a key of (decision, answer code) pairs into a full result."""
+        path: List[PathStep] = []
+        templates: Dict[str, None] = {}
+        node = 0
+        decisions = iter(zip(key[::2], key[1::2]))
+        for _ in range(len(self.node_ids) + len(key)):
+            templates.update(dict.fromkeys(self.templates[node]))
+            kind = self.kinds[node]
+            if kind == DECISION:
+                decision = next(decisions, None)
+                if decision is None:
+                    return Evaluation(
+                        self.name, 'needs_answer', tuple(path + [PathStep(self.node_ids[node], self.labels[node])]),
+                        templates=tuple(templates), question=self.labels[node],
+                        options=tuple(self.answers[code] for code in self.option_codes[node]),
+                        possible_outcomes=self._outcome_labels(node)
+                    )
+                path.append(PathStep(self.node_ids[node], self.labels[node], self.answers[decision[1]]))
+                node = self.transitions[node][decision[1]]
+            elif kind == STEP:
+                path.append(PathStep(self.node_ids[node], self.labels[node]))
+                node = self.defaults[node]
+            else:
+                path.append(PathStep(self.node_ids[node], self.labels[node]))
+                if kind == FAN_OUT:
+                    return Evaluation(self.name, 'ambiguous', tuple(path), templates=tuple(templates),
+                                      possible_outcomes=self._outcome_labels(node),
+                                      message=f"{self.node_ids[node]} has several unlabelled successors")
+                return Evaluation(self.name, 'outcome', tuple(path), outcome=self.labels[node],
+                                  outcome_node=self.node_ids[node], templates=tuple(templates),
+                                  possible_outcomes=(self.labels[node],))
+        return Evaluation(self.name, 'ambiguous', tuple(path), message="Tree contains a cycle")
+    
+    def _outcome_labels(self, node: int) -> Tuple[str, ...]:
+        return tuple(self.labels[outcome] for outcome in sorted(self.reachable_outcomes[node]))
+    
+    def evaluate(self, answers: Answers) -> Evaluation:
+        """Walk the table with answers keyed by decision (id or question) or given in order."""
+        check_answers(answers)
+        if not self.node_ids:
+            return Evaluation(self.name, 'ambiguous', (), message="Tree has no nodes")
+        
+        if isinstance(answers, Mapping):
+            by_question = {normalize_answer(question): answer for question, answer in answers.items()}
+            positional = None
+        else:
+            by_question = None
+            positional = iter(answers)
+        
+        key: List[int] = []
+        node = self._follow(0)
+        while node != NO_NODE and self.kinds[node] == DECISION:
+            if positional is not None:
+                answer = next(positional, None)
+            else:
+                answer = next((by_question[question] for question in self.question_keys[node]
+                               if question in by_question), None)
+            if answer is None:
+                break
+            code = self.answer_codes.get(normalize_answer(answer))
+            target = self.transitions[node].get(code) if code is not None else None
+            if target is None:
+                partial = self._lookup(tuple(key))
+                return Evaluation(
+                    self.name, 'invalid_answer', partial.path, templates=partial.templates,
+                    question=self.labels[node], options=partial.options,
+                    possible_outcomes=partial.possible_outcomes,
+                    message=f"'{answer}' is not an answer to '{self.labels[node]}'"
+                )
+            key.append(node)
+            key.append(code)
+            node = self._follow(target)
+        
+        return self._lookup(tuple(key))
+    
+    def _lookup(self, key: Tuple[int, ...]) -> Evaluation:
+        result = self._results.get(key)
+        if result is None:
+            result = self._results[key] = self._build_result(key)
+        return result
+    
+    def describe(self) -> Dict[str, Any]:
+        """Questions, their options and the tree's outcomes."""
+        return {
+            "tree": self.name,
+            "nodes": len(self.node_ids),
+            "precomputed_combinations": len(self._results),
+            "questions": [
+                {
+                    "node": self.node_ids[node],
+                    "question": self.labels[node],
+                    "options": [self.answers[code] for code in self.option_codes[node]]
+                }
+                for node in range(len(self.node_ids)) if self.kinds[node] == DECISION
+            ],
+            "outcomes": [self.labels[node] for node in range(len(self.node_ids)) if self.kinds[node] == OUTCOME]
+        }
+
+class DecisionTreeEngine:
+    """Loads and compiles every decision tree in a directory."""
+    
+    def __init__(self, trees_dir: str = "resources/decision-trees", repo_root: str = "."):
+        self.trees_dir = Path(trees_dir)
+        self.repo_root = Path(repo_root).resolve()
+        self.trees: Dict[str, CompiledTree] = {}
+        self.errors: List[str] = []
+    
+    def load(self) -> "DecisionTreeEngine":
+        """Compile the first flowchart of each document, named after the file."""
+        for document in sorted(self.trees_dir.glob("*.md")):
+            with open(document, 'r', encoding='utf-8') as f:
+                content = f.read()
+            block = next((block for block in extract_mermaid_blocks(content)
+                          if block.diagram_type in ('flowchart', 'graph')), None)
+            if block is None:
+                continue
+            chart = parse_flowchart(block.source, block.line)
+            if chart.syntax_errors:
+                self.errors.extend(f"{document}:{issue.line}: {issue.message}" for issue in chart.syntax_errors)
+                continue
+            self.trees[document.stem] = CompiledTree(document.stem, chart, document.resolve(), self.repo_root)
+        return self
+    
+    def evaluate(self, tree: str, answers: Answers) -> Evaluation:
+        if tree not in self.trees:
+            raise KeyError(f"Unknown decision tree: {tree}")
+        return self.trees[tree].evaluate(answers)
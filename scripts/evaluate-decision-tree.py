@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Decision Tree Evaluation
+
+Evaluates the compiled decision trees for a set of answers and returns the
+outcome, the path taken and the linked templates. Can also serve
+evaluations as JSON over HTTP for the portal:
+
+    GET  /trees                 list trees with their questions and outcomes
+    POST /evaluate              {"tree": "...", "answers": {...} or [...]}
+"""
+
+import json
+import sys
+import time
+import argparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List
+
+from decision_tree import DecisionTreeEngine, Evaluation
+from tracing import add_instrumentation_arguments, start_instrumentation
+
+def parse_answer_args(values: List[str]) -> Dict[str, str]:
+    """Turn repeated `QUESTION=ANSWER` arguments into a mapping."""
+    answers = {}
+    for value in values:
+        question, separator, answer = value.partition('=')
+        if not separator:
+            raise ValueError(f"Expected QUESTION=ANSWER, got '{value}'")
+        answers[question.strip()] = answer.strip()
+    return answers
+
+def print_evaluation(evaluation: Evaluation):
+    """Print an evaluation in the scripts' usual style."""
+    print(f"🌳 Tree: {evaluation.tree}")
+    for step in evaluation.path:
+        answer = f" → {step.answer}" if step.answer else ""
+        print(f"  • {step.label}{answer}")
+    
+    if evaluation.status == 'outcome':
+        print(f"\n✅ Outcome: {evaluation.outcome}")
+    elif evaluation.status == 'needs_answer':
+        print(f"\n❓ Next question: {evaluation.question}")
+        print(f"   Options: {', '.join(evaluation.options)}")
+    else:
+        print(f"\n❌ {evaluation.message}")
+        if evaluation.options:
+            print(f"   Options: {', '.join(evaluation.options)}")
+    
+    if evaluation.possible_outcomes and evaluation.status != 'outcome':
+        print(f"   Possible outcomes: {', '.join(evaluation.possible_outcomes)}")
+    if evaluation.templates:
+        print("\n📄 Templates:")
+        for template in evaluation.templates:
+            print(f"  • {template}")
+
+def make_handler(engine: DecisionTreeEngine):
+    """Build a request handler bound to a loaded engine."""
+    catalogue = json.dumps({"trees": [tree.describe() for tree in engine.trees.values()]}).encode('utf-8')
+    
+    class EvaluationHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        
+        def log_message(self, format: str, *args: Any):
+            pass
+        
+        def do_GET(self):
+            if self.path.rstrip('/') == '/trees':
+                self._send(200, catalogue)
+            else:
+                self._send_json(404, {"error": f"Not found: {self.path}"})
+        
+        def do_POST(self):
+            if self.path.rstrip('/') != '/evaluate':
+                self._send_json(404, {"error": f"Not found: {self.path}"})
+                return
+            try:
+                length = int(self.headers.get('Content-Length', 0))
+                request = json.loads(self.rfile.read(length) or b'{}')
+                if not isinstance(request, dict):
+                    raise TypeError("the request must be a JSON object")
+                evaluation = engine.evaluate(request['tree'], request.get('answers', {}))
+            except KeyError as e:
+                self._send_json(404, {"error": e.args[0]})
+                return
+            except (ValueError, TypeError) as e:
+                self._send_json(400, {"error": f"Invalid request: {e}"})
+                return
+            self._send_json(200, evaluation.to_dict())
+        
+        def _send_json(self, status: int, payload: Dict[str, Any]):
+            self._send(status, json.dumps(payload).encode('utf-8'))
+        
+        def _send(self, status: int, body: bytes):
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+    
+    return EvaluationHandler
+
+def main():
+    parser = argparse.ArgumentParser(description='Evaluate SDD decision trees for a set of answers')
+    parser.add_argument('--trees-dir', default='resources/decision-trees',
+                       help='Directory containing decision-tree documents')
+    parser.add_argument('--tree', '-t',
+                       help='Tree to evaluate (document name without .md)')
+    parser.add_argument('--answer', '-a', action='append', default=[],
+                       help='QUESTION=ANSWER, where QUESTION is the node id or question text (repeatable)')
+    parser.add_argument('--answers-file',
+                       help='JSON file with a question->answer object or an ordered list of answers')
+    parser.add_argument('--json', action='store_true',
+                       help='Print the evaluation as JSON')
+    parser.add_argument('--list', action='store_true',
+                       help='List trees with their questions and outcomes')
+    parser.add_argument('--serve', type=int, metavar='PORT',
+                       help='Serve evaluations as JSON over HTTP on PORT')
+    parser.add_argument('--host', default='127.0.0.1',
+                       help='Interface to bind when serving')
+    add_instrumentation_arguments(parser)
+    
+    args = parser.parse_args()
+    start_instrumentation(args, "evaluate-decision-tree")
+    
+    start_time = time.perf_counter()
+    engine = DecisionTreeEngine(args.trees_dir).load()
+    load_ms = (time.perf_counter() - start_time) * 1000
+    
+    for error in engine.errors:
+        print(f"⚠️  Skipped tree: {error}", file=sys.stderr)
+    
+    if args.list:
+        catalogue = [tree.describe() for tree in engine.trees.values()]
+        if args.json:
+            print(json.dumps({"trees": catalogue}, indent=2))
+            return
+        for tree in catalogue:
+            print(f"🌳 {tree['tree']}: {len(tree['questions'])} questions, {len(tree['outcomes'])} outcomes, "
+                  f"{tree['precomputed_combinations']} precomputed combinations")
+            for question in tree['questions']:
+                print(f"  {question['node']}: {question['question']} [{' | '.join(question['options'])}]")
+        return
+    
+    if args.serve is not None:
+        server = ThreadingHTTPServer((args.host, args.serve), make_handler(engine))
+        print(f"🚀 Serving {len(engine.trees)} decision trees on http://{args.host}:{args.serve} "
+              f"(compiled in {load_ms:.1f} ms)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+        return
+    
+    if not args.tree:
+        parser.error("--tree is required unless --list or --serve is given")
+    
+    try:
+        answers: Any = parse_answer_args(args.answer)
+        if args.answers_file:
+            with open(args.answers_file, 'r') as f:
+                answers = json.load(f)
+        evaluation = engine.evaluate(args.tree, answers)
+    except KeyError as e:
+        print(f"❌ {e.args[0]}. Available: {', '.join(engine.trees)}")
+        sys.exit(1)
+    except (OSError, ValueError, TypeError) as e:
+        print(f"❌ Error reading answers: {e}")
+        sys.exit(1)
+    
+    if args.json:
+        print(json.dumps(evaluation.to_dict(), indent=2))
+    else:
+        print_evaluation(evaluation)
+    
+    if evaluation.status == 'invalid_answer':
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
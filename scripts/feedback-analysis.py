@@ -5,14 +5,22 @@ Analyzes GitHub issues, discussions, and usage patterns to improve content quali
 """
 
 import os
+import csv
+import argparse
 import json
 import re
 import time
+import heapq
+import hashlib
+import zlib
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Tuple, Callable
 from dataclasses import dataclass
 from collections import defaultdict, Counter
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+
+from openmetrics import MetricsRegistry, add_metrics_argument, validator_metrics
+from tracing import add_instrumentation_arguments, span, start_instrumentation
 
 @dataclass
 class FeedbackItem:
@@ -38,13 +46,176 @@ class ContentMetrics:
     negative_feedback: int
     improvement_suggestions: List[str]
 
+@dataclass
+class ContentScore:
+    """Cached content-derived engagement component for a single file."""
+    fingerprint: str  # sha256 of the file bytes
+    size: int
+    mtime_ns: int
+    score: float
+
+class RankedView:
+    """Top-K views over content metrics under several named ranking keys.
+    
+    Each ranking is computed with heap selection (O(n log k)) rather than a
+    full sort. The best prefix found so far is kept per ranking, so repeated
+    requests for the same or a smaller K are slices, and larger requests
+    grow the prefix geometrically.
+    """
+    
+    def __init__(self, metrics: Dict[str, ContentMetrics]):
+        self._items: List[Tuple[str, ContentMetrics]] = list(metrics.items())
+        self._rankings: Dict[str, Callable[[Tuple[str, ContentMetrics]], Any]] = {}
+        self._candidates: Dict[str, List[Tuple[str, ContentMetrics]]] = {}
+        self._prefixes: Dict[str, List[Tuple[str, ContentMetrics]]] = {}
+    
+    def add_ranking(self, name: str, key: Callable[[Tuple[str, ContentMetrics]], Any],
+                    predicate: Optional[Callable[[ContentMetrics], bool]] = None):
+        """Register a ranking; highest key values rank first."""
+        self._rankings[name] = key
+        self._candidates[name] = (
+            [item for item in self._items if predicate(item[1])] if predicate else self._items
+        )
+        self._prefixes.pop(name, None)
+    
+    def count(self, name: str) -> int:
+        """Number of metrics eligible for a ranking."""
+        return len(self._candidates[name])
+    
+    def top(self, name: str, k: int) -> List[Tuple[str, ContentMetrics]]:
+        """Return the K best (path, metrics) pairs for a ranking."""
+        candidates = self._candidates[name]
+        prefix = self._prefixes.get(name)
+        if prefix is not None and (len(prefix) >= k or len(prefix) == len(candidates)):
+            return prefix[:k]
+        
+        size = max(k, 2 * len(prefix or []))
+        prefix = heapq.nlargest(size, candidates, key=self._rankings[name])
+        self._prefixes[name] = prefix
+        return prefix[:k]
+
+class FeedbackTrends:
+    """Rolling sentiment aggregates over feedback, bucketed by day and ISO week.
+    
+    Buckets are updated as each feedback item is added, for the whole corpus
+    and per category (feedback type) and per related file. Window queries
+    sum at most one bucket per day, so they never rescan the feedback items.
+    """
+    
+    WINDOWS = (7, 30, 90)
+    
+    def __init__(self):
+        self.daily: Dict[Tuple[str, str], Dict[date, Counter]] = defaultdict(lambda: defaultdict(Counter))
+        self.weekly: Dict[Tuple[str, str], Dict[date, Counter]] = defaultdict(lambda: defaultdict(Counter))
+        self.latest: Optional[date] = None
+    
+    def add(self, item: FeedbackItem):
+        """Fold a single feedback item into the day and week buckets."""
+        day = item.created_at.date()
+        week = day - timedelta(days=day.weekday())
+        
+        for scope in self._scopes(item):
+            self.daily[scope][day][item.sentiment] += 1
+            self.weekly[scope][week][item.sentiment] += 1
+        
+        if self.latest is None or day > self.latest:
+            self.latest = day
+    
+    def _scopes(self, item: FeedbackItem) -> List[Tuple[str, str]]:
+        scopes = [("all", "all"), ("category", item.type)]
+        scopes.extend(("file", file) for file in item.related_files)
+        return scopes
+    
+    def window(self, scope: Tuple[str, str], days: int, as_of: Optional[date] = None) -> Counter:
+        """Sentiment counts for the ``days``-day window ending on ``as_of``."""
+        totals = Counter()
+        buckets = self.daily.get(scope)
+        as_of = as_of or self.latest
+        if not buckets or as_of is None:
+            return totals
+        
+        start = as_of - timedelta(days=days - 1)
+        if len(buckets) <= days:
+            for day, counts in buckets.items():
+                if start <= day <= as_of:
+                    totals.update(counts)
+        else:
+            for offset in range(days):
+                counts = buckets.get(start + timedelta(days=offset))
+                if counts:
+                    totals.update(counts)
+        return totals
+    
+    @staticmethod
+    def sentiment_ratio(counts: Counter) -> float:
+        return counts["positive"] / max(1, counts["negative"])
+    
+    def trend(self, scope: Tuple[str, str], as_of: Optional[date] = None) -> Dict[str, Dict[str, Any]]:
+        """Totals and sentiment ratio for each rolling window."""
+        trend = {}
+        for days in self.WINDOWS:
+            counts = self.window(scope, days, as_of)
+            trend[f"{days}d"] = {
+                "total": sum(counts.values()),
+                "positive": counts["positive"],
+                "negative": counts["negative"],
+                "sentiment_ratio": self.sentiment_ratio(counts)
+            }
+        return trend
+    
+    def weekly_series(self, scope: Tuple[str, str]) -> List[Dict[str, Any]]:
+        """Per-week sentiment counts in chronological order."""
+        return [
+            {
+                "week_start": week.isoformat(),
+                "total": sum(counts.values()),
+                "positive": counts["positive"],
+                "negative": counts["negative"],
+                "sentiment_ratio": self.sentiment_ratio(counts)
+            }
+            for week, counts in sorted(self.weekly.get(scope, {}).items())
+        ]
+    
+    def to_report(self, as_of: Optional[date] = None) -> Dict[str, Any]:
+        """Render dashboard-ready trends from the precomputed buckets."""
+        scopes_by_kind = defaultdict(list)
+        for kind, key in self.daily:
+            scopes_by_kind[kind].append(key)
+        
+        return {
+            "as_of": (as_of or self.latest or date.today()).isoformat(),
+            "overall": self.trend(("all", "all"), as_of),
+            "weekly": self.weekly_series(("all", "all")),
+            "by_category": {
+                key: self.trend(("category", key), as_of) for key in sorted(scopes_by_kind["category"])
+            },
+            "by_file": {
+                key: self.trend(("file", key), as_of) for key in sorted(scopes_by_kind["file"])
+            }
+        }
+
 class FeedbackAnalyzer:
     """Analyzes feedback and generates improvement recommendations."""
     
-    def __init__(self, repo_root: str = "."):
+    CACHE_VERSION = 1
+    
+    def __init__(self, repo_root: str = ".",
+                 cache_path: Optional[str] = ".sdd-cache/engagement-scores.json",
+                 analytics_dir: str = "analytics/exports"):
         self.repo_root = Path(repo_root)
         self.feedback_items: List[FeedbackItem] = []
         self.content_metrics: Dict[str, ContentMetrics] = {}
+        self.cache_path = self.repo_root / cache_path if cache_path else None
+        self.analytics_dir = self.repo_root / analytics_dir
+        self.content_scores: Dict[str, ContentScore] = self._load_score_cache()
+        with span("parse", "analytics exports"):
+            self.view_counts: Dict[str, int] = self._load_view_counts()
+        self.rescored_files = 0
+        self.files_read = 0
+        self.bytes_read = 0
+        self.score_cache_hits = 0
+        self.ranked_view = RankedView({})
+        self.trends = FeedbackTrends()
         
     def analyze_feedback(self) -> Dict[str, Any]:
         """Perform comprehensive feedback analysis."""
@@ -54,13 +225,23 @@ class FeedbackAnalyzer:
         self._collect_simulated_feedback()
         
         # Analyze content effectiveness
-        self._analyze_content_metrics()
+        with span("suite", "content metrics"):
+            self._analyze_content_metrics()
+        
+        self._save_score_cache()
         
         # Generate improvement recommendations
-        recommendations = self._generate_recommendations()
+        with span("suite", "recommendations"):
+            recommendations = self._generate_recommendations()
         
         # Create analysis report
-        return self._create_analysis_report(recommendations)
+        with span("report", "feedback analysis"):
+            return self._create_analysis_report(recommendations)
+    
+    def add_feedback(self, feedback_item: FeedbackItem):
+        """Record a feedback item and fold it into the rolling trends."""
+        self.feedback_items.append(feedback_item)
+        self.trends.add(feedback_item)
     
     def _collect_simulated_feedback(self):
         """Simulate feedback collection (replace with actual GitHub API calls)."""
@@ -74,6 +255,7 @@ class FeedbackAnalyzer:
                 "labels": ["documentation", "enhancement"],
                 "sentiment": "neutral",
                 "priority": 3,
+                "days_ago": 2,
                 "related_files": ["how-to/getting-started.md"]
             },
             {
@@ -84,6 +266,7 @@ class FeedbackAnalyzer:
                 "labels": ["question", "integration"],
                 "sentiment": "neutral",
                 "priority": 4,
+                "days_ago": 5,
                 "related_files": ["how-to/advanced-flows.md"]
             },
             {
@@ -94,6 +277,7 @@ class FeedbackAnalyzer:
                 "labels": ["bug", "windows", "scripts"],
                 "sentiment": "negative",
                 "priority": 3,
+                "days_ago": 12,
                 "related_files": ["scripts/validate-templates.sh"]
             },
             {
@@ -104,6 +288,7 @@ class FeedbackAnalyzer:
                 "labels": ["enhancement", "template", "mobile"],
                 "sentiment": "positive",
                 "priority": 4,
+                "days_ago": 24,
                 "related_files": ["resources/templates/"]
             },
             {
@@ -114,6 +299,7 @@ class FeedbackAnalyzer:
                 "labels": ["positive", "decision-trees"],
                 "sentiment": "positive",
                 "priority": 2,
+                "days_ago": 48,
                 "related_files": ["resources/decision-trees/integration-strategy.md"]
             }
         ]
@@ -130,7 +316,7 @@ class FeedbackAnalyzer:
                 created_at=datetime.now() - timedelta(days=item_data.get("days_ago", 1)),
                 related_files=item_data["related_files"]
             )
-            self.feedback_items.append(feedback_item)
+            self.add_feedback(feedback_item)
     
     def _analyze_content_metrics(self):
         """Analyze content effectiveness based on feedback and usage."""
@@ -138,20 +324,26 @@ class FeedbackAnalyzer:
         content_files = []
         
         # Find all markdown files
-        for pattern in ["**/*.md"]:
-            content_files.extend(self.repo_root.glob(pattern))
+        with span("walk", self.repo_root):
+            for pattern in ["**/*.md"]:
+                content_files.extend(self.repo_root.glob(pattern))
         
-        for file_path in content_files:
-            relative_path = str(file_path.relative_to(self.repo_root))
+        seen_paths = set()
+        for file_path in sorted(content_files):
+            relative_path = file_path.relative_to(self.repo_root).as_posix()
+            seen_paths.add(relative_path)
             
             # Calculate metrics based on feedback
-            related_feedback = [f for f in self.feedback_items if relative_path in f.related_files]
+            with span("validate", relative_path):
+                related_feedback = [f for f in self.feedback_items if relative_path in f.related_files]
             
             positive_count = sum(1 for f in related_feedback if f.sentiment == "positive")
             negative_count = sum(1 for f in related_feedback if f.sentiment == "negative")
             
-            # Simulate view count and engagement (replace with actual analytics)
-            view_count = self._simulate_view_count(relative_path)
+            # View counts come from analytics exports when available
+            view_count = self.view_counts.get(relative_path)
+            if view_count is None:
+                view_count = self._simulate_view_count(relative_path)
             engagement_score = self._calculate_engagement_score(relative_path, related_feedback)
             
             # Extract improvement suggestions from feedback
@@ -169,20 +361,116 @@ class FeedbackAnalyzer:
                 negative_feedback=negative_count,
                 improvement_suggestions=suggestions
             )
+        
+        # Drop cache entries for files that no longer exist
+        for stale_path in set(self.content_scores) - seen_paths:
+            del self.content_scores[stale_path]
+        
+        self.ranked_view = self._build_ranked_view()
+    
+    def _build_ranked_view(self) -> RankedView:
+        """Register the rankings used by recommendations and reports."""
+        view = RankedView(self.content_metrics)
+        view.add_ranking(
+            "top_engagement",
+            key=lambda item: item[1].engagement_score
+        )
+        view.add_ranking(
+            "needs_attention",
+            key=lambda item: (item[1].negative_feedback, -item[1].engagement_score),
+            predicate=lambda m: m.negative_feedback > 0 or m.engagement_score < 2.5
+        )
+        view.add_ranking(
+            "low_engagement",
+            key=lambda item: -item[1].engagement_score,
+            predicate=lambda m: m.engagement_score < 2.5 and m.view_count > 50
+        )
+        return view
+    
+    def _load_view_counts(self) -> Dict[str, int]:
+        """Load page view counts from local analytics exports.
+        
+        Exports are CSV files with ``path`` and ``views`` columns, or JSON files
+        holding either a ``{path: views}`` mapping or a list of
+        ``{"path": ..., "views": ...}`` records. Counts for the same path are
+        summed across exports so monthly files can simply be dropped in.
+        """
+        view_counts: Dict[str, int] = defaultdict(int)
+        if not self.analytics_dir.is_dir():
+            return {}
+        
+        for export_file in sorted(self.analytics_dir.iterdir()):
+            try:
+                if export_file.suffix == ".csv":
+                    with open(export_file, 'r', encoding='utf-8', newline='') as f:
+                        records = [(row.get("path"), row.get("views")) for row in csv.DictReader(f)]
+                elif export_file.suffix == ".json":
+                    with open(export_file, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
+                    if isinstance(data, dict):
+                        records = list(data.items())
+                    else:
+                        records = [(row.get("path"), row.get("views")) for row in data]
+                else:
+                    continue
+            except (OSError, ValueError, AttributeError) as e:
+                print(f"⚠️  Skipping analytics export {export_file}: {e}")
+                continue
+            
+            for path, views in records:
+                if not isinstance(path, str) or not path:
+                    continue
+                try:
+                    count = int(views)
+                except (TypeError, ValueError):
+                    continue
+                view_counts[path.removeprefix("./")] += count
+        
+        return dict(view_counts)
+    
+    def _load_score_cache(self) -> Dict[str, ContentScore]:
+        """Load cached content scores from disk."""
+        if not self.cache_path or not self.cache_path.exists():
+            return {}
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if not isinstance(data, dict) or data.get("version") != self.CACHE_VERSION:
+                return {}
+            return {path: ContentScore(**entry) for path, entry in data.get("files", {}).items()}
+        except (OSError, ValueError, TypeError, AttributeError):
+            return {}
+    
+    def _save_score_cache(self):
+        """Persist content scores so unchanged files are not rescored."""
+        if not self.cache_path:
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "version": self.CACHE_VERSION,
+            "files": {path: vars(entry) for path, entry in sorted(self.content_scores.items())}
+        }
+        tmp_path = self.cache_path.with_suffix(".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.cache_path)
     
     def _simulate_view_count(self, file_path: str) -> int:
         """Simulate view count based on file type and location."""
+        # crc32 is stable across processes, unlike the salted built-in hash()
+        path_hash = zlib.crc32(file_path.encode('utf-8'))
+        
         # Simulate higher views for key files
         if "README.md" in file_path:
-            return 1000 + hash(file_path) % 500
+            return 1000 + path_hash % 500
         elif "getting-started" in file_path:
-            return 500 + hash(file_path) % 300
+            return 500 + path_hash % 300
         elif file_path.startswith("examples/"):
-            return 200 + hash(file_path) % 200
+            return 200 + path_hash % 200
         elif file_path.startswith("how-to/"):
-            return 150 + hash(file_path) % 150
+            return 150 + path_hash % 150
         else:
-            return 50 + hash(file_path) % 100
+            return 50 + path_hash % 100
     
     def _calculate_engagement_score(self, file_path: str, feedback: List[FeedbackItem]) -> float:
         """Calculate engagement score based on feedback and file characteristics."""
@@ -195,24 +483,79 @@ class FeedbackAnalyzer:
             elif item.sentiment == "negative":
                 base_score -= 0.3
         
-        # Adjust based on file completeness (simulate)
-        try:
-            with open(self.repo_root / file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                
-            # Longer, more structured content gets higher scores
-            if len(content) > 2000:
-                base_score += 0.5
-            if content.count('#') >= 5:  # Good heading structure
-                base_score += 0.3
-            if '```' in content:  # Contains code examples
-                base_score += 0.2
-                
-        except Exception:
-            base_score -= 0.5
+        # Adjust based on file completeness
+        base_score += self._get_content_score(file_path)
         
         return max(1.0, min(5.0, base_score))
     
+    def _get_content_score(self, file_path: str) -> float:
+        """Return the content-derived score, reusing the cache for unchanged files."""
+        full_path = self.repo_root / file_path
+        try:
+            stat = full_path.stat()
+        except OSError:
+            return -0.5
+        
+        cached = self.content_scores.get(file_path)
+        if cached and cached.size == stat.st_size and cached.mtime_ns == stat.st_mtime_ns:
+            self.score_cache_hits += 1
+            return cached.score
+        
+        try:
+            with span("read", file_path), open(full_path, 'rb') as f:
+                raw = f.read()
+        except OSError:
+            return -0.5
+        self.files_read += 1
+        self.bytes_read += len(raw)
+        
+        fingerprint = hashlib.sha256(raw).hexdigest()
+        if cached and cached.fingerprint == fingerprint:
+            # Touched but unchanged: refresh the stat key only
+            self.score_cache_hits += 1
+            score = cached.score
+        else:
+            with span("parse", file_path):
+                score = self._score_content(raw)
+            self.rescored_files += 1
+        
+        self.content_scores[file_path] = ContentScore(
+            fingerprint=fingerprint,
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+            score=score
+        )
+        return score
+    
+    def metrics(self, duration: float) -> MetricsRegistry:
+        """OpenMetrics for the last analyze_feedback() run; files needing attention count as warnings."""
+        return validator_metrics(
+            "feedback",
+            duration=duration,
+            files=self.files_read,
+            bytes_read=self.bytes_read,
+            errors=0,
+            warnings=self.ranked_view.count("needs_attention"),
+            rule_evaluations=len(self.content_metrics),
+            caches={"content-score": (self.score_cache_hits, self.rescored_files)}
+        )
+    
+    def _score_content(self, raw: bytes) -> float:
+        """Score file structure: longer, more structured content gets higher scores."""
+        try:
+            content = raw.decode('utf-8')
+        except UnicodeDecodeError:
+            return -0.5
+        
+        score = 0.0
+        if len(content) > 2000:
+            score += 0.5
+        if content.count('#') >= 5:  # Good heading structure
+            score += 0.3
+        if '```' in content:  # Contains code examples
+            score += 0.2
+        return score
+    
     def _generate_recommendations(self) -> List[Dict[str, Any]]:
         """Generate improvement recommendations based on analysis."""
         recommendations = []
@@ -245,18 +588,15 @@ class FeedbackAnalyzer:
             })
         
         # Content with low engagement
-        low_engagement_content = [
-            (path, metrics) for path, metrics in self.content_metrics.items()
-            if metrics.engagement_score < 2.5 and metrics.view_count > 50
-        ]
+        low_engagement_count = self.ranked_view.count("low_engagement")
         
-        if low_engagement_content:
+        if low_engagement_count:
             recommendations.append({
                 "category": "Content Quality",
                 "priority": 3,
-                "description": f"Improve {len(low_engagement_content)} low-engagement content files",
+                "description": f"Improve {low_engagement_count} low-engagement content files",
                 "actions": ["Add more examples", "Improve structure", "Add practical guidance"],
-                "affected_files": [path for path, _ in low_engagement_content[:5]]
+                "affected_files": [path for path, _ in self.ranked_view.top("low_engagement", 5)]
             })
         
         # Missing content (based on questions)
@@ -298,19 +638,10 @@ class FeedbackAnalyzer:
         feedback_by_type = Counter(f.type for f in self.feedback_items)
         
         # Top content by engagement
-        top_content = sorted(
-            self.content_metrics.items(),
-            key=lambda x: x[1].engagement_score,
-            reverse=True
-        )[:10]
+        top_content = self.ranked_view.top("top_engagement", 10)
         
         # Content needing attention
-        needs_attention = sorted(
-            [(path, metrics) for path, metrics in self.content_metrics.items()
-             if metrics.negative_feedback > 0 or metrics.engagement_score < 2.5],
-            key=lambda x: (x[1].negative_feedback, -x[1].engagement_score),
-            reverse=True
-        )[:10]
+        needs_attention = self.ranked_view.top("needs_attention", 10)
         
         report = {
             "summary": {
@@ -344,6 +675,7 @@ class FeedbackAnalyzer:
                     for path, metrics in needs_attention
                 ]
             },
+            "trends": self.trends.to_report(as_of=date.today()),
             "recommendations": recommendations,
             "action_items": [
                 {
@@ -370,10 +702,18 @@ class FeedbackAnalyzer:
 
 def main():
     """Main analysis function."""
+    parser = argparse.ArgumentParser(description='Analyze feedback and content usage')
+    add_metrics_argument(parser, "feedback-analysis")
+    add_instrumentation_arguments(parser)
+    args = parser.parse_args()
+    start_instrumentation(args, "feedback-analysis")
+    
     analyzer = FeedbackAnalyzer()
     
     # Run feedback analysis
+    start_time = time.time()
     report = analyzer.analyze_feedback()
+    duration = time.time() - start_time
     
     # Print summary
     print(f"\n📈 Feedback Analysis Summary:")
@@ -381,6 +721,9 @@ def main():
     print(f"   Positive Feedback: {report['summary']['positive_feedback']}")
     print(f"   Negative Feedback: {report['summary']['negative_feedback']}")
     print(f"   Sentiment Ratio: {report['summary']['sentiment_ratio']:.2f}")
+    trend_30d = report['trends']['overall']['30d']
+    print(f"   Last 30 Days: {trend_30d['total']} items, sentiment ratio {trend_30d['sentiment_ratio']:.2f}")
+    print(f"   Files Rescored: {analyzer.rescored_files}/{len(analyzer.content_metrics)}")
     
     # Print top recommendations
     if report['recommendations']:
@@ -397,6 +740,8 @@ def main():
     
     # Save detailed report
     analyzer.save_report(report)
+    if args.metrics:
+        analyzer.metrics(duration).write(args.metrics)
     
     print("\n✅ Feedback analysis completed!")
     return 0
@@ -0,0 +1,251 @@
+"""
+File Watcher
+
+Reports changed paths under a directory tree in debounced batches. On
+Linux it uses inotify (through ctypes, so no extra dependency) with one
+watch per directory; elsewhere, or when inotify is unavailable or out of
+watches, it falls back to polling a stat snapshot of the tree.
+
+Paths are reported relative to the root, POSIX-style, the same keys the
+link index and the validation workspace use.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterator, Optional, Set, Tuple
+
+SKIPPED_DIRS = {'.git', 'node_modules', '.sdd-cache', '__pycache__'}
+
+# Bursts of events closer together than this are reported as one batch
+DEFAULT_DEBOUNCE = 0.05
+# ...but a batch is never held back longer than this
+MAX_BATCH_DELAY = 0.5
+DEFAULT_POLL_INTERVAL = 0.5
+
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+WATCH_MASK = (IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE |
+              IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+EVENT_HEADER = struct.Struct('iIII')
+
+class WatcherUnavailable(OSError):
+    """Raised when inotify cannot be used and the caller should poll instead."""
+
+@dataclass(frozen=True)
+class ChangeBatch:
+    """Paths that changed during one debounce window.
+    
+    ``overflow`` means events were lost (inotify queue overflow) and the
+    caller should rescan everything.
+    """
+    paths: FrozenSet[str]
+    overflow: bool = False
+
+def _walk_directories(root: Path) -> Iterator[str]:
+    """Relative paths of every watched directory, the root included as ''."""
+    for directory, subdirs, _ in os.walk(root):
+        subdirs[:] = sorted(d for d in subdirs if d not in SKIPPED_DIRS)
+        relative = Path(directory).relative_to(root).as_posix()
+        yield '' if relative == '.' else relative
+
+class _InotifyBackend:
+    name = "inotify"
+    
+    def __init__(self, root: Path):
+        if not sys.platform.startswith('linux'):
+            raise WatcherUnavailable("inotify is only available on Linux")
+        self.root = root
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c') or None, use_errno=True)
+        self.fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise WatcherUnavailable(ctypes.get_errno(), "inotify_init1 failed")
+        self._directories: Dict[int, str] = {}
+        self._poller = select.poll()
+        self._poller.register(self.fd, select.POLLIN)
+        self.overflow = False
+        try:
+            for relative in _walk_directories(root):
+                self._add_watch(relative)
+        except WatcherUnavailable:
+            self.close()
+            raise
+    
+    def _add_watch(self, relative: str):
+        path = os.fsencode(self.root / relative)
+        wd = self._libc.inotify_add_watch(self.fd, path, WATCH_MASK)
+        if wd < 0:
+            error = ctypes.get_errno()
+            if error == errno.ENOSPC:
+                raise WatcherUnavailable(error, "inotify watch limit reached "
+                                                "(see /proc/sys/fs/inotify/max_user_watches)")
+            # The directory vanished before we could watch it
+            return
+        self._directories[wd] = relative
+    
+    def wait(self, timeout: Optional[float]) -> Set[str]:
+        """Block up to ``timeout`` seconds (forever if None) for events."""
+        if not self._poller.poll(None if timeout is None else int(timeout * 1000)):
+            return set()
+        try:
+            data = os.read(self.fd, 256 * 1024)
+        except BlockingIOError:
+            return set()
+        
+        changed: Set[str] = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+            offset += length
+            
+            if mask & IN_Q_OVERFLOW:
+                self.overflow = True
+                continue
+            directory = self._directories.get(wd)
+            if directory is None:
+                continue
+            if mask & IN_IGNORED:
+                del self._directories[wd]
+                continue
+            if not name:
+                # Events on the watched directory itself (deleted or moved)
+                if directory:
+                    changed.add(directory)
+                continue
+            if name in SKIPPED_DIRS and mask & IN_ISDIR:
+                continue
+            
+            relative = f"{directory}/{name}" if directory else name
+            changed.add(relative)
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                changed.update(self._watch_new_tree(relative))
+        return changed
+    
+    def _watch_new_tree(self, relative: str) -> Set[str]:
+        """Watch a directory that just appeared and report what is already in it."""
+        found = set()
+        top = self.root / relative
+        for directory, subdirs, files in os.walk(top):
+            subdirs[:] = [d for d in subdirs if d not in SKIPPED_DIRS]
+            sub = Path(directory).relative_to(self.root).as_posix()
+            self._add_watch(sub)
+            found.add(sub)
+            found.update(f"{sub}/{name}" for name in files)
+        return found
+    
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+class _PollingBackend:
+    name = "polling"
+    
+    def __init__(self, root: Path, interval: float = DEFAULT_POLL_INTERVAL):
+        self.root = root
+        self.interval = interval
+        self.overflow = False
+        self._snapshot = self._take_snapshot()
+    
+    def _take_snapshot(self) -> Dict[str, Tuple[int, int]]:
+        snapshot = {}
+        pending = ['']
+        while pending:
+            relative = pending.pop()
+            try:
+                entries = os.scandir(self.root / relative)
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    child = f"{relative}/{entry.name}" if relative else entry.name
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in SKIPPED_DIRS:
+                                snapshot[child] = (-1, 0)
+                                pending.append(child)
+                            continue
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    snapshot[child] = (stat.st_size, stat.st_mtime_ns)
+        return snapshot
+    
+    def wait(self, timeout: Optional[float]) -> Set[str]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            delay = self.interval if deadline is None else max(0.0, min(self.interval, deadline - time.monotonic()))
+            time.sleep(delay)
+            snapshot = self._take_snapshot()
+            previous, self._snapshot = self._snapshot, snapshot
+            changed = {path for path in snapshot.keys() | previous.keys()
+                       if snapshot.get(path) != previous.get(path)}
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+    
+    def close(self):
+        pass
+
+class FileWatcher:
+    """Debounced change notifications for a directory tree."""
+    
+    def __init__(self, root: str = ".", debounce: float = DEFAULT_DEBOUNCE,
+                 poll_interval: float = DEFAULT_POLL_INTERVAL, force_polling: bool = False):
+        self.root = Path(root).resolve()
+        self.debounce = debounce
+        self.fallback_reason: Optional[str] = None
+        self._backend = None
+        if not force_polling:
+            try:
+                self._backend = _InotifyBackend(self.root)
+            except (WatcherUnavailable, OSError, AttributeError) as e:
+                self.fallback_reason = str(e)
+        if self._backend is None:
+            self._backend = _PollingBackend(self.root, poll_interval)
+    
+    @property
+    def backend(self) -> str:
+        return self._backend.name
+    
+    def changes(self) -> Iterator[ChangeBatch]:
+        """Yield a batch once events stop arriving for ``debounce`` seconds."""
+        while True:
+            pending = self._backend.wait(None)
+            deadline = time.monotonic() + MAX_BATCH_DELAY
+            while time.monotonic() < deadline:
+                more = self._backend.wait(self.debounce)
+                if not more:
+                    break
+                pending |= more
+            
+            overflow, self._backend.overflow = self._backend.overflow, False
+            if pending or overflow:
+                yield ChangeBatch(frozenset(pending), overflow)
+    
+    def close(self):
+        self._backend.close()
+    
+    def __enter__(self) -> "FileWatcher":
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,488 @@
+#!/usr/bin/env python3
+"""
+Synthetic Corpus Generator
+
+Writes a repository-shaped corpus for benchmarking the validators: example
+projects (README, spec, plan and tasks with FR/TR requirement IDs, SHALL
+statements and traceable tasks), templates with inheriting `.meta.json`
+files, Mermaid decision trees, the pages the user journeys walk,
+documentation pages that link to each other, analytics view-count exports
+and feedback exports.
+
+The output is determined by the seed and the sizes alone, so corpora built
+on different machines or commits are byte-for-byte identical. A share of
+the documents (--defect-rate) carries deliberate defects, such as dangling
+requirement references, missing sections and broken links, so error
+paths are exercised as well.
+    
+    generate-corpus.py /tmp/corpus --projects 500 --seed 7
+"""
+
+import csv
+import json
+import random
+import shutil
+import sys
+import argparse
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from validation_workspace import load_script
+from tracing import add_instrumentation_arguments, start_instrumentation
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+TEMPLATES_DIR = "resources/templates"
+TREES_DIR = "resources/decision-trees"
+
+# Exports are dated back from a fixed day so output does not depend on when it is generated
+EXPORT_END_DATE = date(2025, 6, 30)
+
+CATEGORIES = ("greenfield", "feature-addition", "legacy-integration", "workflows")
+TEMPLATE_DOMAINS = ("api", "backend", "frontend", "mobile", "devops", "data", "ml", "custom")
+DOC_SECTIONS = ("how-to", "audiences", "training", "resources/checklists", "docs")
+FEEDBACK_SOURCES = ("issue", "discussion", "pr_comment", "survey")
+FEEDBACK_TYPES = ("bug", "enhancement", "question", "documentation")
+SENTIMENTS = ("positive", "negative", "neutral")
+
+WORDS = (
+    "account", "audit", "batch", "cache", "catalog", "client", "config", "dashboard", "data",
+    "deploy", "event", "export", "feature", "gateway", "import", "index", "invoice", "job",
+    "ledger", "login", "message", "metric", "migration", "notification", "order", "payment",
+    "policy", "profile", "queue", "record", "report", "request", "review", "role", "schedule",
+    "search", "session", "setting", "stream", "task", "team", "tenant", "token", "upload",
+    "user", "webhook", "workflow", "workspace"
+)
+VERBS = ("create", "update", "delete", "list", "validate", "export", "import", "notify",
+         "archive", "approve", "reject", "retry", "schedule", "sync", "authorize", "audit")
+QUALITIES = ("within 200 ms", "for up to 10,000 concurrent users", "with an audit trail",
+             "without data loss", "idempotently", "in under 5 seconds", "with role-based access",
+             "across all regions", "with at-least-once delivery", "with encryption at rest")
+
+@dataclass
+class CorpusSpec:
+    """How much of each kind of document to generate."""
+    projects: int = 100
+    requirements: int = 12  # mean functional requirements per project
+    templates: int = 10
+    decision_trees: int = 10
+    pages: int = 200
+    feedback_items: int = 400
+    export_months: int = 6
+    defect_rate: float = 0.05
+    seed: int = 1
+    
+    @classmethod
+    def scaled(cls, projects: int, seed: int = 1, defect_rate: float = 0.05) -> "CorpusSpec":
+        """A corpus whose other document counts grow in proportion to ``projects``."""
+        return cls(
+            projects=projects,
+            templates=max(4, projects // 10),
+            decision_trees=max(4, projects // 10),
+            pages=projects * 2,
+            feedback_items=projects * 4,
+            defect_rate=defect_rate,
+            seed=seed
+        )
+
+@dataclass
+class CorpusStats:
+    """What was written."""
+    files: int = 0
+    bytes: int = 0
+    by_kind: Counter = field(default_factory=Counter)
+    defects: Counter = field(default_factory=Counter)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "files": self.files,
+            "bytes": self.bytes,
+            "by_kind": dict(sorted(self.by_kind.items())),
+            "defects": dict(sorted(self.defects.items()))
+        }
+
+class CorpusGenerator:
+    """Writes one seeded corpus under a root directory."""
+    
+    def __init__(self, root: str, spec: CorpusSpec):
+        self.root = Path(root)
+        self.spec = spec
+        self.rng = random.Random(spec.seed)
+        self.stats = CorpusStats()
+        self.markdown_files: List[str] = []
+        self.pages: List[str] = []
+    
+    def generate(self) -> CorpusStats:
+        journeys = load_script("test-user-journeys").UserJourneyTester(str(self.root)).journeys()
+        steps = [step for _, _, journey_steps in journeys for step in journey_steps]
+        
+        self._examples(steps)
+        self._templates()
+        self._decision_trees()
+        self._pages(steps)
+        self._journey_content(steps)
+        self._view_exports()
+        self._feedback_export()
+        return self.stats
+    
+    # Writing
+    
+    def _write(self, relative: str, content: str, kind: str):
+        path = self.root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = content.encode('utf-8')
+        path.write_bytes(data)
+        self.stats.files += 1
+        self.stats.bytes += len(data)
+        self.stats.by_kind[kind] += 1
+        if relative.endswith('.md'):
+            self.markdown_files.append(relative)
+    
+    def _defect(self, kind: str) -> bool:
+        if self.rng.random() < self.spec.defect_rate:
+            self.stats.defects[kind] += 1
+            return True
+        return False
+    
+    # Text
+    
+    def _sentence(self, words: int = 12) -> str:
+        text = " ".join(self.rng.choice(WORDS) for _ in range(words))
+        return text[0].upper() + text[1:] + "."
+    
+    def _paragraph(self, sentences: int = 3) -> str:
+        return " ".join(self._sentence(self.rng.randint(8, 16)) for _ in range(sentences))
+    
+    def _title(self, words: int = 3) -> str:
+        return " ".join(self.rng.choice(WORDS).capitalize() for _ in range(words))
+    
+    def _shall(self) -> str:
+        return (f"The system SHALL {self.rng.choice(VERBS)} {self.rng.choice(WORDS)} "
+                f"{self.rng.choice(WORDS)}s {self.rng.choice(QUALITIES)}")
+    
+    # Examples
+    
+    def _examples(self, steps):
+        reserved = []
+        for step in steps:
+            parts = step.expected_file.split('/')
+            if parts[0] == "examples" and len(parts) == 4 and (parts[1], parts[2]) not in reserved:
+                reserved.append((parts[1], parts[2]))
+        
+        projects = reserved[:self.spec.projects]
+        while len(projects) < self.spec.projects:
+            number = len(projects)
+            category = CATEGORIES[number % len(CATEGORIES)]
+            projects.append((category, f"{self.rng.choice(WORDS)}-{self.rng.choice(WORDS)}-{number:05d}"))
+        
+        self._write("examples/README.md", "\n\n".join([
+            "# Example Specifications and Workflows",
+            self._paragraph(),
+            "## Directory Structure",
+            "\n".join(f"- `{category}/` - {self._sentence(6)}" for category in CATEGORIES),
+            "## How to Use These Examples",
+            self._paragraph()
+        ]) + "\n", "example")
+        
+        for category, name in projects:
+            self._project(f"examples/{category}/{name}")
+    
+    def _project(self, project: str):
+        rng = self.rng
+        functional = [f"FR-{major}.{minor}"
+                      for major in range(1, max(2, rng.randint(self.spec.requirements // 4, self.spec.requirements // 2)))
+                      for minor in range(1, rng.randint(2, 4))]
+        technical = [f"TR-{major}.{minor}" for major in range(1, rng.randint(2, 5)) for minor in range(1, 3)]
+        
+        readme_sections = ["## Project Context", "## Business Requirements", "## Technical Constraints",
+                           "## SDD Workflow Files", "## Validation Results"]
+        if self._defect("readme-missing-section"):
+            readme_sections.remove(rng.choice(readme_sections))
+        readme = [f"# {self._title()}", self._paragraph()]
+        for section in readme_sections:
+            readme += [section, self._paragraph(2)]
+        readme.append("See [the specification](spec.md), [the plan](plan.md) and [the tasks](tasks.md).")
+        self._write(f"{project}/README.md", "\n\n".join(readme) + "\n", "example")
+        
+        spec = [f"# {self._title()} Specification", "## Overview", self._paragraph(4),
+                "## Functional Requirements"]
+        for req_id in functional:
+            if req_id.endswith(".1"):
+                spec.append(f"### {self._title(2)}")
+            spec.append(f"- **{req_id}**: {self._shall()}. {self._sentence()}")
+        spec.append("## Technical Requirements")
+        spec += [f"- **{req_id}**: {self._shall()}." for req_id in technical]
+        spec += ["## Acceptance Criteria",
+                 "\n".join(f"- WHEN a {rng.choice(WORDS)} is {rng.choice(VERBS)}d THEN {self._shall()}"
+                           for _ in range(3)),
+                 "## Related Documents", "- [Implementation plan](plan.md#architecture-overview)",
+                 "- [Tasks](tasks.md)"]
+        if self._defect("spec-broken-link"):
+            spec.append("- [Design notes](design-notes.md)")
+        self._write(f"{project}/spec.md", "\n\n".join(spec) + "\n", "example")
+        
+        plan = [f"# {self._title()} Technical Plan"]
+        for section in ("## Architecture Overview", "## Technology Stack", "## Database Design",
+                        "## Security Architecture"):
+            plan += [section, self._paragraph(3)]
+        plan += ["```mermaid\nflowchart LR\n    Client --> API\n    API --> Store\n```",
+                 "```sql\nCREATE TABLE records (id SERIAL PRIMARY KEY, payload JSONB NOT NULL);\n```"]
+        self._write(f"{project}/plan.md", "\n\n".join(plan) + "\n", "example")
+        
+        referenced = functional + technical
+        if self._defect("uncovered-requirement"):
+            referenced = referenced[:-1]
+        tasks = [f"# {self._title()} Implementation Tasks"]
+        chunk = 3
+        for number, start in enumerate(range(0, len(referenced), chunk), 1):
+            group = referenced[start:start + chunk]
+            if self._defect("dangling-reference"):
+                group = group + [f"FR-{len(functional) + 90}.9"]
+            tasks.append(f"- [ ] {number}. {rng.choice(VERBS).capitalize()} {rng.choice(WORDS)} {rng.choice(WORDS)}s")
+            for sub in range(1, rng.randint(2, 4)):
+                tasks.append(f"  - [ ] {number}.{sub} {self._sentence(6)}")
+            tasks.append(f"  - _Requirements: {', '.join(group)}_")
+        self._write(f"{project}/tasks.md", "\n".join(tasks) + "\n", "example")
+    
+    # Templates
+    
+    def _templates(self):
+        schema = REPO_ROOT / TEMPLATES_DIR / "template-schema.json"
+        base_metadata = REPO_ROOT / TEMPLATES_DIR / "base" / "spec.meta.json"
+        (self.root / TEMPLATES_DIR / "base").mkdir(parents=True, exist_ok=True)
+        for source, relative in ((schema, f"{TEMPLATES_DIR}/template-schema.json"),
+                                 (base_metadata, f"{TEMPLATES_DIR}/base/spec.meta.json")):
+            shutil.copyfile(source, self.root / relative)
+            self.stats.files += 1
+            self.stats.bytes += source.stat().st_size
+            self.stats.by_kind["template-metadata"] += 1
+        
+        self._write(f"{TEMPLATES_DIR}/README.md", f"# Templates\n\n{self._paragraph()}\n", "template")
+        self._template_files("base")
+        for number in range(self.spec.templates - 1):
+            domain = TEMPLATE_DOMAINS[number % len(TEMPLATE_DOMAINS)]
+            directory = domain if number < len(TEMPLATE_DOMAINS) else f"{domain}-{number // len(TEMPLATE_DOMAINS)}"
+            self._template_files(directory, domain)
+    
+    def _template_files(self, directory: str, domain: Optional[str] = None):
+        rng = self.rng
+        sections = ["Overview", "User Stories", "Acceptance Criteria", "Technical Constraints",
+                    "Dependencies", "Assumptions"]
+        if domain and self._defect("template-missing-section"):
+            sections.remove("Acceptance Criteria")
+        spec = ["---", f"title: {self._title()} Specification Template", "---",
+                "# [feature_name] Specification",
+                f"Optimized for AI agents such as Claude, ChatGPT and GitHub Copilot. {self._sentence()}"]
+        for section in sections:
+            spec += [f"## {section}", self._paragraph(2)]
+            if section == "User Stories":
+                spec.append(f"**User Story:** As a [user_role], I want [capability], so that [benefit].")
+            if section == "Acceptance Criteria":
+                spec += [f"- WHEN [condition] THEN {self._shall()}" for _ in range(3)]
+                spec.append("_Requirements: 1.1, 1.2_")
+        self._write(f"{TEMPLATES_DIR}/{directory}/spec.md", "\n\n".join(spec) + "\n", "template")
+        
+        if domain is None or rng.random() < 0.5:
+            plan = [f"# [feature_name] Technical Plan"]
+            for section in ("Architecture", "Components", "Technical Constraints"):
+                plan += [f"## {section}", self._paragraph(2)]
+            self._write(f"{TEMPLATES_DIR}/{directory}/plan.md", "\n\n".join(plan) + "\n", "template")
+            tasks = ["# [feature_name] Implementation Tasks"]
+            tasks += [f"- [ ] {number}. {self._sentence(5)}\n  - _Requirements: {number}.1_"
+                      for number in range(1, rng.randint(4, 9))]
+            self._write(f"{TEMPLATES_DIR}/{directory}/tasks.md", "\n".join(tasks) + "\n", "template")
+        
+        if domain is None:
+            return
+        metadata = {
+            "template": {
+                "name": f"{self._title(2)} {domain.capitalize()} Specification Template",
+                "version": f"1.{rng.randint(0, 9)}.{rng.randint(0, 9)}",
+                "type": "spec",
+                "domain": domain,
+                "complexity": rng.choice(("basic", "intermediate", "advanced")),
+                "audience": ["experienced-developer", "specialist"],
+                "description": self._sentence(10),
+                "extends": "base/spec.meta.json",
+                "tags": [domain, rng.choice(WORDS)]
+            }
+        }
+        if self._defect("metadata-schema-violation"):
+            metadata["template"]["version"] = "latest"
+        self._write(f"{TEMPLATES_DIR}/{directory}/spec.meta.json", json.dumps(metadata, indent=2) + "\n",
+                    "template-metadata")
+    
+    # Decision trees
+    
+    def _decision_trees(self):
+        names = ["integration-strategy", "validation-gates", "project-initiation", "escalation-framework"]
+        while len(names) < self.spec.decision_trees:
+            names.append(f"{self.rng.choice(WORDS)}-{self.rng.choice(WORDS)}-{len(names):04d}")
+        for name in names[:self.spec.decision_trees]:
+            self._write(f"{TREES_DIR}/{name}.md", self._decision_tree(), "decision-tree")
+    
+    def _decision_tree(self) -> str:
+        rng = self.rng
+        lines = ["flowchart TD", f"    N0[{self._title(2)}] --> N1{{{self._title(2)}?}}"]
+        decisions = [1]
+        count = 2
+        while decisions and count < rng.randint(20, 60):
+            node = decisions.pop(0)
+            for label in rng.sample(("Yes", "No", "Low", "Medium", "High", "Unknown"), rng.randint(2, 3)):
+                if rng.random() < 0.4:
+                    lines.append(f"    N{node} -->|{label}| N{count}{{{self._title(2)}?}}")
+                    decisions.append(count)
+                else:
+                    lines.append(f"    N{node} -->|{label}| N{count}[{self._title(3)}]")
+                count += 1
+        if self._defect("tree-dangling-edge"):
+            lines.append(f"    N{count + 5} --> N0")
+        lines += [f"    style N{node} fill:#e1f5fe" for node in range(0, count, 7)]
+        return "\n\n".join([
+            f"# {self._title()} Decision Tree",
+            self._paragraph(2),
+            "```mermaid\n" + "\n".join(lines) + "\n```",
+            "## Decision Points",
+            self._paragraph(3)
+        ]) + "\n"
+    
+    # Pages
+    
+    def _pages(self, steps):
+        journey_pages = [step.expected_file for step in steps
+                         if step.expected_file.split('/')[0] not in ("examples", "resources")
+                         or step.expected_file.startswith("resources/checklists/")]
+        self.pages = list(dict.fromkeys(journey_pages))
+        while len(self.pages) < self.spec.pages:
+            section = DOC_SECTIONS[len(self.pages) % len(DOC_SECTIONS)]
+            self.pages.append(f"{section}/{self.rng.choice(WORDS)}-{self.rng.choice(WORDS)}-{len(self.pages):05d}.md")
+        
+        for page in self.pages:
+            self._write(page, self._page(page), "page")
+    
+    def _page(self, page: str) -> str:
+        rng = self.rng
+        lines = [f"# {self._title()}", self._paragraph()]
+        for _ in range(rng.randint(2, 5)):
+            heading = self._title(2)
+            lines += [f"## {heading}", self._paragraph(rng.randint(2, 5))]
+            targets = rng.sample(self.markdown_files, min(len(self.markdown_files), rng.randint(1, 4)))
+            for target in targets:
+                relative = Path(*([".."] * (page.count('/')))) / target
+                lines.append(f"- [{self._title(2)}]({relative.as_posix()})")
+            if rng.random() < 0.3:
+                lines.append(f"See also [{heading}](#{heading.lower().replace(' ', '-')}).")
+            if self._defect("page-broken-link"):
+                lines.append(f"- [Moved page]({self.rng.choice(WORDS)}-missing.md)")
+            if rng.random() < 0.2:
+                lines.append("```bash\npython3 scripts/validate-examples.py --jobs 4\n```")
+        return "\n\n".join(lines) + "\n"
+    
+    def _journey_content(self, steps):
+        """Make sure each journey step's file exists and mentions its required content."""
+        by_file: Dict[str, List[str]] = {}
+        for step in steps:
+            by_file.setdefault(step.expected_file, []).extend(step.required_content)
+        for relative, required in by_file.items():
+            path = self.root / relative
+            existing = path.read_text(encoding='utf-8') if path.exists() else f"# {self._title()}\n\n{self._paragraph(4)}\n"
+            if self._defect("journey-missing-content"):
+                required = required[1:]
+            addition = "\n## Highlights\n\n" + "\n".join(f"- Covers {phrase}: {self._sentence(8)}" for phrase in required) + "\n"
+            if not path.exists():
+                self._write(relative, existing + addition, "page")
+            else:
+                path.write_text(existing + addition, encoding='utf-8')
+                self.stats.bytes += len(addition.encode('utf-8'))
+    
+    # Analytics and feedback exports
+    
+    def _view_exports(self):
+        month_end = EXPORT_END_DATE
+        for _ in range(self.spec.export_months):
+            month_start = month_end.replace(day=1)
+            sample = self.rng.sample(self.markdown_files, max(1, len(self.markdown_files) // 2))
+            rows = [{"path": path, "views": self.rng.randint(0, 5000)} for path in sorted(sample)]
+            output = self.root / "analytics" / "exports" / f"views-{month_start:%Y-%m}.csv"
+            output.parent.mkdir(parents=True, exist_ok=True)
+            with open(output, 'w', encoding='utf-8', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=["path", "views"])
+                writer.writeheader()
+                writer.writerows(rows)
+            self.stats.files += 1
+            self.stats.bytes += output.stat().st_size
+            self.stats.by_kind["analytics-export"] += 1
+            month_end = month_start - timedelta(days=1)
+    
+    def _feedback_export(self):
+        rng = self.rng
+        items = []
+        for _ in range(self.spec.feedback_items):
+            items.append({
+                "source": rng.choice(FEEDBACK_SOURCES),
+                "type": rng.choice(FEEDBACK_TYPES),
+                "title": self._sentence(6)[:-1],
+                "content": self._paragraph(2),
+                "labels": rng.sample(WORDS, 2),
+                "sentiment": rng.choice(SENTIMENTS),
+                "priority": rng.randint(1, 5),
+                "created_at": (EXPORT_END_DATE - timedelta(days=rng.randint(0, 180))).isoformat(),
+                "related_files": rng.sample(self.markdown_files, rng.randint(1, 3))
+            })
+        self._write("analytics/feedback/feedback-export.json", json.dumps(items, indent=2) + "\n",
+                    "feedback-export")
+
+def parse_counts(spec: CorpusSpec, overrides: Dict[str, Optional[int]]) -> CorpusSpec:
+    for name, value in overrides.items():
+        if value is not None:
+            setattr(spec, name, value)
+    return spec
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a seeded synthetic corpus for validator benchmarks')
+    parser.add_argument('output', help='Directory to write the corpus into (must be empty or missing)')
+    parser.add_argument('--projects', type=int, default=100,
+                       help='Example projects; other counts scale with it unless given')
+    parser.add_argument('--seed', type=int, default=1,
+                       help='Random seed')
+    parser.add_argument('--defect-rate', type=float, default=0.05,
+                       help='Share of documents with a deliberate defect')
+    parser.add_argument('--requirements', type=int, default=None,
+                       help='Mean functional requirements per project')
+    parser.add_argument('--templates', type=int, default=None,
+                       help='Template directories')
+    parser.add_argument('--decision-trees', type=int, default=None,
+                       help='Decision-tree documents')
+    parser.add_argument('--pages', type=int, default=None,
+                       help='Documentation pages')
+    parser.add_argument('--feedback-items', type=int, default=None,
+                       help='Items in the feedback export')
+    add_instrumentation_arguments(parser)
+    
+    args = parser.parse_args()
+    start_instrumentation(args, "generate-corpus")
+    
+    output = Path(args.output)
+    if output.exists() and any(output.iterdir()):
+        print(f"❌ Output directory is not empty: {output}")
+        sys.exit(1)
+    
+    spec = parse_counts(CorpusSpec.scaled(args.projects, args.seed, args.defect_rate), {
+        "requirements": args.requirements,
+        "templates": args.templates,
+        "decision_trees": args.decision_trees,
+        "pages": args.pages,
+        "feedback_items": args.feedback_items
+    })
+    stats = CorpusGenerator(str(output), spec).generate()
+    
+    print(f"✅ Generated {stats.files} files ({stats.bytes / 1_000_000:.1f} MB) in {output}")
+    for kind, count in sorted(stats.by_kind.items()):
+        print(f"   {kind}: {count}")
+    if stats.defects:
+        print(f"⚠️  Injected defects: " + ", ".join(f"{kind} {count}" for kind, count in sorted(stats.defects.items())))
+
+if __name__ == '__main__':
+    main()
@@ -6,21 +6,44 @@ Creates new templates based on existing base templates with proper metadata
 and structure validation.
 """
 
+import copy
+import hashlib
+import itertools
 import json
 import os
 import sys
+import tempfile
 from pathlib import Path
 from datetime import date
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
 import argparse
 
+from template_inheritance import InheritanceError, MetadataResolver
+from tracing import add_instrumentation_arguments, start_instrumentation
+
+# Generator used by batch worker processes, set up once per worker
+_worker_generator = None
+
+def _init_batch_worker(generator: "TemplateGenerator"):
+    global _worker_generator
+    _worker_generator = generator
+
+def _render_variant_worker(config: Dict[str, Any]) -> List[Tuple[str, str]]:
+    return _worker_generator.try_write_variant(config)
+
 class TemplateGenerator:
-    def __init__(self, base_template_dir: str = "resources/templates/base"):
+    def __init__(self, base_template_dir: str = "resources/templates/base",
+                 output_root: str = "resources/templates"):
         self.base_template_dir = Path(base_template_dir)
+        self.output_root = Path(output_root)
         self.template_types = ["spec", "plan", "tasks"]
         self.domains = ["api", "backend", "frontend", "mobile", "devops", "data", "ml"]
         self.complexities = ["basic", "intermediate", "advanced"]
         self.audiences = ["new-developer", "experienced-developer", "product-manager", "team-lead", "specialist"]
+        # Parsed base templates, read at most once each
+        self._base_templates: Dict[str, Optional[str]] = {}
+        # Shared, memoized resolution of `extends` chains
+        self.metadata_resolver = MetadataResolver(str(self.output_root))
     
     def create_template(self, template_config: Dict[str, Any]) -> bool:
         """Create a new template based on configuration."""
@@ -30,7 +53,7 @@ class TemplateGenerator:
                 return False
             
             # Create template directory
-            template_dir = Path(f"resources/templates/{template_config['domain']}")
+            template_dir = self.output_root / template_config['domain']
             template_dir.mkdir(parents=True, exist_ok=True)
             
             # Generate template file
@@ -93,26 +116,160 @@ class TemplateGenerator:
         
         return True
     
+    def create_templates_from_manifest(self, manifest: Dict[str, Any], jobs: Optional[int] = None) -> Dict[str, int]:
+        """Render every variant described by a batch manifest.
+        
+        The manifest may list explicit ``variants`` and/or a ``matrix`` of
+        domain, type, complexity and audience values whose cross product is
+        expanded, with ``defaults`` merged into every variant. Base templates
+        are parsed once in this process and shared with the worker pool;
+        outputs whose rendered content is unchanged are not rewritten.
+        """
+        configs = self._expand_manifest(manifest)
+        counts = {"written": 0, "unchanged": 0, "invalid": 0, "failed": 0}
+        
+        valid_configs = []
+        for config in configs:
+            if self._validate_config(config):
+                valid_configs.append(config)
+            else:
+                print(f"   Skipping variant: {config.get('name', '<unnamed>')}")
+                counts["invalid"] += 1
+        
+        # Parse each base template and parent metadata once before fanning out
+        for config in valid_configs:
+            self._load_base_template(config['type'])
+            if config.get('extends'):
+                try:
+                    self._load_base_metadata(config['extends'])
+                except InheritanceError as e:
+                    print(f"❌ {e}")
+                    return {"written": 0, "unchanged": 0, "invalid": len(configs), "failed": 0}
+        
+        for domain in sorted({config['domain'] for config in valid_configs}):
+            template_dir = self.output_root / domain
+            template_dir.mkdir(parents=True, exist_ok=True)
+            readme_file = template_dir / "README.md"
+            if not readme_file.exists():
+                self._generate_domain_readme(domain, readme_file)
+        
+        if jobs is None:
+            jobs = os.cpu_count() or 1
+        jobs = max(1, min(jobs, len(valid_configs)))
+        
+        if jobs == 1:
+            results = [self.try_write_variant(config) for config in valid_configs]
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+            chunksize = max(1, len(valid_configs) // (jobs * 4))
+            with ProcessPoolExecutor(max_workers=jobs, initializer=_init_batch_worker,
+                                     initargs=(self,)) as executor:
+                results = list(executor.map(_render_variant_worker, valid_configs, chunksize=chunksize))
+        
+        for outputs in results:
+            for target, status in outputs:
+                if status == "failed":
+                    print(f"❌ Variant {target}")
+                counts[status] += 1
+        
+        return counts
+    
+    def _expand_manifest(self, manifest: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Expand a manifest into individual template configs."""
+        defaults = manifest.get('defaults', {})
+        name_pattern = manifest.get('name_pattern', "{domain}-{type}-{complexity}-{audience}")
+        description_pattern = manifest.get('description_pattern',
+                                           "{domain_title} {type} template ({complexity}, {audience})")
+        configs = []
+        
+        matrix = manifest.get('matrix')
+        if matrix:
+            axes = ['domain', 'type', 'complexity', 'audience']
+            values = [matrix.get(axis) or [defaults.get(axis)] for axis in axes]
+            for combination in itertools.product(*values):
+                fields = dict(zip(axes, combination))
+                fields['domain_title'] = fields['domain'].title() if fields['domain'] else ''
+                config = {**defaults, **{axis: fields[axis] for axis in axes}}
+                config.setdefault('name', name_pattern.format(**fields))
+                config.setdefault('description', description_pattern.format(**fields))
+                configs.append(config)
+        
+        for variant in manifest.get('variants', []):
+            configs.append({**defaults, **variant})
+        
+        return configs
+    
+    def write_variant(self, config: Dict[str, Any]) -> List[Tuple[str, str]]:
+        """Render a validated config and write its template and metadata files."""
+        template_dir = self.output_root / config['domain']
+        template_file = template_dir / f"{config['name']}.md"
+        metadata_file = template_dir / f"{config['name']}.meta.json"
+        
+        content = self.render_template(config)
+        metadata = self.render_metadata(config, self._read_existing_metadata(metadata_file))
+        
+        return [
+            (str(template_file), self._write_if_changed(template_file, content)),
+            (str(metadata_file), self._write_metadata_if_changed(metadata_file, metadata))
+        ]
+    
+    def try_write_variant(self, config: Dict[str, Any]) -> List[Tuple[str, str]]:
+        """write_variant(), with a failure reported as ``[(message, "failed")]`` for this variant only."""
+        try:
+            return self.write_variant(config)
+        except (OSError, ValueError) as e:
+            return [(f"{config['name']}: {e}", "failed")]
+    
+    def _load_base_template(self, template_type: str) -> Optional[str]:
+        """Read a base template, caching the result for later variants."""
+        if template_type not in self._base_templates:
+            base_template_file = self.base_template_dir / f"{template_type}.md"
+            if base_template_file.exists():
+                with open(base_template_file, 'r') as f:
+                    self._base_templates[template_type] = f.read()
+            else:
+                self._base_templates[template_type] = None
+        return self._base_templates[template_type]
+    
+    def render_template(self, config: Dict[str, Any]) -> str:
+        """Render template markdown for a config from the cached base template."""
+        base_content = self._load_base_template(config['type'])
+        if base_content is None:
+            raise FileNotFoundError(f"Base template not found: {self.base_template_dir / (config['type'] + '.md')}")
+        return self._customize_template_content(base_content, config)
+    
+    def _write_if_changed(self, output_file: Path, content: str) -> str:
+        """Atomically write content unless the file already holds the same bytes."""
+        encoded = content.encode('utf-8')
+        if self._file_matches(output_file, encoded):
+            return "unchanged"
+        
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=output_file.parent, prefix=f".{output_file.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(encoded)
+            os.replace(tmp_path, output_file)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return "written"
+    
+    @staticmethod
+    def _file_matches(path: Path, encoded: bytes) -> bool:
+        """True if the file exists and its content hash equals that of ``encoded``."""
+        try:
+            with open(path, 'rb') as f:
+                existing = f.read()
+        except OSError:
+            return False
+        return hashlib.sha256(existing).digest() == hashlib.sha256(encoded).digest()
+    
     def _generate_template_file(self, config: Dict[str, Any], output_file: Path) -> bool:
         """Generate the template markdown file."""
         try:
-            # Load base template
-            base_template_file = self.base_template_dir / f"{config['type']}.md"
-            
-            if not base_template_file.exists():
-                print(f"❌ Base template not found: {base_template_file}")
-                return False
-            
-            with open(base_template_file, 'r') as f:
-                base_content = f.read()
-            
-            # Customize content for domain
-            customized_content = self._customize_template_content(base_content, config)
-            
-            # Write template file
-            with open(output_file, 'w') as f:
-                f.write(customized_content)
-            
+            content = self.render_template(config)
+            self._write_if_changed(output_file, content)
             return True
         
         except Exception as e:
@@ -199,63 +356,97 @@ class TemplateGenerator:
     def _generate_metadata_file(self, config: Dict[str, Any], output_file: Path) -> bool:
         """Generate the metadata JSON file."""
         try:
-            # Load base metadata if extending
-            base_metadata = {}
-            if config.get('extends'):
-                base_metadata_file = Path(config['extends']).with_suffix('.meta.json')
-                if base_metadata_file.exists():
-                    with open(base_metadata_file, 'r') as f:
-                        base_metadata = json.load(f)
-            
-            # Create metadata structure
-            metadata = {
-                "template": {
-                    "name": config['description'],
-                    "version": config.get('version', '1.0.0'),
-                    "type": config['type'],
-                    "domain": config['domain'],
-                    "complexity": config['complexity'],
-                    "audience": config['audience'] if isinstance(config['audience'], list) else [config['audience']],
-                    "description": config['description'],
-                    "ai_compatibility": config.get('ai_compatibility', ["github-copilot", "claude", "chatgpt", "cursor", "kiro", "generic"]),
-                    "requirements": config.get('requirements', []),
-                    "tags": config.get('tags', [config['domain'], config['type'], config['complexity']])
-                },
-                "structure": base_metadata.get('structure', {
-                    "sections": self._get_default_sections(config['type'], config['domain']),
-                    "placeholders": self._get_default_placeholders(config['type'], config['domain'])
-                }),
-                "validation": base_metadata.get('validation', {
-                    "rules": self._get_default_validation_rules(config['type'])
-                }),
-                "usage": {
-                    "instructions": f"This template is optimized for {config['domain']} {config['type']} creation. {config.get('usage_instructions', '')}",
-                    "examples": config.get('examples', []),
-                    "prerequisites": config.get('prerequisites', []),
-                    "related_templates": config.get('related_templates', [])
-                },
-                "maintenance": {
-                    "created": str(date.today()),
-                    "updated": str(date.today()),
-                    "maintainer": config.get('maintainer', 'SDD Community'),
-                    "status": config.get('status', 'draft')
-                }
-            }
-            
-            # Add extends if specified
-            if config.get('extends'):
-                metadata['template']['extends'] = config['extends']
-            
-            # Write metadata file
-            with open(output_file, 'w') as f:
-                json.dump(metadata, f, indent=2)
-            
+            metadata = self.render_metadata(config, self._read_existing_metadata(output_file))
+            self._write_metadata_if_changed(output_file, metadata)
             return True
         
         except Exception as e:
             print(f"❌ Error generating metadata file: {e}")
             return False
     
+    def _load_base_metadata(self, extends: str) -> Dict[str, Any]:
+        """Return the fully resolved metadata of an extended template.
+        
+        Multi-level `extends` chains are merged by the shared resolver; a
+        missing parent yields empty metadata so defaults apply, while an
+        inheritance cycle is an error.
+        """
+        parent = self.metadata_resolver.locate(extends)
+        if not parent.exists():
+            return {}
+        return self.metadata_resolver.resolve(parent)
+    
+    def _read_existing_metadata(self, metadata_file: Path) -> Optional[Dict[str, Any]]:
+        if not metadata_file.exists():
+            return None
+        try:
+            with open(metadata_file, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def _write_metadata_if_changed(self, output_file: Path, metadata: Dict[str, Any]) -> str:
+        """Write metadata, bumping the updated date only when the content changed."""
+        content = json.dumps(metadata, indent=2)
+        if output_file.exists():
+            if self._file_matches(output_file, content.encode('utf-8')):
+                return "unchanged"
+            metadata = copy.deepcopy(metadata)
+            metadata['maintenance']['updated'] = str(date.today())
+            content = json.dumps(metadata, indent=2)
+        return self._write_if_changed(output_file, content)
+    
+    def render_metadata(self, config: Dict[str, Any], existing: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Build the metadata structure for a config.
+        
+        Maintenance dates are carried over from ``existing`` metadata so that
+        re-rendering an unchanged template produces identical output.
+        """
+        # Load base metadata if extending
+        base_metadata = self._load_base_metadata(config['extends']) if config.get('extends') else {}
+        existing_maintenance = (existing or {}).get('maintenance', {})
+        
+        # Create metadata structure
+        metadata = {
+            "template": {
+                "name": config['description'],
+                "version": config.get('version', '1.0.0'),
+                "type": config['type'],
+                "domain": config['domain'],
+                "complexity": config['complexity'],
+                "audience": config['audience'] if isinstance(config['audience'], list) else [config['audience']],
+                "description": config['description'],
+                "ai_compatibility": config.get('ai_compatibility', ["github-copilot", "claude", "chatgpt", "cursor", "kiro", "generic"]),
+                "requirements": config.get('requirements', []),
+                "tags": config.get('tags', [config['domain'], config['type'], config['complexity']])
+            },
+            "structure": base_metadata.get('structure', {
+                "sections": self._get_default_sections(config['type'], config['domain']),
+                "placeholders": self._get_default_placeholders(config['type'], config['domain'])
+            }),
+            "validation": base_metadata.get('validation', {
+                "rules": self._get_default_validation_rules(config['type'])
+            }),
+            "usage": {
+                "instructions": f"This template is optimized for {config['domain']} {config['type']} creation. {config.get('usage_instructions', '')}",
+                "examples": config.get('examples', []),
+                "prerequisites": config.get('prerequisites', []),
+                "related_templates": config.get('related_templates', [])
+            },
+            "maintenance": {
+                "created": existing_maintenance.get('created', str(date.today())),
+                "updated": existing_maintenance.get('updated', str(date.today())),
+                "maintainer": config.get('maintainer', 'SDD Community'),
+                "status": config.get('status', 'draft')
+            }
+        }
+        
+        # Add extends if specified
+        if config.get('extends'):
+            metadata['template']['extends'] = config['extends']
+        
+        return metadata
+    
     def _get_default_sections(self, template_type: str, domain: str) -> List[Dict]:
         """Get default sections for template type and domain."""
         base_sections = {
@@ -427,12 +618,18 @@ def main():
                        help='Interactive template creation')
     parser.add_argument('--config', '-c', type=str,
                        help='JSON config file for template creation')
+    parser.add_argument('--manifest', '-m', type=str,
+                       help='JSON manifest describing a batch of template variants')
+    parser.add_argument('--jobs', '-j', type=int, default=None,
+                       help='Worker processes for --manifest (default: one per CPU)')
     parser.add_argument('--list-domains', action='store_true',
                        help='List available domains')
     parser.add_argument('--list-types', action='store_true',
                        help='List available template types')
+    add_instrumentation_arguments(parser)
     
     args = parser.parse_args()
+    start_instrumentation(args, "generate-template")
     
     generator = TemplateGenerator()
     
@@ -448,7 +645,25 @@ def main():
             print(f"  - {template_type}")
         return
     
-    if args.interactive:
+    if args.manifest:
+        try:
+            with open(args.manifest, 'r') as f:
+                manifest = json.load(f)
+        except Exception as e:
+            print(f"❌ Error reading manifest file: {e}")
+            sys.exit(1)
+        
+        if manifest.get('output_dir'):
+            # The metadata resolver is rooted at the output directory, so build a generator for it
+            generator = TemplateGenerator(output_root=manifest['output_dir'])
+        
+        counts = generator.create_templates_from_manifest(manifest, jobs=args.jobs)
+        print(f"✅ Batch complete: {counts['written']} files written, "
+              f"{counts['unchanged']} unchanged, {counts['invalid']} invalid variants, "
+              f"{counts['failed']} failed variants")
+        if counts['invalid'] or counts['failed']:
+            sys.exit(1)
+    elif args.interactive:
         interactive_template_creation()
     elif args.config:
         try:
@@ -464,7 +679,7 @@ def main():
             print(f"❌ Error reading config file: {e}")
             sys.exit(1)
     else:
-        print("Use --interactive for interactive creation or --config for config file")
+        print("Use --interactive for interactive creation, --config for config file, or --manifest for batch generation")
         print("Use --help for more options")
 
 if __name__ == '__main__':
@@ -0,0 +1,174 @@
+"""
+Test impact analysis for `ComprehensiveTestRunner --since <rev>`.
+
+Maps the files changed since a git revision to the test suites they can
+affect, and narrows each affected suite to the affected files where its
+script allows it:
+
+- templates: any change under `resources/templates/` runs template
+  validation,
+- examples: a change under `examples/` runs example validation on the
+  changed projects only (`--changed-only --base <rev>`),
+- journeys: a change to any journey step's file runs every journey, as
+  the suite passes or fails on the success rate over all of them (a
+  full run takes about 0.1 s),
+- links: a changed page, and every page that links to a changed or
+  deleted path, has its links checked (`--sources PAGE ...`); a change
+  to `.markdown-link-check.json` checks every page,
+- code: a change to a suite's script, or to any module it imports or
+  loads from `scripts/`, runs that suite in full.
+
+The graph is built from the working tree: journey steps come from
+`test-user-journeys.py` and links from the `check-links.py` index, so
+the analysis follows the same rules as the suites themselves.
+"""
+
+import re
+import subprocess
+from dataclasses import dataclass, field
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+# Paths whose change affects each scope, as fnmatch patterns (`*` matches `/`)
+SCOPE_INPUTS = {
+    "templates": ("resources/templates/*",),
+    "examples": ("examples/*",),
+    "content": ("*.md", ".markdownlint.json", ".markdown-link-check.json", ".cspell.json"),
+    "ai-integration": ("resources/templates/*", "examples/*"),
+    "feedback": ("*.md", "analytics/*"),
+}
+
+# Changes here can alter which suites exist or how they run
+RUNNER_FILES = ("scripts/run-all-tests.py", "scripts/impact_analysis.py")
+
+# Reports the suites write; untracked, but never an input to a suite
+GENERATED_PREFIXES = ("test-results/",)
+
+IMPORT_PATTERN = re.compile(r'^\s*(?:from|import)\s+([A-Za-z_]\w*)', re.MULTILINE)
+LOAD_SCRIPT_PATTERN = re.compile(r'load_script\(\s*["\']([\w-]+)["\']\s*\)')
+
+@dataclass
+class Selection:
+    """Why a suite runs, and the arguments that narrow it (none: the whole suite)."""
+    reasons: List[str]
+    args: List[str] = field(default_factory=list)
+
+def changed_files(since: str, repo_root: str = ".") -> List[str]:
+    """Repository paths changed since ``since``, including uncommitted and untracked files.
+    
+    Renames are reported as a deletion and an addition, so both the old
+    and the new path count as changed. The suites' own reports are left out.
+    """
+    def git(*args: str) -> List[str]:
+        return subprocess.run(["git", *args], capture_output=True, text=True, check=True,
+                              cwd=repo_root).stdout.splitlines()
+    
+    changed = git("diff", "--name-only", "--no-renames", since, "--")
+    untracked = git("ls-files", "--others", "--exclude-standard")
+    return sorted({path for path in changed + untracked
+                   if path and not path.startswith(GENERATED_PREFIXES)})
+
+class ImpactGraph:
+    """Dependencies from repository files to the suites and files that check them."""
+    
+    def __init__(self, repo_root: str = "."):
+        self.repo_root = Path(repo_root).resolve()
+        self._script_dependencies: Dict[str, Set[str]] = {}
+        self._journeys: Optional[Dict[str, Set[str]]] = None
+        self._backlinks: Optional[Dict[str, Set[str]]] = None
+    
+    def script_dependencies(self, script_path: str) -> Set[str]:
+        """The script plus every module in `scripts/` it imports or loads, transitively."""
+        if script_path in self._script_dependencies:
+            return self._script_dependencies[script_path]
+        
+        found: Set[str] = set()
+        pending = [script_path]
+        while pending:
+            path = pending.pop()
+            if path in found:
+                continue
+            found.add(path)
+            try:
+                source = (self.repo_root / path).read_text(encoding='utf-8')
+            except (OSError, UnicodeDecodeError):
+                continue
+            names = IMPORT_PATTERN.findall(source) + LOAD_SCRIPT_PATTERN.findall(source)
+            for name in names:
+                for candidate in (f"scripts/{name}.py", f"scripts/{name}/__init__.py"):
+                    if (self.repo_root / candidate).is_file():
+                        pending.append(candidate)
+        
+        self._script_dependencies[script_path] = found
+        return found
+    
+    def journeys(self) -> Dict[str, Set[str]]:
+        """Journey name -> the files its steps read."""
+        if self._journeys is None:
+            from sdd.cli import load_script
+            tester = load_script("test-user-journeys").UserJourneyTester(str(self.repo_root))
+            self._journeys = {name: {step.expected_file for step in steps}
+                              for _, name, steps in tester.journeys()}
+        return self._journeys
+    
+    def backlinks(self) -> Dict[str, Set[str]]:
+        """Repository path -> the Markdown pages with a local link to it."""
+        if self._backlinks is None:
+            from sdd.cli import load_script
+            check_links = load_script("check-links")
+            checker = check_links.LinkChecker(str(self.repo_root),
+                                              str(self.repo_root / ".markdown-link-check.json"),
+                                              cache_path="", offline=True)
+            checker.index.build()
+            backlinks: Dict[str, Set[str]] = {}
+            for link in checker.index.links:
+                kind, target = checker.classify(link)
+                if kind != "local":
+                    continue
+                resolved, _ = checker.resolve_local(link, target)
+                if resolved:
+                    backlinks.setdefault(resolved, set()).add(link.source)
+            self._backlinks = backlinks
+        return self._backlinks
+    
+    def linking_pages(self, paths: Iterable[str]) -> Set[str]:
+        """Pages linking to any of ``paths`` or to a directory containing one."""
+        backlinks = self.backlinks()
+        targets = set()
+        for path in paths:
+            parts = path.split('/')
+            targets.update('/'.join(parts[:depth]) for depth in range(1, len(parts) + 1))
+        return {page for target in targets for page in backlinks.get(target, ())}
+    
+    def select(self, scope: Optional[str], script_path: str, changed: List[str],
+               since: str) -> Optional[Selection]:
+        """How a suite should run for ``changed``, or None if the changes cannot affect it."""
+        code = self.script_dependencies(script_path) | set(RUNNER_FILES)
+        changed_code = sorted(path for path in changed if path in code)
+        if changed_code:
+            return Selection([f"code changed: {', '.join(changed_code)}"])
+        
+        if scope == "links" and ".markdown-link-check.json" in changed:
+            return Selection(["link check configuration changed"])
+        if scope == "examples":
+            examples = [path for path in changed if fnmatch(path, "examples/*")]
+            if examples:
+                return Selection([f"{len(examples)} example file(s) changed"], ["--changed-only", "--base", since])
+        elif scope == "journeys":
+            changed_set = set(changed)
+            names = sorted(name for name, files in self.journeys().items() if files & changed_set)
+            if names:
+                return Selection([f"journey steps changed: {', '.join(names)}"])
+        elif scope == "links":
+            pages = {path for path in changed if path.endswith('.md') and (self.repo_root / path).is_file()}
+            pages |= self.linking_pages(changed)
+            # A deleted page cannot be checked, only the pages that link to it
+            pages = {page for page in pages if (self.repo_root / page).is_file()}
+            if pages:
+                return Selection([f"{len(pages)} page(s) changed or link to a change"], ["--sources", *sorted(pages)])
+        elif scope in SCOPE_INPUTS:
+            matches = [path for path in changed if any(fnmatch(path, pattern) for pattern in SCOPE_INPUTS[scope])]
+            if matches:
+                return Selection([f"{len(matches)} input file(s) changed"])
+        return None
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Result Record Merger
+
+Renders each validation script's JSON report from the result records its
+shards streamed (see result_records.py), without running the scripts'
+own `--merge`. Every results directory holds one shard's records under
+`records/`; the reports are written in the shapes an unsharded run
+writes, so the runner, dashboards and plan-shards.py read them as before.
+Each report is judged as the unsharded run would be, and the exit status
+is 1 if any of them fails:
+    
+    merge-results.py shard-1/test-results shard-2/test-results
+    plan-shards.py --shards 2
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from result_records import SCRIPT_REPORTS, merge_records, records_path
+from validation_workspace import load_script
+from tracing import add_instrumentation_arguments, span, start_instrumentation
+
+def main():
+    parser = argparse.ArgumentParser(description='Render reports from the result records of all shards')
+    parser.add_argument('results', nargs='+', metavar='DIR',
+                       help='Results directory of one shard, with its records/ directory')
+    parser.add_argument('--output-dir', default='test-results',
+                       help='Directory to write the rendered reports to')
+    add_instrumentation_arguments(parser)
+    
+    args = parser.parse_args()
+    start_instrumentation(args, "merge-results")
+    
+    output_dir = Path(args.output_dir)
+    merged = failed = 0
+    for script, filename in SCRIPT_REPORTS.items():
+        paths = [records_path(script, str(Path(directory) / "records")) for directory in args.results]
+        paths = [path for path in paths if Path(path).exists()]
+        if not paths:
+            continue
+        
+        reducer = load_script(script).REPORT_REDUCER()
+        with span("suite", script):
+            try:
+                report = merge_records(paths, reducer, script).report()
+            except (OSError, ValueError) as e:
+                print(f"❌ {script}: cannot merge records: {e}")
+                failed += 1
+                continue
+        
+        output_file = output_dir / filename
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        merged += 1
+        failure = reducer.failure(report)
+        if failure:
+            print(f"❌ {script}: {failure} ({len(paths)} record stream(s) -> {output_file})")
+            failed += 1
+        else:
+            print(f"✅ {script}: {len(paths)} record stream(s) -> {output_file}")
+    
+    if not merged and not failed:
+        print(f"⚠️  No result records found in {', '.join(args.results)}")
+        return 1
+    print(f"\n🧩 Rendered {merged} report(s) from result records")
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
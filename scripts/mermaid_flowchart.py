@@ -0,0 +1,355 @@
+"""
+Mermaid Flowchart Parser
+
+Parses the flowchart subset used by the decision trees (node shapes,
+labelled edges, edge chains, `&` groups and `click` links) into a graph
+and checks its structure: unreachable nodes, decisions with fewer than
+two branches, dead ends that are not outcomes, and cycles. Styling statements are
+accepted and ignored; other diagram types are recognized and skipped.
+"""
+
+import re
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+FLOWCHART_HEADER = re.compile(r'^(?:flowchart|graph)(?:\s+(TB|TD|BT|RL|LR))?\s*;?$')
+OTHER_DIAGRAM_TYPES = (
+    'sequenceDiagram', 'classDiagram', 'stateDiagram', 'stateDiagram-v2', 'erDiagram', 'gantt',
+    'pie', 'journey', 'gitGraph', 'mindmap', 'timeline', 'quadrantChart', 'requirementDiagram',
+    'C4Context', 'C4Container', 'C4Component', 'C4Dynamic', 'C4Deployment', 'sankey-beta', 'xychart-beta'
+)
+IGNORED_STATEMENTS = re.compile(r'^(?:style|classDef|class|linkStyle|click|direction)\b')
+# `click A "url"` / `click A href "url"`; callback forms are ignored
+CLICK_LINK = re.compile(r'^click\s+([A-Za-z0-9_]+)\s+(?:href\s+)?"([^"]+)"')
+
+NODE_ID = re.compile(r'[A-Za-z0-9_]+')
+CLASS_SUFFIX = re.compile(r':::[\w-]+')
+# "-- text -->" style labels, tried before plain arrows
+TEXT_EDGE = re.compile(r'\s*(?:--|==|-\.)\s+([^|>]*?)\s+(-{2,}>|={2,}>|\.-?>|-{3,}|={3,})\s*')
+PLAIN_EDGE = re.compile(r'\s*(<?(?:-{2,}|={2,}|-\.+-)(?:>|x|o)?)\s*(?:\|([^|]*)\|)?\s*')
+AMPERSAND = re.compile(r'\s*&\s*')
+
+# (opening, closing, shape); longer delimiters first so "((" wins over "("
+NODE_SHAPES = (
+    ('(((', ')))', 'double-circle'), ('((', '))', 'circle'), ('([', '])', 'stadium'),
+    ('[[', ']]', 'subroutine'), ('[(', ')]', 'cylinder'), ('{{', '}}', 'hexagon'),
+    ('[/', '/]', 'parallelogram'), ('[\\', '\\]', 'parallelogram-alt'),
+    ('[', ']', 'rectangle'), ('(', ')', 'rounded'), ('{', '}', 'rhombus'), ('>', ']', 'asymmetric'),
+)
+
+@dataclass
+class FlowNode:
+    """A flowchart node; decisions are drawn as `{rhombus}` shapes."""
+    id: str
+    label: str
+    shape: str
+    line: int
+    
+    @property
+    def is_decision(self) -> bool:
+        return self.shape == 'rhombus'
+
+@dataclass(frozen=True)
+class FlowEdge:
+    source: str
+    target: str
+    label: str
+    line: int
+
+@dataclass(frozen=True)
+class FlowLink:
+    """A `click` link from a node to a URL or document path."""
+    node: str
+    target: str
+    line: int
+
+@dataclass(frozen=True)
+class GraphIssue:
+    """A structural finding; severity is 'error' or 'warning'."""
+    severity: str
+    kind: str
+    message: str
+    line: int
+
+@dataclass
+class Flowchart:
+    """Parsed flowchart: nodes in first-appearance order plus edges."""
+    direction: str = 'TD'
+    nodes: Dict[str, FlowNode] = field(default_factory=dict)
+    edges: List[FlowEdge] = field(default_factory=list)
+    links: Dict[str, FlowLink] = field(default_factory=dict)
+    syntax_errors: List[GraphIssue] = field(default_factory=list)
+    
+    @property
+    def entry(self) -> Optional[str]:
+        return next(iter(self.nodes), None)
+    
+    def successors(self) -> Dict[str, List[FlowEdge]]:
+        adjacency: Dict[str, List[FlowEdge]] = {node_id: [] for node_id in self.nodes}
+        for edge in self.edges:
+            adjacency[edge.source].append(edge)
+        return adjacency
+    
+    def outcomes(self) -> List[str]:
+        """Leaf nodes that end a path with an answer rather than a question."""
+        adjacency = self.successors()
+        return [node_id for node_id, node in self.nodes.items()
+                if not adjacency[node_id] and not _is_question(node)]
+    
+    def analyze(self) -> List[GraphIssue]:
+        """Run every structural check and return findings sorted by line."""
+        issues = list(self.syntax_errors)
+        if not self.nodes:
+            return issues
+        adjacency = self.successors()
+        
+        reachable = self._reachable(adjacency)
+        for node_id, node in self.nodes.items():
+            if node_id not in reachable:
+                issues.append(GraphIssue('error', 'unreachable',
+                                         f"Node {node_id} [{node.label}] is unreachable from {self.entry}", node.line))
+        
+        for node_id, node in self.nodes.items():
+            branches = adjacency[node_id]
+            if not branches:
+                if _is_question(node):
+                    issues.append(GraphIssue('error', 'dead-end',
+                                             f"Node {node_id} [{node.label}] is a dead end, not an outcome", node.line))
+                continue
+            if not node.is_decision:
+                continue
+            
+            targets = {edge.target for edge in branches}
+            if len(targets) < 2:
+                issues.append(GraphIssue('error', 'single-branch',
+                                         f"Decision {node_id} [{node.label}] has {len(targets)} branch(es), expected at least 2",
+                                         node.line))
+            labels: Dict[str, int] = {}
+            for edge in branches:
+                if not edge.label:
+                    issues.append(GraphIssue('warning', 'unlabelled-branch',
+                                             f"Decision {node_id} has an unlabelled branch to {edge.target}", edge.line))
+                    continue
+                labels[edge.label] = labels.get(edge.label, 0) + 1
+            for label, count in labels.items():
+                if count > 1:
+                    issues.append(GraphIssue('error', 'ambiguous-branch',
+                                             f"Decision {node_id} has {count} branches labelled '{label}'", node.line))
+        
+        for link in self.links.values():
+            if link.node not in self.nodes:
+                issues.append(GraphIssue('warning', 'unknown-node', f"click target {link.node} is not a node", link.line))
+        
+        for cycle in self._cycles(adjacency):
+            issues.append(GraphIssue('error', 'cycle', "Cycle: " + " -> ".join(cycle + [cycle[0]]),
+                                     self.nodes[cycle[0]].line))
+        
+        return sorted(issues, key=lambda issue: issue.line)
+    
+    def _reachable(self, adjacency: Dict[str, List[FlowEdge]]) -> Set[str]:
+        seen = {self.entry}
+        queue = deque([self.entry])
+        while queue:
+            for edge in adjacency[queue.popleft()]:
+                if edge.target not in seen:
+                    seen.add(edge.target)
+                    queue.append(edge.target)
+        return seen
+    
+    def _cycles(self, adjacency: Dict[str, List[FlowEdge]]) -> List[List[str]]:
+        """Find cycles with an iterative three-colour DFS, one report per back edge."""
+        WHITE, GREY, BLACK = 0, 1, 2
+        colour = {node_id: WHITE for node_id in self.nodes}
+        cycles, reported = [], set()
+        for root in self.nodes:
+            if colour[root] != WHITE:
+                continue
+            path = [root]
+            stack = [iter(adjacency[root])]
+            colour[root] = GREY
+            while stack:
+                edge = next(stack[-1], None)
+                if edge is None:
+                    colour[path.pop()] = BLACK
+                    stack.pop()
+                    continue
+                if colour[edge.target] == GREY:
+                    cycle = path[path.index(edge.target):]
+                    key = frozenset(cycle)
+                    if key not in reported:
+                        reported.add(key)
+                        cycles.append(cycle)
+                elif colour[edge.target] == WHITE:
+                    colour[edge.target] = GREY
+                    path.append(edge.target)
+                    stack.append(iter(adjacency[edge.target]))
+        return cycles
+
+@dataclass
+class MermaidBlock:
+    """A fenced ```mermaid block; ``line`` is the first line inside the fence."""
+    line: int
+    source: str
+    
+    @property
+    def diagram_type(self) -> str:
+        for raw in self.source.split('\n'):
+            stripped = raw.strip()
+            if stripped and not stripped.startswith('%%'):
+                return stripped.split()[0].rstrip(';')
+        return ''
+
+def extract_mermaid_blocks(content: str) -> List[MermaidBlock]:
+    """Collect the ```mermaid fenced blocks of a Markdown document."""
+    blocks, current, start = [], None, 0
+    for number, line in enumerate(content.split('\n'), 1):
+        stripped = line.strip()
+        if current is None:
+            if stripped.startswith('```') and stripped[3:].strip() == 'mermaid':
+                current, start = [], number + 1
+        elif stripped.startswith('```'):
+            blocks.append(MermaidBlock(start, '\n'.join(current)))
+            current = None
+        else:
+            current.append(line)
+    return blocks
+
+def parse_flowchart(source: str, first_line: int = 1) -> Flowchart:
+    """Parse flowchart source; problems are recorded as syntax errors, not raised."""
+    chart = Flowchart()
+    lines = source.split('\n')
+    header_seen = False
+    
+    for offset, raw in enumerate(lines):
+        number = first_line + offset
+        text = raw.split('%%', 1)[0].strip()
+        if not text:
+            continue
+        if not header_seen:
+            header = FLOWCHART_HEADER.match(text)
+            if not header:
+                chart.syntax_errors.append(GraphIssue('error', 'syntax', f"Expected a flowchart header, got '{text}'", number))
+                return chart
+            chart.direction = header.group(1) or 'TD'
+            header_seen = True
+            continue
+        
+        for statement in _split_statements(text):
+            click = CLICK_LINK.match(statement)
+            if click:
+                chart.links[click.group(1)] = FlowLink(click.group(1), click.group(2), number)
+                continue
+            if IGNORED_STATEMENTS.match(statement) or statement == 'end' or statement.startswith('subgraph'):
+                continue
+            error = _parse_statement(chart, statement, number)
+            if error:
+                chart.syntax_errors.append(GraphIssue('error', 'syntax', error, number))
+    
+    if not header_seen:
+        chart.syntax_errors.append(GraphIssue('error', 'syntax', "Empty flowchart", first_line))
+    return chart
+
+def _split_statements(text: str) -> List[str]:
+    """Split on ';' outside of labels."""
+    statements, depth, quoted, start = [], 0, False, 0
+    for index, char in enumerate(text):
+        if char == '"':
+            quoted = not quoted
+        elif not quoted and char in '[({':
+            depth += 1
+        elif not quoted and char in '])}':
+            depth -= 1
+        elif char == ';' and depth <= 0 and not quoted:
+            statements.append(text[start:index].strip())
+            start = index + 1
+    statements.append(text[start:].strip())
+    return [statement for statement in statements if statement]
+
+def _parse_statement(chart: Flowchart, text: str, line: int) -> Optional[str]:
+    """Parse `group (edge group)*` where a group is `node (& node)*`."""
+    position = 0
+    previous: Optional[List[str]] = None
+    pending_label = ''
+    
+    while True:
+        group, position, error = _parse_group(chart, text, position, line)
+        if error:
+            return error
+        if previous is not None:
+            for source in previous:
+                for target in group:
+                    chart.edges.append(FlowEdge(source, target, pending_label, line))
+        if position >= len(text):
+            return None
+        
+        edge = TEXT_EDGE.match(text, position) or PLAIN_EDGE.match(text, position)
+        if not edge or edge.end() == position:
+            return f"Unexpected '{text[position:]}' in '{text}'"
+        pending_label = (edge.group(1) if edge.re is TEXT_EDGE else edge.group(2) or '').strip().strip('"')
+        position = edge.end()
+        if position >= len(text):
+            return f"Edge without a target in '{text}'"
+        previous = group
+
+def _parse_group(chart: Flowchart, text: str, position: int, line: int) -> Tuple[List[str], int, Optional[str]]:
+    group = []
+    while True:
+        node_id, position, error = _parse_node(chart, text, position, line)
+        if error:
+            return group, position, error
+        group.append(node_id)
+        ampersand = AMPERSAND.match(text, position)
+        if not ampersand:
+            return group, position, None
+        position = ampersand.end()
+
+def _parse_node(chart: Flowchart, text: str, position: int, line: int) -> Tuple[str, int, Optional[str]]:
+    while position < len(text) and text[position].isspace():
+        position += 1
+    match = NODE_ID.match(text, position)
+    if not match:
+        return '', position, f"Expected a node id at '{text[position:]}'"
+    node_id = match.group(0)
+    position = match.end()
+    
+    label, shape = None, None
+    for opening, closing, shape_name in NODE_SHAPES:
+        if text.startswith(opening, position):
+            end, label = _read_label(text, position + len(opening), closing)
+            if end < 0:
+                return node_id, position, f"Unclosed '{opening}' for node {node_id}"
+            position, shape = end, shape_name
+            break
+    
+    suffix = CLASS_SUFFIX.match(text, position)
+    if suffix:
+        position = suffix.end()
+    
+    existing = chart.nodes.get(node_id)
+    if existing is None:
+        chart.nodes[node_id] = FlowNode(node_id, label if label is not None else node_id, shape or 'rectangle', line)
+    elif label is not None:
+        existing.label, existing.shape = label, shape
+    return node_id, position, None
+
+def _read_label(text: str, start: int, closing: str) -> Tuple[int, str]:
+    """Return (index after the closing delimiter, label) or (-1, '') if unclosed."""
+    stripped_start = start
+    while stripped_start < len(text) and text[stripped_start] == ' ':
+        stripped_start += 1
+    if stripped_start < len(text) and text[stripped_start] == '"':
+        end_quote = text.find('"', stripped_start + 1)
+        if end_quote < 0:
+            return -1, ''
+        end = text.find(closing, end_quote + 1)
+        if end < 0 or text[end_quote + 1:end].strip():
+            return -1, ''
+        return end + len(closing), text[stripped_start + 1:end_quote]
+    end = text.find(closing, start)
+    if end < 0:
+        return -1, ''
+    return end + len(closing), text[start:end].strip()
+
+def _is_question(node: FlowNode) -> bool:
+    return node.is_decision or node.label.rstrip().endswith('?')
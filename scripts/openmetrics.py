@@ -0,0 +1,187 @@
+"""
+OpenMetrics export of validation and test-runner metrics.
+
+Each script writes one text file (`test-results/metrics/<script>.prom` by
+default) in the OpenMetrics text format. Files are replaced atomically, so
+the node-exporter textfile collector never sees a partial write. The
+collector parses the Prometheus text format, in which the OpenMetrics-only
+`# UNIT` and `# EOF` lines are comments and counters arrive as untyped
+series under their `_total` sample names, so queries are the same either
+way.
+
+Metric names and help texts are defined once here. Counters describe a
+single run and start from zero in the next one, which `rate()` and
+`increase()` treat as a counter reset. Every sample carries a `repository`
+label (`SDD_METRICS_REPOSITORY`, or the name of the working directory) so
+metrics from many checkouts can share one Prometheus.
+"""
+
+import math
+import os
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+DEFAULT_METRICS_DIR = "test-results/metrics"
+
+# Seconds; spans one small file (sub-millisecond) to a whole suite
+DURATION_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _format_value(value: float) -> str:
+    if isinstance(value, int) or (isinstance(value, float) and value.is_integer() and abs(value) < 1e15):
+        return str(int(value))
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels) + "}"
+
+class MetricFamily:
+    """One named metric with a sample (or a set of histogram buckets) per label set."""
+    
+    def __init__(self, name: str, metric_type: str, help_text: str, unit: str = "",
+                 buckets: Tuple[float, ...] = DURATION_BUCKETS):
+        self.name = name
+        self.type = metric_type
+        self.help = help_text
+        self.unit = unit
+        self.buckets = buckets
+        self.values: Dict[Labels, float] = defaultdict(float)
+        # label set -> (bucket counts, sum, count) for histograms
+        self.histograms: Dict[Labels, Tuple[List[int], float, int]] = {}
+    
+    def inc(self, labels: Labels, amount: float = 1):
+        self.values[labels] += amount
+    
+    def set(self, labels: Labels, value: float):
+        self.values[labels] = value
+    
+    def observe(self, labels: Labels, value: float):
+        counts, total, count = self.histograms.get(labels) or ([0] * len(self.buckets), 0.0, 0)
+        for number, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[number] += 1
+                break
+        self.histograms[labels] = (counts, total + value, count + 1)
+    
+    def render(self) -> List[str]:
+        lines = [f"# TYPE {self.name} {self.type}", f"# HELP {self.name} {_escape(self.help)}"]
+        if self.unit:
+            lines.append(f"# UNIT {self.name} {self.unit}")
+        suffix = "_total" if self.type == "counter" else ""
+        for labels, value in sorted(self.values.items()):
+            lines.append(f"{self.name}{suffix}{_format_labels(labels)} {_format_value(value)}")
+        for labels, (counts, total, count) in sorted(self.histograms.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f"{self.name}_bucket{_format_labels(labels + (('le', repr(float(bound))),))} {cumulative}")
+            lines.append(f"{self.name}_bucket{_format_labels(labels + (('le', '+Inf'),))} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {count}")
+        return lines
+
+class MetricsRegistry:
+    """Metric families for one script run, rendered as an OpenMetrics exposition."""
+    
+    def __init__(self, const_labels: Optional[Mapping[str, str]] = None):
+        if const_labels is None:
+            const_labels = {"repository": os.environ.get("SDD_METRICS_REPOSITORY") or Path.cwd().name}
+        self.const_labels: Labels = tuple(sorted(const_labels.items()))
+        self.families: Dict[str, MetricFamily] = {}
+    
+    def _family(self, name: str, metric_type: str) -> MetricFamily:
+        family = self.families.get(name)
+        if family is None:
+            help_text, unit = METRICS[name]
+            family = self.families[name] = MetricFamily(name, metric_type, help_text, unit)
+        return family
+    
+    def _labels(self, labels: Mapping[str, str]) -> Labels:
+        return tuple(sorted(self.const_labels + tuple((name, str(value)) for name, value in labels.items())))
+    
+    def inc(self, name: str, amount: float = 1, **labels: str):
+        self._family(name, "counter").inc(self._labels(labels), amount)
+    
+    def set(self, name: str, value: float, **labels: str):
+        self._family(name, "gauge").set(self._labels(labels), value)
+    
+    def observe(self, name: str, value: float, **labels: str):
+        self._family(name, "histogram").observe(self._labels(labels), value)
+    
+    def render(self) -> str:
+        lines = []
+        for family in self.families.values():
+            lines.extend(family.render())
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+    
+    def write(self, output_path: str):
+        """Atomically replace the metrics file."""
+        output_file = Path(output_path)
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = output_file.with_name(f".{output_file.name}.{os.getpid()}.tmp")
+        with open(temp_path, 'w') as f:
+            f.write(self.render())
+        os.replace(temp_path, output_file)
+        print(f"📊 Metrics saved to: {output_file}")
+
+# name -> (help, unit); counters are rendered with a _total suffix
+METRICS = {
+    "sdd_files_processed": ("Files a validator processed in its last run.", ""),
+    "sdd_read_bytes": ("Bytes read by a validator in its last run.", "bytes"),
+    "sdd_rule_evaluations": ("Checks a validator evaluated in its last run.", ""),
+    "sdd_findings": ("Errors and warnings a validator reported in its last run.", ""),
+    "sdd_cache_lookups": ("Cache lookups in a validator's last run, by cache and result.", ""),
+    "sdd_cache_hit_ratio": ("Share of cache lookups that hit in a validator's last run.", "ratio"),
+    "sdd_file_validation_duration_seconds": ("Time to validate one file or project.", "seconds"),
+    "sdd_validation_duration_seconds": ("Duration of a validator's last run.", "seconds"),
+    "sdd_validation_last_run_timestamp_seconds": ("When a validator last finished, as a Unix time.", "seconds"),
+    "sdd_suite_duration_seconds": ("Duration of each test suite in the runner's last run.", "seconds"),
+    "sdd_suite_success": ("Whether each test suite passed (1) or failed (0) in the runner's last run.", ""),
+    "sdd_suite_exit_code": ("Exit code of each test suite in the runner's last run.", ""),
+    "sdd_suite_errors": ("Errors each test suite reported in its results file in the runner's last run.", ""),
+    "sdd_suites": ("Test suites in the runner's last run, by outcome.", ""),
+    "sdd_test_run_duration_seconds": ("Duration of the runner's last run.", "seconds"),
+    "sdd_test_run_quality_score": ("Quality score of the runner's last run.", ""),
+    "sdd_test_run_last_run_timestamp_seconds": ("When the runner last finished, as a Unix time.", "seconds"),
+}
+
+def validator_metrics(validator: str, *, duration: float, files: int, bytes_read: int, errors: int, warnings: int,
+                      rule_evaluations: Optional[int] = None, file_durations: Iterable[float] = (),
+                      caches: Optional[Mapping[str, Tuple[int, int]]] = None) -> MetricsRegistry:
+    """The standard metrics for one validator run.
+    
+    ``caches`` maps a cache name to (hits, misses).
+    """
+    registry = MetricsRegistry()
+    registry.inc("sdd_files_processed", files, validator=validator)
+    registry.inc("sdd_read_bytes", bytes_read, validator=validator)
+    if rule_evaluations is not None:
+        registry.inc("sdd_rule_evaluations", rule_evaluations, validator=validator)
+    registry.inc("sdd_findings", errors, validator=validator, severity="error")
+    registry.inc("sdd_findings", warnings, validator=validator, severity="warning")
+    for cache, (hits, misses) in sorted((caches or {}).items()):
+        registry.inc("sdd_cache_lookups", hits, validator=validator, cache=cache, result="hit")
+        registry.inc("sdd_cache_lookups", misses, validator=validator, cache=cache, result="miss")
+        if hits + misses:
+            registry.set("sdd_cache_hit_ratio", round(hits / (hits + misses), 6), validator=validator, cache=cache)
+    for seconds in file_durations:
+        registry.observe("sdd_file_validation_duration_seconds", seconds, validator=validator)
+    registry.set("sdd_validation_duration_seconds", round(duration, 6), validator=validator)
+    registry.set("sdd_validation_last_run_timestamp_seconds", round(time.time(), 3), validator=validator)
+    return registry
+
+def add_metrics_argument(parser, script: str):
+    """Add --metrics, defaulting to test-results/metrics/<script>.prom."""
+    parser.add_argument('--metrics', default=f'{DEFAULT_METRICS_DIR}/{script}.prom',
+                       help='Where to write OpenMetrics for the node-exporter textfile collector (empty to disable)')
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Shard Planner
+
+Builds the shard plan that `--shard i/N` reads (see sharding.py) from the
+timings in earlier reports: the per-file timings each validation script
+records, and the duration of each run-all-tests.py suite that cannot be
+split. The units are balanced over N shards longest first, so every
+shard gets about the same estimated work.
+
+Run it on the reports of an unsharded run, or of a merged sharded one:
+    
+    run-all-tests.py --merge shard-1/test-results shard-2/test-results
+    plan-shards.py --shards 4
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from result_records import SCRIPT_REPORTS
+from sharding import DEFAULT_PLAN_PATH, ShardPlan, balance
+from validation_workspace import load_script
+from tracing import add_instrumentation_arguments, start_instrumentation
+
+RUNNER_REPORT = "comprehensive-test-report.json"
+
+# Estimate for a whole suite no report has timed yet
+DEFAULT_SUITE_SECONDS = 1.0
+
+def read_report(path: Path) -> Optional[Dict[str, Any]]:
+    """A report's JSON, or None if it is missing or unreadable."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+class ShardPlanner:
+    """Collects unit timings from results directories and balances them over shards."""
+    
+    def __init__(self, result_dirs: List[str]):
+        self.result_dirs = [Path(directory) for directory in result_dirs]
+        # script -> unit -> seconds; later directories override earlier ones
+        self.file_timings: Dict[str, Dict[str, float]] = {}
+        # run-all-tests suite name -> seconds
+        self.suite_timings: Dict[str, float] = {}
+    
+    def collect(self):
+        """Read the timings of every report found in the results directories."""
+        for directory in self.result_dirs:
+            for script, filename in SCRIPT_REPORTS.items():
+                report = read_report(directory / filename)
+                if report and report.get("timings"):
+                    self.file_timings.setdefault(script, {}).update(report["timings"])
+            
+            runner_report = read_report(directory / RUNNER_REPORT)
+            for entry in (runner_report or {}).get("detailed_results", []):
+                if not entry.get("skipped"):
+                    self.suite_timings[entry["suite_name"]] = entry["duration"]
+    
+    def plan(self, shards: int) -> ShardPlan:
+        """Balance every timed file and every whole suite over ``shards`` shards."""
+        costs: Dict[Tuple[str, str], float] = {}
+        for script, timings in self.file_timings.items():
+            for unit, seconds in timings.items():
+                costs[(script, unit)] = seconds
+        for suite in load_script("run-all-tests").ComprehensiveTestRunner().test_suites:
+            if not suite.shardable:
+                costs[("suite", suite.name)] = self.suite_timings.get(suite.name, DEFAULT_SUITE_SECONDS)
+        
+        assignment, loads = balance(costs, shards)
+        plan = ShardPlan(shards, loads=loads)
+        for (script, unit), shard in assignment.items():
+            if script == "suite":
+                plan.suites[unit] = shard
+            else:
+                plan.files.setdefault(script, {})[unit] = shard
+        return plan
+
+def main():
+    parser = argparse.ArgumentParser(description='Balance validation work across CI shards from past timings')
+    parser.add_argument('--shards', type=int, required=True,
+                       help='Number of shards')
+    parser.add_argument('--results', action='append', metavar='DIR',
+                       help='Directory of earlier reports; repeat to combine (default: test-results)')
+    parser.add_argument('--output', default=DEFAULT_PLAN_PATH,
+                       help='Path to write the shard plan to')
+    add_instrumentation_arguments(parser)
+    
+    args = parser.parse_args()
+    start_instrumentation(args, "plan-shards")
+    if args.shards < 1:
+        parser.error("--shards must be at least 1")
+    
+    planner = ShardPlanner(args.results or ["test-results"])
+    planner.collect()
+    if not planner.file_timings and not planner.suite_timings:
+        print(f"⚠️  No timings found in {', '.join(str(d) for d in planner.result_dirs)}; "
+              "files will be assigned by name hash")
+    
+    plan = planner.plan(args.shards)
+    plan.save(args.output)
+    
+    units = sum(len(files) for files in plan.files.values()) + len(plan.suites)
+    print(f"🧩 Planned {units} units over {args.shards} shards: {args.output}")
+    for index, load in enumerate(plan.loads, 1):
+        print(f"   shard {index}/{args.shards}: {load:.1f}s")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Bulk Spec Renderer
+
+Fills `[placeholder]` markers in SDD templates from rows of a CSV or JSONL
+variables file. Each template is compiled once into literal chunks and
+placeholder slots, so rendering a row is a single join with no regex work.
+Rows are streamed to a worker pool and unfilled required placeholders are
+reported per row. Two outputs that resolve to the same file fail the run.
+"""
+
+import csv
+import json
+import os
+import re
+import sys
+import argparse
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from tracing import add_instrumentation_arguments, start_instrumentation
+
+# Square-bracketed text that is not a link target, checkbox or footnote
+PLACEHOLDER_PATTERN = re.compile(r'(?<!!)\[([^\[\]\n]{2,})\](?![(\[:])')
+NORMALIZE_PATTERN = re.compile(r'[^a-z0-9]+')
+
+# Rows handed to a worker at a time, and batches kept in flight per worker
+BATCH_SIZE = 256
+BATCHES_IN_FLIGHT = 2
+
+def normalize_placeholder(name: str) -> str:
+    """Map a placeholder or variable name to its lookup key ('User Role' -> 'user_role')."""
+    return NORMALIZE_PATTERN.sub('_', name.lower()).strip('_')
+
+@dataclass
+class CompiledTemplate:
+    """A template split into literal chunks around placeholder slots.
+    
+    ``literals`` always has one more entry than ``slots``; rendering
+    interleaves them.
+    """
+    path: str
+    literals: List[str]
+    slots: List[str]
+    markers: List[str]
+    required: Set[str] = field(default_factory=set)
+    
+    @classmethod
+    def compile(cls, path: Path, optional: Optional[Set[str]] = None) -> "CompiledTemplate":
+        """Scan the template once and record its segments."""
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        
+        literals, slots, markers = [], [], []
+        position = 0
+        for match in PLACEHOLDER_PATTERN.finditer(content):
+            slot = normalize_placeholder(match.group(1))
+            if not slot:
+                # '[...]' and similar markers name nothing a variable can fill
+                continue
+            literals.append(content[position:match.start()])
+            slots.append(slot)
+            markers.append(match.group(0))
+            position = match.end()
+        literals.append(content[position:])
+        
+        optional = set(optional or ()) | cls._optional_from_metadata(path)
+        required = {slot for slot in slots if slot not in optional}
+        return cls(str(path), literals, slots, markers, required)
+    
+    @staticmethod
+    def _optional_from_metadata(path: Path) -> Set[str]:
+        """Placeholders the template's metadata marks as not required."""
+        metadata_file = path.with_suffix('.meta.json')
+        if not metadata_file.exists():
+            return set()
+        try:
+            with open(metadata_file, 'r') as f:
+                metadata = json.load(f)
+        except (OSError, ValueError):
+            return set()
+        return {
+            normalize_placeholder(placeholder['name'])
+            for placeholder in metadata.get('structure', {}).get('placeholders', [])
+            if not placeholder.get('required', False)
+        }
+    
+    def render(self, values: Dict[str, str]) -> Tuple[str, List[str]]:
+        """Fill slots from ``values``; returns the text and the unfilled required slots."""
+        parts = [self.literals[0]]
+        missing = []
+        for slot, marker, literal in zip(self.slots, self.markers, self.literals[1:]):
+            value = values.get(slot)
+            if value is None or value == "":
+                parts.append(marker)
+                if slot in self.required and slot not in missing:
+                    missing.append(slot)
+            else:
+                parts.append(value)
+            parts.append(literal)
+        return ''.join(parts), missing
+
+@dataclass(frozen=True)
+class RowResult:
+    """Outcome of rendering every template for one variables row."""
+    row: int
+    outputs: Tuple[str, ...]
+    missing: Tuple[Tuple[str, Tuple[str, ...]], ...]  # (template, unfilled slots)
+
+# Compiled templates and output settings, set once per worker process
+_worker_state: Dict[str, Any] = {}
+
+def _init_render_worker(templates: List[CompiledTemplate], output_dir: str, output_pattern: str):
+    _worker_state.update(templates=templates, output_dir=Path(output_dir), output_pattern=output_pattern)
+
+def _render_batch_worker(batch: List[Tuple[int, Dict[str, str]]]) -> List[RowResult]:
+    return [
+        render_row(row, values, _worker_state['templates'],
+                   _worker_state['output_dir'], _worker_state['output_pattern'])
+        for row, values in batch
+    ]
+
+def render_row(row: int, values: Dict[str, str], templates: List[CompiledTemplate],
+               output_dir: Path, output_pattern: str) -> RowResult:
+    """Render all templates for one row and write the filled specs."""
+    outputs, missing = [], []
+    for template in templates:
+        content, unfilled = template.render(values)
+        name_fields = _NameFields(values, row=row, template=Path(template.path).stem,
+                                  domain=Path(template.path).parent.name)
+        output_file = output_dir / output_pattern.format_map(name_fields)
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write(content)
+        outputs.append(str(output_file))
+        if unfilled:
+            missing.append((template.path, tuple(unfilled)))
+    return RowResult(row, tuple(outputs), tuple(missing))
+
+class _NameFields(dict):
+    """Output-name fields: row values plus row/template/domain, with safe file names."""
+    
+    def __init__(self, values: Dict[str, str], **extra: Any):
+        super().__init__(values)
+        self.update(extra)
+    
+    def __getitem__(self, key: str) -> Any:
+        value = super().__getitem__(key)
+        if isinstance(value, str):
+            return re.sub(r'[^A-Za-z0-9._-]+', '-', value).strip('-') or 'unnamed'
+        return value
+    
+    def __missing__(self, key: str) -> str:
+        return 'unnamed'
+
+class SpecRenderer:
+    """Renders compiled templates for every row of a variables file."""
+    
+    def __init__(self, template_paths: List[str], output_dir: str = "rendered-specs",
+                 output_pattern: str = "{domain}-{template}-{row:05d}.md", optional: Optional[Set[str]] = None):
+        optional = {normalize_placeholder(name) for name in (optional or ())}
+        self.templates = [CompiledTemplate.compile(Path(path), optional) for path in template_paths]
+        self.output_dir = Path(output_dir)
+        self.output_pattern = output_pattern
+        self.results: List[RowResult] = []
+    
+    def read_rows(self, variables_path: str) -> Iterator[Tuple[int, Dict[str, str]]]:
+        """Stream normalized rows from a CSV or JSONL file."""
+        path = Path(variables_path)
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            if path.suffix.lower() == '.csv':
+                reader = csv.reader(f)
+                header = [normalize_placeholder(column) for column in next(reader, [])]
+                for row, record in enumerate(reader, 1):
+                    yield row, dict(zip(header, record))
+            else:
+                key_cache: Dict[str, str] = {}
+                for row, line in enumerate((line for line in f if line.strip()), 1):
+                    try:
+                        record = json.loads(line)
+                    except ValueError as e:
+                        raise ValueError(f"{path}: row {row}: invalid JSON: {e}") from None
+                    if not isinstance(record, dict):
+                        raise ValueError(f"{path}: row {row}: expected a JSON object, got {type(record).__name__}")
+                    values = {}
+                    for key, value in record.items():
+                        if key not in key_cache:
+                            key_cache[key] = normalize_placeholder(key)
+                        values[key_cache[key]] = "" if value is None else str(value)
+                    yield row, values
+    
+    def render_all(self, variables_path: str, jobs: Optional[int] = None) -> List[RowResult]:
+        """Render every row, in parallel when more than one job is requested."""
+        rows = self.read_rows(variables_path)
+        if jobs is None:
+            jobs = os.cpu_count() or 1
+        
+        if jobs <= 1:
+            self.results = [
+                render_row(row, values, self.templates, self.output_dir, self.output_pattern)
+                for row, values in rows
+            ]
+            return self.results
+        
+        from concurrent.futures import ProcessPoolExecutor
+        self.results = []
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_render_worker,
+                                 initargs=(self.templates, str(self.output_dir), self.output_pattern)) as executor:
+            # Keep a bounded number of batches in flight so huge files stream
+            pending = deque()
+            for batch in self._batches(rows):
+                pending.append(executor.submit(_render_batch_worker, batch))
+                if len(pending) >= jobs * BATCHES_IN_FLIGHT:
+                    self.results.extend(pending.popleft().result())
+            while pending:
+                self.results.extend(pending.popleft().result())
+        return self.results
+    
+    @staticmethod
+    def _batches(rows: Iterator[Tuple[int, Dict[str, str]]]) -> Iterator[List[Tuple[int, Dict[str, str]]]]:
+        batch = []
+        for item in rows:
+            batch.append(item)
+            if len(batch) >= BATCH_SIZE:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+    
+    def generate_report(self) -> Dict[str, Any]:
+        """Summarize rendered rows and unfilled required placeholders."""
+        incomplete = [result for result in self.results if result.missing]
+        rows_by_output: Dict[str, List[int]] = {}
+        for result in self.results:
+            for output in result.outputs:
+                rows_by_output.setdefault(output, []).append(result.row)
+        return {
+            "summary": {
+                "templates": [template.path for template in self.templates],
+                "rows_rendered": len(self.results),
+                "files_written": len(rows_by_output),
+                "rows_with_missing_placeholders": len(incomplete),
+                "duplicate_outputs": sum(1 for rows in rows_by_output.values() if len(rows) > 1)
+            },
+            "duplicate_outputs": [
+                {"output": output, "rows": rows}
+                for output, rows in sorted(rows_by_output.items())
+                if len(rows) > 1
+            ],
+            "missing_placeholders": [
+                {
+                    "row": result.row,
+                    "templates": {template: list(slots) for template, slots in result.missing}
+                }
+                for result in incomplete
+            ]
+        }
+    
+    def save_report(self, report: Dict[str, Any], output_path: str):
+        """Save the render report to file."""
+        output_file = Path(output_path)
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        
+        print(f"\n📊 Render report saved to: {output_file}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Fill SDD template placeholders from a CSV or JSONL variables file')
+    parser.add_argument('--template', '-t', action='append', required=True,
+                       help='Template to render (repeatable)')
+    parser.add_argument('--variables', '-v', required=True,
+                       help='CSV (with header) or JSONL file, one spec per row')
+    parser.add_argument('--output-dir', '-o', default='rendered-specs',
+                       help='Directory for rendered specs')
+    parser.add_argument('--output-pattern', default='{domain}-{template}-{row:05d}.md',
+                       help='Output file name; may use {row}, {template}, {domain} and any variable')
+    parser.add_argument('--optional', action='append', default=[],
+                       help='Placeholder that may be left unfilled (repeatable)')
+    parser.add_argument('--jobs', '-j', type=int, default=None,
+                       help='Worker processes (default: one per CPU)')
+    parser.add_argument('--report', default='test-results/render-report.json',
+                       help='Where to write the JSON render report')
+    parser.add_argument('--allow-missing', action='store_true',
+                       help='Exit successfully even if required placeholders are unfilled')
+    add_instrumentation_arguments(parser)
+    
+    args = parser.parse_args()
+    start_instrumentation(args, "render-specs")
+    
+    for template in args.template:
+        if not os.path.exists(template):
+            print(f"❌ Template not found: {template}")
+            sys.exit(1)
+    if not os.path.exists(args.variables):
+        print(f"❌ Variables file not found: {args.variables}")
+        sys.exit(1)
+    
+    renderer = SpecRenderer(args.template, args.output_dir, args.output_pattern, set(args.optional))
+    
+    print(f"🎯 Rendering {len(renderer.templates)} template(s) from: {args.variables}")
+    for template in renderer.templates:
+        print(f"   {template.path}: {len(template.slots)} placeholders ({len(set(template.slots))} unique)")
+    
+    try:
+        renderer.render_all(args.variables, jobs=args.jobs)
+    except (OSError, ValueError) as e:
+        print(f"❌ Error rendering specs: {e}")
+        sys.exit(1)
+    
+    report = renderer.generate_report()
+    summary = report['summary']
+    print(f"\n✅ Rendered {summary['rows_rendered']} rows into {summary['files_written']} files")
+    
+    if report['missing_placeholders']:
+        print(f"\n⚠️  {summary['rows_with_missing_placeholders']} rows have unfilled required placeholders:")
+        for entry in report['missing_placeholders'][:10]:
+            for template, slots in entry['templates'].items():
+                print(f"  • row {entry['row']} ({template}): {', '.join(slots)}")
+    
+    if report['duplicate_outputs']:
+        print(f"\n❌ {summary['duplicate_outputs']} output files were written more than once; "
+              f"make --output-pattern unique per template and row:")
+        for entry in report['duplicate_outputs'][:10]:
+            print(f"  • {entry['output']} (rows {', '.join(map(str, entry['rows']))})")
+    
+    renderer.save_report(report, args.report)
+    
+    if report['duplicate_outputs']:
+        sys.exit(1)
+    if report['missing_placeholders'] and not args.allow_missing:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,181 @@
+"""
+Streaming JSONL result records.
+
+Each validation script writes its results as they are produced, one JSON
+object per line, to `test-results/records/<script>.jsonl` by default:
+    
+    {"record": "run", "script": "validate-templates", "version": 1, "shard": "1/2"}
+    {"record": "template", "path": "resources/templates/base/spec.md", ...}
+    {"record": "end", "duration": 0.41}
+
+The first record names the script and the shard that wrote the stream,
+the last one marks a finished run; in between come the script's own
+records, one per file or check. Lines are flushed as they are written, so
+a stream can be followed while the run is still going, and a stream
+without its `end` record comes from a run that did not finish.
+
+A script's JSON report is rendered from its records by a `ReportReducer`
+that folds in one record at a time. Reducers order what they render, so
+the records of every shard of a sharded run, fed to the same reducer,
+give the report of an unsharded run: that is what each script's `--merge`
+and `merge-results.py` do.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+RECORDS_VERSION = 1
+DEFAULT_RECORDS_DIR = "test-results/records"
+
+# Report each script renders from its records, relative to a results directory
+SCRIPT_REPORTS = {
+    "validate-templates": "template-validation.json",
+    "validate-template-metadata": "template-metadata-report.json",
+    "validate-examples": "example-validation.json",
+    "validate-decision-trees": "decision-tree-report.json",
+    "check-links": "link-check-report.json",
+    "spell-check": "spell-check-report.json",
+    "test-user-journeys": "user-journey-report.json",
+    "test-ai-integration": "ai-integration-report.json",
+}
+
+Record = Dict[str, Any]
+
+class ReportReducer:
+    """Folds a script's records into its report, one record at a time.
+    
+    Subclasses handle their record kinds in ``reduce_<kind>`` methods and
+    render the report in ``report()``; records of other kinds are ignored.
+    """
+    
+    def __init__(self):
+        self.shards: List[Optional[str]] = []
+        # Sum over the runs fed in: the work done, not the wall-clock time
+        self.duration = 0.0
+    
+    def feed(self, record: Record):
+        handler = getattr(self, f"reduce_{record['record']}", None)
+        if handler is not None:
+            handler(record)
+    
+    def reduce_run(self, record: Record):
+        self.shards.append(record.get("shard"))
+    
+    def reduce_end(self, record: Record):
+        self.duration += record["duration"]
+    
+    def report(self) -> Dict[str, Any]:
+        raise NotImplementedError
+    
+    def failure(self, report: Dict[str, Any]) -> Optional[str]:
+        """Why the run ``report`` describes fails, or None if it passes.
+        
+        Verdicts that aggregate over every unit (a success rate, say) only
+        hold for the whole run, so sharded runs leave them to the merge.
+        """
+        return None
+
+class RecordWriter:
+    """Streams a script's records to a JSONL file and feeds each one to its reducer.
+    
+    With an empty ``path`` nothing is written, but the reducer still sees
+    every record, so the report is rendered the same way.
+    """
+    
+    def __init__(self, path: Optional[str], script: str, reducer: ReportReducer, shard: Any = None):
+        self.path = path
+        self.reducer = reducer
+        self._file = None
+        if path:
+            output_file = Path(path)
+            output_file.parent.mkdir(parents=True, exist_ok=True)
+            # Line buffered, so every record is visible as soon as it is written
+            self._file = open(output_file, 'w', encoding='utf-8', buffering=1)
+        self.emit("run", script=script, version=RECORDS_VERSION, shard=str(shard) if shard else None)
+    
+    def emit(self, kind: str, /, **fields: Any) -> Record:
+        record = {"record": kind, **fields}
+        self.reducer.feed(record)
+        if self._file is not None:
+            self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        return record
+    
+    def close(self, duration: float) -> Dict[str, Any]:
+        """Mark the run finished and return the report rendered from its records."""
+        self.emit("end", duration=duration)
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        return self.reducer.report()
+
+def records_path(script: str, records_dir: str = DEFAULT_RECORDS_DIR) -> str:
+    return f"{records_dir}/{script}.jsonl"
+
+def add_records_argument(parser, script: str):
+    """Add --records, defaulting to test-results/records/<script>.jsonl."""
+    parser.add_argument('--records', default=records_path(script),
+                       help='Where to stream JSONL result records as they are produced (empty to disable)')
+
+def read_records(path: str) -> Iterator[Record]:
+    """The records of one stream, read a line at a time."""
+    with open(path, 'r', encoding='utf-8') as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                raise ValueError(f"{path}:{number}: {e}")
+            if not isinstance(record, dict) or "record" not in record:
+                raise ValueError(f"{path}:{number}: not a result record")
+            yield record
+
+def _read_header(path: str) -> Record:
+    header = next(read_records(path), None)
+    if header is None or header["record"] != "run":
+        raise ValueError(f"{path}: does not start with a run record")
+    if header.get("version") != RECORDS_VERSION:
+        raise ValueError(f"{path}: unsupported record version {header.get('version')}")
+    return header
+
+def merge_records(paths: Sequence[str], reducer: ReportReducer, script: Optional[str] = None) -> ReportReducer:
+    """Feed the streams of one run to ``reducer``: a single unsharded stream, or one per shard.
+    
+    Raises ValueError if the streams come from another script, do not make
+    up a complete set of shards, or one of them did not finish.
+    """
+    headers = [_read_header(path) for path in paths]
+    scripts = {header["script"] for header in headers}
+    if script is not None and scripts != {script}:
+        raise ValueError(f"expected records of {script}, got {', '.join(sorted(scripts))}")
+    if len(scripts) > 1:
+        raise ValueError(f"records of several scripts: {', '.join(sorted(scripts))}")
+    
+    shards = [header["shard"] for header in headers]
+    if None in shards:
+        if len(paths) > 1:
+            raise ValueError("an unsharded run cannot be merged with other streams")
+    else:
+        counts = {int(shard.split('/')[1]) for shard in shards}
+        indexes = sorted(int(shard.split('/')[0]) for shard in shards)
+        if len(counts) > 1 or indexes != list(range(1, counts.pop() + 1)):
+            raise ValueError(f"expected one stream from each shard, got {', '.join(sorted(shards))}")
+    
+    for path in paths:
+        finished = False
+        for record in read_records(path):
+            if finished:
+                raise ValueError(f"{path}: records after the end of the run")
+            reducer.feed(record)
+            finished = record["record"] == "end"
+        if not finished:
+            raise ValueError(f"{path}: the run did not finish")
+    return reducer
+
+def merge_streams(parser, paths: Sequence[str], reducer: ReportReducer, script: str) -> Dict[str, Any]:
+    """The report for a script's --merge; exits through ``parser`` if the streams cannot be merged."""
+    try:
+        return merge_records(paths, reducer, script).report()
+    except (OSError, ValueError) as e:
+        parser.error(f"cannot merge records: {e}")
@@ -2,6 +2,12 @@
 """
 Comprehensive Test Runner for SDD Repository Validation.
 Orchestrates all validation frameworks and generates unified reports.
+
+With --shard i/N, suites that can split their work run on every shard
+over the files the shard plan gives it, and the other suites run whole
+on one shard. --merge then combines the shards' test-results directories
+into the reports of an unsharded run, rendering each split suite's report
+from the result records its shards streamed (see result_records.py).
 """
 
 import os
@@ -11,10 +17,16 @@ import time
 import asyncio
 import subprocess
 from pathlib import Path
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, Sequence
+from dataclasses import dataclass, field
 from datetime import datetime
 
+from impact_analysis import ImpactGraph, Selection, changed_files
+from openmetrics import MetricsRegistry, add_metrics_argument
+from result_records import records_path
+from sharding import ShardSelector, add_shard_arguments, shard_selector
+from tracing import DEFAULT_TRACE_DIR, add_instrumentation_arguments, span, start_instrumentation, tracer
+
 @dataclass
 class TestSuite:
     """Configuration for a test suite."""
@@ -23,6 +35,10 @@ class TestSuite:
     description: str
     timeout: int = 300  # 5 minutes default
     required: bool = True
+    results_path: Optional[str] = None  # machine-readable results written by the script
+    arguments: List[str] = field(default_factory=list)
+    scope: Optional[str] = None  # which changed files affect the suite, for --since (see impact_analysis.py)
+    shardable: bool = False  # the script takes --shard and --merge, writing results_path
 
 @dataclass
 class TestResult:
@@ -33,6 +49,8 @@ class TestResult:
     exit_code: int
     output: str
     error_output: str
+    details: Optional[Dict[str, Any]] = None
+    skipped: bool = False  # not affected by the changes under --since
 
 class ComprehensiveTestRunner:
     """Runs all validation tests and generates unified reports."""
@@ -41,56 +59,90 @@ class ComprehensiveTestRunner:
         self.repo_root = Path(repo_root)
         self.test_suites = self._define_test_suites()
         self.results: List[TestResult] = []
+        self.impact: Optional[Dict[str, Any]] = None
         
     def _define_test_suites(self) -> List[TestSuite]:
         """Define all available test suites."""
         return [
             TestSuite(
                 name="Template Validation",
-                script_path="scripts/validate-templates.sh",
+                script_path="scripts/validate-templates.py",
                 description="Validate template syntax and completeness",
                 timeout=120,
-                required=True
+                required=True,
+                results_path="test-results/template-validation.json",
+                scope="templates",
+                shardable=True
             ),
             TestSuite(
                 name="Example Validation",
                 script_path="scripts/validate-examples.py",
                 description="Validate example specifications and workflows",
                 timeout=180,
-                required=True
+                required=True,
+                results_path="test-results/example-validation.json",
+                scope="examples",
+                shardable=True
             ),
             TestSuite(
                 name="Content Validation",
                 script_path=".github/workflows/content-validation.yml",
                 description="Markdown linting and link checking",
                 timeout=240,
-                required=True
+                required=True,
+                scope="content"
             ),
             TestSuite(
                 name="AI Integration Testing",
                 script_path="scripts/test-ai-integration.py",
                 description="Test compatibility with AI agents",
                 timeout=300,
-                required=False
+                required=False,
+                results_path="test-results/ai-integration-report.json",
+                scope="ai-integration",
+                shardable=True
             ),
             TestSuite(
                 name="User Journey Testing",
                 script_path="scripts/test-user-journeys.py",
                 description="Validate complete user workflows",
                 timeout=180,
-                required=True
+                required=True,
+                results_path="test-results/user-journey-report.json",
+                scope="journeys",
+                shardable=True
             ),
             TestSuite(
                 name="Feedback Analysis",
                 script_path="scripts/feedback-analysis.py",
                 description="Analyze feedback and generate improvement recommendations",
                 timeout=120,
-                required=False
+                required=False,
+                scope="feedback"
+            ),
+            TestSuite(
+                name="Link Validation",
+                script_path="scripts/check-links.py",
+                description="Check intra-repository links and anchors",
+                timeout=120,
+                required=False,
+                results_path="test-results/link-check-report.json",
+                arguments=["--offline"],
+                scope="links",
+                shardable=True
             )
         ]
     
-    async def run_all_tests(self, include_optional: bool = False) -> Dict[str, Any]:
-        """Run all test suites and generate comprehensive report."""
+    async def run_all_tests(self, include_optional: bool = False, since: Optional[str] = None,
+                            shard: Optional[ShardSelector] = None, shard_plan: str = "") -> Dict[str, Any]:
+        """Run all test suites and generate comprehensive report.
+        
+        With ``since`` (a git revision), only suites affected by the files
+        changed since then run, narrowed to those files where the suite
+        supports it; the others are reported as skipped. With a ``shard``,
+        shardable suites run on the files it owns (per ``shard_plan``) and
+        the others only on the shard that owns them.
+        """
         print("🚀 Starting Comprehensive SDD Repository Validation")
         print("=" * 60)
         
@@ -102,6 +154,11 @@ class ComprehensiveTestRunner:
             if suite.required or include_optional
         ]
         
+        selections: Dict[str, Optional[Selection]] = {}
+        if since is not None:
+            with span("walk", "impact analysis"):
+                selections = self._plan_impact(suites_to_run, since)
+        
         print(f"Running {len(suites_to_run)} test suites...\n")
         
         # Run test suites
@@ -109,11 +166,37 @@ class ComprehensiveTestRunner:
             print(f"[{i}/{len(suites_to_run)}] {suite.name}")
             print(f"Description: {suite.description}")
             
-            result = await self._run_test_suite(suite)
+            selection = selections.get(suite.name)
+            extra_args = list(selection.args) if selection else []
+            if shard is not None and shard.shard is not None and suite.shardable:
+                extra_args += ["--shard", str(shard.shard), "--shard-plan", shard_plan]
+            if since is not None and selection is None:
+                result = TestResult(
+                    suite_name=suite.name,
+                    success=True,
+                    duration=0.0,
+                    exit_code=0,
+                    output=f"Not affected by changes since {since}",
+                    error_output="",
+                    skipped=True
+                )
+            elif shard is not None and not suite.shardable and not shard.owns_suite(suite.name):
+                result = TestResult(
+                    suite_name=suite.name,
+                    success=True,
+                    duration=0.0,
+                    exit_code=0,
+                    output="Runs on another shard",
+                    error_output="",
+                    skipped=True
+                )
+            else:
+                with span("suite", suite.name):
+                    result = await self._run_test_suite(suite, extra_args)
             self.results.append(result)
             
             # Print immediate result
-            status = "✅ PASSED" if result.success else "❌ FAILED"
+            status = "⏭️  SKIPPED" if result.skipped else "✅ PASSED" if result.success else "❌ FAILED"
             print(f"Result: {status} ({result.duration:.1f}s)")
             
             if not result.success and result.error_output:
@@ -125,6 +208,8 @@ class ComprehensiveTestRunner:
         
         # Generate comprehensive report
         report = self._generate_comprehensive_report(total_time)
+        if shard is not None and shard.shard is not None:
+            report["shard"] = {"index": shard.shard.index, "count": shard.shard.count}
         
         # Save report
         self._save_report(report)
@@ -134,8 +219,93 @@ class ComprehensiveTestRunner:
         
         return report
     
-    async def _run_test_suite(self, suite: TestSuite) -> TestResult:
-        """Run a single test suite."""
+    async def merge_shards(self, shard_dirs: List[str]) -> Dict[str, Any]:
+        """Combine the test-results directories of all shards into the reports of an unsharded run.
+        
+        Shardable suites are merged by their script's --merge over the
+        record streams in each shard's `records/` directory, and its exit
+        code is the suite's outcome; other suites take the result of the
+        shard that ran them.
+        """
+        reports = []
+        for directory in shard_dirs:
+            with open(Path(directory) / "comprehensive-test-report.json", 'r', encoding='utf-8') as f:
+                reports.append(json.load(f))
+        shards = [report.get("shard") for report in reports]
+        if None in shards:
+            raise ValueError("not every report comes from a sharded run")
+        count = shards[0]["count"]
+        indexes = sorted(shard["index"] for shard in shards)
+        if any(shard["count"] != count for shard in shards) or indexes != list(range(1, count + 1)):
+            raise ValueError(f"expected one report from each of {count} shards, got shards {indexes}")
+        
+        print(f"🧩 Merging {count} shards")
+        print("=" * 60)
+        for suite in self.test_suites:
+            entries = [(directory, entry) for directory, report in zip(shard_dirs, reports)
+                       for entry in report["detailed_results"] if entry["suite_name"] == suite.name]
+            if not entries:
+                continue
+            ran = [(directory, entry) for directory, entry in entries if not entry["skipped"]]
+            duration = sum(entry["duration"] for _, entry in entries)
+            
+            if suite.shardable and ran:
+                shard_records = [records_path(Path(suite.script_path).stem, str(Path(directory) / "records"))
+                                 for directory, _ in ran]
+                with span("suite", suite.name):
+                    result = await self._run_test_suite(suite, ["--merge", *shard_records])
+                result.duration = duration
+            else:
+                entry = (ran or entries)[0][1]
+                result = TestResult(
+                    suite_name=suite.name,
+                    success=entry["success"],
+                    duration=duration,
+                    exit_code=entry["exit_code"],
+                    output="",
+                    error_output=entry["error_summary"] or "",
+                    details=entry["details"],
+                    skipped=not ran
+                )
+            self.results.append(result)
+            status = "⏭️  SKIPPED" if result.skipped else "✅ PASSED" if result.success else "❌ FAILED"
+            print(f"{suite.name}: {status} ({result.duration:.1f}s)")
+        
+        if "impact" in reports[0]:
+            self.impact = reports[0]["impact"]
+        report = self._generate_comprehensive_report(sum(report["summary"]["total_duration"] for report in reports))
+        self._save_report(report)
+        self._print_summary(report)
+        return report
+    
+    def _plan_impact(self, suites: List[TestSuite], since: str) -> Dict[str, Optional[Selection]]:
+        """Select the suites affected by the files changed since ``since``."""
+        changed = changed_files(since, str(self.repo_root))
+        graph = ImpactGraph(str(self.repo_root))
+        selections = {suite.name: graph.select(suite.scope, suite.script_path, changed, since) for suite in suites}
+        
+        self.impact = {
+            "since": since,
+            "changed_files": changed,
+            "suites": {
+                name: {
+                    "selected": selection is not None,
+                    "reasons": selection.reasons if selection else [],
+                    "arguments": selection.args if selection else []
+                }
+                for name, selection in selections.items()
+            }
+        }
+        
+        selected = [name for name, selection in selections.items() if selection is not None]
+        print(f"🎯 {len(changed)} file(s) changed since {since}: {len(selected)} of {len(suites)} suites affected")
+        for name in selected:
+            print(f"   • {name}: {'; '.join(selections[name].reasons)}")
+        print()
+        return selections
+    
+    async def _run_test_suite(self, suite: TestSuite, extra_args: Sequence[str] = ()) -> TestResult:
+        """Run a single test suite, with ``extra_args`` narrowing it to the affected files."""
         script_path = self.repo_root / suite.script_path
         
         if not script_path.exists():
@@ -149,13 +319,18 @@ class ComprehensiveTestRunner:
             )
         
         start_time = time.time()
+        # While tracing, each Python suite writes its own trace, merged into ours afterwards
+        trace_path = None
         
         try:
             # Determine how to run the script
             if script_path.suffix == ".py":
-                cmd = [sys.executable, str(script_path)]
+                cmd = [sys.executable, str(script_path), *suite.arguments, *extra_args]
+                if tracer() is not None:
+                    trace_path = f"{DEFAULT_TRACE_DIR}/{script_path.stem}.trace.json"
+                    cmd += ["--trace-file", trace_path]
             elif script_path.suffix == ".sh":
-                cmd = ["bash", str(script_path)]
+                cmd = ["bash", str(script_path), *suite.arguments, *extra_args]
             elif script_path.suffix == ".yml":
                 # For GitHub Actions, we'll simulate or skip
                 return TestResult(
@@ -196,6 +371,8 @@ class ComprehensiveTestRunner:
                 )
             
             duration = time.time() - start_time
+            if trace_path is not None:
+                tracer().include(str(self.repo_root / trace_path))
             
             return TestResult(
                 suite_name=suite.name,
@@ -203,7 +380,8 @@ class ComprehensiveTestRunner:
                 duration=duration,
                 exit_code=exit_code,
                 output=stdout.decode('utf-8', errors='ignore'),
-                error_output=stderr.decode('utf-8', errors='ignore')
+                error_output=stderr.decode('utf-8', errors='ignore'),
+                details=self._load_suite_details(suite)
             )
             
         except Exception as e:
@@ -217,6 +395,19 @@ class ComprehensiveTestRunner:
                 error_output=f"Exception running test: {str(e)}"
             )
     
+    def _load_suite_details(self, suite: TestSuite) -> Optional[Dict[str, Any]]:
+        """Load the summary a suite wrote to its results file, if it has one."""
+        if not suite.results_path:
+            return None
+        
+        try:
+            with open(self.repo_root / suite.results_path, 'r') as f:
+                results = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        
+        return results.get("summary") if isinstance(results, dict) else None
+    
     def _generate_comprehensive_report(self, total_time: float) -> Dict[str, Any]:
         """Generate comprehensive test report."""
         total_tests = len(self.results)
@@ -247,6 +438,7 @@ class ComprehensiveTestRunner:
                 "passed_tests": passed_tests,
                 "failed_tests": failed_tests,
                 "success_rate": (passed_tests / total_tests * 100) if total_tests > 0 else 0,
+                "skipped_tests": sum(1 for r in self.results if r.skipped),
                 "quality_score": quality_score
             },
             "test_breakdown": {
@@ -269,8 +461,10 @@ class ComprehensiveTestRunner:
                     "success": r.success,
                     "duration": r.duration,
                     "exit_code": r.exit_code,
+                    "skipped": r.skipped,
                     "required": any(s.name == r.suite_name and s.required for s in self.test_suites),
-                    "error_summary": r.error_output[:500] if r.error_output else None
+                    "error_summary": r.error_output[:500] if r.error_output else None,
+                    "details": r.details
                 }
                 for r in self.results
             ],
@@ -283,6 +477,8 @@ class ComprehensiveTestRunner:
             ],
             "recommendations": self._generate_recommendations()
         }
+        if self.impact is not None:
+            report["impact"] = self.impact
         
         return report
     
@@ -341,6 +537,27 @@ class ComprehensiveTestRunner:
         
         return recommendations
     
+    def metrics(self, report: Dict[str, Any]) -> MetricsRegistry:
+        """OpenMetrics for the suites of the last run_all_tests() run."""
+        registry = MetricsRegistry()
+        required = {suite.name: suite.required for suite in self.test_suites}
+        for result in self.results:
+            labels = {"suite": result.suite_name, "required": str(required.get(result.suite_name, True)).lower()}
+            registry.set("sdd_suite_duration_seconds", round(result.duration, 6), **labels)
+            registry.set("sdd_suite_success", int(result.success), **labels)
+            registry.set("sdd_suite_exit_code", result.exit_code, **labels)
+            if result.details and isinstance(result.details.get("errors"), int):
+                registry.set("sdd_suite_errors", result.details["errors"], **labels)
+        
+        skipped = report["summary"]["skipped_tests"]
+        registry.inc("sdd_suites", report["summary"]["passed_tests"] - skipped, outcome="passed")
+        registry.inc("sdd_suites", skipped, outcome="skipped")
+        registry.inc("sdd_suites", report["summary"]["failed_tests"], outcome="failed")
+        registry.set("sdd_test_run_duration_seconds", round(report["summary"]["total_duration"], 6))
+        registry.set("sdd_test_run_quality_score", report["summary"]["quality_score"])
+        registry.set("sdd_test_run_last_run_timestamp_seconds", round(time.time(), 3))
+        return registry
+    
     def _save_report(self, report: Dict[str, Any]):
         """Save comprehensive report to file."""
         output_dir = self.repo_root / "test-results"
@@ -373,6 +590,8 @@ class ComprehensiveTestRunner:
         print(f"\nTest Results:")
         print(f"  ✅ Passed: {summary['passed_tests']}")
         print(f"  ❌ Failed: {summary['failed_tests']}")
+        if summary['skipped_tests']:
+            print(f"  ⏭️  Skipped (not affected): {summary['skipped_tests']}")
         print(f"  📊 Total: {summary['total_tests']}")
         
         # Required vs Optional breakdown
@@ -403,13 +622,34 @@ async def main():
     parser = argparse.ArgumentParser(description="Run comprehensive SDD repository validation")
     parser.add_argument("--include-optional", action="store_true", help="Include optional test suites")
     parser.add_argument("--timeout", type=int, default=300, help="Global timeout for test suites")
+    parser.add_argument("--since", metavar="REV", help="Only run suites and files affected by changes since this git revision")
+    add_metrics_argument(parser, "run-all-tests")
+    add_shard_arguments(parser, merge_metavar="DIR",
+                        merge_help="Combine the test-results directories of all shards instead of running the suites")
+    add_instrumentation_arguments(parser)
     
     args = parser.parse_args()
+    start_instrumentation(args, "run-all-tests")
     
     runner = ComprehensiveTestRunner()
     
-    # Run all tests
-    report = await runner.run_all_tests(include_optional=args.include_optional)
+    if args.merge:
+        try:
+            report = await runner.merge_shards(args.merge)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"❌ Could not merge shard results: {e}")
+            return 1
+    else:
+        # Run all tests
+        shard = shard_selector(parser, args, "run-all-tests")
+        try:
+            report = await runner.run_all_tests(include_optional=args.include_optional, since=args.since,
+                                                shard=shard, shard_plan=args.shard_plan)
+        except subprocess.CalledProcessError as e:
+            print(f"❌ Could not determine changed files since {args.since}: {e.stderr.strip() or e}")
+            return 1
+    if args.metrics:
+        runner.metrics(report).write(args.metrics)
     
     # Determine exit code
     required_success_rate = report["test_breakdown"]["required_tests"]["success_rate"]
@@ -0,0 +1,495 @@
+"""
+JSON Schema Compiler
+
+Compiles a JSON Schema (draft-07 subset) into nested Python closures once,
+so validating many documents against the same schema does no keyword
+dispatch or schema walking per document. Enums become frozensets and
+patterns are precompiled. Compiled validators are cached by schema hash.
+
+Supported keywords: type, enum, const, properties, required,
+additionalProperties, patternProperties, propertyNames, minProperties,
+maxProperties, items (single schema or tuple), additionalItems, minItems,
+maxItems, uniqueItems, contains, pattern, minLength, maxLength, format
+(date, date-time), minimum, maximum, exclusiveMinimum, exclusiveMaximum,
+multipleOf, allOf, anyOf, oneOf, not, if/then/else and local $ref
+("#/definitions/..."). Annotation keywords are ignored.
+"""
+
+import hashlib
+import json
+import re
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, Optional
+
+# (instance, path, errors) -> None; appends messages for any violations
+Check = Callable[[Any, str, List[str]], None]
+
+_TYPE_NAMES = {
+    dict: "object", list: "array", str: "string", bool: "boolean",
+    int: "integer", float: "number", type(None): "null"
+}
+
+_compiled_cache: Dict[str, Callable[[Any], List[str]]] = {}
+
+def schema_hash(schema: Dict[str, Any]) -> str:
+    """Stable hash of a schema's canonical JSON form."""
+    return hashlib.sha256(json.dumps(schema, sort_keys=True, separators=(',', ':')).encode('utf-8')).hexdigest()
+
+def compile_schema(schema: Dict[str, Any]) -> Callable[[Any], List[str]]:
+    """Return a validator for ``schema``, compiling it at most once per process."""
+    key = schema_hash(schema)
+    validator = _compiled_cache.get(key)
+    if validator is None:
+        check = _SchemaCompiler(schema).compile(schema)
+        
+        def validator(instance: Any) -> List[str]:
+            errors: List[str] = []
+            check(instance, "", errors)
+            return errors
+        
+        _compiled_cache[key] = validator
+    return validator
+
+def _json_type(value: Any) -> str:
+    return _TYPE_NAMES.get(type(value), type(value).__name__)
+
+def _is_type(value: Any, type_name: str) -> bool:
+    if type_name == "object":
+        return isinstance(value, dict)
+    if type_name == "array":
+        return isinstance(value, list)
+    if type_name == "string":
+        return isinstance(value, str)
+    if type_name == "boolean":
+        return isinstance(value, bool)
+    if type_name == "integer":
+        return (isinstance(value, int) and not isinstance(value, bool)) or \
+            (isinstance(value, float) and value.is_integer())
+    if type_name == "number":
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+    if type_name == "null":
+        return value is None
+    return False
+
+def _display(path: str) -> str:
+    return path or "<root>"
+
+def _freeze(value: Any) -> Any:
+    """Hashable form of a JSON value that keeps 1 and True distinct."""
+    if isinstance(value, dict):
+        return ("object", frozenset((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, list):
+        return ("array", tuple(_freeze(v) for v in value))
+    return (_json_type(value) if not isinstance(value, (int, float)) or isinstance(value, bool) else "number", value)
+
+def _check_date(value: str) -> bool:
+    try:
+        date.fromisoformat(value)
+        return len(value) == 10
+    except ValueError:
+        return False
+
+def _check_date_time(value: str) -> bool:
+    try:
+        datetime.fromisoformat(value.replace('Z', '+00:00').replace('z', '+00:00'))
+        return 'T' in value or 't' in value or ' ' in value
+    except ValueError:
+        return False
+
+_FORMAT_CHECKS: Dict[str, Callable[[str], bool]] = {
+    "date": _check_date,
+    "date-time": _check_date_time,
+}
+
+class _SchemaCompiler:
+    """Turns schema nodes into Check closures; local $refs are compiled lazily."""
+    
+    def __init__(self, root: Dict[str, Any]):
+        self.root = root
+        self.refs: Dict[str, Check] = {}
+    
+    def compile(self, schema: Any) -> Check:
+        if schema is True or schema == {}:
+            return _accept
+        if schema is False:
+            return _reject
+        
+        if "$ref" in schema:
+            # Per draft-07, siblings of $ref are ignored
+            return self._compile_ref(schema["$ref"])
+        
+        type_check = self._compile_type(schema)
+        checks: List[Check] = []
+        for compile_keyword in (self._compile_enum, self._compile_const, self._compile_object,
+                                self._compile_array, self._compile_string, self._compile_number,
+                                self._compile_combinators):
+            checks.extend(compile_keyword(schema))
+        
+        if type_check is None and len(checks) == 1:
+            return checks[0]
+        checks_tuple = tuple(checks)
+        
+        def validate(value: Any, path: str, errors: List[str]):
+            if type_check is not None and not type_check(value, path, errors):
+                return
+            for check in checks_tuple:
+                check(value, path, errors)
+        
+        return validate
+    
+    def _compile_ref(self, ref: str) -> Check:
+        if ref in self.refs:
+            return self.refs[ref]
+        
+        target = self._resolve_pointer(ref)
+        compiled: List[Optional[Check]] = [None]
+        
+        def validate_ref(value: Any, path: str, errors: List[str]):
+            compiled[0](value, path, errors)
+        
+        # Register before compiling so recursive schemas terminate
+        self.refs[ref] = validate_ref
+        compiled[0] = self.compile(target)
+        return validate_ref
+    
+    def _resolve_pointer(self, ref: str) -> Any:
+        if not ref.startswith('#'):
+            raise ValueError(f"Only local $ref values are supported: {ref}")
+        node: Any = self.root
+        for part in ref[1:].lstrip('/').split('/'):
+            if not part:
+                continue
+            part = part.replace('~1', '/').replace('~0', '~')
+            node = node[int(part)] if isinstance(node, list) else node[part]
+        return node
+    
+    def _compile_type(self, schema: Dict[str, Any]) -> Optional[Callable[[Any, str, List[str]], bool]]:
+        if "type" not in schema:
+            return None
+        types = schema["type"] if isinstance(schema["type"], list) else [schema["type"]]
+        expected = " or ".join(types)
+        
+        if len(types) == 1 and types[0] in ("object", "array", "string"):
+            python_type = {"object": dict, "array": list, "string": str}[types[0]]
+            
+            def check_simple_type(value: Any, path: str, errors: List[str]) -> bool:
+                if isinstance(value, python_type):
+                    return True
+                errors.append(f"{_display(path)}: expected {expected}, got {_json_type(value)}")
+                return False
+            
+            return check_simple_type
+        
+        def check_type(value: Any, path: str, errors: List[str]) -> bool:
+            if any(_is_type(value, type_name) for type_name in types):
+                return True
+            errors.append(f"{_display(path)}: expected {expected}, got {_json_type(value)}")
+            return False
+        
+        return check_type
+    
+    def _compile_enum(self, schema: Dict[str, Any]) -> List[Check]:
+        if "enum" not in schema:
+            return []
+        allowed = frozenset(_freeze(value) for value in schema["enum"])
+        listing = ", ".join(json.dumps(value) for value in schema["enum"])
+        
+        if all(isinstance(value, str) for value in schema["enum"]):
+            strings = frozenset(schema["enum"])
+            
+            def check_string_enum(value: Any, path: str, errors: List[str]):
+                if not (isinstance(value, str) and value in strings):
+                    errors.append(f"{_display(path)}: {json.dumps(value)} is not one of [{listing}]")
+            
+            return [check_string_enum]
+        
+        def check_enum(value: Any, path: str, errors: List[str]):
+            if _freeze(value) not in allowed:
+                errors.append(f"{_display(path)}: {json.dumps(value)} is not one of [{listing}]")
+        
+        return [check_enum]
+    
+    def _compile_const(self, schema: Dict[str, Any]) -> List[Check]:
+        if "const" not in schema:
+            return []
+        expected = _freeze(schema["const"])
+        shown = json.dumps(schema["const"])
+        
+        def check_const(value: Any, path: str, errors: List[str]):
+            if _freeze(value) != expected:
+                errors.append(f"{_display(path)}: expected constant {shown}")
+        
+        return [check_const]
+    
+    def _compile_object(self, schema: Dict[str, Any]) -> List[Check]:
+        checks: List[Check] = []
+        properties = {name: self.compile(sub) for name, sub in schema.get("properties", {}).items()}
+        pattern_properties = [
+            (re.compile(pattern), self.compile(sub))
+            for pattern, sub in schema.get("patternProperties", {}).items()
+        ]
+        required = tuple(schema.get("required", ()))
+        additional = schema.get("additionalProperties", True)
+        known = frozenset(properties)
+        
+        if required:
+            def check_required(value: Any, path: str, errors: List[str]):
+                if isinstance(value, dict):
+                    for name in required:
+                        if name not in value:
+                            errors.append(f"{_display(path)}: missing required property '{name}'")
+            
+            checks.append(check_required)
+        
+        if properties or pattern_properties or additional is not True:
+            property_items = tuple(properties.items())
+            additional_check = None if additional is False or additional is True else self.compile(additional)
+            reject_additional = additional is False
+            
+            def check_properties(value: Any, path: str, errors: List[str]):
+                if not isinstance(value, dict):
+                    return
+                prefix = f"{path}." if path else ""
+                for name, check in property_items:
+                    if name in value:
+                        check(value[name], prefix + name, errors)
+                
+                if not pattern_properties and additional is True:
+                    return
+                for name in value.keys() - known:
+                    matched = False
+                    for pattern, check in pattern_properties:
+                        if pattern.search(name):
+                            matched = True
+                            check(value[name], prefix + name, errors)
+                    if matched:
+                        continue
+                    if reject_additional:
+                        errors.append(f"{_display(path)}: unexpected property '{name}'")
+                    elif additional_check is not None:
+                        additional_check(value[name], prefix + name, errors)
+            
+            checks.append(check_properties)
+        
+        if "propertyNames" in schema:
+            name_check = self.compile(schema["propertyNames"])
+            
+            def check_property_names(value: Any, path: str, errors: List[str]):
+                if isinstance(value, dict):
+                    for name in value:
+                        name_check(name, f"{_display(path)} (property name '{name}')", errors)
+            
+            checks.append(check_property_names)
+        
+        min_props, max_props = schema.get("minProperties"), schema.get("maxProperties")
+        if min_props is not None or max_props is not None:
+            def check_property_count(value: Any, path: str, errors: List[str]):
+                if not isinstance(value, dict):
+                    return
+                if min_props is not None and len(value) < min_props:
+                    errors.append(f"{_display(path)}: expected at least {min_props} properties")
+                if max_props is not None and len(value) > max_props:
+                    errors.append(f"{_display(path)}: expected at most {max_props} properties")
+            
+            checks.append(check_property_count)
+        
+        return checks
+    
+    def _compile_array(self, schema: Dict[str, Any]) -> List[Check]:
+        checks: List[Check] = []
+        items = schema.get("items")
+        
+        if isinstance(items, list):
+            item_checks = tuple(self.compile(sub) for sub in items)
+            additional_items = schema.get("additionalItems", True)
+            extra_check = None if additional_items is True else self.compile(additional_items)
+            
+            def check_tuple_items(value: Any, path: str, errors: List[str]):
+                if not isinstance(value, list):
+                    return
+                for index, item in enumerate(value):
+                    if index < len(item_checks):
+                        item_checks[index](item, f"{path}[{index}]", errors)
+                    elif extra_check is not None:
+                        extra_check(item, f"{path}[{index}]", errors)
+            
+            checks.append(check_tuple_items)
+        elif items is not None:
+            item_check = self.compile(items)
+            
+            if item_check is not _accept:
+                def check_items(value: Any, path: str, errors: List[str]):
+                    if isinstance(value, list):
+                        for index, item in enumerate(value):
+                            item_check(item, f"{path}[{index}]", errors)
+                
+                checks.append(check_items)
+        
+        min_items, max_items = schema.get("minItems"), schema.get("maxItems")
+        if min_items is not None or max_items is not None:
+            def check_item_count(value: Any, path: str, errors: List[str]):
+                if not isinstance(value, list):
+                    return
+                if min_items is not None and len(value) < min_items:
+                    errors.append(f"{_display(path)}: expected at least {min_items} items")
+                if max_items is not None and len(value) > max_items:
+                    errors.append(f"{_display(path)}: expected at most {max_items} items")
+            
+            checks.append(check_item_count)
+        
+        if schema.get("uniqueItems"):
+            def check_unique(value: Any, path: str, errors: List[str]):
+                if isinstance(value, list) and len({_freeze(item) for item in value}) != len(value):
+                    errors.append(f"{_display(path)}: items are not unique")
+            
+            checks.append(check_unique)
+        
+        if "contains" in schema:
+            contains_check = self.compile(schema["contains"])
+            
+            def check_contains(value: Any, path: str, errors: List[str]):
+                if not isinstance(value, list):
+                    return
+                for item in value:
+                    item_errors: List[str] = []
+                    contains_check(item, path, item_errors)
+                    if not item_errors:
+                        return
+                errors.append(f"{_display(path)}: no item matches the 'contains' schema")
+            
+            checks.append(check_contains)
+        
+        return checks
+    
+    def _compile_string(self, schema: Dict[str, Any]) -> List[Check]:
+        checks: List[Check] = []
+        
+        if "pattern" in schema:
+            pattern = re.compile(schema["pattern"])
+            source = schema["pattern"]
+            
+            def check_pattern(value: Any, path: str, errors: List[str]):
+                if isinstance(value, str) and not pattern.search(value):
+                    errors.append(f"{_display(path)}: {json.dumps(value)} does not match pattern '{source}'")
+            
+            checks.append(check_pattern)
+        
+        min_length, max_length = schema.get("minLength"), schema.get("maxLength")
+        if min_length is not None or max_length is not None:
+            def check_length(value: Any, path: str, errors: List[str]):
+                if not isinstance(value, str):
+                    return
+                if min_length is not None and len(value) < min_length:
+                    errors.append(f"{_display(path)}: shorter than {min_length} characters")
+                if max_length is not None and len(value) > max_length:
+                    errors.append(f"{_display(path)}: longer than {max_length} characters")
+            
+            checks.append(check_length)
+        
+        format_check = _FORMAT_CHECKS.get(schema.get("format"))
+        if format_check is not None:
+            format_name = schema["format"]
+            
+            def check_format(value: Any, path: str, errors: List[str]):
+                if isinstance(value, str) and not format_check(value):
+                    errors.append(f"{_display(path)}: {json.dumps(value)} is not a valid {format_name}")
+            
+            checks.append(check_format)
+        
+        return checks
+    
+    def _compile_number(self, schema: Dict[str, Any]) -> List[Check]:
+        bounds = []
+        if "minimum" in schema:
+            bounds.append((lambda v, b: v >= b, schema["minimum"], "less than minimum"))
+        if "maximum" in schema:
+            bounds.append((lambda v, b: v <= b, schema["maximum"], "greater than maximum"))
+        if "exclusiveMinimum" in schema:
+            bounds.append((lambda v, b: v > b, schema["exclusiveMinimum"], "not greater than exclusive minimum"))
+        if "exclusiveMaximum" in schema:
+            bounds.append((lambda v, b: v < b, schema["exclusiveMaximum"], "not less than exclusive maximum"))
+        multiple_of = schema.get("multipleOf")
+        if not bounds and multiple_of is None:
+            return []
+        
+        def check_number(value: Any, path: str, errors: List[str]):
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                return
+            for accept, bound, message in bounds:
+                if not accept(value, bound):
+                    errors.append(f"{_display(path)}: {value} is {message} {bound}")
+            if multiple_of is not None and (value / multiple_of) % 1:
+                errors.append(f"{_display(path)}: {value} is not a multiple of {multiple_of}")
+        
+        return [check_number]
+    
+    def _compile_combinators(self, schema: Dict[str, Any]) -> List[Check]:
+        checks: List[Check] = []
+        
+        if "allOf" in schema:
+            all_checks = tuple(self.compile(sub) for sub in schema["allOf"])
+            
+            def check_all_of(value: Any, path: str, errors: List[str]):
+                for check in all_checks:
+                    check(value, path, errors)
+            
+            checks.append(check_all_of)
+        
+        if "anyOf" in schema:
+            any_checks = tuple(self.compile(sub) for sub in schema["anyOf"])
+            
+            def check_any_of(value: Any, path: str, errors: List[str]):
+                for check in any_checks:
+                    branch_errors: List[str] = []
+                    check(value, path, branch_errors)
+                    if not branch_errors:
+                        return
+                errors.append(f"{_display(path)}: does not match any of the allowed schemas")
+            
+            checks.append(check_any_of)
+        
+        if "oneOf" in schema:
+            one_checks = tuple(self.compile(sub) for sub in schema["oneOf"])
+            
+            def check_one_of(value: Any, path: str, errors: List[str]):
+                matches = 0
+                for check in one_checks:
+                    branch_errors: List[str] = []
+                    check(value, path, branch_errors)
+                    if not branch_errors:
+                        matches += 1
+                if matches != 1:
+                    errors.append(f"{_display(path)}: matches {matches} schemas, expected exactly one")
+            
+            checks.append(check_one_of)
+        
+        if "not" in schema:
+            not_check = self.compile(schema["not"])
+            
+            def check_not(value: Any, path: str, errors: List[str]):
+                branch_errors: List[str] = []
+                not_check(value, path, branch_errors)
+                if not branch_errors:
+                    errors.append(f"{_display(path)}: must not match the 'not' schema")
+            
+            checks.append(check_not)
+        
+        if "if" in schema:
+            if_check = self.compile(schema["if"])
+            then_check = self.compile(schema["then"]) if "then" in schema else _accept
+            else_check = self.compile(schema["else"]) if "else" in schema else _accept
+            
+            def check_conditional(value: Any, path: str, errors: List[str]):
+                condition_errors: List[str] = []
+                if_check(value, path, condition_errors)
+                (else_check if condition_errors else then_check)(value, path, errors)
+            
+            checks.append(check_conditional)
+        
+        return checks
+
+def _accept(value: Any, path: str, errors: List[str]):
+    pass
+
+def _reject(value: Any, path: str, errors: List[str]):
+    errors.append(f"{_display(path)}: no value is allowed here")
@@ -0,0 +1,11 @@
+"""
+The `sdd` command: one entry point for the repository's validation scripts.
+
+    sdd validate templates
+    sdd validate examples --jobs 4
+    sdd run-all --include-optional
+
+Subcommands are the existing scripts in `scripts/`, loaded on dispatch
+only, so `sdd --help` starts without importing any of them. See
+`sdd.cli` for the command table.
+"""
@@ -0,0 +1,12 @@
+"""Run `sdd` as `python3 -m sdd` (with `scripts/` on the path) or `python3 scripts/sdd`."""
+
+import os
+import sys
+
+if __package__ in (None, ""):
+    # Run as a directory: import the package from its parent, `scripts/`
+    sys.path[0] = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+from sdd.cli import main
+
+sys.exit(main())
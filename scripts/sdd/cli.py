@@ -0,0 +1,116 @@
+"""
+Command-line dispatch for `sdd`.
+
+Only `sys` and `os`, which the interpreter has already imported, are
+loaded before a subcommand is chosen: the command table below is plain
+data, and the usage text is formatted by hand instead of with argparse.
+The chosen script is then imported from `scripts/` and its `main()` runs
+with the remaining arguments, so each subcommand keeps its own options
+and `--help`.
+"""
+
+import os
+import sys
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (words, script, summary)
+COMMANDS = (
+    (("validate", "templates"), "validate-templates", "Check template structure, format and completeness"),
+    (("validate", "metadata"), "validate-template-metadata", "Validate template metadata against the schema"),
+    (("validate", "examples"), "validate-examples", "Validate example specifications and workflows"),
+    (("validate", "decision-trees"), "validate-decision-trees", "Validate Mermaid decision-tree flowcharts"),
+    (("validate", "links"), "check-links", "Check intra-repo and external links"),
+    (("validate", "spelling"), "spell-check", "Spell check Markdown prose"),
+    (("validate", "community"), "validate-community-setup", "Validate the community launch setup"),
+    (("journeys",), "test-user-journeys", "Test complete user journeys through the repository"),
+    (("ai-integration",), "test-ai-integration", "Test templates and examples with AI agents"),
+    (("feedback",), "feedback-analysis", "Analyze feedback and content usage"),
+    (("generate",), "generate-template", "Generate new templates"),
+    (("render",), "render-specs", "Fill template placeholders from a variables file"),
+    (("decide",), "evaluate-decision-tree", "Evaluate a decision tree for a set of answers"),
+    (("workspace",), "validate-workspace", "Validate from a resident workspace, or watch and serve"),
+    (("run-all",), "run-all-tests", "Run every test suite and write the comprehensive report"),
+    (("plan-shards",), "plan-shards", "Balance validation work across CI shards from past timings"),
+    (("merge-results",), "merge-results", "Render reports from the result records of all shards"),
+    (("benchmark",), "benchmark-validators", "Benchmark validator throughput and sdd start-up"),
+    (("corpus",), "generate-corpus", "Generate a seeded synthetic corpus"),
+    (("language-server",), "spec-language-server", "Language server for specs, plans, tasks and metadata"),
+)
+
+HELP_FLAGS = ("-h", "--help")
+
+def usage(prefix=()) -> str:
+    """Usage text for every command, or for the commands under ``prefix``."""
+    commands = [(words, summary) for words, _, summary in COMMANDS if words[:len(prefix)] == prefix]
+    name = " ".join(("sdd",) + prefix)
+    width = max(len(" ".join(words)) for words, _ in commands)
+    lines = [f"usage: {name} <command> [options]", "", "commands:"]
+    lines.extend(f"  {' '.join(words):{width}}  {summary}" for words, summary in commands)
+    lines.extend(["", f"Run '{name} <command> --help' for a command's options."])
+    return "\n".join(lines)
+
+def resolve(argv):
+    """The (words, script) of the command ``argv`` starts with, or None."""
+    for words, script, _ in COMMANDS:
+        if tuple(argv[:len(words)]) == words:
+            return words, script
+    return None
+
+def load_script(name: str):
+    """Import a hyphenated script from `scripts/` as a module.
+    
+    Modules are registered under the same names as
+    `validation_workspace.load_script` uses, so a script is loaded once
+    however it is reached.
+    """
+    module_name = name.replace('-', '_')
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    # The scripts import their shared modules (tracing, openmetrics, ...) as top-level modules
+    if SCRIPTS_DIR not in sys.path:
+        sys.path.insert(0, SCRIPTS_DIR)
+    import importlib.util
+    spec = importlib.util.spec_from_file_location(module_name, os.path.join(SCRIPTS_DIR, f"{name}.py"))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+def run(words, script: str, argv) -> int:
+    """Run a script's main() as ``sdd <words>`` with ``argv`` as its arguments."""
+    module = load_script(script)
+    sys.argv = [" ".join(("sdd",) + words)] + list(argv)
+    result = module.main()
+    if hasattr(result, '__await__'):
+        import asyncio
+        result = asyncio.run(result)
+    return result if isinstance(result, int) else 0
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv:
+        print(usage(), file=sys.stderr)
+        return 2
+    if argv[0] in HELP_FLAGS:
+        print(usage())
+        return 0
+    
+    command = resolve(argv)
+    if command is None:
+        # A group name alone (`sdd validate`) or with --help lists its commands
+        group = (argv[0],)
+        if any(words[:1] == group and len(words) > 1 for words, _, _ in COMMANDS):
+            if len(argv) == 1:
+                print(usage(group), file=sys.stderr)
+                return 2
+            if argv[1] in HELP_FLAGS:
+                print(usage(group))
+                return 0
+            print(f"sdd: unknown command '{argv[0]} {argv[1]}'\n\n{usage(group)}", file=sys.stderr)
+            return 2
+        print(f"sdd: unknown command '{argv[0]}'\n\n{usage()}", file=sys.stderr)
+        return 2
+    
+    words, script = command
+    return run(words, script, argv[len(words):])
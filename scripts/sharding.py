@@ -0,0 +1,176 @@
+"""
+Sharding validation work across CI nodes.
+
+A shard plan assigns each known unit of work to one of N shards. A unit
+is a file (a project for example validation, a journey for journey
+testing) of a validation script, or a whole suite of run-all-tests.py
+that cannot be split. `plan-shards.py` builds the plan from the timings
+earlier reports recorded, balancing estimated load with the greedy
+longest-processing-time-first rule: the most expensive remaining unit
+goes to the least-loaded shard. Units the plan has never seen, such as
+a new file, go to a shard chosen by a stable hash of their name, so
+every shard agrees on their owner without coordination.
+
+Scripts take `--shard i/N` (1-based) with `--shard-plan`, process only
+the units they own and run repository-wide checks on shard 1 only, so
+the per-shard result records partition the work. A script's `--merge`
+renders the report an unsharded run writes from the record streams of
+all shards (see result_records.py). Durations and cache statistics in a
+merged report are sums over shards: the work done, not the wall-clock
+time, and the reuse each shard saw.
+"""
+
+import argparse
+import heapq
+import json
+import os
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Hashable, Iterable, List, Mapping, Optional, Tuple, TypeVar
+
+PLAN_VERSION = 1
+DEFAULT_PLAN_PATH = ".sdd-cache/shard-plan.json"
+
+T = TypeVar('T')
+K = TypeVar('K', bound=Hashable)
+
+@dataclass(frozen=True)
+class Shard:
+    """Shard ``index`` of ``count``, numbered from 1."""
+    index: int
+    count: int
+    
+    @classmethod
+    def parse(cls, text: str) -> "Shard":
+        """Parse ``i/N`` as given to --shard."""
+        try:
+            index, count = (int(part) for part in text.split('/'))
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"expected i/N, got '{text}'")
+        if not 1 <= index <= count:
+            raise argparse.ArgumentTypeError(f"shard {index} is not between 1 and {count}")
+        return cls(index, count)
+    
+    def __str__(self) -> str:
+        return f"{self.index}/{self.count}"
+
+def stable_shard(name: str, count: int) -> int:
+    """The shard a unit the plan does not know goes to; the same in every process."""
+    return zlib.crc32(name.encode('utf-8')) % count + 1
+
+def balance(costs: Mapping[K, float], count: int) -> Tuple[Dict[K, int], List[float]]:
+    """Assign each unit to one of ``count`` shards, longest first to the least-loaded shard.
+    
+    Returns the assignment and the estimated load of each shard. Ties are
+    broken by unit and shard order, so the same timings give the same plan.
+    """
+    heap = [(0.0, shard) for shard in range(1, count + 1)]
+    assignment: Dict[K, int] = {}
+    for key, cost in sorted(costs.items(), key=lambda item: (-item[1], str(item[0]))):
+        load, shard = heapq.heappop(heap)
+        assignment[key] = shard
+        heapq.heappush(heap, (load + cost, shard))
+    
+    loads = [0.0] * count
+    for load, shard in heap:
+        loads[shard - 1] = round(load, 6)
+    return assignment, loads
+
+@dataclass
+class ShardPlan:
+    """Owner shard of every unit seen in earlier reports."""
+    shards: int
+    # script -> unit -> shard
+    files: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    # run-all-tests suite name -> shard, for suites that run whole
+    suites: Dict[str, int] = field(default_factory=dict)
+    # estimated seconds of work per shard
+    loads: List[float] = field(default_factory=list)
+    
+    def owner(self, script: str, name: str) -> int:
+        shard = self.files.get(script, {}).get(name)
+        return shard if shard is not None else stable_shard(f"{script}:{name}", self.shards)
+    
+    def suite_owner(self, name: str) -> int:
+        shard = self.suites.get(name)
+        return shard if shard is not None else stable_shard(f"suite:{name}", self.shards)
+    
+    @classmethod
+    def load(cls, path: str) -> "ShardPlan":
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') != PLAN_VERSION:
+            raise ValueError(f"unsupported plan version {data.get('version')}")
+        return cls(data['shards'], data.get('files', {}), data.get('suites', {}), data.get('loads', []))
+    
+    def save(self, path: str):
+        output_file = Path(path)
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = output_file.with_suffix('.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({"version": PLAN_VERSION, "shards": self.shards, "loads": self.loads,
+                       "suites": self.suites, "files": self.files}, f, indent=2, sort_keys=True)
+        os.replace(temp_path, output_file)
+
+class ShardSelector:
+    """The units of one script that the current shard owns (all of them when unsharded)."""
+    
+    def __init__(self, script: str, shard: Optional[Shard] = None, plan: Optional[ShardPlan] = None):
+        self.script = script
+        self.shard = shard
+        self.plan = plan
+    
+    @property
+    def primary(self) -> bool:
+        """True on the shard that runs repository-wide checks: shard 1, or an unsharded run."""
+        return self.shard is None or self.shard.index == 1
+    
+    def owns(self, name: str) -> bool:
+        if self.shard is None:
+            return True
+        if self.plan is not None:
+            return self.plan.owner(self.script, name) == self.shard.index
+        return stable_shard(f"{self.script}:{name}", self.shard.count) == self.shard.index
+    
+    def owns_suite(self, name: str) -> bool:
+        if self.shard is None:
+            return True
+        if self.plan is not None:
+            return self.plan.suite_owner(name) == self.shard.index
+        return stable_shard(f"suite:{name}", self.shard.count) == self.shard.index
+    
+    def select(self, items: Iterable[T], key: Callable[[T], str] = str) -> List[T]:
+        """The items this shard owns, in their original order."""
+        return [item for item in items if self.owns(key(item))]
+
+def add_shard_arguments(parser, merge_metavar: str = 'RECORDS',
+                        merge_help: str = 'Render the output report from the record streams of all shards '
+                                          'instead of validating'):
+    """Add --shard, --shard-plan and --merge to a script's argument parser."""
+    group = parser.add_argument_group('sharding')
+    group.add_argument('--shard', type=Shard.parse, metavar='i/N',
+                       help='Only process the work shard i of N owns (see plan-shards.py)')
+    group.add_argument('--shard-plan', default=DEFAULT_PLAN_PATH, metavar='PATH',
+                       help='Shard plan assigning work to shards (missing: assign by name hash)')
+    group.add_argument('--merge', nargs='+', metavar=merge_metavar, help=merge_help)
+
+def shard_selector(parser, args, script: str) -> ShardSelector:
+    """The selector for a script's parsed arguments; exits through ``parser`` on a bad plan."""
+    if args.shard is None:
+        return ShardSelector(script)
+    if not args.shard_plan or not os.path.exists(args.shard_plan):
+        print(f"⚠️  No shard plan at {args.shard_plan or '(none)'}; assigning work by name hash")
+        return ShardSelector(script, args.shard)
+    
+    try:
+        plan = ShardPlan.load(args.shard_plan)
+    except (OSError, ValueError, KeyError) as e:
+        parser.error(f"invalid shard plan {args.shard_plan}: {e}")
+    if plan.shards != args.shard.count:
+        parser.error(f"shard plan {args.shard_plan} has {plan.shards} shards, not {args.shard.count}")
+    return ShardSelector(script, args.shard, plan)
+
+def path_order(path: str) -> Tuple[str, ...]:
+    """Sort key matching ``sorted()`` over the ``Path`` objects a directory walk yields."""
+    return Path(path).parts
@@ -0,0 +1,483 @@
+#!/usr/bin/env python3
+"""
+Spec Language Server
+
+Speaks the Language Server Protocol over stdio so editors show the
+repository's validation results while spec.md, plan.md, tasks.md and
+*.meta.json files are edited, and complete requirement IDs from the
+resident requirement index.
+
+    python3 scripts/spec-language-server.py [--repo-root .]
+
+Documents are synchronized incrementally: each change is applied to the
+open document's lines and the result is validated as a workspace buffer,
+which rescans only the Markdown sections the change touched. Changes that
+arrive together are applied before a single revalidation.
+"""
+
+import json
+import os
+import queue
+import re
+import sys
+import threading
+import time
+import argparse
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Optional, Set, Tuple
+from urllib.parse import unquote, urlparse
+
+from file_watcher import FileWatcher
+from validation_workspace import PROJECT_FILES, Diagnostic, ValidationWorkspace
+from tracing import add_instrumentation_arguments, start_instrumentation
+
+TRACKED_FILES = ("spec.md", "plan.md", "tasks.md")
+
+# LSP constants
+SYNC_INCREMENTAL = 2
+SEVERITY = {"error": 1, "warning": 2}
+COMPLETION_KIND_REFERENCE = 18
+METHOD_NOT_FOUND = -32601
+INTERNAL_ERROR = -32603
+SERVER_NOT_INITIALIZED = -32002
+
+# The partial requirement ID in front of the cursor, e.g. "FR-1." or "TR"
+PARTIAL_ID_PATTERN = re.compile(r'[A-Z]+(?:-[\d.]*)?$')
+REQUIREMENT_ID_PARTS = re.compile(r'([A-Z]+)-(\d+)\.(\d+)')
+
+def is_tracked(path: str) -> bool:
+    name = path.rpartition('/')[2]
+    return name in TRACKED_FILES or name.endswith('.meta.json')
+
+def uri_to_path(uri: str) -> Optional[Path]:
+    parsed = urlparse(uri)
+    if parsed.scheme != 'file':
+        return None
+    return Path(unquote(parsed.path))
+
+def utf16_length(text: str) -> int:
+    if text.isascii():
+        return len(text)
+    return len(text.encode('utf-16-le')) // 2
+
+def utf16_to_index(text: str, character: int) -> int:
+    """Index into ``text`` of an LSP character offset (UTF-16 code units)."""
+    if text.isascii():
+        return min(character, len(text))
+    units = 0
+    for index, char in enumerate(text):
+        if units >= character:
+            return index
+        units += 2 if ord(char) > 0xFFFF else 1
+    return len(text)
+
+class TextDocument:
+    """An open document, kept as lines so range edits stay local."""
+    
+    def __init__(self, uri: str, path: str, version: int, text: str):
+        self.uri = uri
+        self.path = path
+        self.version = version
+        self.lines = text.split('\n')
+        self._text: Optional[str] = text
+    
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = '\n'.join(self.lines)
+        return self._text
+    
+    def apply_change(self, change: Dict[str, Any]):
+        """Apply one ``TextDocumentContentChangeEvent``."""
+        self._text = None
+        if 'range' not in change:
+            self.lines = change['text'].split('\n')
+            return
+        
+        start, end = change['range']['start'], change['range']['end']
+        start_line = min(start['line'], len(self.lines) - 1)
+        end_line = min(end['line'], len(self.lines) - 1)
+        before = self.lines[start_line][:utf16_to_index(self.lines[start_line], start['character'])]
+        after = self.lines[end_line][utf16_to_index(self.lines[end_line], end['character']):]
+        self.lines[start_line:end_line + 1] = (before + change['text'] + after).split('\n')
+
+class MessageStream:
+    """JSON-RPC messages framed with Content-Length headers."""
+    
+    def __init__(self, reader: BinaryIO, writer: BinaryIO):
+        self.reader = reader
+        self.writer = writer
+        self._write_lock = threading.Lock()
+    
+    def read(self) -> Optional[Dict[str, Any]]:
+        """The next message, or None at end of input."""
+        length = None
+        while True:
+            header = self.reader.readline()
+            if not header:
+                return None
+            header = header.strip()
+            if not header:
+                if length is None:
+                    continue
+                break
+            name, _, value = header.decode('ascii').partition(':')
+            if name.strip().lower() == 'content-length':
+                length = int(value.strip())
+        body = self.reader.read(length)
+        if len(body) < length:
+            return None
+        return json.loads(body)
+    
+    def write(self, message: Dict[str, Any]):
+        self.write_body(json.dumps(dict(message, jsonrpc="2.0"), separators=(',', ':')))
+    
+    def write_body(self, body: str):
+        """Send an already encoded message."""
+        data = body.encode('utf-8')
+        with self._write_lock:
+            self.writer.write(b'Content-Length: %d\r\n\r\n' % len(data) + data)
+            self.writer.flush()
+
+class SpecLanguageServer:
+    """Maps LSP requests and notifications onto a validation workspace."""
+    
+    def __init__(self, stream: MessageStream, repo_root: Optional[str] = None,
+                 watch: bool = True, verbose: bool = False):
+        self.stream = stream
+        self.repo_root = repo_root
+        self.watch = watch
+        self.verbose = verbose
+        self.workspace: Optional[ValidationWorkspace] = None
+        self.watcher: Optional[FileWatcher] = None
+        self.documents: Dict[str, TextDocument] = {}
+        self.published: Dict[str, Tuple[Diagnostic, ...]] = {}
+        # Findings already encoded as LSP diagnostics, by finding
+        self._encoded: Dict[Diagnostic, str] = {}
+        self.events: "queue.Queue[Tuple[str, Any]]" = queue.Queue()
+        self.shutdown_requested = False
+        self._dirty: Set[str] = set()
+        self._handlers = {
+            "initialize": self.initialize,
+            "shutdown": self.shutdown,
+            "textDocument/didOpen": self.did_open,
+            "textDocument/didChange": self.did_change,
+            "textDocument/didClose": self.did_close,
+            "textDocument/completion": self.completion,
+            "workspace/didChangeWatchedFiles": self.did_change_watched_files
+        }
+    
+    def log(self, message: str):
+        if self.verbose:
+            print(message, file=sys.stderr, flush=True)
+    
+    def run(self) -> int:
+        """Serve until ``exit``; returns the process exit code."""
+        threading.Thread(target=self._read_messages, daemon=True).start()
+        try:
+            while True:
+                # Take everything already queued so bursts of edits are validated once
+                events = [self.events.get()]
+                while True:
+                    try:
+                        events.append(self.events.get_nowait())
+                    except queue.Empty:
+                        break
+                
+                for kind, payload in events:
+                    if kind == "message" and isinstance(payload, dict) and payload.get("method") == "exit":
+                        return 0 if self.shutdown_requested else 1
+                    if kind == "eof":
+                        return 1
+                    self._guarded(self._handle_event, kind, payload)
+                self._guarded(self._flush)
+        finally:
+            if self.watcher is not None:
+                self.watcher.close()
+    
+    def _handle_event(self, kind: str, payload: Any):
+        if kind == "changes":
+            self._apply_file_changes(payload.paths, payload.overflow)
+        elif payload.get("method") == "textDocument/didChange":
+            self.did_change(payload["params"])
+        else:
+            self._flush()
+            self._dispatch(payload)
+    
+    def _guarded(self, step, *args):
+        """Run one step of the event loop; a failure is logged and the server keeps serving."""
+        try:
+            step(*args)
+        except Exception as e:
+            self.log(f"{step.__name__} failed: {e!r}")
+    
+    def _read_messages(self):
+        while True:
+            try:
+                message = self.stream.read()
+            except (ValueError, OSError) as e:
+                self.log(f"Unreadable message: {e}")
+                message = None
+            if message is None:
+                self.events.put(("eof", None))
+                return
+            self.events.put(("message", message))
+    
+    def _watch_files(self):
+        for batch in self.watcher.changes():
+            self.events.put(("changes", batch))
+    
+    def _dispatch(self, message: Dict[str, Any]):
+        method = message.get("method")
+        if method is None:
+            # A response to a request we never make
+            return
+        handler = self._handlers.get(method)
+        request_id = message.get("id")
+        
+        if handler is None:
+            if request_id is not None:
+                self._respond_error(request_id, METHOD_NOT_FOUND, f"Unhandled method {method}")
+            return
+        if self.workspace is None and method != "initialize":
+            if request_id is not None:
+                self._respond_error(request_id, SERVER_NOT_INITIALIZED, "Server not initialized")
+            return
+        
+        try:
+            result = handler(message.get("params") or {})
+        except Exception as e:
+            self.log(f"{method} failed: {e!r}")
+            if request_id is not None:
+                self._respond_error(request_id, INTERNAL_ERROR, str(e))
+            return
+        if request_id is not None:
+            self.stream.write({"id": request_id, "result": result})
+    
+    def _respond_error(self, request_id: Any, code: int, message: str):
+        self.stream.write({"id": request_id, "error": {"code": code, "message": message}})
+    
+    # Lifecycle
+    
+    def initialize(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        root = self.repo_root
+        if root is None:
+            folders = params.get("workspaceFolders") or []
+            root_uri = params.get("rootUri") or (folders[0]["uri"] if folders else None)
+            root_path = uri_to_path(root_uri) if root_uri else None
+            root = str(root_path) if root_path else (params.get("rootPath") or os.getcwd())
+        
+        start_time = time.perf_counter()
+        self.workspace = ValidationWorkspace(root).load()
+        summary = self.workspace.summary()
+        self.log(f"Loaded {self.workspace.root}: {summary['units']} units in "
+                 f"{(time.perf_counter() - start_time) * 1000:.0f} ms")
+        if self.watch:
+            self.watcher = FileWatcher(str(self.workspace.root))
+            threading.Thread(target=self._watch_files, daemon=True).start()
+        
+        return {
+            "capabilities": {
+                "textDocumentSync": {"openClose": True, "change": SYNC_INCREMENTAL},
+                "completionProvider": {"triggerCharacters": ["-", "."]}
+            },
+            "serverInfo": {"name": "spec-language-server"}
+        }
+    
+    def shutdown(self, params: Dict[str, Any]) -> None:
+        self.shutdown_requested = True
+        return None
+    
+    # Document synchronization
+    
+    def did_open(self, params: Dict[str, Any]):
+        item = params["textDocument"]
+        path = self._relative_path(item["uri"])
+        if path is None or not is_tracked(path):
+            return
+        self.documents[item["uri"]] = TextDocument(item["uri"], path, item.get("version", 0), item["text"])
+        self._dirty.add(item["uri"])
+    
+    def did_change(self, params: Dict[str, Any]):
+        uri = params["textDocument"]["uri"]
+        document = self.documents.get(uri)
+        if document is None:
+            return
+        for change in params["contentChanges"]:
+            document.apply_change(change)
+        document.version = params["textDocument"].get("version", document.version)
+        self._dirty.add(uri)
+    
+    def did_close(self, params: Dict[str, Any]):
+        uri = params["textDocument"]["uri"]
+        document = self.documents.pop(uri, None)
+        self._dirty.discard(uri)
+        if document is None:
+            return
+        self.workspace.clear_buffer(document.path)
+        self.published.pop(uri, None)
+        self.stream.write({"method": "textDocument/publishDiagnostics",
+                           "params": {"uri": uri, "diagnostics": []}})
+        self._publish()
+    
+    def did_change_watched_files(self, params: Dict[str, Any]):
+        paths = [self._relative_path(change["uri"]) for change in params.get("changes", [])]
+        self._apply_file_changes([path for path in paths if path is not None])
+    
+    def _apply_file_changes(self, paths, overflow: bool = False):
+        if overflow:
+            self.workspace.load()
+        else:
+            self.workspace.apply_changes(paths)
+        self._publish()
+    
+    def _flush(self):
+        """Validate the documents changed since the last flush and publish."""
+        if not self._dirty:
+            return
+        start_time = time.perf_counter()
+        # Taken up front, so a document that fails to validate is not retried on every event
+        dirty, self._dirty = sorted(self._dirty), set()
+        for uri in dirty:
+            document = self.documents[uri]
+            self.workspace.set_buffer(document.path, document.text)
+        changed = ", ".join(self.documents[uri].path for uri in dirty)
+        self._publish()
+        self.log(f"Revalidated {changed} in {(time.perf_counter() - start_time) * 1000:.1f} ms")
+    
+    def _publish(self):
+        """Send diagnostics for every open document whose findings changed."""
+        encoded: Dict[Diagnostic, str] = {}
+        for uri, document in self.documents.items():
+            findings = tuple(self.workspace.diagnostics([document.path]))
+            for finding in findings:
+                if finding not in encoded:
+                    encoded[finding] = self._encoded.get(finding) or json.dumps(
+                        self._lsp_diagnostic(finding), separators=(',', ':'))
+            if self.published.get(uri) == findings:
+                continue
+            self.published[uri] = findings
+            # Large specs can carry thousands of findings; splice in their cached encodings
+            self.stream.write_body(
+                '{"jsonrpc":"2.0","method":"textDocument/publishDiagnostics","params":'
+                f'{{"uri":{json.dumps(uri)},"version":{json.dumps(document.version)},'
+                f'"diagnostics":[{",".join(encoded[finding] for finding in findings)}]}}}}'
+            )
+        # Keep encodings for current findings only
+        self._encoded = encoded
+    
+    @staticmethod
+    def _lsp_diagnostic(diagnostic: Diagnostic) -> Dict[str, Any]:
+        # The range covers the whole line; findings without one (line 0) go on the first line
+        line = max(diagnostic.line - 1, 0)
+        return {
+            "range": {
+                "start": {"line": line, "character": 0},
+                "end": {"line": line + 1, "character": 0}
+            },
+            "severity": SEVERITY.get(diagnostic.severity, 2),
+            "source": "sdd",
+            "code": diagnostic.source,
+            "message": diagnostic.message
+        }
+    
+    # Completion
+    
+    def completion(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Requirement IDs defined in the project's spec.md."""
+        document = self.documents.get(params["textDocument"]["uri"])
+        project = self._project_of(document.path) if document else None
+        if project is None:
+            return {"isIncomplete": False, "items": []}
+        
+        position = params["position"]
+        line = document.lines[min(position["line"], len(document.lines) - 1)]
+        cursor = utf16_to_index(line, position["character"])
+        partial = PARTIAL_ID_PATTERN.search(line[:cursor])
+        start = partial.start() if partial else cursor
+        replace = {
+            "start": {"line": position["line"], "character": utf16_length(line[:start])},
+            "end": {"line": position["line"], "character": position["character"]}
+        }
+        
+        index = self.workspace.requirements
+        project_key = str(self.workspace.root / project)
+        spec_lines = self._spec_lines(project)
+        items = []
+        for key in index.project_keys.get(project_key, ()):
+            sites = index.definitions.get(key)
+            if not sites:
+                continue
+            req_id = key[1]
+            definition_line = sites[0].line
+            detail = spec_lines[definition_line - 1].strip() if 0 < definition_line <= len(spec_lines) else ""
+            id_parts = REQUIREMENT_ID_PARTS.match(req_id)
+            sort_text = (f"{id_parts.group(1)}-{int(id_parts.group(2)):06d}.{int(id_parts.group(3)):06d}"
+                         if id_parts else req_id)
+            items.append({
+                "label": req_id,
+                "kind": COMPLETION_KIND_REFERENCE,
+                "detail": detail,
+                "sortText": sort_text,
+                "filterText": req_id,
+                "textEdit": {"range": replace, "newText": req_id}
+            })
+        return {"isIncomplete": False, "items": items}
+    
+    def _project_of(self, path: str) -> Optional[str]:
+        examples_dir = self.workspace.examples_dir
+        parts = path.split('/')
+        prefix = examples_dir.split('/')
+        if parts[:len(prefix)] != prefix or len(parts) != len(prefix) + 3 or parts[-1] not in PROJECT_FILES:
+            return None
+        return '/'.join(parts[:-1])
+    
+    def _spec_lines(self, project: str) -> List[str]:
+        spec = f"{project}/spec.md"
+        content = self.workspace.buffers.get(spec)
+        if content is None:
+            try:
+                with open(self.workspace.root / spec, 'r', encoding='utf-8') as f:
+                    content = f.read()
+            except (OSError, UnicodeDecodeError):
+                return []
+        return content.split('\n')
+    
+    def _relative_path(self, uri: str) -> Optional[str]:
+        path = uri_to_path(uri)
+        if path is None:
+            return None
+        relative = os.path.relpath(os.path.normpath(path), self.workspace.root)
+        if relative == '..' or relative.startswith('../'):
+            return None
+        return Path(relative).as_posix()
+
+def main():
+    parser = argparse.ArgumentParser(description='Language server for SDD specs, plans, tasks and template metadata')
+    parser.add_argument('--repo-root', default=None,
+                       help='Repository root (default: the root the editor opens)')
+    parser.add_argument('--stdio', action='store_true',
+                       help='Communicate over stdio (the default; accepted for editor compatibility)')
+    parser.add_argument('--no-watch', action='store_true',
+                       help='Do not watch the tree for changes made outside the editor')
+    parser.add_argument('--verbose', action='store_true',
+                       help='Log revalidation timings to stderr')
+    add_instrumentation_arguments(parser)
+    
+    args = parser.parse_args()
+    instrumentation = start_instrumentation(args, "spec-language-server")
+    
+    if args.repo_root is not None and not os.path.isdir(args.repo_root):
+        print(f"❌ Repository root not found: {args.repo_root}", file=sys.stderr)
+        sys.exit(1)
+    
+    stream = MessageStream(sys.stdin.buffer, sys.stdout.buffer)
+    server = SpecLanguageServer(stream, args.repo_root, watch=not args.no_watch, verbose=args.verbose)
+    exit_code = server.run()
+    instrumentation.finish()
+    sys.stdout.flush()
+    # The reader thread may still be blocked on stdin, which would stall a normal interpreter exit
+    os._exit(exit_code)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,611 @@
+#!/usr/bin/env python3
+"""
+Incremental Spell Checker
+
+Checks the prose of every Markdown file against a prebuilt dictionary and
+the custom words in `.cspell.json`. The dictionary is a single binary file
+that is memory-mapped rather than loaded: a Bloom filter rejects most
+unknown words without touching the word list, and known-looking words are
+confirmed by binary search over the sorted word table.
+
+Results are cached per file (by size/mtime, then content hash) and per
+line (by line hash), so unchanged files are not re-read and only edited
+lines of a changed file are re-checked. Code fences, inline code spans,
+link destinations and URLs are skipped by walking the document structure.
+
+The dictionary is built from the system word list (Debian and Ubuntu:
+the `wamerican` package) or from `--wordlist` files. It lacks cspell's
+bundled technical dictionaries, so cspell remains the spelling gate and
+this stage runs alongside it (`npm run check:spelling:fast`) until the
+custom words in `.cspell.json` cover the difference.
+Each file's issues are streamed as a record once it is checked (see
+result_records.py). With `--shard`, only the files a shard owns are
+checked, and cache entries of the other shards' files are kept.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+import time
+import argparse
+from dataclasses import dataclass
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from openmetrics import MetricsRegistry, add_metrics_argument, validator_metrics
+from result_records import RecordWriter, ReportReducer, add_records_argument, merge_streams
+from sharding import ShardSelector, add_shard_arguments, shard_selector
+from tracing import add_instrumentation_arguments, span, start_instrumentation
+
+DICTIONARY_MAGIC = b'SDDDICT1'
+# magic, word count, bloom bits, bloom hashes, bloom offset, offsets offset, words offset, words size
+DICTIONARY_HEADER = struct.Struct('<8sIQIQQQQ')
+BLOOM_BITS_PER_WORD = 10
+BLOOM_HASHES = 7
+CACHE_VERSION = 1
+
+# cspell's default: shorter words are not checked
+MIN_WORD_LENGTH = 4
+WORD_PATTERN = re.compile(r"[A-Za-z]+(?:'[A-Za-z]+)*")
+# Split camelCase and PascalCase the way cspell does ("JavaScript" -> "Java", "Script")
+CAMEL_CASE_PATTERN = re.compile(r'[A-Z]{2,}(?=[A-Z][a-z]|\b|$)|[A-Z]?[a-z]+|[A-Z]+')
+
+DEFAULT_WORDLISTS = ('/usr/share/dict/words', '/usr/share/dict/american-english', '/usr/share/dict/british-english')
+
+def _bloom_positions(word: bytes, bits: int, hashes: int) -> Iterator[int]:
+    digest = hashlib.blake2b(word, digest_size=16).digest()
+    first, second = struct.unpack('<QQ', digest)
+    second |= 1
+    for i in range(hashes):
+        yield (first + i * second) % bits
+
+class SpellingDictionary:
+    """Memory-mapped sorted word table with a Bloom filter prefilter."""
+    
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._file = open(self.path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, self.word_count, self.bloom_bits, self.bloom_hashes, self.bloom_offset,
+         self.offsets_offset, self.words_offset, self.words_size) = DICTIONARY_HEADER.unpack_from(self._map, 0)
+        if magic != DICTIONARY_MAGIC:
+            raise ValueError(f"Not a spelling dictionary: {path}")
+        self.signature = hashlib.sha256(self._map[:DICTIONARY_HEADER.size + 64]).hexdigest()[:16]
+    
+    @staticmethod
+    def build(words: Iterable[str], output_path: str) -> int:
+        """Write a dictionary file from a word iterable; returns the word count."""
+        unique = sorted({word.strip().lower() for word in words if word.strip()})
+        encoded = [word.encode('utf-8') for word in unique]
+        
+        bloom_bits = max(64, len(encoded) * BLOOM_BITS_PER_WORD)
+        bloom = bytearray((bloom_bits + 7) // 8)
+        for word in encoded:
+            for position in _bloom_positions(word, bloom_bits, BLOOM_HASHES):
+                bloom[position >> 3] |= 1 << (position & 7)
+        
+        offsets, position = [], 0
+        for word in encoded:
+            offsets.append(position)
+            position += len(word)
+        offsets.append(position)
+        
+        bloom_offset = DICTIONARY_HEADER.size
+        offsets_offset = bloom_offset + len(bloom)
+        words_offset = offsets_offset + 4 * len(offsets)
+        header = DICTIONARY_HEADER.pack(DICTIONARY_MAGIC, len(encoded), bloom_bits, BLOOM_HASHES,
+                                        bloom_offset, offsets_offset, words_offset, position)
+        
+        output = Path(output_path)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = output.with_suffix('.tmp')
+        with open(temp_path, 'wb') as f:
+            f.write(header)
+            f.write(bloom)
+            f.write(struct.pack(f'<{len(offsets)}I', *offsets))
+            f.write(b''.join(encoded))
+        os.replace(temp_path, output)
+        return len(encoded)
+    
+    def __contains__(self, word: str) -> bool:
+        encoded = word.lower().encode('utf-8')
+        for position in _bloom_positions(encoded, self.bloom_bits, self.bloom_hashes):
+            if not self._map[self.bloom_offset + (position >> 3)] & (1 << (position & 7)):
+                return False
+        
+        low, high = 0, self.word_count
+        while low < high:
+            middle = (low + high) // 2
+            candidate = self._word_at(middle)
+            if candidate < encoded:
+                low = middle + 1
+            elif candidate > encoded:
+                high = middle
+            else:
+                return True
+        return False
+    
+    def _word_at(self, index: int) -> bytes:
+        start, end = struct.unpack_from('<II', self._map, self.offsets_offset + 4 * index)
+        return self._map[self.words_offset + start:self.words_offset + end]
+    
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+def load_jsonc(path: Path) -> Dict[str, Any]:
+    """Load JSON that may contain // and /* */ comments (as .cspell.json does)."""
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    output, index, in_string = [], 0, False
+    while index < len(text):
+        char = text[index]
+        if in_string:
+            output.append(char)
+            if char == '\\' and index + 1 < len(text):
+                output.append(text[index + 1])
+                index += 1
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+            output.append(char)
+        elif text.startswith('//', index):
+            index = text.find('\n', index)
+            if index < 0:
+                break
+            continue
+        elif text.startswith('/*', index):
+            end = text.find('*/', index + 2)
+            if end < 0:
+                raise ValueError("unterminated /* comment")
+            index = end + 2
+            continue
+        else:
+            output.append(char)
+        index += 1
+    return json.loads(''.join(output))
+
+def prose_lines(content: str) -> Iterator[Tuple[int, str]]:
+    """Yield (line number, prose text) for lines outside code blocks and front matter.
+    
+    Inline code spans, link destinations and URL-like tokens are blanked
+    out (with spaces, so columns are preserved).
+    """
+    lines = content.split('\n')
+    fence: Optional[str] = None
+    start = 0
+    if lines and lines[0].strip() == '---':
+        for index in range(1, len(lines)):
+            if lines[index].strip() in ('---', '...'):
+                start = index + 1
+                break
+    
+    for index in range(start, len(lines)):
+        line = lines[index]
+        stripped = line.lstrip(' ')
+        indent = len(line) - len(stripped)
+        marker = stripped[:1]
+        if indent < 4 and marker in ('`', '~'):
+            run = len(stripped) - len(stripped.lstrip(marker))
+            if fence is None and run >= 3:
+                fence = marker * run
+                continue
+            if fence is not None and marker == fence[0] and run >= len(fence) and not stripped[run:].strip():
+                fence = None
+                continue
+        if fence is not None:
+            continue
+        yield index + 1, _blank_code_and_links(line)
+
+def _blank_code_and_links(line: str) -> str:
+    """Replace inline code spans, link destinations and URLs with spaces."""
+    chars = list(line)
+    index = 0
+    while index < len(line):
+        char = line[index]
+        if char == '`':
+            run = len(line) - index - len(line[index:].lstrip('`'))
+            closing = _find_backtick_run(line, index + run, run)
+            if closing < 0:
+                index += run
+                continue
+            for position in range(index, closing + run):
+                chars[position] = ' '
+            index = closing + run
+        elif char == ']' and line.startswith('](', index):
+            depth, position = 0, index + 2
+            while position < len(line):
+                if line[position] == '(':
+                    depth += 1
+                elif line[position] == ')':
+                    if depth == 0:
+                        break
+                    depth -= 1
+                position += 1
+            for blank in range(index + 1, min(position + 1, len(line))):
+                chars[blank] = ' '
+            index = position + 1
+        elif char == '<' and (line.startswith('<http', index) or line.startswith('</', index)
+                              or line[index + 1:index + 2].isalpha()):
+            end = line.find('>', index)
+            if end < 0:
+                index += 1
+                continue
+            for position in range(index, end + 1):
+                chars[position] = ' '
+            index = end + 1
+        else:
+            index += 1
+    
+    # URL-, email- and file-path-like tokens are never prose
+    text = ''.join(chars)
+    for match in re.finditer(r'\S+', text):
+        token = match.group(0)
+        if '://' in token or token.startswith('www.') or ('@' in token and '.' in token) or \
+                ('/' in token and '.' in token.rstrip('.,;:')):
+            text = text[:match.start()] + ' ' * len(token) + text[match.end():]
+    return text
+
+def _find_backtick_run(line: str, start: int, length: int) -> int:
+    """Index of the next run of exactly ``length`` backticks, or -1."""
+    index = start
+    while index < len(line):
+        if line[index] == '`':
+            run = len(line) - index - len(line[index:].lstrip('`'))
+            if run == length:
+                return index
+            index += run
+        else:
+            index += 1
+    return -1
+
+def words_in(text: str) -> Iterator[Tuple[int, str]]:
+    """Yield (column, word) for each checkable word, splitting camelCase."""
+    for match in WORD_PATTERN.finditer(text):
+        token = match.group(0)
+        if token.endswith("'s") or token.endswith("'S"):
+            token = token[:-2]
+        parts = [token] if "'" in token else CAMEL_CASE_PATTERN.findall(token) or [token]
+        offset = 0
+        for part in parts:
+            column = match.start() + token.find(part, offset)
+            offset = column - match.start() + len(part)
+            if len(part) >= MIN_WORD_LENGTH:
+                yield column + 1, part
+
+@dataclass(frozen=True)
+class SpellingIssue:
+    path: str
+    line: int
+    column: int
+    word: str
+    flagged: bool = False
+
+class SpellChecker:
+    """Checks Markdown prose incrementally against a dictionary and custom words."""
+    
+    def __init__(self, dictionary_path: str, config_path: str = ".cspell.json",
+                 cache_path: str = ".sdd-cache/spell-check.json", repo_root: str = "."):
+        self.repo_root = Path(repo_root)
+        self.dictionary = SpellingDictionary(dictionary_path)
+        config = load_jsonc(Path(config_path)) if Path(config_path).exists() else {}
+        self.custom_words: Set[str] = {word.lower() for word in config.get('words', [])}
+        self.flag_words: Set[str] = {word.lower() for word in config.get('flagWords', [])}
+        self.ignore_paths: List[str] = config.get('ignorePaths', [])
+        self.cache_path = Path(cache_path)
+        self.cache_key = hashlib.sha256(json.dumps(
+            [self.dictionary.signature, sorted(self.custom_words), sorted(self.flag_words), MIN_WORD_LENGTH]
+        ).encode('utf-8')).hexdigest()[:16]
+        self.cache = self._load_cache()
+        self.issues: List[SpellingIssue] = []
+        self.stats = {"files": 0, "files_rechecked": 0, "lines_rechecked": 0, "lines_reused": 0}
+        self._word_verdicts: Dict[str, Optional[bool]] = {}
+        self.bytes_read = 0
+        # file -> seconds spent checking it
+        self.timings: Dict[str, float] = {}
+    
+    def _load_cache(self) -> Dict[str, Any]:
+        empty = {"files": {}, "lines": {}}
+        if not self.cache_path.exists():
+            return empty
+        try:
+            with open(self.cache_path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return empty
+        if data.get('version') != CACHE_VERSION or data.get('key') != self.cache_key:
+            return empty
+        return {"files": data.get('files', {}), "lines": data.get('lines', {})}
+    
+    def save_cache(self):
+        """Persist file and line results, keeping only lines still in use."""
+        live_lines = {line_hash for entry in self.cache['files'].values() for line_hash in entry['lines']}
+        lines = {line_hash: issues for line_hash, issues in self.cache['lines'].items() if line_hash in live_lines}
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.cache_path.with_suffix('.tmp')
+        with open(temp_path, 'w') as f:
+            json.dump({"version": CACHE_VERSION, "key": self.cache_key,
+                       "files": self.cache['files'], "lines": lines}, f)
+        os.replace(temp_path, self.cache_path)
+    
+    def markdown_files(self) -> List[Path]:
+        files = []
+        for directory, subdirs, names in os.walk(self.repo_root):
+            subdirs[:] = sorted(d for d in subdirs if d not in ('.git', 'node_modules', '.sdd-cache'))
+            for name in sorted(names):
+                if name.lower().endswith('.md'):
+                    path = Path(directory) / name
+                    relative = path.relative_to(self.repo_root).as_posix()
+                    if not any(fnmatch(relative, pattern) for pattern in self.ignore_paths):
+                        files.append(path)
+        return files
+    
+    def check_all(self, paths: Optional[List[Path]] = None, shard: Optional[ShardSelector] = None,
+                  records: Optional[RecordWriter] = None) -> List[SpellingIssue]:
+        """Check the given files (default: every Markdown file) and drop cache entries for the rest.
+        
+        ``shard`` limits checking to the files it owns; cache entries are
+        then only dropped for files that no longer exist. Each file's issues
+        are emitted to ``records`` once it is checked.
+        """
+        if records is not None:
+            records.emit("dictionary", words=self.dictionary.word_count)
+        check_everything = paths is None
+        seen = set()
+        if check_everything:
+            with span("walk", self.repo_root):
+                paths = self.markdown_files()
+        relatives = [(path, Path(os.path.relpath(path, self.repo_root)).as_posix()) for path in paths]
+        if shard is not None:
+            seen.update(relative for _, relative in relatives)
+            relatives = shard.select(relatives, key=lambda item: item[1])
+        for path, relative in relatives:
+            seen.add(relative)
+            stats = dict(self.stats)
+            start_time = time.perf_counter()
+            with span("validate", relative):
+                issues = self.check_file(path, relative)
+            self.timings[relative] = time.perf_counter() - start_time
+            self.issues.extend(issues)
+            if records is not None:
+                records.emit("file", path=relative, duration=self.timings[relative],
+                             stats={key: self.stats[key] - stats[key] for key in stats},
+                             issues=[{"line": issue.line, "column": issue.column, "word": issue.word,
+                                      "flagged": issue.flagged} for issue in issues])
+        if check_everything:
+            for stale in set(self.cache['files']) - seen:
+                del self.cache['files'][stale]
+        self.issues.sort(key=lambda issue: (issue.path, issue.line, issue.column))
+        return self.issues
+    
+    def check_file(self, path: Path, relative: str) -> List[SpellingIssue]:
+        """Check one file, reusing cached results for unchanged files and lines."""
+        self.stats["files"] += 1
+        stat = path.stat()
+        entry = self.cache['files'].get(relative)
+        if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+            return self._issues_from_entry(relative, entry)
+        
+        with span("read", relative), open(path, 'rb') as f:
+            raw = f.read()
+        self.bytes_read += len(raw)
+        digest = hashlib.sha256(raw).hexdigest()
+        if entry and entry['sha256'] == digest:
+            entry.update(size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+            return self._issues_from_entry(relative, entry)
+        
+        self.stats["files_rechecked"] += 1
+        line_hashes: Dict[str, List[int]] = {}
+        for number, text in prose_lines(raw.decode('utf-8', errors='replace')):
+            line_hash = hashlib.blake2b(text.encode('utf-8'), digest_size=8).hexdigest()
+            if line_hash not in self.cache['lines']:
+                self.cache['lines'][line_hash] = self._check_text(text)
+                self.stats["lines_rechecked"] += 1
+            else:
+                self.stats["lines_reused"] += 1
+            if self.cache['lines'][line_hash]:
+                line_hashes.setdefault(line_hash, []).append(number)
+            else:
+                line_hashes.setdefault(line_hash, [])
+        
+        entry = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest, "lines": line_hashes}
+        self.cache['files'][relative] = entry
+        return self._issues_from_entry(relative, entry)
+    
+    def _issues_from_entry(self, relative: str, entry: Dict[str, Any]) -> List[SpellingIssue]:
+        issues = []
+        for line_hash, numbers in entry['lines'].items():
+            for column, word, flagged in self.cache['lines'].get(line_hash, ()):
+                issues.extend(SpellingIssue(relative, number, column, word, flagged) for number in numbers)
+        return issues
+    
+    def _check_text(self, text: str) -> List[Tuple[int, str, bool]]:
+        """Return (column, word, flagged) for each unknown or flagged word in a line."""
+        found = []
+        for column, word in words_in(text):
+            verdict = self._word_verdicts.get(word)
+            if verdict is None and word not in self._word_verdicts:
+                verdict = self._verdict(word)
+                self._word_verdicts[word] = verdict
+            if verdict is not None:
+                found.append((column, word, verdict))
+        return found
+    
+    def _verdict(self, word: str) -> Optional[bool]:
+        """None if the word is fine, True if flagged, False if unknown."""
+        lower = word.lower()
+        if lower in self.flag_words:
+            return True
+        if lower in self.custom_words or lower in self.dictionary:
+            return None
+        # Accept simple inflections of known words
+        for suffix in ("s", "es", "ed", "d", "ing", "ly"):
+            if lower.endswith(suffix) and len(lower) - len(suffix) >= 3:
+                stem = lower[:-len(suffix)]
+                if stem in self.custom_words or stem in self.dictionary:
+                    return None
+        return False
+    
+    def metrics(self, duration: float) -> MetricsRegistry:
+        """OpenMetrics for the last check_all() run; each re-checked line is one evaluation."""
+        stats = self.stats
+        return validator_metrics(
+            "spelling",
+            duration=duration,
+            files=stats["files"],
+            bytes_read=self.bytes_read,
+            errors=sum(1 for issue in self.issues if issue.flagged),
+            warnings=sum(1 for issue in self.issues if not issue.flagged),
+            rule_evaluations=stats["lines_rechecked"],
+            caches={
+                "files": (stats["files"] - stats["files_rechecked"], stats["files_rechecked"]),
+                "lines": (stats["lines_reused"], stats["lines_rechecked"])
+            }
+        )
+    
+    @staticmethod
+    def save_report(report: Dict[str, Any], output_path: str):
+        """Save the spell check report to file."""
+        output_file = Path(output_path)
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        
+        with open(output_file, 'w') as f:
+            json.dump(report, f, indent=2)
+        
+        print(f"\n📊 Spell check report saved to: {output_file}")
+
+class SpellingReportReducer(ReportReducer):
+    """Renders the unknown and flagged words report from `dictionary` and `file` records."""
+    
+    def __init__(self):
+        super().__init__()
+        self.stats = {"files": 0, "files_rechecked": 0, "lines_rechecked": 0, "lines_reused": 0}
+        self.dictionary_words: Optional[int] = None
+        self.issues: List[Dict[str, Any]] = []
+        self.unknown: Dict[str, int] = {}
+        self.timings: Dict[str, float] = {}
+    
+    def reduce_dictionary(self, record: Dict[str, Any]):
+        if self.dictionary_words is None:
+            self.dictionary_words = record["words"]
+    
+    def reduce_file(self, record: Dict[str, Any]):
+        for key, count in record["stats"].items():
+            self.stats[key] += count
+        for issue in record["issues"]:
+            self.issues.append({"file": record["path"], **issue})
+            word = issue["word"].lower()
+            self.unknown[word] = self.unknown.get(word, 0) + 1
+        self.timings[record["path"]] = round(record["duration"], 6)
+    
+    def report(self) -> Dict[str, Any]:
+        return {
+            "summary": dict(self.stats, issues=len(self.issues), unique_words=len(self.unknown),
+                            dictionary_words=self.dictionary_words or 0),
+            "issues": sorted(self.issues, key=lambda issue: (issue["file"], issue["line"], issue["column"])),
+            "unknown_words": dict(sorted(self.unknown.items(), key=lambda item: (-item[1], item[0]))),
+            "timings": dict(sorted(self.timings.items()))
+        }
+    
+    def failure(self, report: Dict[str, Any]) -> Optional[str]:
+        issues = len(report['issues'])
+        return f"{issues} spelling issues" if issues else None
+
+REPORT_REDUCER = SpellingReportReducer
+
+def read_wordlists(paths: List[str]) -> Iterator[str]:
+    for path in paths:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                # Hunspell .dic files carry "/FLAGS" suffixes and a count on the first line
+                word = line.split('/', 1)[0].strip()
+                if word and not word.isdigit():
+                    yield word
+
+def main():
+    parser = argparse.ArgumentParser(description='Incrementally spell check Markdown prose')
+    parser.add_argument('--dictionary', default='.sdd-cache/spelling.dict',
+                       help='Prebuilt dictionary file')
+    parser.add_argument('--build-dictionary', action='store_true',
+                       help='(Re)build the dictionary from word lists before checking')
+    parser.add_argument('--wordlist', action='append', default=[],
+                       help='Word list used to build the dictionary (repeatable; default: system word lists)')
+    parser.add_argument('--config', default='.cspell.json',
+                       help='cspell configuration with custom words, flagWords and ignorePaths')
+    parser.add_argument('--cache', default='.sdd-cache/spell-check.json',
+                       help='Per-file and per-line result cache')
+    parser.add_argument('--output', default='test-results/spell-check-report.json',
+                       help='Where to write the JSON report')
+    parser.add_argument('files', nargs='*',
+                       help='Markdown files to check (default: all)')
+    add_metrics_argument(parser, "spell-check")
+    add_records_argument(parser, "spell-check")
+    add_shard_arguments(parser)
+    add_instrumentation_arguments(parser)
+    
+    args = parser.parse_args()
+    start_instrumentation(args, "spell-check")
+    
+    if args.merge:
+        report = merge_streams(parser, args.merge, SpellingReportReducer(), "spell-check")
+        SpellChecker.save_report(report, args.output)
+        summary = report['summary']
+        print(f"🧩 Merged {len(args.merge)} shard record streams: {summary['files']} files, "
+              f"{summary['issues']} spelling issues")
+        sys.exit(1 if summary['issues'] else 0)
+    
+    if args.build_dictionary or not os.path.exists(args.dictionary):
+        wordlists = args.wordlist or [path for path in DEFAULT_WORDLISTS if os.path.exists(path)]
+        if not wordlists:
+            print("❌ No word list found in /usr/share/dict (install wamerican) or pass --wordlist to build the dictionary")
+            sys.exit(1)
+        start_time = time.time()
+        count = SpellingDictionary.build(read_wordlists(wordlists), args.dictionary)
+        print(f"📚 Built dictionary with {count} words in {time.time() - start_time:.2f}s: {args.dictionary}")
+    
+    missing = [path for path in args.files if not os.path.isfile(path)]
+    if missing:
+        for path in missing:
+            print(f"❌ File not found: {path}")
+        sys.exit(1)
+    
+    try:
+        checker = SpellChecker(args.dictionary, args.config, args.cache)
+    except ValueError as e:
+        print(f"❌ Invalid configuration in {args.config}: {e}")
+        sys.exit(1)
+    shard = shard_selector(parser, args, "spell-check")
+    records = RecordWriter(args.records, "spell-check", SpellingReportReducer(), shard.shard)
+    start_time = time.time()
+    paths = [Path(path) for path in args.files] if args.files else None
+    checker.check_all(paths, shard=shard, records=records)
+    checker.save_cache()
+    duration = time.time() - start_time
+    
+    report = records.close(duration)
+    summary = report['summary']
+    print(f"📝 Checked {summary['files']} files in {duration:.2f}s "
+          f"({summary['files_rechecked']} re-read, {summary['lines_rechecked']} lines re-checked, "
+          f"{summary['lines_reused']} reused)")
+    
+    for issue in checker.issues:
+        kind = "Forbidden word" if issue.flagged else "Unknown word"
+        print(f"{issue.path}:{issue.line}:{issue.column} - {kind} ({issue.word})")
+    
+    checker.save_report(report, args.output)
+    if args.metrics:
+        checker.metrics(duration).write(args.metrics)
+    
+    if checker.issues:
+        print(f"\n❌ {len(checker.issues)} spelling issues ({summary['unique_words']} unique words)")
+        sys.exit(1)
+    print("\n✅ No spelling issues found")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,269 @@
+"""
+Template Metadata Inheritance Resolver
+
+Builds the `extends` graph across all template metadata files, detects
+cycles, and memoizes the fully merged metadata for each template so that
+generators and validators share resolved metadata instead of re-reading
+parent chains.
+"""
+
+import copy
+import json
+import os
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+class InheritanceError(ValueError):
+    """Raised when a metadata file cannot be resolved (cycle or missing parent)."""
+
+def merge_metadata(parent: Dict[str, Any], child: Dict[str, Any]) -> Dict[str, Any]:
+    """Deep-merge child metadata over its parent; lists and scalars are replaced."""
+    merged = copy.deepcopy(parent)
+    for key, value in child.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = merge_metadata(merged[key], value)
+        else:
+            merged[key] = copy.deepcopy(value)
+    return merged
+
+def display_path(path: Path) -> str:
+    """Render a resolved node path relative to the working directory."""
+    return os.path.relpath(path)
+
+class MetadataResolver:
+    """Resolves `extends` chains across `.meta.json` files with memoization.
+
+    Each node is a metadata file. Its parent is the file named by
+    ``template.extends``, resolved relative to the templates root, the
+    file's own directory, or the working directory. Raw files are cached by
+    size and mtime; merged metadata and validation results are memoized
+    per node and invalidated only for a changed file and its descendants.
+    """
+
+    def __init__(self, templates_root: str = "resources/templates"):
+        self.templates_root = Path(templates_root)
+        self._raw: Dict[Path, Dict[str, Any]] = {}
+        self._stat: Dict[Path, Tuple[int, int]] = {}
+        self._load_errors: Dict[Path, str] = {}
+        self.parents: Dict[Path, Optional[Path]] = {}
+        self.children: Dict[Path, Set[Path]] = {}
+        self._resolved: Dict[Path, Dict[str, Any]] = {}
+        self._validation: Dict[Tuple[Path, str], Any] = {}
+        # Running totals for metrics
+        self.files_loaded = 0
+        self.bytes_loaded = 0
+        self.validation_hits = 0
+        self.validation_misses = 0
+
+    def scan(self) -> Set[Path]:
+        """Index every metadata file under the templates root.
+
+        Returns the nodes whose memoized results were invalidated because
+        the file (or one of its ancestors) changed or disappeared.
+        """
+        seen = set()
+        invalidated: Set[Path] = set()
+        for metadata_file in sorted(self.templates_root.rglob("*.meta.json")):
+            node = self._key(metadata_file)
+            seen.add(node)
+            if self._load(node):
+                invalidated |= self.invalidate(node)
+
+        for node in set(self._raw) | set(self._load_errors):
+            if node not in seen and not node.exists():
+                invalidated |= self.invalidate(node)
+                self._forget(node)
+
+        return invalidated
+
+    def _key(self, path: Path) -> Path:
+        return Path(path).resolve()
+
+    def _load(self, node: Path) -> bool:
+        """(Re)load a metadata file if it changed on disk; returns True if it did."""
+        try:
+            stat = node.stat()
+        except OSError:
+            return False
+
+        signature = (stat.st_size, stat.st_mtime_ns)
+        if self._stat.get(node) == signature:
+            return False
+
+        self._stat[node] = signature
+        self._load_errors.pop(node, None)
+        self.files_loaded += 1
+        self.bytes_loaded += stat.st_size
+        try:
+            with open(node, 'r') as f:
+                self._raw[node] = json.load(f)
+        except (OSError, ValueError) as e:
+            self._raw.pop(node, None)
+            self._load_errors[node] = str(e)
+
+        self._link(node)
+        return True
+
+    def _link(self, node: Path):
+        """Update the graph edge from a node to its parent."""
+        old_parent = self.parents.get(node)
+        if old_parent is not None:
+            self.children.get(old_parent, set()).discard(node)
+
+        parent = None
+        extends = self._raw.get(node, {}).get('template', {}).get('extends')
+        if extends:
+            parent = self.locate(extends, node.parent)
+        self.parents[node] = parent
+        if parent is not None:
+            self.children.setdefault(parent, set()).add(node)
+            if parent not in self._stat:
+                self._load(parent)
+
+    def _forget(self, node: Path):
+        for table in (self._raw, self._stat, self._load_errors, self._resolved):
+            table.pop(node, None)
+        parent = self.parents.pop(node, None)
+        if parent is not None:
+            self.children.get(parent, set()).discard(node)
+
+    def locate(self, extends: str, relative_to: Optional[Path] = None) -> Path:
+        """Map an `extends` value (template or metadata path) to a metadata file."""
+        target = Path(extends)
+        if not extends.endswith('.meta.json'):
+            target = target.with_suffix('.meta.json')
+
+        candidates = [self.templates_root / target]
+        if relative_to is not None:
+            candidates.append(relative_to / target)
+        candidates.append(target)
+
+        for candidate in candidates:
+            if candidate.exists():
+                return self._key(candidate)
+        # Keep a stable key for missing parents so the error can be reported
+        return self._key(candidates[0])
+
+    def invalidate(self, node: Path) -> Set[Path]:
+        """Drop memoized results for a node and all of its descendants."""
+        node = self._key(node)
+        invalidated = set()
+        queue = deque([node])
+        while queue:
+            current = queue.popleft()
+            if current in invalidated:
+                continue
+            invalidated.add(current)
+            self._resolved.pop(current, None)
+            queue.extend(self.children.get(current, ()))
+
+        if invalidated:
+            self._validation = {
+                key: value for key, value in self._validation.items() if key[0] not in invalidated
+            }
+        return invalidated
+
+    def refresh(self, path: Path) -> Set[Path]:
+        """Reload a single changed metadata file and invalidate its descendants."""
+        node = self._key(path)
+        if not node.exists():
+            invalidated = self.invalidate(node)
+            self._forget(node)
+            return invalidated
+        if self._load(node):
+            return self.invalidate(node)
+        return set()
+
+    def chain(self, path: Path) -> List[Path]:
+        """Return the inheritance chain from the node up to its root ancestor."""
+        node = self._key(path)
+        if node not in self._stat:
+            self._load(node)
+
+        chain = []
+        visited = set()
+        current: Optional[Path] = node
+        while current is not None:
+            if current in visited:
+                cycle = chain[chain.index(current):] + [current]
+                raise InheritanceError(
+                    "Inheritance cycle: " + " -> ".join(display_path(p) for p in cycle)
+                )
+            visited.add(current)
+            chain.append(current)
+            if current not in self._stat:
+                self._load(current)
+            current = self.parents.get(current)
+        return chain
+
+    def cycles(self) -> List[List[Path]]:
+        """Find every distinct inheritance cycle in the graph."""
+        found = []
+        reported: Set[Path] = set()
+        for node in self.parents:
+            try:
+                self.chain(node)
+            except InheritanceError:
+                # Walk again to extract the cycle members
+                path, current = [], node
+                while current not in path:
+                    path.append(current)
+                    current = self.parents[current]
+                cycle = path[path.index(current):]
+                if not reported.intersection(cycle):
+                    reported.update(cycle)
+                    found.append(cycle)
+        return found
+
+    def resolve(self, path: Path) -> Dict[str, Any]:
+        """Return the fully merged metadata for a file (memoized)."""
+        node = self._key(path)
+        if node in self._resolved:
+            return self._resolved[node]
+
+        chain = self.chain(node)
+        for ancestor in reversed(chain):
+            if ancestor in self._resolved:
+                continue
+            if ancestor in self._load_errors:
+                raise InheritanceError(f"Invalid metadata in {ancestor}: {self._load_errors[ancestor]}")
+            if ancestor not in self._raw:
+                raise InheritanceError(f"Extended metadata not found: {ancestor}")
+
+            parent = self.parents.get(ancestor)
+            raw = self._raw[ancestor]
+            self._resolved[ancestor] = merge_metadata(self._resolved[parent], raw) if parent else raw
+
+        return self._resolved[node]
+
+    def resolve_content(self, path: Path, raw: Dict[str, Any]) -> Dict[str, Any]:
+        """Merge unsaved metadata for a file over its parent chain, without memoizing it."""
+        extends = raw.get('template', {}).get('extends') if isinstance(raw.get('template'), dict) else None
+        if not extends:
+            return raw
+        parent = self.locate(extends, self._key(path).parent)
+        if parent == self._key(path):
+            raise InheritanceError(f"Inheritance cycle: {display_path(parent)} extends itself")
+        return merge_metadata(self.resolve(parent), raw)
+    
+    def raw(self, path: Path) -> Dict[str, Any]:
+        """Return the unmerged metadata for a file."""
+        node = self._key(path)
+        if node not in self._stat:
+            self._load(node)
+        if node in self._load_errors:
+            raise InheritanceError(f"Invalid metadata in {node}: {self._load_errors[node]}")
+        if node not in self._raw:
+            raise InheritanceError(f"Metadata file not found: {node}")
+        return self._raw[node]
+
+    def validated(self, path: Path, name: str, validate: Callable[[Dict[str, Any]], Any]) -> Any:
+        """Memoize ``validate(resolved_metadata)`` per node under a validator name."""
+        key = (self._key(path), name)
+        if key in self._validation:
+            self.validation_hits += 1
+        else:
+            self.validation_misses += 1
+            self._validation[key] = validate(self.resolve(path))
+        return self._validation[key]
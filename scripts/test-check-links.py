@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Link Checker Self-Test
+
+Runs check-links.py against a local HTTP server instead of the internet, so
+its external-link handling can be tested offline: status codes, HEAD to
+GET fallback, redirects, 429 retries, the on-disk cache and the baseline of
+known broken links. The pages under test live in a scratch repository, and
+the checker runs from a separate scratch directory with a relative cache
+path to make sure the cache lands in the repository rather than in the
+working directory.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from validation_workspace import load_script
+
+CACHE_PATH = ".sdd-cache/link-check.json"
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answers each path with a fixed behaviour and counts the requests."""
+    
+    hits: Dict[str, int] = {}
+    lock = threading.Lock()
+    
+    def do_HEAD(self):
+        self._respond(send_body=False)
+    
+    def do_GET(self):
+        self._respond(send_body=True)
+    
+    def _respond(self, send_body: bool):
+        with self.lock:
+            self.hits[self.path] = self.hits.get(self.path, 0) + 1
+            count = self.hits[self.path]
+        
+        headers = {}
+        if self.path == '/ok':
+            status = 200
+        elif self.path == '/moved':
+            status, headers = 301, {'Location': '/ok'}
+        elif self.path == '/get-only':
+            status = 405 if self.command == 'HEAD' else 200
+        elif self.path == '/busy':
+            # The first request is rate limited, the retry succeeds
+            status, headers = (429, {'Retry-After': '0'}) if count == 1 else (200, {})
+        else:
+            status = 404
+        
+        body = f"{status}\n".encode('utf-8')
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        pass
+
+def write_repository(root: Path, base_url: str):
+    """Create a scratch repository whose README links to every stub path."""
+    (root / '.markdown-link-check.json').write_text(json.dumps({
+        'timeout': '5s',
+        'retryOn429': True,
+        'retryCount': 2,
+        'fallbackRetryDelay': '0s',
+    }), encoding='utf-8')
+    (root / 'README.md').write_text("\n".join([
+        "# Stub Links",
+        "",
+        f"- [OK]({base_url}/ok)",
+        f"- [Moved]({base_url}/moved)",
+        f"- [GET only]({base_url}/get-only)",
+        f"- [Busy]({base_url}/busy)",
+        f"- [Missing]({base_url}/missing)",
+        "",
+    ]), encoding='utf-8')
+
+def run_checker(check_links, root: Path, workdir: Path,
+                baseline_path: Optional[str] = None) -> Tuple[Dict[str, Tuple[str, str]], object]:
+    """Check the scratch repository from ``workdir``; returns stub path -> (status, message) and the checker."""
+    previous = os.getcwd()
+    os.chdir(workdir)
+    try:
+        checker = check_links.LinkChecker(str(root), cache_path=CACHE_PATH, concurrency=4, per_host=2,
+                                          baseline_path=baseline_path)
+        results = checker.check_all()
+    finally:
+        os.chdir(previous)
+    outcomes = {}
+    for result in results:
+        if result.target.startswith('http'):
+            outcomes['/' + result.target.rsplit('/', 1)[1]] = (result.status, result.message)
+    return outcomes, checker
+
+def main():
+    parser = argparse.ArgumentParser(description='Test check-links.py against a local HTTP server')
+    parser.parse_args()
+    
+    check_links = load_script("check-links")
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    
+    checks: List[Tuple[str, bool, str]] = []
+    
+    def expect(name: str, passed: bool, detail: str = ""):
+        checks.append((name, passed, detail))
+    
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir, tempfile.TemporaryDirectory() as work_dir:
+            root, workdir = Path(temp_dir), Path(work_dir)
+            write_repository(root, base_url)
+            
+            # First run: everything is fetched from the server
+            first, checker = run_checker(check_links, root, workdir)
+            expect("200 is alive", first.get('/ok') == ('ok', '200'), str(first.get('/ok')))
+            expect("404 is broken", first.get('/missing') == ('broken', 'HTTP 404'), str(first.get('/missing')))
+            expect("redirect is followed", first.get('/moved') == ('ok', '200') and StubHandler.hits.get('/ok', 0) >= 2,
+                   f"{first.get('/moved')}, /ok requested {StubHandler.hits.get('/ok', 0)} time(s)")
+            expect("HEAD falls back to GET", first.get('/get-only') == ('ok', '200'), str(first.get('/get-only')))
+            expect("429 is retried", first.get('/busy') == ('ok', '200') and StubHandler.hits.get('/busy') == 2,
+                   f"{first.get('/busy')}, /busy requested {StubHandler.hits.get('/busy')} time(s)")
+            
+            cache_file = root / CACHE_PATH
+            expect("cache is written under the repository root", cache_file.exists(), str(cache_file))
+            expect("cache is not written to the working directory",
+                   not (workdir / CACHE_PATH).exists(), str(workdir / CACHE_PATH))
+            cached = json.loads(cache_file.read_text(encoding='utf-8')).get('entries', {}) if cache_file.exists() else {}
+            expect("only alive URLs are cached",
+                   sorted(url.rsplit('/', 1)[1] for url in cached) == ['busy', 'get-only', 'moved', 'ok'],
+                   ", ".join(sorted(cached)))
+            
+            # Second run: alive URLs come from the cache, broken ones are rechecked
+            hits_before = dict(StubHandler.hits)
+            second, checker = run_checker(check_links, root, workdir)
+            alive_cached = all(second.get(path, ('', ''))[1].endswith('(cached)')
+                               for path in ('/ok', '/moved', '/get-only', '/busy'))
+            expect("alive URLs are served from the cache", alive_cached and checker.external.cache_hits == 4,
+                   f"{checker.external.cache_hits} cache hit(s)")
+            expect("broken URLs are rechecked",
+                   second.get('/missing') == ('broken', 'HTTP 404')
+                   and StubHandler.hits.get('/missing', 0) > hits_before.get('/missing', 0),
+                   str(second.get('/missing')))
+            expect("cached URLs are not requested again",
+                   all(StubHandler.hits.get(path) == hits_before.get(path) for path in ('/ok', '/moved', '/get-only', '/busy')),
+                   f"{checker.external.requests_made} request(s) made")
+            
+            # Third run: a baselined broken link is reported but no longer broken
+            (root / 'baseline.json').write_text(json.dumps({'links': [
+                {'source': 'README.md', 'target': f"{base_url}/missing"},
+            ]}), encoding='utf-8')
+            third, checker = run_checker(check_links, root, workdir, baseline_path='baseline.json')
+            expect("baselined links do not count as broken",
+                   third.get('/missing') == ('baselined', 'HTTP 404')
+                   and not any(status == 'broken' for status, _ in third.values()),
+                   str(third.get('/missing')))
+    finally:
+        server.shutdown()
+        server.server_close()
+    
+    print("🔗 Link Checker Self-Test")
+    for name, passed, detail in checks:
+        print(f"   {'✅' if passed else '❌'} {name}" + (f" ({detail})" if detail and not passed else ""))
+    
+    failed = sum(1 for _, passed, _ in checks if not passed)
+    if failed:
+        print(f"\n❌ {failed} of {len(checks)} check(s) failed")
+        return 1
+    print(f"\n✅ All {len(checks)} checks passed")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,16 +2,30 @@
 """
 User Journey Testing Framework for SDD Repository.
 Tests complete user workflows from different entry points and validates user experience.
+Each journey's result is streamed as a record when it finishes and the
+report is rendered from the records. With --shard, only the journeys a
+shard owns are tested; --merge renders the report from every shard's records.
 """
 
 import os
 import json
 import time
+import argparse
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
+from openmetrics import MetricsRegistry, add_metrics_argument, validator_metrics
+from result_records import RecordWriter, ReportReducer, add_records_argument, merge_streams
+from sharding import ShardSelector, add_shard_arguments, shard_selector
+from tracing import add_instrumentation_arguments, span, start_instrumentation
+
+# Step files shorter than this are considered incomplete
+MIN_STEP_CONTENT_LENGTH = 200
+# Overall success rate, in percent, below which the journey tests fail
+SUCCESS_THRESHOLD = 75
+
 class UserType(Enum):
     """Different types of users accessing the SDD repository."""
     NEW_DEVELOPER = "new_developer"
@@ -41,28 +55,67 @@ class JourneyResult:
     issues: List[str]
     recommendations: List[str]
 
+def journey_step_issues(step: JourneyStep, content: str) -> List[str]:
+    """Reasons the content of a step's file does not satisfy the step."""
+    content = content.lower()
+    issues = [f"missing required content '{required}'"
+              for required in step.required_content if required.lower() not in content]
+    
+    # Check file length (minimum quality threshold)
+    if len(content) < MIN_STEP_CONTENT_LENGTH:
+        issues.append(f"shorter than {MIN_STEP_CONTENT_LENGTH} characters")
+    
+    return issues
+
 class UserJourneyTester:
     """Tests complete user journeys through the SDD repository."""
     
     def __init__(self, repo_root: str = "."):
         self.repo_root = Path(repo_root)
         self.results: List[JourneyResult] = []
+        self.files_read = 0
+        self.bytes_read = 0
+        self.checks = 0
         
-    def test_all_user_journeys(self) -> Dict[str, Any]:
-        """Test all defined user journeys."""
+    def test_all_user_journeys(self, names: Optional[List[str]] = None, shard: Optional[ShardSelector] = None,
+                               records: Optional[RecordWriter] = None) -> Dict[str, Any]:
+        """Test all defined user journeys, or only the ones named in ``names`` or owned by ``shard``.
+        
+        Each journey's result is emitted to ``records`` when it finishes.
+        """
         print("👥 Testing User Journeys...")
+        records = records or RecordWriter("", "test-user-journeys", JourneyReportReducer())
         
-        # Define and test journeys for each user type
-        self._test_new_developer_journey()
-        self._test_experienced_developer_journey()
-        self._test_product_manager_journey()
-        self._test_team_lead_journey()
-        self._test_specialist_journey()
+        # Test the journey defined for each user type
+        for position, (user_type, journey_name, steps) in enumerate(self.journeys()):
+            if names is not None and journey_name not in names:
+                continue
+            if shard is not None and not shard.owns(journey_name):
+                continue
+            with span("suite", journey_name):
+                result = self._execute_journey(user_type, journey_name, steps)
+            self.results.append(result)
+            records.emit("journey", position=position, user_type=result.user_type.value,
+                         journey=result.journey_name, total_steps=result.total_steps,
+                         completed_steps=result.completed_steps, success_rate=result.success_rate,
+                         time_to_complete=result.time_to_complete, issues=result.issues,
+                         recommendations=result.recommendations)
         
-        return self._generate_journey_report()
+        with span("report", "user journeys"):
+            return records.reducer.report()
+    
+    def journeys(self) -> List[Tuple[UserType, str, List[JourneyStep]]]:
+        """Every defined journey as (user type, journey name, steps)."""
+        return [
+            self._new_developer_journey(),
+            self._experienced_developer_journey(),
+            self._product_manager_journey(),
+            self._team_lead_journey(),
+            self._specialist_journey()
+        ]
     
-    def _test_new_developer_journey(self):
-        """Test the journey of a new developer learning SDD."""
+    def _new_developer_journey(self) -> Tuple[UserType, str, List[JourneyStep]]:
+        """Steps in the journey of a new developer learning SDD."""
         journey_steps = [
             JourneyStep(
                 step_name="Landing and Overview",
@@ -121,11 +174,10 @@ class UserJourneyTester:
             )
         ]
         
-        result = self._execute_journey(UserType.NEW_DEVELOPER, "Complete Onboarding", journey_steps)
-        self.results.append(result)
+        return UserType.NEW_DEVELOPER, "Complete Onboarding", journey_steps
     
-    def _test_experienced_developer_journey(self):
-        """Test the journey of an experienced developer adopting SDD."""
+    def _experienced_developer_journey(self) -> Tuple[UserType, str, List[JourneyStep]]:
+        """Steps in the journey of an experienced developer adopting SDD."""
         journey_steps = [
             JourneyStep(
                 step_name="Advanced Guidance Access",
@@ -173,11 +225,10 @@ class UserJourneyTester:
             )
         ]
         
-        result = self._execute_journey(UserType.EXPERIENCED_DEVELOPER, "Advanced Implementation", journey_steps)
-        self.results.append(result)
+        return UserType.EXPERIENCED_DEVELOPER, "Advanced Implementation", journey_steps
     
-    def _test_product_manager_journey(self):
-        """Test the journey of a product manager using SDD for requirements."""
+    def _product_manager_journey(self) -> Tuple[UserType, str, List[JourneyStep]]:
+        """Steps in the journey of a product manager using SDD for requirements."""
         journey_steps = [
             JourneyStep(
                 step_name="PM-Specific Guidance",
@@ -214,11 +265,10 @@ class UserJourneyTester:
             )
         ]
         
-        result = self._execute_journey(UserType.PRODUCT_MANAGER, "Requirements Management", journey_steps)
-        self.results.append(result)
+        return UserType.PRODUCT_MANAGER, "Requirements Management", journey_steps
     
-    def _test_team_lead_journey(self):
-        """Test the journey of a team lead implementing SDD governance."""
+    def _team_lead_journey(self) -> Tuple[UserType, str, List[JourneyStep]]:
+        """Steps in the journey of a team lead implementing SDD governance."""
         journey_steps = [
             JourneyStep(
                 step_name="Team Lead Guidance",
@@ -255,11 +305,10 @@ class UserJourneyTester:
             )
         ]
         
-        result = self._execute_journey(UserType.TEAM_LEAD, "Team Implementation", journey_steps)
-        self.results.append(result)
+        return UserType.TEAM_LEAD, "Team Implementation", journey_steps
     
-    def _test_specialist_journey(self):
-        """Test the journey of a role-specific specialist (frontend, backend, etc.)."""
+    def _specialist_journey(self) -> Tuple[UserType, str, List[JourneyStep]]:
+        """Steps in the journey of a role-specific specialist (frontend, backend, etc.)."""
         journey_steps = [
             JourneyStep(
                 step_name="Specialist Guidance",
@@ -296,8 +345,7 @@ class UserJourneyTester:
             )
         ]
         
-        result = self._execute_journey(UserType.SPECIALIST, "Domain Implementation", journey_steps)
-        self.results.append(result)
+        return UserType.SPECIALIST, "Domain Implementation", journey_steps
     
     def _execute_journey(self, user_type: UserType, journey_name: str, steps: List[JourneyStep]) -> JourneyResult:
         """Execute a complete user journey and return results."""
@@ -336,35 +384,76 @@ class UserJourneyTester:
             return False
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read().lower()
+            with span("read", step.expected_file), open(file_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+                self.files_read += 1
+                self.bytes_read += os.fstat(f.fileno()).st_size
         except Exception:
             return False
         
-        # Check required content
-        for required in step.required_content:
-            if required.lower() not in content:
-                return False
+        # One check per required phrase, plus the length threshold
+        self.checks += len(step.required_content) + 1
+        with span("validate", step.expected_file):
+            return not journey_step_issues(step, content)
+    
+    def metrics(self, duration: float) -> MetricsRegistry:
+        """OpenMetrics for the last test_all_user_journeys() run; failed steps count as errors."""
+        return validator_metrics(
+            "user-journeys",
+            duration=duration,
+            files=self.files_read,
+            bytes_read=self.bytes_read,
+            errors=sum(len(result.issues) for result in self.results),
+            warnings=0,
+            rule_evaluations=self.checks,
+            file_durations=[result.time_to_complete for result in self.results]
+        )
+    
+    def save_report(self, report: Dict[str, Any], output_path: str = "test-results/user-journey-report.json"):
+        """Save journey test report to file."""
+        output_file = Path(output_path)
+        output_file.parent.mkdir(parents=True, exist_ok=True)
         
-        # Check file length (minimum quality threshold)
-        if len(content) < 200:
-            return False
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
         
-        return True
+        print(f"\n📊 Journey test report saved to: {output_file}")
+
+class JourneyReportReducer(ReportReducer):
+    """Renders the journey test report from `journey` records."""
+    
+    def __init__(self):
+        super().__init__()
+        # (position in journeys(), result)
+        self.results: List[Tuple[int, JourneyResult]] = []
+    
+    def reduce_journey(self, record: Dict[str, Any]):
+        self.results.append((record["position"], JourneyResult(
+            user_type=UserType(record["user_type"]),
+            journey_name=record["journey"],
+            total_steps=record["total_steps"],
+            completed_steps=record["completed_steps"],
+            success_rate=record["success_rate"],
+            time_to_complete=record["time_to_complete"],
+            issues=record["issues"],
+            recommendations=record["recommendations"]
+        )))
     
-    def _generate_journey_report(self) -> Dict[str, Any]:
+    def report(self) -> Dict[str, Any]:
         """Generate comprehensive journey test report."""
-        total_journeys = len(self.results)
-        successful_journeys = sum(1 for r in self.results if r.success_rate >= 80)
+        # Journeys in definition order, however the shards interleaved them
+        results = [result for _, result in sorted(self.results, key=lambda item: item[0])]
+        total_journeys = len(results)
+        successful_journeys = sum(1 for r in results if r.success_rate >= 80)
         
         # Calculate overall metrics
-        avg_success_rate = sum(r.success_rate for r in self.results) / total_journeys if total_journeys > 0 else 0
-        avg_completion_time = sum(r.time_to_complete for r in self.results) / total_journeys if total_journeys > 0 else 0
+        avg_success_rate = sum(r.success_rate for r in results) / total_journeys if total_journeys > 0 else 0
+        avg_completion_time = sum(r.time_to_complete for r in results) / total_journeys if total_journeys > 0 else 0
         
         # Group results by user type
         user_type_results = {}
         for user_type in UserType:
-            user_results = [r for r in self.results if r.user_type == user_type]
+            user_results = [r for r in results if r.user_type == user_type]
             if user_results:
                 user_type_results[user_type.value] = {
                     "journeys_tested": len(user_results),
@@ -383,13 +472,13 @@ class UserJourneyTester:
         
         # Collect all recommendations
         all_recommendations = []
-        for result in self.results:
+        for result in results:
             all_recommendations.extend(result.recommendations)
         
-        # Remove duplicates and prioritize
-        unique_recommendations = list(set(all_recommendations))
+        # Remove duplicates, keeping journey order so merged shard reports match
+        unique_recommendations = list(dict.fromkeys(all_recommendations))
         
-        report = {
+        return {
             "summary": {
                 "total_journeys": total_journeys,
                 "successful_journeys": successful_journeys,
@@ -404,30 +493,54 @@ class UserJourneyTester:
                     "user_type": r.user_type.value,
                     "journey": r.journey_name,
                     "success_rate": r.success_rate,
-                    "issues": r.issues
+                    "issues": r.issues,
+                    "recommendations": r.recommendations
                 }
-                for r in self.results
-            ]
+                for r in results
+            ],
+            "timings": {r.journey_name: round(r.time_to_complete, 6) for r in results}
         }
-        
-        return report
     
-    def save_report(self, report: Dict[str, Any], output_path: str = "test-results/user-journey-report.json"):
-        """Save journey test report to file."""
-        output_file = Path(output_path)
-        output_file.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(report, f, indent=2)
-        
-        print(f"\n📊 Journey test report saved to: {output_file}")
+    def failure(self, report: Dict[str, Any]) -> Optional[str]:
+        if report['summary']['overall_success_rate'] < SUCCESS_THRESHOLD:
+            return f"User journey tests below {SUCCESS_THRESHOLD}% success rate"
+        return None
+
+REPORT_REDUCER = JourneyReportReducer
 
 def main():
     """Main testing function."""
+    parser = argparse.ArgumentParser(description='Test complete user journeys through the repository')
+    parser.add_argument('--journey', action='append', metavar='NAME',
+                       help='Only test this journey (repeatable; default: all)')
+    parser.add_argument('--output', default='test-results/user-journey-report.json',
+                       help='Where to write the JSON report')
+    add_metrics_argument(parser, "test-user-journeys")
+    add_records_argument(parser, "test-user-journeys")
+    add_shard_arguments(parser)
+    add_instrumentation_arguments(parser)
+    args = parser.parse_args()
+    start_instrumentation(args, "test-user-journeys")
+    
     tester = UserJourneyTester()
+    if args.journey:
+        unknown = set(args.journey) - {name for _, name, _ in tester.journeys()}
+        if unknown:
+            print(f"❌ Unknown journeys: {', '.join(sorted(unknown))}")
+            return 1
     
-    # Run all journey tests
-    report = tester.test_all_user_journeys()
+    reducer = JourneyReportReducer()
+    if args.merge:
+        report = merge_streams(parser, args.merge, reducer, "test-user-journeys")
+        print(f"🧩 Merged {len(args.merge)} shard record streams")
+    else:
+        # Run all journey tests
+        shard = shard_selector(parser, args, "test-user-journeys")
+        records = RecordWriter(args.records, "test-user-journeys", reducer, shard.shard)
+        start_time = time.time()
+        tester.test_all_user_journeys(args.journey, shard=shard, records=records)
+        duration = time.time() - start_time
+        report = records.close(duration)
     
     # Print summary
     print(f"\n🎯 Journey Test Summary:")
@@ -447,11 +560,17 @@ def main():
             print(f"   {i}. {rec}")
     
     # Save detailed report
-    tester.save_report(report)
+    tester.save_report(report, args.output)
+    if args.metrics and not args.merge:
+        tester.metrics(duration).write(args.metrics)
     
-    # Return appropriate exit code
-    if report['summary']['overall_success_rate'] < 75:
-        print("\n⚠️  User journey tests below 75% success rate")
+    # Return appropriate exit code; a shard holds only some journeys, so --merge judges the run
+    if args.shard:
+        print(f"\n✅ {report['summary']['total_journeys']} user journey(s) completed on shard {args.shard}")
+        return 0
+    failure = reducer.failure(report)
+    if failure:
+        print(f"\n⚠️  {failure}")
         return 1
     else:
         print("\n✅ User journey tests passed!")
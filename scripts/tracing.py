@@ -0,0 +1,291 @@
+"""
+Span tracing and profiling for the validation scripts.
+
+Code marks where its time goes with spans, named by phase (walk, read,
+parse, validate, report, or suite for a whole validator run) and by the
+file or suite they cover:
+
+    with span("read", path):
+        content = path.read_text()
+
+While tracing is off, `span()` is a global lookup that returns a shared
+no-op context manager, so spans stay in hot paths permanently. With
+`--trace` (or `--trace-file PATH`), every closed span is recorded with its thread and the time
+spent in nested spans. At exit they are written as Chrome trace-event JSON
+(open it in chrome://tracing or ui.perfetto.dev), and a per-phase table of
+total and self time is printed. Timestamps are wall-clock microseconds, so
+traces from several processes, such as the test runner and its suites,
+line up when merged.
+
+`--profile` runs the script under cProfile and tracemalloc and writes
+`<script>.pstats` and a `<script>.tracemalloc` snapshot to the profile
+directory (`--profile-dir DIR`), printing the top functions and
+allocation sites. Both paths are options of their own, so neither can
+take a script's positional file arguments.
+
+Spans recorded in process-pool workers stay in the worker; trace with
+`--jobs 1` for a per-file breakdown of the pooled validators.
+"""
+
+import atexit
+import contextlib
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+PHASES = ("suite", "walk", "read", "parse", "validate", "report")
+
+DEFAULT_TRACE_DIR = "test-results/traces"
+DEFAULT_PROFILE_DIR = "test-results/profiles"
+
+# Shared by every disabled span; nullcontext is reusable and reentrant
+_NULL_SPAN = contextlib.nullcontext()
+
+class Span:
+    """An open span; records itself on the tracer when it closes."""
+    
+    __slots__ = ("tracer", "phase", "name", "args", "start", "child_time")
+    
+    def __init__(self, tracer: "Tracer", phase: str, name: Optional[str], args: Dict[str, Any]):
+        self.tracer = tracer
+        self.phase = phase
+        self.name = name
+        self.args = args
+        self.child_time = 0
+    
+    def __enter__(self) -> "Span":
+        self.tracer._stack().append(self)
+        self.start = time.perf_counter_ns()
+        return self
+    
+    def __exit__(self, *exc_info) -> bool:
+        duration = time.perf_counter_ns() - self.start
+        stack = self.tracer._stack()
+        stack.pop()
+        if stack:
+            stack[-1].child_time += duration
+        self.tracer.events.append((self.phase, self.name, self.start, duration,
+                                   duration - self.child_time, threading.get_ident(), self.args))
+        return False
+
+class Tracer:
+    """Collects closed spans for one process."""
+    
+    def __init__(self, process_name: str = ""):
+        self.process_name = process_name or Path(sys.argv[0]).stem
+        self.pid = os.getpid()
+        # (phase, name, start_ns, duration_ns, self_ns, thread_id, args)
+        self.events: List[tuple] = []
+        self.included: List[Dict[str, Any]] = []
+        self._origin_ns = time.perf_counter_ns()
+        self._origin_wall_us = time.time_ns() / 1000
+        self._local = threading.local()
+    
+    def _stack(self) -> List[Span]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+    
+    def _timestamp_us(self, perf_ns: int) -> float:
+        return self._origin_wall_us + (perf_ns - self._origin_ns) / 1000
+    
+    def include(self, trace_path: str):
+        """Merge the events of another process's trace file into this trace."""
+        try:
+            with open(trace_path, 'r') as f:
+                self.included.extend(json.load(f).get("traceEvents", []))
+        except (OSError, ValueError):
+            pass
+    
+    def phase_table(self) -> List[Dict[str, Any]]:
+        """Per-phase span counts and total, self, mean and max time in milliseconds."""
+        phases: Dict[str, Dict[str, Any]] = defaultdict(lambda: {"spans": 0, "total_ns": 0, "self_ns": 0, "max_ns": 0})
+        for phase, _, _, duration, self_time, _, _ in self.events:
+            row = phases[phase]
+            row["spans"] += 1
+            row["total_ns"] += duration
+            row["self_ns"] += self_time
+            row["max_ns"] = max(row["max_ns"], duration)
+        
+        traced_ns = sum(row["self_ns"] for row in phases.values()) or 1
+        order = {phase: number for number, phase in enumerate(PHASES)}
+        return [
+            {
+                "phase": phase,
+                "spans": row["spans"],
+                "total_ms": round(row["total_ns"] / 1e6, 3),
+                "self_ms": round(row["self_ns"] / 1e6, 3),
+                "mean_ms": round(row["total_ns"] / row["spans"] / 1e6, 4),
+                "max_ms": round(row["max_ns"] / 1e6, 3),
+                "share": round(row["self_ns"] / traced_ns, 4)
+            }
+            for phase, row in sorted(phases.items(), key=lambda item: (order.get(item[0], len(order)), item[0]))
+        ]
+    
+    def slowest(self, limit: int = 5) -> List[Dict[str, Any]]:
+        """The slowest named spans below suite level, by self time."""
+        named = [event for event in self.events if event[1] is not None and event[0] != "suite"]
+        named.sort(key=lambda event: event[4], reverse=True)
+        return [{"phase": phase, "name": name, "self_ms": round(self_time / 1e6, 3)}
+                for phase, name, _, _, self_time, _, _ in named[:limit]]
+    
+    def chrome_trace(self) -> Dict[str, Any]:
+        """The spans as Chrome trace-event JSON, with the phase table as metadata."""
+        events = [{"name": "process_name", "ph": "M", "pid": self.pid, "tid": 0,
+                   "args": {"name": self.process_name}}]
+        for phase, name, start, duration, _, thread, args in self.events:
+            event = {
+                "name": f"{phase} {name}" if name is not None else phase,
+                "cat": phase,
+                "ph": "X",
+                "ts": round(self._timestamp_us(start), 3),
+                "dur": round(duration / 1000, 3),
+                "pid": self.pid,
+                "tid": thread
+            }
+            if args:
+                event["args"] = args
+            events.append(event)
+        return {
+            "traceEvents": events + self.included,
+            "displayTimeUnit": "ms",
+            "otherData": {"process": self.process_name, "phases": self.phase_table()}
+        }
+    
+    def write(self, trace_path: str):
+        output_file = Path(trace_path)
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_file, 'w') as f:
+            json.dump(self.chrome_trace(), f, default=str)
+    
+    def print_summary(self, file=None):
+        file = file or sys.stdout
+        rows = self.phase_table()
+        if not rows:
+            return
+        print(f"\n⏱️  Time by phase ({len(self.events)} spans):", file=file)
+        print(f"   {'phase':10} {'spans':>8} {'total ms':>11} {'self ms':>11} {'mean ms':>10} {'max ms':>10} {'self %':>7}",
+              file=file)
+        for row in rows:
+            print(f"   {row['phase']:10} {row['spans']:8} {row['total_ms']:11.1f} {row['self_ms']:11.1f} "
+                  f"{row['mean_ms']:10.3f} {row['max_ms']:10.1f} {row['share'] * 100:6.1f}%", file=file)
+        slowest = self.slowest()
+        if slowest:
+            print("   Slowest: " + ", ".join(f"{item['phase']} {item['name']} ({item['self_ms']:.1f} ms)"
+                                             for item in slowest), file=file)
+
+_tracer: Optional[Tracer] = None
+
+def span(phase: str, name: Any = None, **args) -> Any:
+    """A context manager timing one phase of work; a no-op unless tracing is on."""
+    if _tracer is None:
+        return _NULL_SPAN
+    return Span(_tracer, phase, None if name is None else str(name), args)
+
+def traced(phase: str, name: Optional[str] = None) -> Callable:
+    """Decorate a function so each call is a span (named after the function by default)."""
+    def decorator(function: Callable) -> Callable:
+        label = name or function.__qualname__
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if _tracer is None:
+                return function(*args, **kwargs)
+            with Span(_tracer, phase, label, {}):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def tracer() -> Optional[Tracer]:
+    """The active tracer, or None while tracing is off."""
+    return _tracer
+
+def enable_tracing(process_name: str = "") -> Tracer:
+    global _tracer
+    if _tracer is None:
+        _tracer = Tracer(process_name)
+    return _tracer
+
+def add_instrumentation_arguments(parser):
+    """Add --trace, --trace-file, --profile and --profile-dir to a script's argument parser."""
+    group = parser.add_argument_group('instrumentation')
+    group.add_argument('--trace', action='store_true',
+                       help=f'Record spans and write a Chrome trace to {DEFAULT_TRACE_DIR}/<script>.trace.json')
+    group.add_argument('--trace-file', metavar='PATH',
+                       help='Record spans and write the Chrome trace to PATH')
+    group.add_argument('--profile', action='store_true',
+                       help=f'Run under cProfile and tracemalloc, writing pstats and a snapshot to {DEFAULT_PROFILE_DIR}')
+    group.add_argument('--profile-dir', metavar='DIR',
+                       help='Profile as --profile does, writing to DIR')
+
+class Instrumentation:
+    """Tracing and profiling started for a script run; finished once, at exit."""
+    
+    def __init__(self, script: str, trace_path: Optional[str], profile_dir: Optional[str]):
+        self.script = script
+        self.trace_path = trace_path
+        self.profile_dir = Path(profile_dir) if profile_dir is not None else None
+        self.profiler = None
+        self.finished = False
+    
+    def start(self) -> "Instrumentation":
+        if self.trace_path is not None:
+            enable_tracing(self.script)
+        if self.profile_dir is not None:
+            import cProfile
+            import tracemalloc
+            tracemalloc.start(16)
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        atexit.register(self.finish)
+        return self
+    
+    def finish(self):
+        """Stop profiling and write the trace and profiles; safe to call more than once."""
+        if self.finished:
+            return
+        self.finished = True
+        # Reports go to stderr so they don't mix with output meant for other programs
+        output = sys.stderr
+        
+        if self.profiler is not None:
+            self.profiler.disable()
+            import pstats
+            import tracemalloc
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            
+            self.profile_dir.mkdir(parents=True, exist_ok=True)
+            stats_path = self.profile_dir / f"{self.script}.pstats"
+            snapshot_path = self.profile_dir / f"{self.script}.tracemalloc"
+            self.profiler.dump_stats(str(stats_path))
+            snapshot.dump(str(snapshot_path))
+            
+            print(f"\n🔬 Top functions by cumulative time:", file=output)
+            pstats.Stats(self.profiler, stream=output).sort_stats("cumulative").print_stats(15)
+            print(f"🔬 Top allocation sites (peak traced memory {peak / 1_000_000:.1f} MB):", file=output)
+            for statistic in snapshot.statistics("lineno")[:10]:
+                print(f"   {statistic}", file=output)
+            print(f"📊 Profile saved to: {stats_path} and {snapshot_path}", file=output)
+        
+        if _tracer is not None and self.trace_path is not None:
+            _tracer.print_summary(output)
+            _tracer.write(self.trace_path)
+            print(f"📊 Trace saved to: {self.trace_path}", file=output)
+
+def start_instrumentation(args, script: str) -> Instrumentation:
+    """Start whatever tracing and profiling the parsed arguments ask for."""
+    trace_path = getattr(args, 'trace_file', None)
+    if trace_path is None and getattr(args, 'trace', False):
+        trace_path = f"{DEFAULT_TRACE_DIR}/{script}.trace.json"
+    profile_dir = getattr(args, 'profile_dir', None)
+    if profile_dir is None and getattr(args, 'profile', False):
+        profile_dir = DEFAULT_PROFILE_DIR
+    return Instrumentation(script, trace_path, profile_dir).start()
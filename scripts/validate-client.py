@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Validation Client
+
+Sends paths or an unsaved buffer to a running validation server
+(`validate-workspace.py --serve`) and prints the diagnostics. Only uses
+the standard library and imports nothing from the validators, so it
+starts fast enough for pre-commit hooks and editor integrations.
+
+    validate-client.py examples/greenfield/app/spec.md
+    git diff --cached --name-only --diff-filter=d | xargs validate-client.py
+    validate-client.py --stdin spec.md < unsaved-spec.md
+"""
+
+import json
+import os
+import socket
+import subprocess
+import sys
+import argparse
+from typing import Any, Dict, List
+
+from tracing import add_instrumentation_arguments, start_instrumentation
+
+DEFAULT_SOCKET = '.sdd-cache/validation.sock'
+
+class ServerUnavailable(OSError):
+    """Raised when no validation server is listening on the socket."""
+
+def default_socket_path() -> str:
+    """The default socket under the root of the current git checkout."""
+    try:
+        root = subprocess.run(["git", "rev-parse", "--show-toplevel"],
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        root = os.getcwd()
+    return os.path.join(root, DEFAULT_SOCKET)
+
+def send_requests(socket_path: str, requests: List[Dict[str, Any]], timeout: float = 30.0) -> List[Dict[str, Any]]:
+    """Send requests over one connection and return the responses in order."""
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    connection.settimeout(timeout)
+    try:
+        connection.connect(socket_path)
+    except (FileNotFoundError, ConnectionRefusedError) as e:
+        connection.close()
+        raise ServerUnavailable(f"No validation server on {socket_path}: {e.strerror}") from e
+    
+    with connection, connection.makefile('rwb') as stream:
+        for number, request in enumerate(requests):
+            stream.write(json.dumps(dict(request, id=number)).encode('utf-8') + b'\n')
+        stream.flush()
+        responses = []
+        for _ in requests:
+            line = stream.readline()
+            if not line:
+                raise ServerUnavailable("Validation server closed the connection")
+            responses.append(json.loads(line))
+    return responses
+
+def print_diagnostics(diagnostics: List[Dict[str, Any]]):
+    for diagnostic in diagnostics:
+        symbol = "❌" if diagnostic['severity'] == 'error' else "⚠️ "
+        location = f"{diagnostic['path']}:{diagnostic['line']}" if diagnostic['line'] else diagnostic['path']
+        print(f"{symbol} [{diagnostic['source']}] {location}: {diagnostic['message']}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Validate files through a running validation server')
+    parser.add_argument('paths', nargs='*',
+                       help='Files to validate')
+    parser.add_argument('--socket', default=None,
+                       help=f'Server socket (default: {DEFAULT_SOCKET} in the git checkout)')
+    parser.add_argument('--stdin', metavar='PATH',
+                       help='Validate content read from stdin as if it were saved at PATH')
+    parser.add_argument('--status', action='store_true',
+                       help='Show the server status')
+    parser.add_argument('--stop', action='store_true',
+                       help='Ask the server to shut down')
+    parser.add_argument('--json', action='store_true',
+                       help='Print the raw JSON responses')
+    parser.add_argument('--timeout', type=float, default=30.0,
+                       help='Seconds to wait for the server')
+    add_instrumentation_arguments(parser)
+    
+    args = parser.parse_args()
+    start_instrumentation(args, "validate-client")
+    
+    if args.status:
+        requests = [{"method": "status"}]
+    elif args.stop:
+        requests = [{"method": "shutdown"}]
+    elif args.stdin:
+        requests = [{"method": "validate_buffer", "path": os.path.abspath(args.stdin),
+                     "content": sys.stdin.read()}]
+    elif args.paths:
+        requests = [{"method": "validate", "paths": [os.path.abspath(path) for path in args.paths]}]
+    else:
+        parser.error("give paths to validate, or one of --stdin, --status, --stop")
+    
+    socket_path = args.socket or default_socket_path()
+    try:
+        responses = send_requests(socket_path, requests, args.timeout)
+    except (ServerUnavailable, OSError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        print("   Start one with: python3 scripts/validate-workspace.py --serve", file=sys.stderr)
+        sys.exit(2)
+    
+    if args.json:
+        print(json.dumps(responses if len(responses) > 1 else responses[0], indent=2))
+    
+    errors = 0
+    for response in responses:
+        if not response.get('ok'):
+            print(f"❌ {response.get('error')}", file=sys.stderr)
+            sys.exit(2)
+        if args.json:
+            continue
+        if args.status:
+            summary = response['summary']
+            print(f"🟢 Serving {response['root']} for {response['uptime']}s, "
+                  f"{response['requests_served']} requests served")
+            print(f"   {summary['units']} units, {summary['errors']} errors, {summary['warnings']} warnings")
+        elif args.stop:
+            print("👋 Validation server stopping")
+        else:
+            print_diagnostics(response['diagnostics'])
+        errors += sum(1 for d in response.get('diagnostics', []) if d['severity'] == 'error')
+    
+    if not args.json and not (args.status or args.stop):
+        print(f"{'❌' if errors else '✅'} {errors} errors ({responses[0]['duration_ms']} ms)")
+    sys.exit(1 if errors else 0)
+
+if __name__ == '__main__':
+    main()
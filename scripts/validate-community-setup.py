@@ -6,8 +6,11 @@ Checks that all required community infrastructure is in place.
 
 import os
 import json
+import argparse
 from pathlib import Path
 
+from tracing import add_instrumentation_arguments, start_instrumentation
+
 def check_file_exists(path, description):
     """Check if a file exists and report status."""
     if Path(path).exists():
@@ -43,6 +46,10 @@ def validate_json_file(path, description):
 
 def main():
     """Run comprehensive community setup validation."""
+    parser = argparse.ArgumentParser(description='Validate the community launch setup')
+    add_instrumentation_arguments(parser)
+    start_instrumentation(parser.parse_args(), "validate-community-setup")
+    
     print("🔍 Validating Community Launch Setup")
     print("=" * 50)
     
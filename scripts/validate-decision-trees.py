@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Decision Tree Validation Script
+
+Parses the Mermaid flowcharts in the decision-tree documents and validates
+their graph structure in-process, without rendering them in a browser.
+Flowcharts must be syntactically valid, every node must be reachable,
+decisions need at least two branches, every leaf must be an outcome, and
+the graph must be acyclic. Documents are processed in parallel, each
+one's findings are streamed as a record as soon as it is done, and
+`--shard` / `--merge` split them across CI nodes.
+"""
+
+import json
+import os
+import sys
+import time
+import argparse
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from mermaid_flowchart import OTHER_DIAGRAM_TYPES, extract_mermaid_blocks, parse_flowchart
+from openmetrics import MetricsRegistry, add_metrics_argument, validator_metrics
+from result_records import RecordWriter, ReportReducer, add_records_argument, merge_streams
+from sharding import ShardSelector, add_shard_arguments, path_order, shard_selector
+from tracing import add_instrumentation_arguments, span, start_instrumentation
+
+# Below this many documents, worker start-up costs more than it saves
+PARALLEL_THRESHOLD = 4
+
+@dataclass(frozen=True)
+class TreeResult:
+    """Findings for one decision-tree document."""
+    path: str
+    flowcharts: int
+    nodes: int
+    edges: int
+    skipped: Tuple[str, ...]
+    errors: Tuple[str, ...]
+    warnings: Tuple[str, ...]
+    duration_ms: float
+    bytes_read: int = 0
+    # Flowchart analyses plus node links checked
+    checks: int = 0
+
+def validate_tree_file(path: str, content: Optional[str] = None) -> TreeResult:
+    """Parse and check every Mermaid block in one document (or ``content`` for it)."""
+    start_time = time.perf_counter()
+    bytes_read = 0
+    if content is None:
+        with span("read", path), open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+            bytes_read = os.fstat(f.fileno()).st_size
+    
+    flowcharts = nodes = edges = checks = 0
+    skipped, errors, warnings = [], [], []
+    for block in extract_mermaid_blocks(content):
+        diagram_type = block.diagram_type
+        if diagram_type in OTHER_DIAGRAM_TYPES:
+            skipped.append(f"{diagram_type} at line {block.line}")
+            continue
+        if diagram_type not in ('flowchart', 'graph'):
+            errors.append(f"{path}:{block.line}: unknown Mermaid diagram type '{diagram_type}'")
+            continue
+        
+        with span("parse", path):
+            chart = parse_flowchart(block.source, block.line)
+        flowcharts += 1
+        nodes += len(chart.nodes)
+        edges += len(chart.edges)
+        checks += 1 + len(chart.links)
+        with span("validate", path):
+            for issue in chart.analyze():
+                message = f"{path}:{issue.line}: [{issue.kind}] {issue.message}"
+                (errors if issue.severity == 'error' else warnings).append(message)
+            for link in chart.links.values():
+                if '://' not in link.target and not (Path(path).parent / link.target.split('#', 1)[0]).exists():
+                    errors.append(f"{path}:{link.line}: [broken-link] Node {link.node} links to missing {link.target}")
+    
+    return TreeResult(path, flowcharts, nodes, edges, tuple(skipped), tuple(errors), tuple(warnings),
+                      (time.perf_counter() - start_time) * 1000, bytes_read, checks)
+
+class DecisionTreeValidator:
+    def __init__(self, trees_dir: str = "resources/decision-trees"):
+        self.trees_dir = Path(trees_dir)
+        self.results: List[TreeResult] = []
+        self.errors = []
+        self.warnings = []
+    
+    def validate_all(self, jobs: Optional[int] = None, shard: Optional[ShardSelector] = None,
+                     records: Optional[RecordWriter] = None) -> bool:
+        """Validate every decision-tree document (or those ``shard`` owns), in parallel when worthwhile.
+        
+        Each document's findings are emitted to ``records`` as soon as they are in.
+        """
+        with span("walk", self.trees_dir):
+            paths = [str(path) for path in sorted(self.trees_dir.rglob("*.md"))]
+        if shard is not None:
+            paths = shard.select(paths)
+        if jobs is None:
+            jobs = os.cpu_count() or 1
+        jobs = min(jobs, len(paths))
+        
+        self.results = []
+        if jobs <= 1 or len(paths) < PARALLEL_THRESHOLD:
+            self._collect(map(validate_tree_file, paths), records)
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                self._collect(executor.map(validate_tree_file, paths), records)
+        return not self.errors
+    
+    def _collect(self, results: Iterable[TreeResult], records: Optional[RecordWriter]):
+        for result in results:
+            self.results.append(result)
+            self.errors.extend(result.errors)
+            self.warnings.extend(result.warnings)
+            if records is not None:
+                records.emit("document", **asdict(result))
+    
+    def metrics(self, duration: float) -> MetricsRegistry:
+        """OpenMetrics for the last validate_all() run."""
+        return validator_metrics(
+            "decision-trees",
+            duration=duration,
+            files=len(self.results),
+            bytes_read=sum(result.bytes_read for result in self.results),
+            errors=len(self.errors),
+            warnings=len(self.warnings),
+            rule_evaluations=sum(result.checks for result in self.results),
+            file_durations=[result.duration_ms / 1000 for result in self.results]
+        )
+    
+    def save_report(self, report: Dict[str, Any], output_path: str):
+        """Save the validation report to file."""
+        output_file = Path(output_path)
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        
+        with open(output_file, 'w') as f:
+            json.dump(report, f, indent=2)
+        
+        print(f"\n📊 Decision tree report saved to: {output_file}")
+
+class DecisionTreeReportReducer(ReportReducer):
+    """Renders the decision tree report from `document` records."""
+    
+    def __init__(self):
+        super().__init__()
+        self.documents: List[Dict[str, Any]] = []
+    
+    def reduce_document(self, record: Dict[str, Any]):
+        self.documents.append({key: value for key, value in record.items() if key != "record"})
+    
+    def report(self) -> Dict[str, Any]:
+        documents = sorted(self.documents, key=lambda document: path_order(document["path"]))
+        return {
+            "summary": {
+                "documents": len(documents),
+                "flowcharts": sum(document["flowcharts"] for document in documents),
+                "nodes": sum(document["nodes"] for document in documents),
+                "edges": sum(document["edges"] for document in documents),
+                "errors": sum(len(document["errors"]) for document in documents),
+                "warnings": sum(len(document["warnings"]) for document in documents),
+                "duration_ms": round(self.duration * 1000, 2)
+            },
+            "documents": documents,
+            "timings": {document["path"]: round(document["duration_ms"] / 1000, 6) for document in documents}
+        }
+    
+    def failure(self, report: Dict[str, Any]) -> Optional[str]:
+        errors = report['summary']['errors']
+        return f"Decision tree validation failed with {errors} errors" if errors else None
+
+REPORT_REDUCER = DecisionTreeReportReducer
+
+def main():
+    parser = argparse.ArgumentParser(description='Validate Mermaid decision-tree flowcharts')
+    parser.add_argument('--trees-dir', default='resources/decision-trees',
+                       help='Directory containing decision-tree documents')
+    parser.add_argument('--jobs', '-j', type=int, default=None,
+                       help='Worker processes (default: one per CPU)')
+    parser.add_argument('--output', default='test-results/decision-tree-report.json',
+                       help='Where to write the JSON report')
+    add_metrics_argument(parser, "validate-decision-trees")
+    add_records_argument(parser, "validate-decision-trees")
+    add_shard_arguments(parser)
+    add_instrumentation_arguments(parser)
+    
+    args = parser.parse_args()
+    start_instrumentation(args, "validate-decision-trees")
+    
+    validator = DecisionTreeValidator(args.trees_dir)
+    if args.merge:
+        report = merge_streams(parser, args.merge, DecisionTreeReportReducer(), "validate-decision-trees")
+        validator.save_report(report, args.output)
+        summary = report['summary']
+        print(f"🧩 Merged {len(args.merge)} shard record streams: {summary['documents']} document(s), "
+              f"{summary['errors']} error(s), {summary['warnings']} warning(s)")
+        sys.exit(1 if summary['errors'] else 0)
+    
+    if not os.path.isdir(args.trees_dir):
+        print(f"❌ Decision tree directory not found: {args.trees_dir}")
+        sys.exit(1)
+    
+    shard = shard_selector(parser, args, "validate-decision-trees")
+    records = RecordWriter(args.records, "validate-decision-trees", DecisionTreeReportReducer(), shard.shard)
+    print(f"🌳 Validating decision trees in: {args.trees_dir}")
+    
+    start_time = time.perf_counter()
+    with span("suite", "decision trees"):
+        success = validator.validate_all(jobs=args.jobs, shard=shard, records=records)
+    duration = time.perf_counter() - start_time
+    
+    with span("report", "decision trees"):
+        for result in validator.results:
+            status = "❌" if result.errors else "✅"
+            print(f"{status} {result.path}: {result.flowcharts} flowchart(s), "
+                  f"{result.nodes} nodes, {result.edges} edges ({result.duration_ms:.1f} ms)")
+        
+        if validator.errors:
+            print(f"\n❌ ERRORS ({len(validator.errors)}):")
+            for error in validator.errors:
+                print(f"  • {error}")
+        
+        if validator.warnings:
+            print(f"\n⚠️  WARNINGS ({len(validator.warnings)}):")
+            for warning in validator.warnings:
+                print(f"  • {warning}")
+        
+        report = records.close(duration)
+        validator.save_report(report, args.output)
+    if args.metrics:
+        validator.metrics(duration).write(args.metrics)
+    
+    if success:
+        print(f"\n✅ All decision trees are valid ({duration * 1000:.1f} ms)")
+    else:
+        print(f"\n❌ Decision tree validation failed with {len(validator.errors)} errors")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
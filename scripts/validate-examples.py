@@ -2,45 +2,458 @@
 """
 Validation script for SDD example specifications and workflows.
 Ensures all examples follow proper structure and contain required elements.
+Each project's findings are streamed as a record as soon as it is validated
+and the report is rendered from the records. With --shard, only the
+projects a shard owns are validated; --merge renders the report from every
+shard's records.
 """
 
 import os
 import json
 import re
 import sys
+import argparse
+import subprocess
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Any, Dict, List, Tuple, Optional, Iterable, Iterator, Set
+
+from openmetrics import MetricsRegistry, add_metrics_argument, validator_metrics
+from result_records import RecordWriter, ReportReducer, add_records_argument, merge_streams
+from sharding import ShardSelector, add_shard_arguments, path_order, shard_selector
+from tracing import add_instrumentation_arguments, span, start_instrumentation
+
+# Below this many projects a worker pool costs more than it saves
+PARALLEL_THRESHOLD = 8
+
+# Specs with fewer SHALL statements than this get a warning
+MIN_SHALL_STATEMENTS = 5
+
+# Traceability findings, in report order
+TRACEABILITY_KINDS = ("dangling", "duplicate", "uncovered")
+
+# Patterns for the single-pass document scan, applied per line only when a
+# cheap substring test says the line can match
+REQUIREMENT_ID_PATTERN = re.compile(r'\b([A-Z]+)-\d+\.\d+')
+REQUIREMENT_REF_PATTERN = re.compile(r'_Requirements?: ([A-Z]+-\d+\.\d+(?:\s*,\s*[A-Z]+-\d+\.\d+)*)')
+CHECKBOX_TASK_PATTERN = re.compile(r'- \[ \] \d+\.(\d+)?')
+SHALL_PATTERN = re.compile(r'\bSHALL\b')
+# A requirement is defined where its ID leads a list item or heading,
+# e.g. "- **FR-1.1**: System SHALL ..."
+REQUIREMENT_DEFINITION_PATTERN = re.compile(r'^\s*(?:[-*+]|#{1,6})\s+(?:\*\*)?([A-Z]+-\d+\.\d+)\b')
+
+@dataclass
+class DocumentScan:
+    """Structural tokens collected from one pass over a Markdown document."""
+    headings: List[str] = field(default_factory=list)
+    requirement_ids: Counter = field(default_factory=Counter)
+    requirement_definitions: Dict[str, List[int]] = field(default_factory=dict)
+    requirement_refs: Dict[str, List[int]] = field(default_factory=dict)
+    shall_count: int = 0
+    task_count: int = 0
+    subtask_count: int = 0
+    code_fence_count: int = 0
+    
+    def has_section(self, marker: str) -> bool:
+        """True if any heading line contains the section marker."""
+        return any(marker in heading for heading in self.headings)
+    
+    def has_requirement_prefix(self, prefix: str) -> bool:
+        """True if any requirement ID with the given prefix (e.g. 'FR') was seen."""
+        return any(req_id.split('-', 1)[0] == prefix for req_id in self.requirement_ids)
+
+def scan_document(content: str, shall_limit: Optional[int] = None) -> DocumentScan:
+    """Tokenize a document in a single pass over its lines.
+    
+    ``shall_limit`` stops counting SHALL statements once that many have been
+    seen, for callers that only compare the count against a threshold.
+    """
+    scan = DocumentScan()
+    in_fence = False
+    
+    for line_number, line in enumerate(content.splitlines(), 1):
+        fences = line.count('```')
+        if fences:
+            scan.code_fence_count += fences
+            if line.lstrip().startswith('```'):
+                in_fence = not in_fence
+                continue
+        
+        if not in_fence and line.startswith('#'):
+            scan.headings.append(line)
+        
+        if '- [ ]' in line:
+            for match in CHECKBOX_TASK_PATTERN.finditer(line):
+                scan.task_count += 1
+                if match.group(1):
+                    scan.subtask_count += 1
+        
+        if '_Requirement' in line:
+            for match in REQUIREMENT_REF_PATTERN.finditer(line):
+                for ref in match.group(1).split(','):
+                    scan.requirement_refs.setdefault(ref.strip(), []).append(line_number)
+        
+        if '-' in line:
+            found_id = False
+            for match in REQUIREMENT_ID_PATTERN.finditer(line):
+                scan.requirement_ids[match.group(0)] += 1
+                found_id = True
+            if found_id:
+                definition = REQUIREMENT_DEFINITION_PATTERN.match(line)
+                if definition:
+                    scan.requirement_definitions.setdefault(definition.group(1), []).append(line_number)
+        
+        if 'SHALL' in line and (shall_limit is None or scan.shall_count < shall_limit):
+            scan.shall_count += len(SHALL_PATTERN.findall(line))
+    
+    return scan
+
+@dataclass(frozen=True)
+class RequirementSite:
+    """Location of a requirement definition or reference."""
+    path: str
+    line: int
+
+class RequirementIndex:
+    """Persistent index of requirement definitions and task references.
+    
+    Requirement IDs are scoped to their example project, so ``FR-1.1`` in one
+    project's spec.md is unrelated to ``FR-1.1`` in another. Definitions come
+    from spec.md and references from the ``_Requirements:`` lines in
+    tasks.md. Dangling, duplicate and uncovered IDs are kept as sets that are
+    updated for the affected keys only when a document changes, so each query
+    is a set lookup. The per-document entries are cached on disk and keyed by
+    size and mtime, so unchanged documents are never re-read.
+    """
+    
+    VERSION = 1
+    INDEXED_FILES = {"spec.md": "spec", "tasks.md": "tasks"}
+    
+    def __init__(self, cache_path: Optional[str] = None):
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.documents: Dict[str, Dict[str, Any]] = {}
+        self.definitions: Dict[Tuple[str, str], List[RequirementSite]] = defaultdict(list)
+        self.references: Dict[Tuple[str, str], List[RequirementSite]] = defaultdict(list)
+        self.project_keys: Dict[str, Set[Tuple[str, str]]] = defaultdict(set)
+        self.projects_with_tasks: Counter = Counter()
+        self.dangling: Set[Tuple[str, str]] = set()
+        self.duplicates: Set[Tuple[str, str]] = set()
+        self.uncovered: Set[Tuple[str, str]] = set()
+        self.reindexed_documents = 0
+        self._load()
+    
+    def build(self, projects: Iterable[Path]):
+        """Index spec.md and tasks.md for every project, dropping vanished documents."""
+        seen = set()
+        for project in projects:
+            for file_name in self.INDEXED_FILES:
+                path = project / file_name
+                seen.add(str(path))
+                self.update_document(path)
+        
+        for stale_path in set(self.documents) - seen:
+            self.remove_document(Path(stale_path))
+    
+    def update_document(self, path: Path) -> bool:
+        """Re-index a document if it changed on disk; returns True if re-indexed."""
+        key = str(path)
+        try:
+            stat = path.stat()
+        except OSError:
+            if key in self.documents:
+                self.remove_document(path)
+                return True
+            return False
+        
+        entry = self.documents.get(key)
+        if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            return False
+        
+        with open(path, 'r', encoding='utf-8') as f:
+            self.index_content(path, f.read(), (stat.st_size, stat.st_mtime_ns))
+        return True
+    
+    def index_content(self, path: Path, content: str, signature: Tuple[int, int] = (-1, -1),
+                      scan: Optional[DocumentScan] = None):
+        """Index a document from content, e.g. an unsaved editor buffer.
+        
+        The default signature never matches a file on disk, so the next
+        ``update_document`` re-reads the saved file. ``scan`` may be passed
+        when the content has already been scanned.
+        """
+        key = str(path)
+        scan = scan or scan_document(content)
+        kind = self.INDEXED_FILES[path.name]
+        new_entry = {
+            "size": signature[0],
+            "mtime_ns": signature[1],
+            "project": str(path.parent),
+            "kind": kind,
+            "definitions": scan.requirement_definitions if kind == "spec" else {},
+            "references": scan.requirement_refs if kind == "tasks" else {}
+        }
+        
+        entry = self.documents.get(key)
+        if entry is not None and entry["project"] == new_entry["project"]:
+            self._replace_entry(key, entry, new_entry)
+        else:
+            self.remove_document(path)
+            self._add_entry(key, new_entry)
+        self.reindexed_documents += 1
+    
+    def remove_document(self, path: Path):
+        """Withdraw a document's definitions and references from the index."""
+        key = str(path)
+        entry = self.documents.pop(key, None)
+        if entry is None:
+            return
+        
+        project = entry["project"]
+        touched = set()
+        for req_id in entry["definitions"]:
+            touched.add((project, req_id))
+            self.definitions[(project, req_id)] = [
+                site for site in self.definitions[(project, req_id)] if site.path != key
+            ]
+        for req_id in entry["references"]:
+            touched.add((project, req_id))
+            self.references[(project, req_id)] = [
+                site for site in self.references[(project, req_id)] if site.path != key
+            ]
+        if entry["kind"] == "tasks":
+            self.projects_with_tasks[project] -= 1
+            touched.update(self.project_keys[project])
+        
+        self._refresh(touched)
+    
+    def _add_entry(self, key: str, entry: Dict[str, Any]):
+        self.documents[key] = entry
+        project = entry["project"]
+        touched = set()
+        for req_id, lines in entry["definitions"].items():
+            touched.add((project, req_id))
+            self.definitions[(project, req_id)].extend(RequirementSite(key, line) for line in lines)
+        for req_id, lines in entry["references"].items():
+            touched.add((project, req_id))
+            self.references[(project, req_id)].extend(RequirementSite(key, line) for line in lines)
+        if entry["kind"] == "tasks":
+            self.projects_with_tasks[project] += 1
+            touched.update(self.project_keys[project])
+        
+        self._refresh(touched)
+    
+    def _replace_entry(self, key: str, entry: Dict[str, Any], new_entry: Dict[str, Any]):
+        """Swap a document's entry, touching only the IDs whose sites moved."""
+        self.documents[key] = new_entry
+        project = entry["project"]
+        touched = set()
+        for field_name, sites_by_key in (("definitions", self.definitions), ("references", self.references)):
+            old_ids, new_ids = entry[field_name], new_entry[field_name]
+            for req_id in old_ids.keys() | new_ids.keys():
+                if old_ids.get(req_id) == new_ids.get(req_id):
+                    continue
+                touched.add((project, req_id))
+                sites = [site for site in sites_by_key[(project, req_id)] if site.path != key]
+                sites.extend(RequirementSite(key, line) for line in new_ids.get(req_id, ()))
+                sites_by_key[(project, req_id)] = sites
+        
+        self._refresh(touched)
+    
+    def _refresh(self, keys: Iterable[Tuple[str, str]]):
+        """Recompute the query sets for the given (project, id) keys only."""
+        for key in keys:
+            project = key[0]
+            defined = self.definitions.get(key)
+            referenced = self.references.get(key)
+            
+            if not defined and not referenced:
+                self.definitions.pop(key, None)
+                self.references.pop(key, None)
+                self.project_keys[project].discard(key)
+            else:
+                self.project_keys[project].add(key)
+            
+            self._set_flag(self.dangling, key, bool(referenced) and not defined)
+            self._set_flag(self.duplicates, key, bool(defined) and len(defined) > 1)
+            self._set_flag(self.uncovered, key,
+                           bool(defined) and not referenced and self.projects_with_tasks[project] > 0)
+    
+    @staticmethod
+    def _set_flag(flags: Set[Tuple[str, str]], key: Tuple[str, str], value: bool):
+        if value:
+            flags.add(key)
+        else:
+            flags.discard(key)
+    
+    def is_dangling(self, project: str, req_id: str) -> bool:
+        return (project, req_id) in self.dangling
+    
+    def is_duplicate(self, project: str, req_id: str) -> bool:
+        return (project, req_id) in self.duplicates
+    
+    def is_uncovered(self, project: str, req_id: str) -> bool:
+        return (project, req_id) in self.uncovered
+    
+    def definition_sites(self, project: str, req_id: str) -> List[RequirementSite]:
+        return self.definitions.get((project, req_id), [])
+    
+    def reference_sites(self, project: str, req_id: str) -> List[RequirementSite]:
+        return self.references.get((project, req_id), [])
+    
+    def _load(self):
+        """Rebuild the in-memory maps from the on-disk document cache."""
+        if not self.cache_path or not self.cache_path.exists():
+            return
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") != self.VERSION:
+            return
+        for key, entry in data.get("documents", {}).items():
+            self._add_entry(key, entry)
+    
+    def save(self):
+        """Write the document cache atomically."""
+        if not self.cache_path:
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_path.with_suffix(".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"version": self.VERSION, "documents": self.documents}, f)
+        os.replace(tmp_path, self.cache_path)
+
+@dataclass(frozen=True)
+class ProjectResult:
+    """Immutable validation outcome for a single example project."""
+    project_path: str
+    errors: Tuple[str, ...]
+    warnings: Tuple[str, ...]
+    files: int = 0
+    bytes_read: int = 0
+    rule_evaluations: int = 0
+    duration: float = 0.0
+
+def _validate_project_worker(args: Tuple[str, str]) -> ProjectResult:
+    """Validate one project in a worker process with its own collector."""
+    examples_dir, project_path = args
+    return ExampleValidator(examples_dir).validate_project(Path(project_path))
 
 class ExampleValidator:
     """Validates SDD examples for completeness and correctness."""
     
-    def __init__(self, examples_dir: str = "examples"):
+    def __init__(self, examples_dir: str = "examples", index_cache: Optional[str] = None):
         self.examples_dir = Path(examples_dir)
         self.errors: List[str] = []
         self.warnings: List[str] = []
+        self.index_cache = index_cache
+        self.buffers: Dict[str, str] = {}
+        self.scans: Dict[str, DocumentScan] = {}
+        self.project_results: List[ProjectResult] = []
+        self.requirement_index: Optional[RequirementIndex] = None
+        # {"kind", "project", "requirement", "message"} per traceability finding
+        self.traceability: List[Dict[str, str]] = []
+        self.files = 0
+        self.bytes_read = 0
+        self.rule_evaluations = 0
+        
+    def validate_all_examples(self, jobs: Optional[int] = 1,
+                              changed_paths: Optional[Iterable[Path]] = None,
+                              shard: Optional[ShardSelector] = None,
+                              records: Optional[RecordWriter] = None) -> bool:
+        """Validate all examples in the examples directory.
         
-    def validate_all_examples(self) -> bool:
-        """Validate all examples in the examples directory."""
+        ``jobs`` sets the worker pool size (``None`` picks one per CPU).
+        When ``changed_paths`` is given, only projects containing one of
+        those paths are validated, and with ``shard`` only the projects it
+        owns; the directory structure is checked on the primary shard.
+        Findings are emitted to ``records`` as soon as they are known.
+        """
         print("🔍 Validating SDD examples...")
+        shard = shard or ShardSelector("validate-examples")
         
         if not self.examples_dir.exists():
             self.errors.append(f"Examples directory '{self.examples_dir}' not found")
+            if records is not None:
+                records.emit("repository", errors=list(self.errors), warnings=[])
             return False
             
         # Validate directory structure
-        self._validate_directory_structure()
+        if shard.primary:
+            self._validate_directory_structure()
+            if records is not None:
+                records.emit("repository", errors=list(self.errors), warnings=list(self.warnings))
         
         # Find and validate all example projects
-        example_projects = self._find_example_projects()
+        with span("walk", self.examples_dir):
+            all_projects = self._find_example_projects()
+        example_projects = shard.select(all_projects)
         
-        for project_path in example_projects:
-            self._validate_example_project(project_path)
+        if changed_paths is not None:
+            example_projects = self._select_changed_projects(example_projects, changed_paths)
+            print(f"   {len(example_projects)} project(s) affected by changes")
+        
+        self.project_results = []
+        for result in self._validate_projects(example_projects, jobs):
+            self.project_results.append(result)
+            self.errors.extend(result.errors)
+            self.warnings.extend(result.warnings)
+            if records is not None:
+                records.emit("project", path=result.project_path, errors=list(result.errors),
+                             warnings=list(result.warnings), duration=result.duration)
+        
+        # Cross-check task references against spec definitions
+        with span("parse", "requirement index"):
+            index = RequirementIndex(self.index_cache)
+            index.build(all_projects)
+            index.save()
+        self.requirement_index = index
+        with span("validate", "traceability"):
+            self._validate_traceability(index, example_projects)
+        if records is not None:
+            for finding in self.traceability:
+                records.emit("traceability", **finding)
             
         # Print results
-        self._print_results()
+        with span("report", "examples"):
+            self._print_results()
         
         return len(self.errors) == 0
     
+    def _validate_traceability(self, index: RequirementIndex, projects: List[Path]):
+        """Report dangling, duplicate and uncovered requirement IDs per project."""
+        selected = {str(project) for project in projects}
+        # One dangling/duplicate/uncovered check per requirement ID
+        self.rule_evaluations += sum(len(index.project_keys.get(project, ())) for project in selected)
+        
+        for kind, flagged in zip(TRACEABILITY_KINDS, (index.dangling, index.duplicates, index.uncovered)):
+            for project, req_id in sorted(flagged):
+                if project not in selected:
+                    continue
+                project_name = f"{Path(project).parent.name}/{Path(project).name}"
+                if kind == "dangling":
+                    lines = self._format_lines(index.reference_sites(project, req_id))
+                    message = f"{project_name}: tasks.md references undefined requirement {req_id} ({lines})"
+                    self.errors.append(message)
+                elif kind == "duplicate":
+                    lines = self._format_lines(index.definition_sites(project, req_id))
+                    message = f"{project_name}: spec.md defines requirement {req_id} more than once ({lines})"
+                    self.errors.append(message)
+                else:
+                    message = f"{project_name}: requirement {req_id} is not covered by any task in tasks.md"
+                    self.warnings.append(message)
+                self.traceability.append({"kind": kind, "project": project, "requirement": req_id,
+                                          "message": message})
+    
+    @staticmethod
+    def _format_lines(sites: List[RequirementSite]) -> str:
+        lines = sorted({site.line for site in sites})
+        label = "line" if len(lines) == 1 else "lines"
+        return f"{label} {', '.join(str(line) for line in lines)}"
+    
     def _validate_directory_structure(self):
         """Validate the overall examples directory structure."""
         required_dirs = ["greenfield", "legacy-integration", "feature-addition", "workflows"]
@@ -58,17 +471,66 @@ class ExampleValidator:
             self._validate_readme_content(readme_path)
     
     def _find_example_projects(self) -> List[Path]:
-        """Find all example project directories."""
+        """Find all example project directories in a stable order."""
         projects = []
         
-        for category_dir in self.examples_dir.iterdir():
+        for category_dir in sorted(self.examples_dir.iterdir()):
             if category_dir.is_dir() and category_dir.name != "__pycache__":
-                for project_dir in category_dir.iterdir():
+                for project_dir in sorted(category_dir.iterdir()):
                     if project_dir.is_dir():
                         projects.append(project_dir)
                         
         return projects
     
+    def _select_changed_projects(self, projects: List[Path], changed_paths: Iterable[Path]) -> List[Path]:
+        """Keep only projects that contain at least one changed path."""
+        changed_dirs: Set[Path] = set()
+        for path in changed_paths:
+            changed_dirs.update(Path(path).resolve().parents)
+        
+        return [project for project in projects if project.resolve() in changed_dirs]
+    
+    def _validate_projects(self, projects: List[Path], jobs: Optional[int]) -> Iterator[ProjectResult]:
+        """Validate projects serially or in a worker pool, yielding results in input order as they finish."""
+        if jobs is None:
+            jobs = os.cpu_count() or 1
+        jobs = min(jobs, len(projects))
+        
+        if jobs <= 1 or len(projects) < PARALLEL_THRESHOLD:
+            for project in projects:
+                yield ExampleValidator(str(self.examples_dir)).validate_project(project)
+            return
+        
+        work = [(str(self.examples_dir), str(project)) for project in projects]
+        from concurrent.futures import ProcessPoolExecutor
+        chunksize = max(1, len(work) // (jobs * 4))
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            # map() yields in submission order, so merging is deterministic
+            yield from executor.map(_validate_project_worker, work, chunksize=chunksize)
+    
+    def validate_project(self, project_path: Path, buffers: Optional[Dict[str, str]] = None,
+                         scans: Optional[Dict[str, DocumentScan]] = None) -> ProjectResult:
+        """Validate a single project and return its findings without side effects.
+        
+        ``buffers`` maps file names (e.g. ``spec.md``) to content that is
+        used instead of the file on disk, and ``scans`` to existing scans of
+        a file's current content, which are used instead of reading it.
+        """
+        start_time = time.perf_counter()
+        validator = ExampleValidator(str(self.examples_dir))
+        validator.buffers = buffers or {}
+        validator.scans = scans or {}
+        validator._validate_example_project(project_path)
+        return ProjectResult(
+            project_path=str(project_path),
+            errors=tuple(validator.errors),
+            warnings=tuple(validator.warnings),
+            files=validator.files,
+            bytes_read=validator.bytes_read,
+            rule_evaluations=validator.rule_evaluations,
+            duration=time.perf_counter() - start_time
+        )
+    
     def _validate_example_project(self, project_path: Path):
         """Validate a single example project."""
         project_name = f"{project_path.parent.name}/{project_path.name}"
@@ -79,41 +541,51 @@ class ExampleValidator:
         
         for file_name in required_files:
             file_path = project_path / file_name
-            if not file_path.exists():
+            if not file_path.exists() and file_name not in self.buffers:
                 self.errors.append(f"{project_name}: Missing required file {file_name}")
             else:
                 self._validate_file_content(file_path, project_name)
                 
         for file_name in optional_files:
             file_path = project_path / file_name
-            if file_path.exists():
+            if file_path.exists() or file_name in self.buffers:
                 self._validate_file_content(file_path, project_name)
     
     def _validate_file_content(self, file_path: Path, project_name: str):
         """Validate the content of a specific file."""
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-        except Exception as e:
-            self.errors.append(f"{project_name}: Error reading {file_path.name}: {e}")
-            return
-            
         file_type = file_path.name
+        scan = self.scans.get(file_type)
+        if scan is None:
+            content = self.buffers.get(file_type)
+            if content is None:
+                try:
+                    with span("read", file_path), open(file_path, 'r', encoding='utf-8') as f:
+                        content = f.read()
+                        self.bytes_read += os.fstat(f.fileno()).st_size
+                except Exception as e:
+                    self.errors.append(f"{project_name}: Error reading {file_path.name}: {e}")
+                    return
+            with span("parse", file_path):
+                scan = scan_document(content, shall_limit=MIN_SHALL_STATEMENTS)
+        self.files += 1
         
-        if file_type == "README.md":
-            self._validate_project_readme(content, project_name)
-        elif file_type == "spec.md":
-            self._validate_spec_file(content, project_name)
-        elif file_type == "plan.md":
-            self._validate_plan_file(content, project_name)
-        elif file_type == "tasks.md":
-            self._validate_tasks_file(content, project_name)
+        with span("validate", file_path):
+            if file_type == "README.md":
+                self._validate_project_readme(scan, project_name)
+            elif file_type == "spec.md":
+                self._validate_spec_file(scan, project_name)
+            elif file_type == "plan.md":
+                self._validate_plan_file(scan, project_name)
+            elif file_type == "tasks.md":
+                self._validate_tasks_file(scan, project_name)
     
     def _validate_readme_content(self, readme_path: Path):
         """Validate examples directory README content."""
         try:
             with open(readme_path, 'r', encoding='utf-8') as f:
                 content = f.read()
+                self.bytes_read += os.fstat(f.fileno()).st_size
+            self.files += 1
         except Exception as e:
             self.errors.append(f"Error reading examples README.md: {e}")
             return
@@ -124,11 +596,13 @@ class ExampleValidator:
             "## How to Use These Examples"
         ]
         
+        scan = scan_document(content)
+        self.rule_evaluations += len(required_sections)
         for section in required_sections:
-            if section not in content:
+            if not scan.has_section(section):
                 self.errors.append(f"Examples README.md missing section: {section}")
     
-    def _validate_project_readme(self, content: str, project_name: str):
+    def _validate_project_readme(self, scan: DocumentScan, project_name: str):
         """Validate project README content."""
         required_sections = [
             "## Project Context",
@@ -137,15 +611,16 @@ class ExampleValidator:
             "## SDD Workflow Files"
         ]
         
+        self.rule_evaluations += len(required_sections) + 1
         for section in required_sections:
-            if section not in content:
+            if not scan.has_section(section):
                 self.warnings.append(f"{project_name}: README.md missing recommended section: {section}")
                 
         # Check for validation results section
-        if "## Validation Results" not in content:
+        if not scan.has_section("## Validation Results"):
             self.warnings.append(f"{project_name}: README.md missing validation results section")
     
-    def _validate_spec_file(self, content: str, project_name: str):
+    def _validate_spec_file(self, scan: DocumentScan, project_name: str):
         """Validate specification file content."""
         required_sections = [
             "# ",  # Title
@@ -154,30 +629,22 @@ class ExampleValidator:
             "## Technical Requirements"
         ]
         
+        self.rule_evaluations += len(required_sections) + 3
         for section in required_sections:
-            if section not in content:
+            if not scan.has_section(section):
                 self.errors.append(f"{project_name}: spec.md missing required section: {section}")
         
         # Check for requirement format (FR-X.X, TR-X.X)
-        fr_pattern = r'FR-\d+\.\d+'
-        tr_pattern = r'TR-\d+\.\d+'
-        
-        fr_matches = re.findall(fr_pattern, content)
-        tr_matches = re.findall(tr_pattern, content)
-        
-        if not fr_matches:
+        if not scan.has_requirement_prefix("FR"):
             self.errors.append(f"{project_name}: spec.md missing functional requirements (FR-X.X format)")
-        if not tr_matches:
+        if not scan.has_requirement_prefix("TR"):
             self.errors.append(f"{project_name}: spec.md missing technical requirements (TR-X.X format)")
             
         # Check for SHALL statements
-        shall_pattern = r'\bSHALL\b'
-        shall_matches = re.findall(shall_pattern, content)
-        
-        if len(shall_matches) < 5:
-            self.warnings.append(f"{project_name}: spec.md has few SHALL statements ({len(shall_matches)}), consider more specific requirements")
+        if scan.shall_count < MIN_SHALL_STATEMENTS:
+            self.warnings.append(f"{project_name}: spec.md has few SHALL statements ({scan.shall_count}), consider more specific requirements")
     
-    def _validate_plan_file(self, content: str, project_name: str):
+    def _validate_plan_file(self, scan: DocumentScan, project_name: str):
         """Validate technical plan file content."""
         recommended_sections = [
             "## Architecture Overview",
@@ -186,40 +653,60 @@ class ExampleValidator:
             "## Security Architecture"
         ]
         
+        self.rule_evaluations += len(recommended_sections) + 1
         for section in recommended_sections:
-            if section not in content:
+            if not scan.has_section(section):
                 self.warnings.append(f"{project_name}: plan.md missing recommended section: {section}")
                 
         # Check for code blocks (architecture diagrams, schemas)
-        code_block_pattern = r'```'
-        code_blocks = re.findall(code_block_pattern, content)
-        
-        if len(code_blocks) < 4:  # At least 2 code blocks (opening and closing)
+        if scan.code_fence_count < 4:  # At least 2 code blocks (opening and closing)
             self.warnings.append(f"{project_name}: plan.md should include code examples or diagrams")
     
-    def _validate_tasks_file(self, content: str, project_name: str):
+    def _validate_tasks_file(self, scan: DocumentScan, project_name: str):
         """Validate implementation tasks file content."""
+        self.rule_evaluations += 3
         # Check for task format with checkboxes
-        task_pattern = r'- \[ \] \d+\.'
-        task_matches = re.findall(task_pattern, content)
-        
-        if not task_matches:
+        if not scan.task_count:
             self.errors.append(f"{project_name}: tasks.md missing properly formatted tasks (- [ ] X. format)")
             
         # Check for requirement references
-        req_ref_pattern = r'_Requirements?: [A-Z]+-\d+\.\d+'
-        req_refs = re.findall(req_ref_pattern, content)
-        
-        if not req_refs:
+        if not scan.requirement_refs:
             self.errors.append(f"{project_name}: tasks.md missing requirement references (_Requirements: XX-X.X_)")
             
         # Check for sub-tasks
-        subtask_pattern = r'- \[ \] \d+\.\d+'
-        subtask_matches = re.findall(subtask_pattern, content)
-        
-        if len(subtask_matches) < 2:
+        if scan.subtask_count < 2:
             self.warnings.append(f"{project_name}: tasks.md should include sub-tasks for complex features")
     
+    def metrics(self, duration: float) -> MetricsRegistry:
+        """OpenMetrics for the last validate_all_examples() run."""
+        results = self.project_results
+        caches = {}
+        if self.requirement_index is not None:
+            reindexed = self.requirement_index.reindexed_documents
+            caches["requirement-index"] = (max(0, len(self.requirement_index.documents) - reindexed), reindexed)
+        return validator_metrics(
+            "examples",
+            duration=duration,
+            files=self.files + sum(result.files for result in results),
+            bytes_read=self.bytes_read + sum(result.bytes_read for result in results),
+            errors=len(self.errors),
+            warnings=len(self.warnings),
+            rule_evaluations=self.rule_evaluations + sum(result.rule_evaluations for result in results),
+            file_durations=[result.duration for result in results],
+            caches=caches
+        )
+    
+    @staticmethod
+    def save_report(report: Dict[str, Any], output_path: str):
+        """Save the validation report to file."""
+        output_file = Path(output_path)
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        
+        with open(output_file, 'w') as f:
+            json.dump(report, f, indent=2)
+        
+        print(f"\n📊 Example validation report saved to: {output_file}")
+    
     def _print_results(self):
         """Print validation results."""
         if self.errors:
@@ -237,10 +724,126 @@ class ExampleValidator:
         elif not self.errors:
             print(f"\n✅ Validation passed with {len(self.warnings)} warnings")
 
+def get_changed_paths(base: str = "HEAD") -> List[Path]:
+    """Paths changed relative to ``base`` in git, plus untracked files."""
+    repo_root = Path(subprocess.run(
+        ["git", "rev-parse", "--show-toplevel"],
+        capture_output=True, text=True, check=True
+    ).stdout.strip())
+    
+    changed = subprocess.run(
+        ["git", "diff", "--name-only", base],
+        capture_output=True, text=True, check=True, cwd=repo_root
+    ).stdout.splitlines()
+    untracked = subprocess.run(
+        ["git", "ls-files", "--others", "--exclude-standard"],
+        capture_output=True, text=True, check=True, cwd=repo_root
+    ).stdout.splitlines()
+    
+    return [repo_root / path for path in changed + untracked if path]
+
+class ExampleReportReducer(ReportReducer):
+    """Renders every finding, plus per-project and traceability detail, from the records."""
+    
+    def __init__(self):
+        super().__init__()
+        # Directory-structure findings, reported before the per-project ones
+        self.errors: List[str] = []
+        self.warnings: List[str] = []
+        self.projects: List[Dict[str, Any]] = []
+        self.traceability: List[Dict[str, str]] = []
+        self.timings: Dict[str, float] = {}
+    
+    def reduce_repository(self, record: Dict[str, Any]):
+        self.errors.extend(record["errors"])
+        self.warnings.extend(record["warnings"])
+    
+    def reduce_project(self, record: Dict[str, Any]):
+        self.projects.append({"path": record["path"], "errors": record["errors"], "warnings": record["warnings"]})
+        self.timings[record["path"]] = round(record["duration"], 6)
+    
+    def reduce_traceability(self, record: Dict[str, Any]):
+        self.traceability.append({key: record[key] for key in ("kind", "project", "requirement", "message")})
+    
+    def report(self) -> Dict[str, Any]:
+        projects = sorted(self.projects, key=lambda project: path_order(project["path"]))
+        traceability = sorted(self.traceability, key=lambda finding: (TRACEABILITY_KINDS.index(finding["kind"]),
+                                                                      finding["project"], finding["requirement"]))
+        errors = self.errors + [error for project in projects for error in project["errors"]]
+        errors += [finding["message"] for finding in traceability if finding["kind"] != "uncovered"]
+        warnings = self.warnings + [warning for project in projects for warning in project["warnings"]]
+        warnings += [finding["message"] for finding in traceability if finding["kind"] == "uncovered"]
+        return {
+            "summary": {
+                "projects": len(projects),
+                "errors": len(errors),
+                "warnings": len(warnings),
+                "duration": round(self.duration, 3)
+            },
+            "errors": errors,
+            "warnings": warnings,
+            "projects": projects,
+            "traceability": traceability,
+            "timings": {project["path"]: self.timings[project["path"]] for project in projects}
+        }
+    
+    def failure(self, report: Dict[str, Any]) -> Optional[str]:
+        errors = report['summary']['errors']
+        return f"Example validation failed with {errors} errors" if errors else None
+
+REPORT_REDUCER = ExampleReportReducer
+
 def main():
     """Main validation function."""
-    validator = ExampleValidator()
-    success = validator.validate_all_examples()
+    parser = argparse.ArgumentParser(description='Validate SDD example specifications and workflows')
+    parser.add_argument('--examples-dir', default='examples',
+                       help='Directory containing example projects')
+    parser.add_argument('--jobs', '-j', type=int, default=None,
+                       help='Worker processes for project validation (default: one per CPU)')
+    parser.add_argument('--changed-only', action='store_true',
+                       help='Only validate projects with changes according to git diff')
+    parser.add_argument('--base', default='HEAD',
+                       help='Git revision to diff against with --changed-only')
+    parser.add_argument('--index-cache', default='.sdd-cache/requirement-index.json',
+                       help='Requirement index cache file (empty to disable)')
+    parser.add_argument('--output', default='test-results/example-validation.json',
+                       help='Where to write the JSON report')
+    add_metrics_argument(parser, "validate-examples")
+    add_records_argument(parser, "validate-examples")
+    add_shard_arguments(parser)
+    add_instrumentation_arguments(parser)
+    
+    args = parser.parse_args()
+    start_instrumentation(args, "validate-examples")
+    
+    if args.merge:
+        report = merge_streams(parser, args.merge, ExampleReportReducer(), "validate-examples")
+        ExampleValidator.save_report(report, args.output)
+        summary = report['summary']
+        print(f"🧩 Merged {len(args.merge)} shard record streams: {summary['projects']} project(s), "
+              f"{summary['errors']} error(s), {summary['warnings']} warning(s)")
+        sys.exit(1 if summary['errors'] else 0)
+    
+    changed_paths = None
+    if args.changed_only:
+        try:
+            changed_paths = get_changed_paths(args.base)
+        except (OSError, subprocess.CalledProcessError) as e:
+            print(f"❌ Could not determine changed files: {e}")
+            sys.exit(1)
+    
+    validator = ExampleValidator(args.examples_dir, index_cache=args.index_cache or None)
+    shard = shard_selector(parser, args, "validate-examples")
+    records = RecordWriter(args.records, "validate-examples", ExampleReportReducer(), shard.shard)
+    start_time = time.perf_counter()
+    with span("suite", "examples"):
+        success = validator.validate_all_examples(jobs=args.jobs, changed_paths=changed_paths, shard=shard,
+                                                  records=records)
+    duration = time.perf_counter() - start_time
+    
+    validator.save_report(records.close(duration), args.output)
+    if args.metrics:
+        validator.metrics(duration).write(args.metrics)
     
     if not success:
         sys.exit(1)
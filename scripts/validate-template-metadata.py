@@ -3,83 +3,94 @@
 Template Metadata Validation Script
 
 Validates template metadata against the schema and checks template content
-against the metadata specifications.
+against the metadata specifications. Each template's findings are
+streamed as a record (see result_records.py) and the JSON report is
+rendered from the records. With --shard, only the templates a shard owns
+are validated; --merge renders the report from the record streams of all
+shards.
 """
 
 import json
 import os
 import re
 import sys
+import time
 from pathlib import Path
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Optional, Tuple
 import argparse
 
+from openmetrics import MetricsRegistry, add_metrics_argument, validator_metrics
+from result_records import RecordWriter, ReportReducer, add_records_argument, merge_streams
+from schema_compiler import compile_schema
+from sharding import ShardSelector, add_shard_arguments, path_order, shard_selector
+from template_inheritance import InheritanceError, MetadataResolver, display_path
+from tracing import add_instrumentation_arguments, span, start_instrumentation
+
 class TemplateValidator:
-    def __init__(self, schema_path: str):
+    def __init__(self, schema_path: str, resolver: MetadataResolver = None):
         """Initialize validator with schema."""
         with open(schema_path, 'r') as f:
             self.schema = json.load(f)
+        # Compiled once per schema hash and shared by every validator instance
+        self.schema_validator = compile_schema(self.schema)
         self.errors = []
         self.warnings = []
+        self.files = 0
+        self.bytes_read = 0
+        self.rule_evaluations = 0
+        self.file_durations: List[float] = []
+        # Shared, memoized resolution of `extends` chains
+        self.resolver = resolver or MetadataResolver(str(Path(schema_path).parent))
     
     def validate_metadata_file(self, metadata_path: str) -> bool:
-        """Validate a metadata file against the schema."""
-        try:
-            with open(metadata_path, 'r') as f:
-                metadata = json.load(f)
-            
-            # Basic schema validation (simplified)
-            return self._validate_metadata_structure(metadata, metadata_path)
+        """Validate a metadata file against the schema.
         
-        except json.JSONDecodeError as e:
-            self.errors.append(f"Invalid JSON in {metadata_path}: {e}")
-            return False
-        except FileNotFoundError:
-            self.errors.append(f"Metadata file not found: {metadata_path}")
+        The file is validated after merging its `extends` chain, and the
+        outcome is memoized by the resolver until the file or an ancestor
+        changes.
+        """
+        try:
+            with span("validate", metadata_path):
+                errors = self.resolver.validated(
+                    Path(metadata_path), "structure",
+                    lambda metadata: self._metadata_structure_errors(metadata, metadata_path)
+                )
+        except InheritanceError as e:
+            self.errors.append(f"{metadata_path}: {e}")
             return False
+        
+        self.errors.extend(errors)
+        return not errors
     
     def _validate_metadata_structure(self, metadata: Dict, file_path: str) -> bool:
         """Validate metadata structure against schema."""
-        valid = True
-        
-        # Check required top-level keys
-        required_keys = ['template', 'structure', 'maintenance']
-        for key in required_keys:
-            if key not in metadata:
-                self.errors.append(f"Missing required key '{key}' in {file_path}")
-                valid = False
-        
-        # Validate template section
-        if 'template' in metadata:
-            template = metadata['template']
-            template_required = ['name', 'version', 'type', 'domain', 'complexity', 'audience', 'description']
-            for key in template_required:
-                if key not in template:
-                    self.errors.append(f"Missing required template key '{key}' in {file_path}")
-                    valid = False
-            
-            # Validate version format
-            if 'version' in template:
-                if not re.match(r'^\d+\.\d+\.\d+$', template['version']):
-                    self.errors.append(f"Invalid version format in {file_path}: {template['version']}")
-                    valid = False
-        
-        return valid
+        errors = self._metadata_structure_errors(metadata, file_path)
+        self.errors.extend(errors)
+        return not errors
+    
+    def _metadata_structure_errors(self, metadata: Dict, file_path: str) -> List[str]:
+        """Collect schema violations for metadata using the compiled schema."""
+        return [f"Schema violation in {file_path}: {error}" for error in self.schema_validator(metadata)]
     
-    def validate_template_content(self, template_path: str, metadata_path: str) -> bool:
-        """Validate template content against its metadata."""
+    def validate_template_content(self, template_path: str, metadata_path: str,
+                                  content: Optional[str] = None) -> bool:
+        """Validate template content (the file, or ``content`` for it) against its metadata."""
         if not os.path.exists(metadata_path):
             self.warnings.append(f"No metadata file found for template: {template_path}")
             return True
         
         try:
-            with open(metadata_path, 'r') as f:
-                metadata = json.load(f)
+            with span("parse", metadata_path):
+                metadata = self.resolver.resolve(Path(metadata_path))
             
-            with open(template_path, 'r') as f:
-                content = f.read()
+            if content is None:
+                with span("read", template_path), open(template_path, 'r') as f:
+                    content = f.read()
+                    self.files += 1
+                    self.bytes_read += os.fstat(f.fileno()).st_size
             
-            return self._validate_content_against_metadata(content, metadata, template_path)
+            with span("validate", template_path):
+                return self._validate_content_against_metadata(content, metadata, template_path)
         
         except Exception as e:
             self.errors.append(f"Error validating {template_path}: {e}")
@@ -93,6 +104,7 @@ class TemplateValidator:
         if 'structure' in metadata and 'sections' in metadata['structure']:
             for section in metadata['structure']['sections']:
                 if section.get('required', False):
+                    self.rule_evaluations += 1
                     section_pattern = f"#{1,6}\\s+{re.escape(section['name'])}"
                     if not re.search(section_pattern, content, re.IGNORECASE):
                         self.errors.append(f"Required section '{section['name']}' not found in {template_path}")
@@ -103,12 +115,14 @@ class TemplateValidator:
             for placeholder in metadata['structure']['placeholders']:
                 placeholder_pattern = f"\\[{re.escape(placeholder['name'])}\\]"
                 if placeholder.get('required', False):
+                    self.rule_evaluations += 1
                     if not re.search(placeholder_pattern, content):
                         self.warnings.append(f"Required placeholder '[{placeholder['name']}]' not found in {template_path}")
         
         # Run validation rules
         if 'validation' in metadata and 'rules' in metadata['validation']:
             for rule in metadata['validation']['rules']:
+                self.rule_evaluations += 1
                 valid = self._apply_validation_rule(rule, content, template_path) and valid
         
         return valid
@@ -141,37 +155,88 @@ class TemplateValidator:
         
         return True
     
-    def validate_template_directory(self, template_dir: str) -> Tuple[int, int]:
-        """Validate all templates in a directory."""
+    def validate_template_directory(self, template_dir: str, shard: Optional[ShardSelector] = None,
+                                    records: Optional[RecordWriter] = None) -> Tuple[int, int]:
+        """Validate all templates in a directory, or those ``shard`` owns.
+        
+        Each template's findings are emitted to ``records`` once it is validated.
+        """
         template_dir = Path(template_dir)
+        shard = shard or ShardSelector("validate-template-metadata")
         validated_count = 0
         error_count = 0
         
-        for template_file in template_dir.rglob("*.md"):
+        # Build the inheritance graph once and report cycles up front
+        with span("walk", template_dir):
+            self.resolver.scan()
+        cycles = self.resolver.cycles()
+        # Cycle members cannot be resolved; their cycle is their one error
+        cyclic = {node for cycle in cycles for node in cycle}
+        if shard.primary:
+            for cycle in cycles:
+                self.errors.append("Inheritance cycle: " + " -> ".join(display_path(node) for node in cycle + cycle[:1]))
+                error_count += 1
+            if records is not None:
+                records.emit("repository", errors=list(self.errors), warnings=list(self.warnings))
+        
+        for template_file in sorted(template_dir.rglob("*.md")):
             # Skip README files
-            if template_file.name.lower() == 'readme.md':
+            if template_file.name.lower() == 'readme.md' or not shard.owns(str(template_file)):
                 continue
             
             # Find corresponding metadata file
             metadata_file = template_file.with_suffix('.meta.json')
             
             print(f"Validating: {template_file}")
+            start_time = time.perf_counter()
+            errors_before, warnings_before = len(self.errors), len(self.warnings)
             
-            # Validate metadata if it exists
-            if metadata_file.exists():
+            # Validate metadata if it exists and is not on a cycle reported above
+            if not metadata_file.exists():
+                self.warnings.append(f"No metadata file for template: {template_file}")
+            elif metadata_file.resolve() not in cyclic:
                 if not self.validate_metadata_file(str(metadata_file)):
                     error_count += 1
                 
                 # Validate content against metadata
                 if not self.validate_template_content(str(template_file), str(metadata_file)):
                     error_count += 1
-            else:
-                self.warnings.append(f"No metadata file for template: {template_file}")
             
+            duration = time.perf_counter() - start_time
+            self.file_durations.append(duration)
+            if records is not None:
+                records.emit("template", path=str(template_file), errors=self.errors[errors_before:],
+                             warnings=self.warnings[warnings_before:], duration=duration)
             validated_count += 1
         
         return validated_count, error_count
     
+    @staticmethod
+    def save_report(report: Dict[str, Any], output_path: str):
+        """Save the validation report to file."""
+        output_file = Path(output_path)
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        
+        with open(output_file, 'w') as f:
+            json.dump(report, f, indent=2)
+        
+        print(f"\n📊 Template metadata report saved to: {output_file}")
+    
+    def metrics(self, duration: float) -> MetricsRegistry:
+        """OpenMetrics for the last validate_template_directory() run."""
+        resolver = self.resolver
+        return validator_metrics(
+            "template-metadata",
+            duration=duration,
+            files=self.files + resolver.files_loaded,
+            bytes_read=self.bytes_read + resolver.bytes_loaded,
+            errors=len(self.errors),
+            warnings=len(self.warnings),
+            rule_evaluations=self.rule_evaluations + resolver.validation_misses,
+            file_durations=self.file_durations,
+            caches={"metadata-validation": (resolver.validation_hits, resolver.validation_misses)}
+        )
+    
     def generate_template_index(self, template_dir: str, output_file: str):
         """Generate an index of all templates with their metadata."""
         template_dir = Path(template_dir)
@@ -191,8 +256,7 @@ class TemplateValidator:
             
             if metadata_file.exists():
                 try:
-                    with open(metadata_file, 'r') as f:
-                        template_info['metadata'] = json.load(f)
+                    template_info['metadata'] = self.resolver.resolve(metadata_file)
                 except Exception as e:
                     print(f"Error reading metadata for {template_file}: {e}")
             
@@ -233,6 +297,48 @@ class TemplateValidator:
         else:
             print(f"\n❌ Validation failed with {len(self.errors)} errors and {len(self.warnings)} warnings")
 
+class TemplateMetadataReportReducer(ReportReducer):
+    """Renders the template metadata report from `repository` and `template` records."""
+    
+    def __init__(self):
+        super().__init__()
+        # Inheritance cycles (from the primary shard) come before per-template findings
+        self.errors: List[str] = []
+        self.warnings: List[str] = []
+        self.templates: List[Dict[str, Any]] = []
+        self.timings: Dict[str, float] = {}
+    
+    def reduce_repository(self, record: Dict[str, Any]):
+        self.errors.extend(record["errors"])
+        self.warnings.extend(record["warnings"])
+    
+    def reduce_template(self, record: Dict[str, Any]):
+        self.templates.append({key: record[key] for key in ("path", "errors", "warnings")})
+        self.timings[record["path"]] = round(record["duration"], 6)
+    
+    def report(self) -> Dict[str, Any]:
+        templates = sorted(self.templates, key=lambda template: path_order(template["path"]))
+        errors = self.errors + [error for template in templates for error in template["errors"]]
+        warnings = self.warnings + [warning for template in templates for warning in template["warnings"]]
+        return {
+            "summary": {
+                "templates": len(templates),
+                "errors": len(errors),
+                "warnings": len(warnings),
+                "duration": round(self.duration, 3)
+            },
+            "errors": errors,
+            "warnings": warnings,
+            "templates": templates,
+            "timings": {template["path"]: self.timings[template["path"]] for template in templates}
+        }
+    
+    def failure(self, report: Dict[str, Any]) -> Optional[str]:
+        errors = report['summary']['errors']
+        return f"Template metadata validation failed with {errors} errors" if errors else None
+
+REPORT_REDUCER = TemplateMetadataReportReducer
+
 def main():
     parser = argparse.ArgumentParser(description='Validate SDD templates and metadata')
     parser.add_argument('--template-dir', default='resources/templates', 
@@ -243,8 +349,23 @@ def main():
                        help='Generate template index file')
     parser.add_argument('--index-output', default='resources/templates/template-index.json',
                        help='Output file for template index')
+    parser.add_argument('--output', default='test-results/template-metadata-report.json',
+                       help='Where to write the JSON report')
+    add_metrics_argument(parser, "validate-template-metadata")
+    add_records_argument(parser, "validate-template-metadata")
+    add_shard_arguments(parser)
+    add_instrumentation_arguments(parser)
     
     args = parser.parse_args()
+    start_instrumentation(args, "validate-template-metadata")
+    
+    if args.merge:
+        report = merge_streams(parser, args.merge, TemplateMetadataReportReducer(), "validate-template-metadata")
+        TemplateValidator.save_report(report, args.output)
+        summary = report['summary']
+        print(f"🧩 Merged {len(args.merge)} shard record streams: {summary['templates']} templates, "
+              f"{summary['errors']} errors, {summary['warnings']} warnings")
+        sys.exit(1 if summary['errors'] else 0)
     
     # Check if schema exists
     if not os.path.exists(args.schema):
@@ -257,19 +378,29 @@ def main():
         sys.exit(1)
     
     validator = TemplateValidator(args.schema)
+    shard = shard_selector(parser, args, "validate-template-metadata")
+    records = RecordWriter(args.records, "validate-template-metadata", TemplateMetadataReportReducer(), shard.shard)
     
     print(f"🎯 Validating templates in: {args.template_dir}")
     print(f"📋 Using schema: {args.schema}")
     print("-" * 50)
     
-    validated_count, error_count = validator.validate_template_directory(args.template_dir)
+    start_time = time.time()
+    with span("suite", "template metadata"):
+        validated_count, error_count = validator.validate_template_directory(args.template_dir, shard=shard,
+                                                                               records=records)
+    duration = time.time() - start_time
     
     if args.generate_index:
         validator.generate_template_index(args.template_dir, args.index_output)
     
-    validator.print_summary()
+    with span("report", "template metadata"):
+        validator.print_summary()
     
     print(f"\nProcessed {validated_count} templates")
+    validator.save_report(records.close(duration), args.output)
+    if args.metrics:
+        validator.metrics(duration).write(args.metrics)
     
     # Exit with error code if there were errors
     sys.exit(1 if error_count > 0 else 0)
@@ -0,0 +1,429 @@
+#!/usr/bin/env python3
+"""
+Template Structure Validation Script
+
+Python port of `validate-templates.sh`. Every template is read once and
+scanned once; the facts the shell script gathered with separate grep
+calls (front matter, placeholder lines, `_Requirements:` references, main
+heading, per-type sections, examples, usage notes and AI compatibility)
+are collected in that single pass. Files are checked in parallel; each
+template's results are streamed as a record (see result_records.py) and
+the JSON report for `ComprehensiveTestRunner` is rendered from the
+records. With `--shard` only the templates a shard owns are checked;
+`--merge` renders the report from the record streams of all shards.
+"""
+
+import json
+import os
+import re
+import sys
+import time
+import argparse
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from openmetrics import MetricsRegistry, add_metrics_argument, validator_metrics
+from result_records import RecordWriter, ReportReducer, add_records_argument, merge_streams
+from sharding import ShardSelector, add_shard_arguments, path_order, shard_selector
+from tracing import add_instrumentation_arguments, span, start_instrumentation
+
+# Below this many templates, worker start-up costs more than it saves
+PARALLEL_THRESHOLD = 8
+
+BASE_TEMPLATES = ("spec.md", "plan.md", "tasks.md")
+DOMAINS = ("api", "backend", "frontend", "mobile")
+SPEC_SECTIONS = ("User Story", "Acceptance Criteria")
+PLAN_SECTIONS = ("Architecture", "Components", "Technical Constraints")
+AI_COMPATIBILITY_TERMS = ("copilot", "claude", "chatgpt", "ai agent")
+KEBAB_CASE_PATTERN = re.compile(r'^[a-z0-9]+(-[a-z0-9]+)*$')
+
+# Report sections, in the order the shell script ran them
+SECTIONS = ("base", "domain", "metadata", "examples", "compatibility")
+
+@dataclass
+class TemplateScan:
+    """Everything the checks need, gathered in one pass over a template."""
+    front_matter: bool = False
+    placeholder_lines: int = 0
+    requirement_lines: int = 0
+    main_heading: bool = False
+    spec_sections: Tuple[str, ...] = ()
+    ears_format: bool = False
+    plan_sections: Tuple[str, ...] = ()
+    checkbox_lines: int = 0
+    numbered_tasks: bool = False
+    has_examples: bool = False
+    has_usage: bool = False
+    ai_compatibility: bool = False
+
+def scan_template(content: str) -> TemplateScan:
+    """Collect line-level facts with substring tests instead of per-check greps."""
+    scan = TemplateScan()
+    lines = content.split('\n')
+    scan.front_matter = bool(lines) and lines[0].startswith('---')
+    spec_found, plan_found = set(), set()
+    
+    for line in lines:
+        # grep "\[.*\]": an opening bracket with a closing one after it
+        opening = line.find('[')
+        if opening >= 0 and line.rfind(']') > opening:
+            scan.placeholder_lines += 1
+        if '_Requirements:' in line:
+            scan.requirement_lines += 1
+        if line.startswith('# '):
+            scan.main_heading = True
+        for section in SPEC_SECTIONS:
+            if section in line:
+                spec_found.add(section)
+        if not scan.ears_format:
+            when = line.find('WHEN')
+            then = line.find('THEN', when + 4) if when >= 0 else -1
+            scan.ears_format = then >= 0 and line.find('SHALL', then + 4) >= 0
+        if '- [ ]' in line:
+            scan.checkbox_lines += 1
+            if line.startswith('- [ ] ') and line[6:7].isdigit():
+                scan.numbered_tasks = True
+        if 'Example:' in line or 'Sample:' in line:
+            scan.has_examples = True
+        if 'Usage:' in line or 'How to use:' in line:
+            scan.has_usage = True
+        
+        lower = line.lower()
+        for section in PLAN_SECTIONS:
+            if section.lower() in lower:
+                plan_found.add(section)
+        if not scan.ai_compatibility and any(term in lower for term in AI_COMPATIBILITY_TERMS):
+            scan.ai_compatibility = True
+    
+    scan.spec_sections = tuple(section for section in SPEC_SECTIONS if section in spec_found)
+    scan.plan_sections = tuple(section for section in PLAN_SECTIONS if section in plan_found)
+    return scan
+
+@dataclass(frozen=True)
+class CheckOutcome:
+    section: str
+    status: str  # passed, warning or error
+    message: str
+
+@dataclass(frozen=True)
+class TemplateResult:
+    """All check outcomes for one template file."""
+    path: str
+    template_type: Optional[str]
+    outcomes: Tuple[CheckOutcome, ...]
+    bytes_read: int = 0
+    duration: float = 0.0
+    
+    @property
+    def errors(self) -> List[str]:
+        return [outcome.message for outcome in self.outcomes if outcome.status == 'error']
+    
+    @property
+    def warnings(self) -> List[str]:
+        return [outcome.message for outcome in self.outcomes if outcome.status == 'warning']
+
+def template_type_for(path: Path) -> str:
+    """Infer the template type from its file name, as the shell script did."""
+    name = path.name
+    if 'spec' in name:
+        return 'spec'
+    if 'plan' in name:
+        return 'plan'
+    if 'task' in name:
+        return 'tasks'
+    return 'generic'
+
+def template_role(templates_dir: Path, path: Path) -> Tuple[Optional[str], Optional[str]]:
+    """Return (content section, template type) for a template, or (None, None).
+    
+    Base templates get the generic content checks; templates under a domain
+    directory get the checks for the type their file name suggests.
+    """
+    try:
+        parts = path.relative_to(templates_dir).parts
+    except ValueError:
+        return None, None
+    if len(parts) == 2 and parts[0] == 'base' and parts[1] in BASE_TEMPLATES:
+        return 'base', 'base'
+    if len(parts) > 1 and parts[0] in DOMAINS:
+        return 'domain', template_type_for(path)
+    return None, None
+
+def check_template(work: Tuple[str, Optional[str], Optional[str], bool],
+                   content: Optional[str] = None) -> TemplateResult:
+    """Read and scan one template, then apply every check that applies to it.
+    
+    ``work`` is (path, content section or None, template type, whether the
+    repository-wide metadata/examples/compatibility checks apply).
+    ``content``, if given, is checked instead of the file on disk.
+    """
+    start_time = time.perf_counter()
+    path, content_section, template_type, repository_checks = work
+    bytes_read = 0
+    if content is None:
+        with span("read", path), open(path, 'r', encoding='utf-8', errors='replace') as f:
+            content = f.read()
+            bytes_read = os.fstat(f.fileno()).st_size
+    with span("parse", path):
+        scan = scan_template(content)
+    
+    outcomes: List[CheckOutcome] = []
+    
+    def record(section: str, ok: bool, passed: str, warning: str):
+        outcomes.append(CheckOutcome(section, 'passed', passed) if ok else CheckOutcome(section, 'warning', warning))
+    
+    if content_section:
+        section = content_section
+        if scan.front_matter:
+            outcomes.append(CheckOutcome(section, 'passed', f"Has front matter: {path}"))
+        record(section, scan.placeholder_lines > 0,
+               f"Has {scan.placeholder_lines} placeholders: {path}", f"No placeholders found: {path}")
+        record(section, scan.requirement_lines > 0,
+               f"Has {scan.requirement_lines} requirement references: {path}", f"No requirement references: {path}")
+        record(section, scan.main_heading, f"Has main heading: {path}", f"Missing main heading: {path}")
+        
+        if template_type == 'spec':
+            for name in SPEC_SECTIONS:
+                record(section, name in scan.spec_sections,
+                       f"Has '{name}' section: {path}", f"Missing '{name}' section: {path}")
+            record(section, scan.ears_format, f"Uses EARS format: {path}", f"May not use EARS format: {path}")
+        elif template_type == 'plan':
+            for name in PLAN_SECTIONS:
+                record(section, name in scan.plan_sections,
+                       f"Has '{name}' section: {path}", f"Missing '{name}' section: {path}")
+        elif template_type == 'tasks':
+            record(section, scan.checkbox_lines > 0,
+                   f"Has {scan.checkbox_lines} checkboxes: {path}", f"No checkboxes found: {path}")
+            record(section, scan.numbered_tasks, f"Has numbered tasks: {path}", f"Tasks may not be numbered: {path}")
+    
+    if repository_checks:
+        template_path = Path(path)
+        record('metadata', bool(KEBAB_CASE_PATTERN.match(template_path.name[:-len('.md')])),
+               f"Follows naming convention: {path}", f"May not follow kebab-case: {path}")
+        record('metadata', (template_path.parent / 'README.md').is_file(),
+               f"Has documentation: {template_path.parent}", f"Missing README.md: {template_path.parent}")
+        record('examples', scan.has_examples, f"Has examples: {path}", f"May be missing examples: {path}")
+        record('examples', scan.has_usage,
+               f"Has usage instructions: {path}", f"May be missing usage instructions: {path}")
+        record('compatibility', scan.ai_compatibility,
+               f"Has AI compatibility notes: {path}", f"Missing AI compatibility info: {path}")
+    
+    return TemplateResult(path, template_type, tuple(outcomes), bytes_read, time.perf_counter() - start_time)
+
+class TemplateStructureValidator:
+    """Runs the template structure checks over a templates directory."""
+    
+    def __init__(self, templates_dir: str = "resources/templates"):
+        self.templates_dir = Path(templates_dir)
+        self.results: List[TemplateResult] = []
+        self.errors: List[str] = []
+        self.warnings: List[str] = []
+    
+    def _plan_work(self, shard: ShardSelector) -> List[Tuple[str, Optional[str], Optional[str], bool]]:
+        """Decide, per file, which checks apply, so each file is read once."""
+        if shard.primary:
+            for name in BASE_TEMPLATES:
+                template = self.templates_dir / "base" / name
+                if not template.is_file():
+                    self.errors.append(f"Missing base template: {template}")
+            
+            for domain in DOMAINS:
+                domain_dir = self.templates_dir / domain
+                if not domain_dir.is_dir():
+                    self.warnings.append(f"Domain directory not found: {domain_dir}")
+        
+        templates = shard.select(str(template) for template in sorted(self.templates_dir.rglob("*.md")))
+        return [(template, *template_role(self.templates_dir, Path(template)), True) for template in templates]
+    
+    def validate_all(self, jobs: Optional[int] = None, shard: Optional[ShardSelector] = None,
+                     records: Optional[RecordWriter] = None) -> bool:
+        """Check every template (or those ``shard`` owns), in parallel when there are enough of them.
+        
+        Each template's results are emitted to ``records`` as soon as they are in.
+        """
+        shard = shard or ShardSelector("validate-templates")
+        with span("walk", self.templates_dir):
+            work = self._plan_work(shard)
+        if records is not None and shard.primary:
+            records.emit("repository", errors=list(self.errors), warnings=list(self.warnings))
+        if jobs is None:
+            jobs = os.cpu_count() or 1
+        jobs = min(jobs, len(work))
+        
+        self.results = []
+        if jobs <= 1 or len(work) < PARALLEL_THRESHOLD:
+            for item in work:
+                # Self time excludes the nested read and parse spans
+                with span("validate", item[0]):
+                    self._collect(check_template(item), records)
+        else:
+            # Imported here so serial runs (and --help) never load multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            chunksize = max(1, len(work) // (jobs * 4))
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                for result in executor.map(check_template, work, chunksize=chunksize):
+                    self._collect(result, records)
+        return not self.errors
+    
+    def _collect(self, result: TemplateResult, records: Optional[RecordWriter]):
+        self.results.append(result)
+        self.errors.extend(result.errors)
+        self.warnings.extend(result.warnings)
+        if records is not None:
+            records.emit("template", path=result.path, type=result.template_type,
+                         passed=[o.message for o in result.outcomes if o.status == 'passed'],
+                         warnings=list(result.warnings), errors=list(result.errors),
+                         checks=len(result.outcomes), duration=result.duration)
+    
+    def metrics(self, duration: float) -> MetricsRegistry:
+        """OpenMetrics for the last validate_all() run."""
+        return validator_metrics(
+            "templates",
+            duration=duration,
+            files=len(self.results),
+            bytes_read=sum(result.bytes_read for result in self.results),
+            errors=len(self.errors),
+            warnings=len(self.warnings),
+            rule_evaluations=sum(len(result.outcomes) for result in self.results),
+            file_durations=[result.duration for result in self.results]
+        )
+    
+    def save_report(self, report: Dict[str, Any], output_path: str):
+        """Save the validation report to file."""
+        output_file = Path(output_path)
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        
+        with open(output_file, 'w') as f:
+            json.dump(report, f, indent=2)
+        
+        print(f"\n📊 Template validation report saved to: {output_file}")
+    
+    def print_results(self, quiet: bool = False):
+        """Print outcomes grouped by check section, like the shell script."""
+        headings = {
+            "base": "Validating base templates...",
+            "domain": "Validating domain-specific templates...",
+            "metadata": "Validating template metadata...",
+            "examples": "Validating template examples...",
+            "compatibility": "Validating template compatibility..."
+        }
+        symbols = {"passed": "✅", "warning": "⚠️ ", "error": "❌"}
+        for section in SECTIONS:
+            outcomes = [o for result in self.results for o in result.outcomes if o.section == section]
+            if quiet:
+                outcomes = [o for o in outcomes if o.status != 'passed']
+                if not outcomes:
+                    continue
+            print(f"ℹ️  {headings[section]}")
+            for outcome in outcomes:
+                print(f"{symbols[outcome.status]} {outcome.message}")
+            print()
+
+class TemplateReportReducer(ReportReducer):
+    """Renders the report for ComprehensiveTestRunner from `repository` and `template` records."""
+    
+    def __init__(self):
+        super().__init__()
+        # Repository-wide errors, reported before the per-template ones
+        self.errors: List[str] = []
+        self.warnings = 0
+        self.checks = 0
+        self.templates: List[Dict[str, Any]] = []
+        self.timings: Dict[str, float] = {}
+    
+    def reduce_repository(self, record: Dict[str, Any]):
+        self.errors.extend(record["errors"])
+        self.warnings += len(record["warnings"])
+    
+    def reduce_template(self, record: Dict[str, Any]):
+        self.templates.append({key: record[key] for key in ("path", "type", "passed", "warnings", "errors")})
+        self.checks += record["checks"]
+        self.warnings += len(record["warnings"])
+        self.timings[record["path"]] = round(record["duration"], 6)
+    
+    def report(self) -> Dict[str, Any]:
+        templates = sorted(self.templates, key=lambda entry: path_order(entry["path"]))
+        errors = self.errors + [error for entry in templates for error in entry["errors"]]
+        return {
+            "summary": {
+                "total_templates": len(templates),
+                "valid_templates": sum(1 for entry in templates if not entry["errors"]),
+                "checks": self.checks,
+                "warnings": self.warnings,
+                "errors": len(errors),
+                "duration": round(self.duration, 3)
+            },
+            "errors": errors,
+            "templates": templates,
+            "timings": {entry["path"]: self.timings[entry["path"]] for entry in templates}
+        }
+    
+    def failure(self, report: Dict[str, Any]) -> Optional[str]:
+        errors = report['summary']['errors']
+        return f"Template validation failed with {errors} errors" if errors else None
+
+REPORT_REDUCER = TemplateReportReducer
+
+def main():
+    parser = argparse.ArgumentParser(description='Validate template structure, format and completeness')
+    parser.add_argument('--templates-dir', default='resources/templates',
+                       help='Templates directory to validate')
+    parser.add_argument('--jobs', '-j', type=int, default=None,
+                       help='Worker processes (default: one per CPU)')
+    parser.add_argument('--output', default='test-results/template-validation.json',
+                       help='Where to write the machine-readable results')
+    parser.add_argument('--quiet', '-q', action='store_true',
+                       help='Only print warnings, errors and the summary')
+    add_metrics_argument(parser, "validate-templates")
+    add_records_argument(parser, "validate-templates")
+    add_shard_arguments(parser)
+    add_instrumentation_arguments(parser)
+    
+    args = parser.parse_args()
+    start_instrumentation(args, "validate-templates")
+    
+    print("🎯 Template Validation Script")
+    print("==============================")
+    
+    validator = TemplateStructureValidator(args.templates_dir)
+    if args.merge:
+        report = merge_streams(parser, args.merge, TemplateReportReducer(), "validate-templates")
+        print(f"🧩 Merged {len(args.merge)} shard record streams")
+    else:
+        shard = shard_selector(parser, args, "validate-templates")
+        records = RecordWriter(args.records, "validate-templates", TemplateReportReducer(), shard.shard)
+        start_time = time.time()
+        with span("suite", "template structure"):
+            validator.validate_all(jobs=args.jobs, shard=shard, records=records)
+        duration = time.time() - start_time
+        
+        with span("report", "template structure"):
+            for error in validator.errors:
+                if not any(error in result.errors for result in validator.results):
+                    print(f"❌ {error}")
+            validator.print_results(quiet=args.quiet)
+            
+            report = records.close(duration)
+    summary = report['summary']
+    print("==============================")
+    print("ℹ️  Validation Summary")
+    print(f"Total templates processed: {summary['total_templates']}")
+    print(f"Valid templates: {summary['valid_templates']}")
+    print(f"Warnings: {summary['warnings']}")
+    print(f"Errors: {summary['errors']}")
+    
+    validator.save_report(report, args.output)
+    if args.metrics and not args.merge:
+        validator.metrics(duration).write(args.metrics)
+    
+    if not summary['errors']:
+        print("✅ Template validation completed successfully!")
+        if summary['warnings']:
+            print("⚠️  Consider addressing the warnings above")
+    else:
+        print(f"❌ Template validation failed with {summary['errors']} errors")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
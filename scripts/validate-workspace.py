@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Workspace Validation
+
+Runs the example, template, metadata, link, decision-tree and journey
+checks from one resident workspace. With `--watch` it stays running: file
+events from inotify (or polling, where inotify is unavailable) are
+debounced, and each batch revalidates only the changed files and their
+dependents, so diagnostics follow a save in milliseconds rather than a
+full CI run.
+
+With `--serve` it also answers requests from editors and hooks
+(`validate-client.py`) on a Unix domain socket. Each connection sends one
+JSON object per line and gets one JSON response per line:
+    
+    {"method": "validate", "paths": ["/abs/spec.md", ...]}
+    {"method": "validate_buffer", "path": "/abs/spec.md", "content": "..."}
+    {"method": "status"}
+    {"method": "shutdown"}
+
+Connections are handled on their own threads; access to the workspace is
+serialized, so each request sees a consistent, warm state.
+"""
+
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+import time
+import argparse
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from file_watcher import DEFAULT_DEBOUNCE, DEFAULT_POLL_INTERVAL, FileWatcher
+from validation_workspace import Diagnostic, ValidationWorkspace
+from tracing import add_instrumentation_arguments, start_instrumentation
+
+def print_diagnostics(diagnostics: List[Diagnostic], indent: str = "  "):
+    for diagnostic in diagnostics:
+        symbol = "❌" if diagnostic.severity == 'error' else "⚠️ "
+        print(f"{indent}{symbol} [{diagnostic.source}] {diagnostic}")
+
+def generate_report(workspace: ValidationWorkspace, duration: float) -> Dict[str, Any]:
+    summary = workspace.summary()
+    summary["duration"] = round(duration, 3)
+    return {
+        "summary": summary,
+        "diagnostics": [asdict(diagnostic) for diagnostic in workspace.diagnostics()]
+    }
+
+def save_report(report: Dict[str, Any], output_path: str):
+    """Save the workspace report to file."""
+    output_file = Path(output_path)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    
+    with open(output_file, 'w') as f:
+        json.dump(report, f, indent=2)
+    
+    print(f"\n📊 Workspace validation report saved to: {output_file}")
+
+def watch(workspace: ValidationWorkspace, watcher: FileWatcher, lock: Optional[threading.Lock] = None):
+    """Revalidate each debounced batch of changes until interrupted."""
+    lock = lock or threading.Lock()
+    for batch in watcher.changes():
+        with lock:
+            start_time = time.perf_counter()
+            if batch.overflow:
+                workspace.load()
+                units = set(workspace.results)
+                label = "event queue overflowed, full rescan"
+            else:
+                units = workspace.apply_changes(batch.paths)
+                if not units:
+                    continue
+                changed = sorted(batch.paths)
+                label = ", ".join(changed[:3]) + (f" and {len(changed) - 3} more" if len(changed) > 3 else "")
+            elapsed_ms = (time.perf_counter() - start_time) * 1000
+            summary = workspace.summary()
+            diagnostics = workspace.unit_diagnostics(units)
+        
+        print(f"\n🔄 {datetime.now():%H:%M:%S} {label}: {len(units)} checks rerun in {elapsed_ms:.1f} ms "
+              f"({summary['errors']} errors, {summary['warnings']} warnings in total)")
+        if diagnostics:
+            print_diagnostics(diagnostics)
+        else:
+            print("  ✅ No issues in the affected files")
+
+class ValidationServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Serves workspace validations over a Unix domain socket."""
+    
+    daemon_threads = True
+    # Editors and hooks may connect in bursts
+    request_queue_size = 128
+    
+    def __init__(self, socket_path: str, workspace: ValidationWorkspace):
+        self.workspace = workspace
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.requests_served = 0
+        # (size, mtime_ns) of each path when a client last had it validated
+        self.signatures: Dict[str, Optional[Tuple[int, int]]] = {}
+        super().__init__(socket_path, ValidationRequestHandler)
+    
+    def relative_path(self, path: str) -> str:
+        """Map a client path (absolute or repository-relative) into the workspace."""
+        absolute = Path(path) if os.path.isabs(path) else self.workspace.root / path
+        relative = os.path.relpath(os.path.normpath(absolute), self.workspace.root)
+        if relative == '..' or relative.startswith('../'):
+            raise ValueError(f"Path is outside the repository: {path}")
+        return Path(relative).as_posix()
+    
+    def handle_request_object(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        if not isinstance(request, dict):
+            raise TypeError("a request must be a JSON object")
+        method = request.get("method")
+        start_time = time.perf_counter()
+        
+        if method == "validate":
+            paths = [self.relative_path(path) for path in request.get("paths", [])]
+            with self.lock:
+                self.workspace.apply_changes([path for path in paths if self._changed(path)])
+                diagnostics = self._diagnostics_under(paths)
+            # A mistyped or deleted path must not pass as clean
+            diagnostics += [Diagnostic(path, 0, "error", "workspace", "File not found")
+                            for path in paths if not (self.workspace.root / path).exists()]
+            response = {"diagnostics": [asdict(diagnostic) for diagnostic in diagnostics]}
+        elif method == "validate_buffer":
+            path = self.relative_path(request["path"])
+            with self.lock:
+                try:
+                    self.workspace.set_buffer(path, request["content"])
+                    diagnostics = self.workspace.diagnostics([path])
+                finally:
+                    self.workspace.clear_buffer(path)
+            response = {"diagnostics": [asdict(diagnostic) for diagnostic in diagnostics]}
+        elif method == "status":
+            with self.lock:
+                summary = self.workspace.summary()
+            response = {
+                "root": str(self.workspace.root),
+                "summary": summary,
+                "uptime": round(time.time() - self.started, 1),
+                "requests_served": self.requests_served
+            }
+        elif method == "shutdown":
+            # The handler stops the server once this response is written
+            response = {}
+        else:
+            raise ValueError(f"Unknown method: {method}")
+        
+        with self.lock:
+            self.requests_served += 1
+        response["duration_ms"] = round((time.perf_counter() - start_time) * 1000, 2)
+        return response
+    
+    def _changed(self, path: str) -> bool:
+        """Whether a path differs from when it was last validated for a client.
+        
+        Unchanged paths are answered from the resident results, which the
+        watcher keeps current when other files change.
+        """
+        try:
+            stat = (self.workspace.root / path).stat()
+            signature = (stat.st_size, stat.st_mtime_ns)
+        except OSError:
+            signature = None
+        if self.signatures.get(path) == signature and signature is not None:
+            return False
+        self.signatures[path] = signature
+        return True
+    
+    def _diagnostics_under(self, paths: List[str]) -> List[Diagnostic]:
+        """Findings located in the given files or anywhere below the given directories."""
+        directories = tuple(path + '/' for path in paths if path in self.workspace.index.directories)
+        if not directories:
+            return self.workspace.diagnostics(paths)
+        selected = set(paths)
+        return [
+            diagnostic for diagnostic in self.workspace.diagnostics()
+            if diagnostic.path in selected or diagnostic.path.startswith(directories)
+        ]
+
+class ValidationRequestHandler(socketserver.StreamRequestHandler):
+    """Answers newline-delimited JSON requests until the client disconnects."""
+    
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            request: Dict[str, Any] = {}
+            try:
+                request = json.loads(line)
+                response = self.server.handle_request_object(request)
+                response["ok"] = True
+            except (KeyError, ValueError, TypeError) as e:
+                response = {"ok": False, "error": f"Invalid request: {e}"}
+            except Exception as e:
+                # A failed validation must not take the connection down with it
+                response = {"ok": False, "error": f"Validation failed: {type(e).__name__}: {e}"}
+            if isinstance(request, dict) and "id" in request:
+                response["id"] = request["id"]
+            self.wfile.write(json.dumps(response).encode('utf-8') + b'\n')
+            self.wfile.flush()
+            if response["ok"] and request.get("method") == "shutdown":
+                # The process exits when serving stops, so only stop after replying
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+                return
+
+def remove_stale_socket(socket_path: str):
+    """Remove a socket file left behind by a server that is no longer running."""
+    if not os.path.exists(socket_path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(socket_path)
+    except OSError:
+        os.unlink(socket_path)
+    else:
+        raise RuntimeError(f"A validation server is already listening on {socket_path}")
+    finally:
+        probe.close()
+
+def serve(workspace: ValidationWorkspace, socket_path: str, watcher: Optional[FileWatcher]):
+    """Answer socket requests, keeping the workspace fresh from file events."""
+    Path(socket_path).parent.mkdir(parents=True, exist_ok=True)
+    remove_stale_socket(socket_path)
+    
+    with ValidationServer(socket_path, workspace) as server:
+        if watcher is not None:
+            threading.Thread(target=watch, args=(workspace, watcher, server.lock), daemon=True).start()
+        print(f"🚀 Serving validations on {socket_path}"
+              + (f", watching with {watcher.backend}" if watcher else ""))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if os.path.exists(socket_path):
+                os.unlink(socket_path)
+    print("\n👋 Validation server stopped")
+
+def main():
+    parser = argparse.ArgumentParser(description='Validate the repository from a resident workspace')
+    parser.add_argument('--repo-root', default='.',
+                       help='Repository root to validate')
+    parser.add_argument('--watch', action='store_true',
+                       help='Keep running and revalidate changed files on save')
+    parser.add_argument('--serve', nargs='?', const='.sdd-cache/validation.sock', metavar='SOCKET',
+                       help='Serve validation requests on a Unix socket (default: .sdd-cache/validation.sock); '
+                            'also watches for changes unless --no-watch is given')
+    parser.add_argument('--no-watch', action='store_true',
+                       help='With --serve, only revalidate the paths clients ask about')
+    parser.add_argument('--poll', action='store_true',
+                       help='Poll for changes instead of using inotify')
+    parser.add_argument('--poll-interval', type=float, default=DEFAULT_POLL_INTERVAL,
+                       help='Seconds between polls when polling')
+    parser.add_argument('--debounce', type=float, default=DEFAULT_DEBOUNCE * 1000,
+                       help='Milliseconds without events before a batch is revalidated')
+    parser.add_argument('--output', default='test-results/workspace-validation.json',
+                       help='Where to write the JSON report (not written in watch mode)')
+    add_instrumentation_arguments(parser)
+    
+    args = parser.parse_args()
+    start_instrumentation(args, "validate-workspace")
+    
+    if not os.path.isdir(args.repo_root):
+        print(f"❌ Repository root not found: {args.repo_root}")
+        sys.exit(1)
+    
+    start_time = time.perf_counter()
+    workspace = ValidationWorkspace(args.repo_root).load()
+    duration = time.perf_counter() - start_time
+    summary = workspace.summary()
+    
+    print(f"🔍 Validated {summary['units']} units across {summary['markdown_files']} Markdown files "
+          f"in {duration * 1000:.0f} ms")
+    
+    if args.serve:
+        socket_path = args.serve if os.path.isabs(args.serve) else str(workspace.root / args.serve)
+        watcher = None
+        if not args.no_watch:
+            watcher = FileWatcher(args.repo_root, debounce=args.debounce / 1000,
+                                  poll_interval=args.poll_interval, force_polling=args.poll)
+        try:
+            serve(workspace, socket_path, watcher)
+        except RuntimeError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        finally:
+            if watcher is not None:
+                watcher.close()
+        return
+    
+    if not args.watch:
+        diagnostics = workspace.diagnostics()
+        if diagnostics:
+            print_diagnostics(diagnostics, indent="")
+        print(f"\n{'❌' if summary['errors'] else '✅'} {summary['errors']} errors, {summary['warnings']} warnings")
+        save_report(generate_report(workspace, duration), args.output)
+        sys.exit(1 if summary['errors'] else 0)
+    
+    with FileWatcher(args.repo_root, debounce=args.debounce / 1000, poll_interval=args.poll_interval,
+                     force_polling=args.poll) as watcher:
+        if watcher.fallback_reason:
+            print(f"⚠️  inotify unavailable ({watcher.fallback_reason}), polling instead")
+        print(f"👀 Watching {workspace.root} with {watcher.backend} "
+              f"({summary['errors']} errors, {summary['warnings']} warnings). Press Ctrl+C to stop.")
+        try:
+            watch(workspace, watcher)
+        except KeyboardInterrupt:
+            print("\n👋 Stopped watching")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,679 @@
+"""
+Validation Workspace
+
+Keeps the repository's parsed documents, requirement index, metadata
+inheritance graph and link index resident in memory, so a change to one
+file revalidates only that file and its dependents instead of the whole
+tree. A file's dependents are:
+
+- its example project: the sibling README, spec, plan and tasks files and
+  the requirement traceability between them,
+- its metadata: a template's `.meta.json`, and every metadata file that
+  `extends` a changed one,
+- the documents linking to it, when it appears, disappears or its
+  anchors change,
+- the decision trees, whose node links may point at it, when it appears
+  or disappears.
+
+Editor buffers can be layered over the files on disk with `set_buffer`;
+while a buffer is set every check sees its content instead of the saved
+file. Buffered Markdown is scanned section by section, so an edit to a
+large document rescans only the sections it touched.
+
+Findings are kept per validation unit, a (source, path) pair such as
+("examples", "examples/greenfield/task-management-api") or
+("links", "README.md"), and replaced whenever that unit is rerun.
+"""
+
+import importlib.util
+import json
+import sys
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from tracing import span
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+
+def load_script(name: str):
+    """Import a hyphenated script from this directory as a module."""
+    module_name = name.replace('-', '_')
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    spec = importlib.util.spec_from_file_location(module_name, SCRIPTS_DIR / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+check_links = load_script("check-links")
+validate_examples = load_script("validate-examples")
+validate_templates = load_script("validate-templates")
+validate_template_metadata = load_script("validate-template-metadata")
+validate_decision_trees = load_script("validate-decision-trees")
+test_user_journeys = load_script("test-user-journeys")
+
+PROJECT_FILES = ("README.md", "spec.md", "plan.md", "tasks.md")
+
+Unit = Tuple[str, str]
+
+# Sections are cut at the first heading at least this many lines after the
+# previous cut. The cuts depend only on the text since the previous one, so
+# after an edit they fall back into step within a section or two.
+MIN_SECTION_LINES = 32
+
+def split_sections(content: str) -> List[Tuple[int, str]]:
+    """Split Markdown at headings outside code fences into (line offset, text) pairs.
+    
+    A line counts as fenced if either the link scan or the document scan
+    would treat it so, so both scanners start every section in the state
+    they start a document in.
+    """
+    lines = content.split('\n')
+    sections = []
+    start = 0
+    fence = None
+    in_fence = False
+    for number, line in enumerate(lines):
+        if (line.startswith('#') and fence is None and not in_fence
+                and number - start >= MIN_SECTION_LINES):
+            sections.append((start, '\n'.join(lines[start:number])))
+            start = number
+        if '```' not in line and '~~~' not in line:
+            continue
+        fence_match = check_links.FENCE_PATTERN.match(line)
+        if fence is not None:
+            if fence_match and fence_match.group(1)[0] == fence[0] and len(fence_match.group(1)) >= len(fence):
+                fence = None
+        elif fence_match:
+            fence = fence_match.group(1)
+        if line.lstrip().startswith('```'):
+            in_fence = not in_fence
+    sections.append((start, '\n'.join(lines[start:])))
+    return sections
+
+class SectionScans:
+    """Link and document scans of buffered Markdown, memoized per section.
+    
+    Each section's scan is kept by its text, so after an edit only the
+    sections whose text changed are scanned again; the others are reused
+    with their line numbers shifted to where the section now starts.
+    """
+    
+    def __init__(self):
+        self._sections: Dict[str, Tuple[str, List[Tuple[int, str]]]] = {}
+        self._parts: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._merged: Dict[Tuple[str, str], Tuple[str, Any]] = {}
+        self.sections_scanned = 0
+    
+    def markdown(self, path: str, content: str) -> Tuple[List[Tuple[int, str]], Set[str]]:
+        """Links and anchors of a document, as ``check_links.scan_markdown`` finds them."""
+        merged = self._merged.get(("markdown", path))
+        if merged is not None and merged[0] == content:
+            return merged[1]
+        
+        links: List[Tuple[int, str]] = []
+        slugs: List[str] = []
+        html_anchors: Set[str] = set()
+        for offset, (part_links, part_slugs, part_anchors) in self._scan("markdown", path, content):
+            links.extend((offset + line, target) for line, target in part_links)
+            slugs.extend(part_slugs)
+            html_anchors |= part_anchors
+        result = (links, check_links.heading_anchors(slugs) | html_anchors)
+        self._merged[("markdown", path)] = (content, result)
+        return result
+    
+    def document(self, path: str, content: str):
+        """The ``validate_examples.scan_document`` result for a document."""
+        merged = self._merged.get(("document", path))
+        if merged is not None and merged[0] == content:
+            return merged[1]
+        
+        result = validate_examples.DocumentScan()
+        requirement_ids: Dict[str, int] = {}
+        for offset, scan in self._scan("document", path, content):
+            result.headings.extend(scan.headings)
+            for req_id, count in scan.requirement_ids.items():
+                requirement_ids[req_id] = requirement_ids.get(req_id, 0) + count
+            for lines_by_id, part in ((result.requirement_definitions, scan.requirement_definitions),
+                                      (result.requirement_refs, scan.requirement_refs)):
+                for req_id, lines in part.items():
+                    lines_by_id.setdefault(req_id, []).extend(offset + line for line in lines)
+            result.shall_count += scan.shall_count
+            result.task_count += scan.task_count
+            result.subtask_count += scan.subtask_count
+            result.code_fence_count += scan.code_fence_count
+        result.requirement_ids.update(requirement_ids)
+        self._merged[("document", path)] = (content, result)
+        return result
+    
+    def discard(self, path: str):
+        self._sections.pop(path, None)
+        for kind in ("markdown", "document"):
+            self._parts.pop((kind, path), None)
+            self._merged.pop((kind, path), None)
+    
+    def _scan(self, kind: str, path: str, content: str) -> List[Tuple[int, Any]]:
+        scanner = check_links.scan_markdown_tokens if kind == "markdown" else validate_examples.scan_document
+        previous = self._parts.get((kind, path), {})
+        current: Dict[str, Any] = {}
+        results = []
+        for offset, text in self._split(path, content):
+            part = current.get(text)
+            if part is None:
+                part = previous.get(text)
+                if part is None:
+                    part = scanner(text)
+                    self.sections_scanned += 1
+                current[text] = part
+            results.append((offset, part))
+        # Only the sections of the latest content are kept
+        self._parts[(kind, path)] = current
+        return results
+    
+    def _split(self, path: str, content: str) -> List[Tuple[int, str]]:
+        cached = self._sections.get(path)
+        if cached is not None and cached[0] == content:
+            return cached[1]
+        sections = split_sections(content)
+        self._sections[path] = (content, sections)
+        return sections
+
+@dataclass(frozen=True)
+class Diagnostic:
+    """One finding, located by repository path and line."""
+    path: str
+    line: int  # 1-based; 0 when it applies to the whole file
+    severity: str  # error or warning
+    source: str
+    message: str
+    
+    def __str__(self) -> str:
+        location = f"{self.path}:{self.line}" if self.line else self.path
+        return f"{location}: {self.message}"
+
+class ValidationWorkspace:
+    """Resident validation state for one repository checkout."""
+    
+    def __init__(self, repo_root: str = ".", examples_dir: str = "examples",
+                 templates_dir: str = "resources/templates",
+                 trees_dir: str = "resources/decision-trees",
+                 schema_path: Optional[str] = None,
+                 link_config: str = ".markdown-link-check.json"):
+        self.root = Path(repo_root).resolve()
+        self.examples_dir = examples_dir.strip('/')
+        self.templates_dir = templates_dir.strip('/')
+        self.trees_dir = trees_dir.strip('/')
+        self.schema_path = schema_path or f"{self.templates_dir}/template-schema.json"
+        self.links = check_links.LinkChecker(str(self.root), str(self.root / link_config),
+                                             cache_path=None, offline=True)
+        self.requirements = validate_examples.RequirementIndex()
+        self.metadata = None
+        self.linked_by: Dict[str, Set[str]] = defaultdict(set)
+        self._link_targets: Dict[str, Set[str]] = {}
+        self.journey_steps: Dict[str, List[Tuple[str, Any]]] = defaultdict(list)
+        self.buffers: Dict[str, str] = {}
+        self.sections = SectionScans()
+        self._file_scans: Dict[str, Tuple[Tuple[int, int], Any]] = {}
+        self.results: Dict[Unit, Tuple[Diagnostic, ...]] = {}
+        self._units_by_path: Dict[str, Set[Unit]] = defaultdict(set)
+        self._severity_counts: Counter = Counter()
+    
+    @property
+    def index(self):
+        return self.links.index
+    
+    def load(self) -> "ValidationWorkspace":
+        """Index the whole tree and validate every unit once.
+        
+        Calling it again discards the resident state (buffers excepted) and
+        starts over, e.g. after file events were lost.
+        """
+        self.links.index = check_links.LinkIndex(self.root)
+        self.requirements = validate_examples.RequirementIndex()
+        self.linked_by.clear()
+        self._link_targets.clear()
+        self.journey_steps.clear()
+        self._file_scans.clear()
+        self.results.clear()
+        self._units_by_path.clear()
+        self._severity_counts.clear()
+        with span("walk", self.root):
+            self.index.build()
+        for source in self.index.documents:
+            self._link_document(source)
+        self.requirements.build(self.root / project for project in self._projects())
+        self._load_metadata_validator()
+        for user_type, journey_name, steps in test_user_journeys.UserJourneyTester(str(self.root)).journeys():
+            for step in steps:
+                self.journey_steps[step.expected_file].append((f"{user_type.value}: {journey_name}", step))
+        
+        units: Set[Unit] = {("examples", project) for project in self._projects()}
+        units.update(("journeys", path) for path in self.journey_steps)
+        for document in self.index.documents:
+            units.add(("links", document))
+            if self._under(document, self.templates_dir):
+                units.update({("templates", document), ("metadata", document)})
+            if self._under(document, self.trees_dir):
+                units.add(("decision-trees", document))
+        self._validate(units)
+        return self
+    
+    def apply_changes(self, paths: Iterable[str]) -> Set[Unit]:
+        """Bring the resident state up to date with changed paths.
+        
+        Returns the units that were revalidated.
+        """
+        units: Set[Unit] = set()
+        existence_changed = False
+        
+        for relative in sorted(paths):
+            if any(part in check_links.SKIPPED_DIRS for part in relative.split('/')):
+                continue
+            known = relative in self.index.paths
+            was_directory = relative in self.index.directories
+            exists = relative in self.buffers or (self.root / relative).exists()
+            appeared_or_vanished = known != exists
+            existence_changed |= appeared_or_vanished
+            
+            if self._reindex(relative):
+                targets = {relative}
+                if was_directory:
+                    prefix = relative + '/'
+                    targets.update(target for target in self.linked_by if target.startswith(prefix))
+                for target in targets:
+                    units.update(("links", source) for source in self.linked_by.get(target, ()))
+            
+            if relative.endswith('.md'):
+                if relative in self.index.documents:
+                    self._link_document(relative)
+                else:
+                    self._unlink_document(relative)
+                units.add(("links", relative))
+                if self._under(relative, self.trees_dir):
+                    units.add(("decision-trees", relative))
+            if relative in self.journey_steps:
+                units.add(("journeys", relative))
+            
+            units |= self._example_units(relative)
+            units |= self._template_units(relative, appeared_or_vanished)
+        
+        if existence_changed:
+            units.update(("decision-trees", document) for document in self.index.documents
+                         if self._under(document, self.trees_dir))
+        
+        self._validate(units)
+        return units
+    
+    def set_buffer(self, relative: str, content: str) -> Set[Unit]:
+        """Validate ``content`` in place of the saved file until the buffer is cleared."""
+        if not isinstance(content, str):
+            raise TypeError(f"buffer content for {relative} must be a string, not {type(content).__name__}")
+        self.buffers[relative] = content
+        return self.apply_changes([relative])
+    
+    def clear_buffer(self, relative: str) -> Set[Unit]:
+        """Drop a buffer and go back to the file on disk."""
+        if self.buffers.pop(relative, None) is None:
+            return set()
+        self.sections.discard(relative)
+        return self.apply_changes([relative])
+    
+    def diagnostics(self, paths: Optional[Iterable[str]] = None) -> List[Diagnostic]:
+        """Current findings, optionally only those located in the given paths."""
+        if paths is None:
+            found = [diagnostic for diagnostics in self.results.values() for diagnostic in diagnostics]
+        else:
+            selected = set(paths)
+            units = {unit for path in selected for unit in self._units_by_path.get(path, ())}
+            found = [diagnostic for unit in units for diagnostic in self.results[unit]
+                     if diagnostic.path in selected]
+        return sorted(found, key=lambda d: (d.path, d.line, d.source, d.message))
+    
+    def unit_diagnostics(self, units: Iterable[Unit]) -> List[Diagnostic]:
+        """Current findings of the given units."""
+        found = [diagnostic for unit in units for diagnostic in self.results.get(unit, ())]
+        return sorted(found, key=lambda d: (d.path, d.line, d.source, d.message))
+    
+    def summary(self) -> Dict[str, int]:
+        return {
+            "markdown_files": len(self.index.documents),
+            "indexed_paths": len(self.index.paths) - 1,
+            "units": len(self.results),
+            "errors": self._severity_counts['error'],
+            "warnings": self._severity_counts['warning']
+        }
+    
+    # Dependency tracking
+    
+    def _reindex(self, relative: str) -> bool:
+        """Update the link index for one path, from its buffer if it has one."""
+        content = self.buffers.get(relative)
+        if content is None or not relative.endswith('.md'):
+            return self.index.update(relative)
+        
+        added = relative not in self.index.paths
+        previous = self.index.anchors.get(relative)
+        self.index.set_document(relative, *self.sections.markdown(relative, content))
+        self.index.paths.add(relative)
+        return added or self.index.anchors[relative] != previous
+    
+    def _link_document(self, source: str):
+        """Record which repository paths a document links to."""
+        self._unlink_document(source)
+        targets = set()
+        # Links with the same target resolve alike within one document
+        distinct = {link.target: link for link in self.index.documents.get(source, ())}
+        for link in distinct.values():
+            kind, target = self.links.classify(link)
+            if kind == "local":
+                resolved, _ = self.links.resolve_local(link, target)
+                if resolved is not None and resolved != source:
+                    targets.add(resolved)
+        self._link_targets[source] = targets
+        for target in targets:
+            self.linked_by[target].add(source)
+    
+    def _unlink_document(self, source: str):
+        for target in self._link_targets.pop(source, ()):
+            sources = self.linked_by.get(target)
+            if sources is not None:
+                sources.discard(source)
+                if not sources:
+                    del self.linked_by[target]
+    
+    def _example_units(self, relative: str) -> Set[Unit]:
+        if not self._under(relative, self.examples_dir):
+            return set()
+        parts = relative[len(self.examples_dir) + 1:].split('/')
+        if len(parts) == 2:
+            # A whole project appeared or disappeared
+            changed = list(self.requirements.INDEXED_FILES)
+        elif len(parts) == 3 and parts[2] in PROJECT_FILES:
+            changed = [parts[2]]
+        else:
+            return set()
+        
+        project = f"{self.examples_dir}/{parts[0]}/{parts[1]}"
+        for name in changed:
+            if name not in self.requirements.INDEXED_FILES:
+                continue
+            buffered = f"{project}/{name}"
+            content = self.buffers.get(buffered)
+            if content is None:
+                self.requirements.update_document(self.root / project / name)
+            else:
+                self.requirements.index_content(self.root / project / name, content,
+                                                scan=self.sections.document(buffered, content))
+        return {("examples", project)}
+    
+    def _template_units(self, relative: str, appeared_or_vanished: bool) -> Set[Unit]:
+        if relative == self.schema_path:
+            self._load_metadata_validator()
+            return {("metadata", document) for document in self.index.documents
+                    if self._under(document, self.templates_dir)}
+        if not self._under(relative, self.templates_dir):
+            return set()
+        
+        units: Set[Unit] = set()
+        if relative.endswith('.meta.json'):
+            if relative in self.buffers:
+                # Unsaved metadata is checked on its own; the saved graph stays as is
+                return {("metadata", relative[:-len('.meta.json')] + '.md')}
+            if self.metadata is None:
+                return units
+            changed = self.root / relative
+            for node in self.metadata.resolver.refresh(changed) | {changed.resolve()}:
+                template = node.parent / (node.name[:-len('.meta.json')] + '.md')
+                units.add(("metadata", self._relative_path(template)))
+        elif relative.endswith('.md'):
+            units.update({("templates", relative), ("metadata", relative)})
+            directory, _, name = relative.rpartition('/')
+            if name == 'README.md' and appeared_or_vanished:
+                # Every template checks for a README.md next to it
+                units.update(("templates", document) for document in self.index.documents
+                             if document.rpartition('/')[0] == directory)
+        return units
+    
+    def _load_metadata_validator(self):
+        schema = self.root / self.schema_path
+        self.metadata = None
+        if schema.is_file():
+            self.metadata = validate_template_metadata.TemplateValidator(str(schema))
+            self.metadata.resolver.scan()
+    
+    # Validation units
+    
+    def _validate(self, units: Iterable[Unit]):
+        runners = {
+            "examples": self._validate_project,
+            "templates": self._validate_template,
+            "metadata": self._validate_metadata,
+            "links": self._validate_links,
+            "decision-trees": self._validate_tree,
+            "journeys": self._validate_journeys
+        }
+        for unit in sorted(units):
+            source, path = unit
+            with span("validate", path, source=source):
+                diagnostics = runners[source](path)
+            self._store(unit, None if diagnostics is None else tuple(diagnostics))
+    
+    def _store(self, unit: Unit, diagnostics: Optional[Tuple[Diagnostic, ...]]):
+        """Replace a unit's findings, keeping the per-path index and counts current."""
+        for diagnostic in self.results.pop(unit, ()):
+            self._severity_counts[diagnostic.severity] -= 1
+            units = self._units_by_path.get(diagnostic.path)
+            if units is not None:
+                units.discard(unit)
+                if not units:
+                    del self._units_by_path[diagnostic.path]
+        if diagnostics is None:
+            return
+        
+        self.results[unit] = diagnostics
+        for diagnostic in diagnostics:
+            self._severity_counts[diagnostic.severity] += 1
+            self._units_by_path[diagnostic.path].add(unit)
+    
+    def _validate_project(self, project: str) -> Optional[List[Diagnostic]]:
+        project_path = self.root / project
+        if not project_path.is_dir():
+            return None
+        
+        buffers = {name: self.buffers[f"{project}/{name}"] for name in PROJECT_FILES
+                   if f"{project}/{name}" in self.buffers}
+        scans = {}
+        for name in PROJECT_FILES:
+            scan = self._document_scan(f"{project}/{name}")
+            if scan is not None:
+                scans[name] = scan
+        validator = validate_examples.ExampleValidator(str(self.root / self.examples_dir))
+        result = validator.validate_project(project_path, buffers, scans)
+        prefix = f"{project_path.parent.name}/{project_path.name}: "
+        diagnostics = []
+        for severity, messages in (("error", result.errors), ("warning", result.warnings)):
+            for message in messages:
+                message = message[len(prefix):] if message.startswith(prefix) else message
+                file_name = message.split(' ', 1)[0]
+                path = f"{project}/{file_name}" if file_name in PROJECT_FILES else project
+                diagnostics.append(Diagnostic(path, 0, severity, "examples", message))
+        
+        key = str(project_path)
+        index = self.requirements
+        site_paths: Dict[str, str] = {}
+        for flagged, severity, sites, describe in (
+            (index.dangling, "error", index.reference_sites,
+             "tasks.md references undefined requirement {}"),
+            (index.duplicates, "error", index.definition_sites,
+             "spec.md defines requirement {} more than once"),
+            (index.uncovered, "warning", index.definition_sites,
+             "requirement {} is not covered by any task in tasks.md")
+        ):
+            for flagged_project, req_id in index.project_keys.get(key, set()) & flagged:
+                for site in sites(flagged_project, req_id):
+                    if site.path not in site_paths:
+                        site_paths[site.path] = self._relative_path(Path(site.path))
+                    diagnostics.append(Diagnostic(site_paths[site.path], site.line,
+                                                  severity, "examples", describe.format(req_id)))
+        return diagnostics
+    
+    def _document_scan(self, relative: str):
+        """Document scan of a buffer or saved file, reused while it is unchanged."""
+        content = self.buffers.get(relative)
+        if content is not None:
+            return self.sections.document(relative, content)
+        
+        try:
+            stat = (self.root / relative).stat()
+            signature = (stat.st_size, stat.st_mtime_ns)
+            cached = self._file_scans.get(relative)
+            if cached is not None and cached[0] == signature:
+                return cached[1]
+            with open(self.root / relative, 'r', encoding='utf-8') as f:
+                scan = validate_examples.scan_document(f.read())
+        except (OSError, UnicodeDecodeError):
+            # Missing or unreadable; the validator reports it
+            self._file_scans.pop(relative, None)
+            return None
+        self._file_scans[relative] = (signature, scan)
+        return scan
+    
+    def _validate_template(self, template: str) -> Optional[List[Diagnostic]]:
+        path = self.root / template
+        if template not in self.buffers and not path.is_file():
+            return None
+        section, template_type = validate_templates.template_role(self.root / self.templates_dir, path)
+        result = validate_templates.check_template((str(path), section, template_type, True),
+                                                   content=self.buffers.get(template))
+        return [
+            Diagnostic(template, 0, outcome.status, "templates", self._relative_text(outcome.message))
+            for outcome in result.outcomes if outcome.status != 'passed'
+        ]
+    
+    def _validate_metadata(self, template: str) -> Optional[List[Diagnostic]]:
+        path = self.root / template
+        if self.metadata is None or path.name.lower() == 'readme.md':
+            return None
+        if template not in self.buffers and not path.is_file():
+            return None
+        
+        metadata_path = path.with_suffix('.meta.json')
+        metadata_file = self._relative_path(metadata_path)
+        metadata_buffer = self.buffers.get(metadata_file)
+        if metadata_buffer is None and not metadata_path.exists():
+            return [Diagnostic(template, 0, "warning", "metadata", "No metadata file for template")]
+        
+        validator = self.metadata
+        validator.errors, validator.warnings = [], []
+        if metadata_buffer is None:
+            validator.validate_metadata_file(str(metadata_path))
+        else:
+            try:
+                metadata = validator.resolver.resolve_content(metadata_path, json.loads(metadata_buffer))
+            except json.JSONDecodeError as e:
+                return [Diagnostic(metadata_file, e.lineno, "error", "metadata", f"Invalid JSON: {e.msg}")]
+            except validate_template_metadata.InheritanceError as e:
+                validator.errors.append(str(e))
+            else:
+                validator.errors.extend(f"Schema violation in {metadata_file}: {error}"
+                                        for error in validator.schema_validator(metadata))
+        metadata_errors = validator.errors
+        validator.errors = []
+        validator.validate_template_content(str(path), str(metadata_path), content=self.buffers.get(template))
+        
+        located = [(metadata_file, "error", message) for message in metadata_errors]
+        located += [(template, "error", message) for message in validator.errors]
+        located += [(template, "warning", message) for message in validator.warnings]
+        
+        diagnostics = []
+        for path, severity, message in located:
+            message = self._relative_text(message)
+            if message.startswith(f"{path}: "):
+                message = message[len(path) + 2:]
+            diagnostics.append(Diagnostic(path, 0, severity, "metadata", message))
+        return diagnostics
+    
+    def _validate_links(self, source: str) -> Optional[List[Diagnostic]]:
+        links = self.index.documents.get(source)
+        if links is None:
+            return None
+        
+        diagnostics = []
+        problems: Dict[str, Optional[str]] = {}
+        for link in links:
+            if link.target not in problems:
+                kind, target = self.links.classify(link)
+                result = self.links.check_local(link, target) if kind == "local" else None
+                problems[link.target] = result.message if result and result.status == "broken" else None
+            problem = problems[link.target]
+            if problem is not None:
+                diagnostics.append(Diagnostic(source, link.line, "error", "links",
+                                              f"Broken link {link.target} ({problem})"))
+        return diagnostics
+    
+    def _validate_tree(self, document: str) -> Optional[List[Diagnostic]]:
+        path = self.root / document
+        if document not in self.buffers and not path.is_file():
+            return None
+        
+        result = validate_decision_trees.validate_tree_file(str(path), self.buffers.get(document))
+        prefix = f"{path}:"
+        diagnostics = []
+        for severity, messages in (("error", result.errors), ("warning", result.warnings)):
+            for message in messages:
+                line = 0
+                if message.startswith(prefix):
+                    number, _, message = message[len(prefix):].partition(': ')
+                    line = int(number) if number.isdigit() else 0
+                diagnostics.append(Diagnostic(document, line, severity, "decision-trees",
+                                              self._relative_text(message)))
+        return diagnostics
+    
+    def _validate_journeys(self, path: str) -> Optional[List[Diagnostic]]:
+        steps = self.journey_steps.get(path)
+        if not steps:
+            return None
+        
+        content = self.buffers.get(path)
+        if content is None:
+            try:
+                with open(self.root / path, 'r', encoding='utf-8') as f:
+                    content = f.read()
+            except (OSError, UnicodeDecodeError):
+                content = None
+        
+        diagnostics = []
+        for journey, step in steps:
+            issues = ["file not found"] if content is None else test_user_journeys.journey_step_issues(step, content)
+            if issues:
+                diagnostics.append(Diagnostic(path, 0, "warning", "journeys",
+                                              f"Journey step '{step.step_name}' ({journey}): {'; '.join(issues)}"))
+        return diagnostics
+    
+    # Paths
+    
+    def _projects(self) -> List[str]:
+        examples = self.root / self.examples_dir
+        if not examples.is_dir():
+            return []
+        return [
+            f"{self.examples_dir}/{category.name}/{project.name}"
+            for category in sorted(examples.iterdir()) if category.is_dir() and category.name != "__pycache__"
+            for project in sorted(category.iterdir()) if project.is_dir()
+        ]
+    
+    @staticmethod
+    def _under(relative: str, directory: str) -> bool:
+        return relative.startswith(directory + '/')
+    
+    def _relative_path(self, path: Path) -> str:
+        try:
+            return Path(path).resolve().relative_to(self.root).as_posix()
+        except ValueError:
+            return str(path)
+    
+    def _relative_text(self, text: str) -> str:
+        return text.replace(f"{self.root}/", "")